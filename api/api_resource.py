@@ -4,9 +4,10 @@ from __future__ import annotations
 
 import collections
 import copy
-import csv
 import datetime
+import hashlib
 import inspect
+import io
 import itertools
 import logging
 import multiprocessing
@@ -14,11 +15,13 @@ import os
 import pathlib
 import random
 import re
+import resource
 import secrets
+import threading
 import time
 import urllib.parse
 from datetime import timedelta
-from functools import wraps
+from functools import partial, wraps
 from typing import TYPE_CHECKING, Any
 from typing import cast as typecast
 
@@ -27,22 +30,37 @@ import falcon
 import orjson
 import psycopg
 import requests
+import zstandard as zstd
 from cachebox import LRUCache, TTLCache
 from cachebox import cached as cachebox_cached
 from psycopg import Connection, Cursor
 
-from api.card_processing import preprocess_card
+from api.card_processing import card_prices, iter_preprocessed_cards
 from api.enums import CardOrdering, PreferOrder, SortDirection, UniqueOn
 from api.noscript_helpers import generate_results_count_html, generate_results_html
-from api.parsing import generate_sql_query, parse_scryfall_query
+from api.parsing import (
+    arithmetic_expressions,
+    generate_routed_sql_query,
+    has_unfiltered_regex,
+    is_indexed_expression,
+    parse_scryfall_query,
+)
+from api.parsing.card_query_nodes import devotion_counts, mana_cost_pip_counts
 from api.scryfall_bulk_data_fetcher import BulkDataKey, ScryfallBulkDataFetcher
 from api.settings import settings
 from api.tagger_client import TaggerClient
-from api.utils import db_utils, error_monitoring, multiprocessing_utils
+from api.utils import db_utils, error_monitoring, jobs, multiprocessing_utils
+from api.utils.concurrent_fetch import fetch_concurrently
+from api.utils.is_tags import IS_TAG_CARD_FIELDS, IS_TAG_RULES, get_derived_is_tags
+from api.utils.json_stream import iter_json_array
+from api.utils.prefer_weights import PREFER_SCORE_COMPONENTS, get_prefer_rank_expression, parse_prefer_weights
+from api.utils.rate_limiter import TokenBucket, rate_limited_get
 from api.utils.timer import Timer
-from api.utils.type_conversions import _get_type_name, make_type_converting_wrapper
+from api.utils.type_conversions import _get_type_name, convert_params_strictly, make_type_converting_wrapper
 
 if TYPE_CHECKING:
+    import uuid
+    from collections.abc import Iterable, Iterator
     from multiprocessing.sharedctypes import Synchronized
     from multiprocessing.synchronize import Event as EventType
     from multiprocessing.synchronize import RLock as LockType
@@ -54,10 +72,50 @@ logger = logging.getLogger(__name__)
 
 # pylint: disable=c-extension-no-member
 NOT_FOUND = 404
+SCRYFALL_SEARCH_URL = "https://api.scryfall.com/cards/search"
+# attempts at a Scryfall request that keeps being answered with 429 Too Many Requests
+SCRYFALL_REQUEST_ATTEMPTS = 5
 IMPORT_EXPORT = True
 MIN_IMPORT_INTERVAL = 300
 IMPORT_LOCK_TIMEOUT = 2
 MIN_IMPORT_CARDS = 90_000
+IMPORT_PROGRESS_INTERVAL = 6000
+PRICE_STAGING_COLUMNS = [("scryfall_id", "uuid"), ("price_usd", "real"), ("price_eur", "real"), ("price_tix", "real")]
+# magic.cards columns written after the import (tag imports and the prefer score backfill),
+# which an import must not overwrite when it updates a changed printing
+COLUMNS_NOT_FROM_IMPORT = frozenset(
+    [
+        "card_oracle_tags",
+        "card_is_tags",
+        "prefer_score",
+        "prefer_score_components",
+        *(f"prefer_{component}" for component in PREFER_SCORE_COMPONENTS),
+    ],
+)
+# magic.card_tags.tag_kind and the magic.cards column each kind of tag is rebuilt into
+CARD_TAG_COLUMNS = {"oracle": "card_oracle_tags", "is": "card_is_tags"}
+CARD_TAG_STAGING_COLUMNS = [("tag", "text"), ("card_name", "text")]
+# a full reload builds magic.cards' indexes after loading it, each with this many parallel workers
+RELOAD_MAINTENANCE_WORKERS = 4
+RELOAD_MAINTENANCE_WORK_MEM = "256MB"
+RELOAD_INDEX_STATEMENT_TIMEOUT = 600_000
+# readers queue behind the swap's lock on magic.cards, so give up rather than stall them
+RELOAD_SWAP_LOCK_TIMEOUT = "10s"
+SEARCH_STATEMENT_TIMEOUT = 10_000
+# regexes with no literal to prefilter on have to scan every row, so give up on them sooner
+UNFILTERED_REGEX_STATEMENT_TIMEOUT = 3_000
+# arithmetic expression statistics are buffered per worker and written at most this often
+ARITHMETIC_STATS_FLUSH_SECONDS = 30.0
+# exports write one zstd-compressed JSON lines file per table, streamed this many rows at a time
+EXPORT_TABLES = ("cards", "tags", "tag_relationships")
+EXPORT_STREAM_ROWS = 1000
+EXPORT_ZSTD_LEVEL = 3
+EXPORT_MANIFEST_FILE = "manifest.json"
+# a restore builds these tables' indexes once after loading them, rather than maintaining them row by row
+RESTORE_REINDEXED_TABLES = ("magic.cards", "magic.oracle_cards")
+# per-row triggers of magic.tag_relationships that a restore replaces with one cycle check and closure rebuild
+RESTORE_DISABLED_TAG_TRIGGERS = ("prevent_circular_references", "add_tag_closure")
+CARD_BLOB_COLUMNS = [("scryfall_id", "uuid"), ("raw_card_blob", "jsonb")]
 
 
 def cached(cache: Any, key: Any = None) -> Any:  # noqa: ANN401
@@ -84,6 +142,17 @@ def cached(cache: Any, key: Any = None) -> Any:  # noqa: ANN401
     return decorator
 
 
+def set_no_store_header(falcon_response: falcon.Response | None) -> None:
+    """Mark a Falcon response as never to be cached, for status that is out of date as soon as it is sent.
+
+    Args:
+        falcon_response: The Falcon response object.
+    """
+    if falcon_response is None:
+        return
+    falcon_response.set_header("Cache-Control", "no-store")
+
+
 def set_cache_header(falcon_response: falcon.Response | None, duration: timedelta) -> None:
     """Set the Cache-Control header on a Falcon response.
 
@@ -108,7 +177,75 @@ def get_where_clause(query: str) -> tuple[str, dict]:
         Tuple of (SQL WHERE clause, parameter dictionary).
     """
     parsed_query = parse_scryfall_query(query)
-    return generate_sql_query(parsed_query)
+    return generate_routed_sql_query(parsed_query)
+
+
+@cached(cache=LRUCache(maxsize=10_000))
+def get_statement_timeout(query: str) -> int:
+    """Pick the statement timeout (in milliseconds) for a search query.
+
+    Args:
+        query: The search query string to parse.
+
+    Returns:
+        A tighter timeout if the query contains a regex that can't be prefiltered, else the default.
+    """
+    if has_unfiltered_regex(parse_scryfall_query(query)):
+        return UNFILTERED_REGEX_STATEMENT_TIMEOUT
+    return SEARCH_STATEMENT_TIMEOUT
+
+
+@cached(cache=LRUCache(maxsize=10_000))
+def get_arithmetic_expressions(query: str) -> tuple[str, ...]:
+    """Get the normalized arithmetic expressions a search query compares.
+
+    Args:
+        query: The search query string to parse.
+
+    Returns:
+        Tuple of expression keys, empty if the query does no arithmetic.
+    """
+    return tuple(arithmetic_expressions(parse_scryfall_query(query)))
+
+
+def summarize_arithmetic_expression_stats(rows: list[dict[str, Any]]) -> dict[str, Any]:
+    """Rank arithmetic expressions by the search time an expression index could save.
+
+    Searches answered from the result cache count towards search_count but not run_count,
+    and only the runs took time. The savings estimate assumes an indexed expression search
+    would take as long as the average run over the expressions that are already indexed.
+
+    Args:
+        rows: magic.arithmetic_expression_stats rows (expression, search_count, run_count, total_ms).
+
+    Returns:
+        Dict with the indexed average and the expressions, most promising index candidate first.
+    """
+    indexed_rows = [row for row in rows if is_indexed_expression(row["expression"])]
+    indexed_runs = sum(row["run_count"] for row in indexed_rows)
+    indexed_mean_ms = sum(row["total_ms"] for row in indexed_rows) / indexed_runs if indexed_runs else None
+
+    expressions = []
+    for row in rows:
+        indexed = is_indexed_expression(row["expression"])
+        estimated_savings_ms = None
+        if indexed:
+            estimated_savings_ms = 0.0
+        elif indexed_mean_ms is not None:
+            estimated_savings_ms = max(row["total_ms"] - row["run_count"] * indexed_mean_ms, 0.0)
+        expressions.append(
+            {
+                "expression": row["expression"],
+                "indexed": indexed,
+                "search_count": row["search_count"],
+                "run_count": row["run_count"],
+                "total_ms": row["total_ms"],
+                "mean_ms": row["total_ms"] / row["run_count"] if row["run_count"] else None,
+                "estimated_savings_ms": estimated_savings_ms,
+            },
+        )
+    expressions.sort(key=lambda expr: (-(expr["estimated_savings_ms"] or 0), -expr["search_count"]))
+    return {"indexed_mean_ms": indexed_mean_ms, "expressions": expressions}
 
 
 def rewrap(query: str) -> str:
@@ -126,18 +263,33 @@ def rewrap(query: str) -> str:
 class APIResource:
     """Class implementing request handling for our simple API."""
 
-    def __init__(
+    def __init__(  # noqa: PLR0913
         self,
         *,
         import_guard: LockType = multiprocessing_utils.DEFAULT_LOCK,
         last_import_time: Synchronized | None = None,
         schema_setup_event: EventType = multiprocessing_utils.DEFAULT_EVENT,
+        data_generation: Synchronized | None = None,
+        import_status: multiprocessing_utils.ImportStatus | None = None,
+        import_requested: EventType | None = None,
+        job_requested: EventType | None = None,
+        scryfall_rate_limiter: TokenBucket | None = None,
+        tagger_rate_limiter: TokenBucket | None = None,
     ) -> None:
         """Initialize an APIResource object, set up connection pool and action map.
 
-        Sets up the database connection pool and action mapping for the API.
+        Sets up the database connection pool and action mapping for the API. When given
+        import_requested, a background importer owns bulk imports: this resource never runs one
+        itself, it asks the importer through the event and picks up new data when the importer
+        bumps data_generation. When given job_requested, a job executor runs the long admin
+        operations in jobs.JOB_ACTIONS: their routes queue a job, wake the executor through the
+        event and return the job's id, rather than running in the request. Given rate limiters
+        created before the workers forked, every Scryfall and tagger request of every worker is
+        held to one shared rate.
         """
-        self._bulk_data_fetcher = ScryfallBulkDataFetcher()
+        # one limiter for every Scryfall request of this worker, however many fetches run at once
+        self._scryfall_rate_limiter = scryfall_rate_limiter or TokenBucket(rate=settings.scryfall_requests_per_second)
+        self._bulk_data_fetcher = ScryfallBulkDataFetcher(rate_limiter=self._scryfall_rate_limiter)
         self._conn_pool: psycopg_pool.ConnectionPool = db_utils.make_pool()
         # Create action map with type-converting wrappers for all public methods
         self.action_map = {}
@@ -163,15 +315,30 @@ class APIResource:
         self._import_guard: LockType = import_guard
         self._last_import_time: Synchronized = last_import_time or multiprocessing.Value("d", 0.0, lock=True)
         self._schema_setup_event: EventType = schema_setup_event
+        self._data_generation: Synchronized = data_generation or multiprocessing.Value("i", 0, lock=True)
+        self._seen_data_generation = self._data_generation.get_obj().value
+        self._import_status = import_status or multiprocessing_utils.ImportStatus()
+        self._import_requested: EventType | None = import_requested
+        self._job_requested: EventType | None = job_requested
+        # arithmetic expression -> [searches, runs, total_ms] not yet written to magic.arithmetic_expression_stats
+        self._arithmetic_stats: dict[str, list] = {}
+        self._arithmetic_stats_lock = threading.Lock()
+        self._arithmetic_stats_flushed_at = time.monotonic()
+        # the job this resource is running, when a job executor owns it, which progress is reported to
+        self._current_job: jobs.RunningJob | None = None
+        if self._job_requested is not None:
+            for action in jobs.JOB_ACTIONS & self.action_map.keys():
+                self.action_map[action] = partial(self._queue_job, action)
 
         version = datetime.datetime.now(tz=datetime.UTC).strftime("%Y%m%d")
         version = f"magic-api/{version}"
         self._session.headers.update({"User-Agent": version})
         # Initialize Tagger client for GraphQL API access
-        self._tagger_client = TaggerClient()
+        self._tagger_client = TaggerClient(rate_limiter=tagger_rate_limiter)
         logger.info("Worker with pid %d has conn pool %s", os.getpid(), self._conn_pool)
         self.setup_schema()
-        self.import_data()  # ensures that database is setup
+        if self._import_requested is None:
+            self.import_data()  # ensures that database is setup
 
     @cached(cache={}, key=lambda args, kwds: args[1] if len(args) > 1 else kwds.get("filename"))
     def read_sql(self, filename: str) -> str:
@@ -202,6 +369,7 @@ class APIResource:
             resp (falcon.Response): The outgoing response.
 
         """
+        self._pick_up_data_generation()
         if resp.complete:
             logger.info("Request already handled: %s", req.relative_uri)
             return
@@ -259,6 +427,23 @@ class APIResource:
             duration = (time.monotonic() - before) * 1000
             logger.info("Request duration: %.1f ms / %s", duration, resp.status)
 
+    def _clear_caches(self) -> None:
+        """Clear the query and search caches of this process."""
+        self._query_cache.clear()
+        # Clear the search cache by accessing its cache attribute
+        if hasattr(self._search, "cache"):
+            self._search.cache.clear()
+
+    def _pick_up_data_generation(self) -> None:
+        """Clear this process's caches if an import has loaded new data since they were filled."""
+        # Unlocked read, as for the last import time: a stale value only delays the clear to the next request
+        data_generation = self._data_generation.get_obj().value
+        if data_generation == self._seen_data_generation:
+            return
+        logger.info("Data generation %d -> %d, clearing caches in pid %d", self._seen_data_generation, data_generation, os.getpid())
+        self._seen_data_generation = data_generation
+        self._clear_caches()
+
     def _raise_not_found(self, **_: object) -> None:
         """Raise a Falcon HTTPNotFound error with available routes."""
         routes = {}
@@ -413,6 +598,60 @@ class APIResource:
         """
         return self._bulk_data_fetcher.get_data_for_key(data_key=BulkDataKey.DEFAULT_CARDS)
 
+    def _load_oracle_cards(self) -> int:
+        """Load the oracle_cards bulk export into magic.oracle_cards, streaming it a card at a time.
+
+        Oracle cards whose data changed since the last load (a ban, an errata, a new EDHREC rank)
+        are updated; unchanged ones are left alone. The faces of a double faced card share an
+        oracle_id, so the card is loaded once, as its first face, like its printings in magic.cards.
+
+        Returns:
+            The number of oracle cards inserted or updated.
+        """
+        oracle_cards = (
+            processed
+            for processed in iter_preprocessed_cards(self._bulk_data_fetcher.iter_data_for_key(BulkDataKey.ORACLE_CARDS))
+            if processed.get("oracle_id")
+        )
+
+        staging_table_name = f"oracle_staging_{secrets.token_hex(8)}"
+        with self._conn_pool.connection() as conn, conn.cursor() as cursor:
+            statement_timeout = 30_000
+            cursor.execute(f"set statement_timeout = {statement_timeout}")
+            oracle_columns = db_utils.get_table_columns(cursor, "magic.oracle_cards")
+            column_names = [column_name for column_name, _ in oracle_columns]
+            updated_columns = [column_name for column_name in column_names if column_name != "oracle_id"]
+            column_list = ", ".join(column_names)
+            cursor.execute(f"CREATE TEMPORARY TABLE {staging_table_name} (LIKE magic.oracle_cards) ON COMMIT DROP")
+            cursor.execute(f"ALTER TABLE {staging_table_name} ADD COLUMN face_idx integer")
+            oracle_cards_sent = db_utils.copy_rows_binary(
+                cursor,
+                staging_table_name,
+                [*oracle_columns, ("face_idx", "integer")],
+                oracle_cards,
+            )
+            cursor.execute(
+                f"""
+                INSERT INTO magic.oracle_cards AS oracle_card ({column_list})
+                SELECT DISTINCT ON (oracle_id)
+                    {column_list}
+                FROM
+                    {staging_table_name}
+                ORDER BY
+                    oracle_id, face_idx
+                ON CONFLICT (oracle_id) DO UPDATE SET
+                    {", ".join(f"{column_name} = EXCLUDED.{column_name}" for column_name in updated_columns)}
+                WHERE
+                    ({", ".join(f"oracle_card.{column_name}" for column_name in updated_columns)})
+                    IS DISTINCT FROM ({", ".join(f"EXCLUDED.{column_name}" for column_name in updated_columns)})
+            """,
+            )
+            oracle_cards_loaded = cursor.rowcount
+            conn.commit()
+
+        logger.info("%d oracle cards inserted or updated, of %d oracle cards", oracle_cards_loaded, oracle_cards_sent)
+        return oracle_cards_loaded
+
     def setup_schema(self, *_: object, **__: object) -> None:
         """Set up the database schema and apply migrations as needed."""
         if self._schema_setup_event.is_set():
@@ -481,15 +720,23 @@ class APIResource:
         For DFCs (Double-Faced Cards), each face is returned as a separate dictionary.
         The deduplication key is (scryfall_id, face_idx) to support multiple faces per printing.
         """
-        all_cards = self.get_data()
-        key_to_card: dict[tuple[str, int], dict[str, Any]] = {}
-        for card in all_cards:
-            processed_cards = preprocess_card(card)
-            for processed_card in processed_cards:
-                scryfall_id = processed_card["scryfall_id"]
-                face_idx = processed_card["face_idx"]
-                key_to_card[(scryfall_id, face_idx)] = processed_card
-        return list(key_to_card.values())
+        return list(self._iter_cards_to_insert())
+
+    def _iter_cards_to_insert(self, data_key: BulkDataKey = BulkDataKey.DEFAULT_CARDS) -> Iterator[dict[str, Any]]:
+        """Stream the processed cards of a bulk export, one face at a time.
+
+        Cards are read and preprocessed in chunks across a process pool, then yielded one at a time
+        in export order, so only the (scryfall_id, face_idx) keys seen so far are kept in memory.
+        The first occurrence of a key wins, as it does when the rows are inserted with
+        ON CONFLICT DO NOTHING.
+        """
+        seen_keys: set[tuple[str, int]] = set()
+        for processed_card in iter_preprocessed_cards(self._bulk_data_fetcher.iter_data_for_key(data_key)):
+            key = (processed_card["scryfall_id"], processed_card["face_idx"])
+            if key in seen_keys:
+                continue
+            seen_keys.add(key)
+            yield processed_card
 
     def get_stats(self, **_: object) -> dict[str, Any]:
         """Get stats about the cards."""
@@ -514,6 +761,12 @@ class APIResource:
             logger.error("Error checking if setup is complete: %s", oops, exc_info=True)
             return False
 
+    def _has_cards(self) -> bool:
+        """Return True if magic.cards has any cards."""
+        with self._conn_pool.connection() as conn, conn.cursor() as cursor:
+            cursor.execute("SELECT EXISTS (SELECT 1 FROM magic.cards) AS has_cards")
+            return cursor.fetchone()["has_cards"]
+
     def _import_recent(self) -> bool:
         """Return True if a bulk import completed in the last 5 minutes (or setup is complete when no shared timestamp)."""
         if self._last_import_time is None:
@@ -535,37 +788,84 @@ class APIResource:
             return None
         self.setup_schema()
 
-        to_insert = self._get_cards_to_insert()
+        try:
+            self._load_oracle_cards()
+        except (requests.RequestException, psycopg.Error, OSError) as err:
+            # not fatal: oracle cards are also backfilled from the printings loaded below
+            logger.warning("Failed to load oracle cards, falling back to printings: %s", err)
+
+        data_key = BulkDataKey(settings.bulk_data_key)
+        self._import_status.update(
+            stage="downloading",
+            bulk_data_key=data_key,
+            started_at=time.time(),
+            finished_at=None,
+            cards_sent=0,
+            message=None,
+        )
+        # download before any database connection is held open for the load
+        self._bulk_data_fetcher.get_cache_file_for_key(data_key)
 
         before = time.monotonic()
+        self._import_status.update(stage="loading")
 
-        result = self._load_cards_with_staging(to_insert)
+        # streamed end to end: cached file -> decompress -> parse -> preprocess -> COPY in pages
+        cards = self._report_import_progress(self._iter_cards_to_insert(data_key))
+        if settings.full_reload or not self._has_cards():
+            # nothing to diff against (or asked not to): build a fresh table and swap it in
+            result = self._reload_processed_cards(cards)
+        else:
+            result = self._load_processed_cards(cards, delete_missing=True)
 
         after_transfer = time.monotonic()
 
         if result["status"] == "success":
-            if self._last_import_time is not None:
-                self._last_import_time.value = time.time()
             total_time = after_transfer - before
-            rate = len(to_insert) / total_time if total_time > 0 else 0
+            rate = result["cards_sent"] / total_time if total_time > 0 else 0
             logger.info(
-                "Loaded %d cards in %.2f seconds, rate: %.2f cards/s...",
+                "Loaded %d cards in %.2f seconds, rate: %.2f cards/s, peak RSS %.0f MiB...",
                 result["cards_loaded"],
                 total_time,
                 rate,
+                resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+            )
+            self._import_status.update(stage="backfilling_prefer_scores")
+            # an incremental load reports what it touched; a reload has no diff to go on
+            self._backfill_prefer_scores(result.pop("touched_scryfall_ids", None), result.pop("touched_illustration_ids", None))
+            if self._last_import_time is not None:
+                self._last_import_time.value = time.time()
+            with self._data_generation.get_lock():
+                self._data_generation.value += 1
+            self._import_status.update(
+                stage="idle",
+                finished_at=time.time(),
+                message=result["message"],
+                result={k: v for k, v in result.items() if k not in ("sample_cards", "message")},
             )
-            self.backfill_prefer_scores()
-            self._last_import_time.value = time.time()
             return result["sample_cards"]
         logger.error("Failed to import data: %s", result["message"])
+        self._import_status.update(stage="failed", finished_at=time.time(), message=result["message"])
         return None
 
+    def _report_import_progress(self, cards: Iterable[dict[str, Any]]) -> Iterator[dict[str, Any]]:
+        """Pass cards through, recording in the import status how many have been sent so far."""
+        cards_sent = 0
+        for cards_sent, card in enumerate(cards, start=1):
+            if cards_sent % IMPORT_PROGRESS_INTERVAL == 0:
+                self._import_status.update(cards_sent=cards_sent)
+            yield card
+        self._import_status.update(cards_sent=cards_sent)
+
     @cached(
         cache=TTLCache(maxsize=1, ttl=MIN_IMPORT_INTERVAL),
         key=lambda _args, _kwds: None,
     )
     def import_data(self, **_: object) -> None:
         """Import data from Scryfall and insert into the database."""
+        if self._import_requested is not None:
+            # a background importer owns imports: ask it for one rather than blocking this worker
+            self._import_requested.set()
+            return None
         before = time.monotonic()
         if self._import_recent():
             after = time.monotonic()
@@ -594,6 +894,231 @@ class APIResource:
         finally:
             import_lock.release()
 
+    def refresh_prices(self, **_: object) -> dict[str, Any]:
+        """Refresh the prices of every printing from the bulk export, leaving everything else alone.
+
+        Only the id and prices of each card are read from the export. They are COPYed into a
+        narrow temporary table and applied with one UPDATE of the printings whose prices changed.
+        The usd-low and usd-high prefer orders read price_usd at query time, so beyond the caches
+        there is nothing derived to recompute.
+
+        Returns:
+        -------
+            Dict[str, Any]: Status, cards_sent (printings in the export), cards_updated (printings
+            whose prices changed) and seconds taken.
+
+        """
+        import_lock = self._last_import_time.get_lock()
+        if not import_lock.acquire(timeout=IMPORT_LOCK_TIMEOUT):
+            return {
+                "status": "import_running",
+                "cards_sent": 0,
+                "cards_updated": 0,
+                "message": "An import is running, its prices will be current when it finishes",
+            }
+        try:
+            before = time.monotonic()
+            data_key = BulkDataKey(settings.bulk_data_key)
+            # download before the connection is held open for the update
+            self._bulk_data_fetcher.get_cache_file_for_key(data_key)
+            result = self._load_prices(
+                {"scryfall_id": card["id"], **card_prices(card)} for card in self._bulk_data_fetcher.iter_data_for_key(data_key)
+            )
+            result["seconds"] = time.monotonic() - before
+        finally:
+            import_lock.release()
+
+        logger.info(
+            "Refreshed prices of %d of %d cards in %.2f seconds", result["cards_updated"], result["cards_sent"], result["seconds"]
+        )
+        if result["cards_updated"]:
+            with self._data_generation.get_lock():
+                self._data_generation.value += 1
+            self._clear_caches()
+        return result
+
+    def _load_prices(self, price_rows: Iterable[dict[str, Any]]) -> dict[str, Any]:
+        """Update the price columns of magic.cards from rows of scryfall_id and prices.
+
+        The content_hash of a repriced printing is cleared, since it covers the prices, so the next
+        import rewrites the row and its raw card rather than matching it against the old prices.
+
+        Args:
+        ----
+            price_rows (Iterable[Dict[str, Any]]): Rows keyed by the PRICE_STAGING_COLUMNS names.
+
+        Returns:
+        -------
+            Dict[str, Any]: Status, cards_sent and cards_updated.
+
+        """
+        staging_table_name = f"price_staging_{secrets.token_hex(8)}"
+        column_definitions = ", ".join(f"{column_name} {column_type}" for column_name, column_type in PRICE_STAGING_COLUMNS)
+        with self._conn_pool.connection() as conn, conn.cursor() as cursor:
+            statement_timeout = 30_000
+            cursor.execute(f"set statement_timeout = {statement_timeout}")
+            cursor.execute(f"CREATE TEMPORARY TABLE {staging_table_name} ({column_definitions}) ON COMMIT DROP")
+            cards_sent = db_utils.copy_rows_binary(cursor, staging_table_name, PRICE_STAGING_COLUMNS, price_rows)
+            cursor.execute(
+                f"""
+                UPDATE magic.cards AS card SET
+                    price_usd = staged.price_usd,
+                    price_eur = staged.price_eur,
+                    price_tix = staged.price_tix,
+                    content_hash = NULL
+                FROM
+                    {staging_table_name} AS staged
+                WHERE
+                    card.scryfall_id = staged.scryfall_id
+                    AND (
+                        card.price_usd IS DISTINCT FROM staged.price_usd
+                        OR card.price_eur IS DISTINCT FROM staged.price_eur
+                        OR card.price_tix IS DISTINCT FROM staged.price_tix
+                    )
+            """,
+            )
+            cards_updated = cursor.rowcount
+            conn.commit()
+        return {
+            "status": "success",
+            "cards_sent": cards_sent,
+            "cards_updated": cards_updated,
+            "message": f"Updated the prices of {cards_updated} cards",
+        }
+
+    def import_status(self, **_: object) -> dict[str, Any]:
+        """Return the progress of the running bulk import, or the outcome of the last one.
+
+        Returns:
+        -------
+            Dict[str, Any]: The import stage (downloading, loading, backfilling_prefer_scores, idle
+            or failed), cards_sent so far, start and finish times and the last result, plus the
+            data_generation this worker has picked up and the age of its bulk data catalog.
+
+        """
+        return {
+            "stage": "idle",
+            **self._import_status.snapshot(),
+            "last_import_time": self._last_import_time.get_obj().value or None,
+            "data_generation": self._data_generation.get_obj().value,
+            "background_import": self._import_requested is not None,
+            "bulk_data_catalog_age_seconds": self._bulk_data_fetcher.catalog_age_seconds(),
+        }
+
+    def rate_limits(self, *, falcon_response: falcon.Response | None = None, **_: object) -> dict[str, Any]:
+        """Return the throughput and waits of the outbound rate limiters.
+
+        Args:
+        ----
+            falcon_response (falcon.Response | None): Response to mark as not cacheable.
+
+        Returns:
+        -------
+            Dict[str, Any]: For scryfall and tagger, the configured and current rate, requests
+            made and their rate, seconds spent waiting for the limiter, 429s backed off from and
+            any pause in effect. Under the server these cover every worker.
+
+        """
+        set_no_store_header(falcon_response)
+        return {
+            "scryfall": self._scryfall_rate_limiter.stats(),
+            "tagger": self._tagger_client.rate_limiter.stats(),
+        }
+
+    def _queue_job(self, action: str, *, falcon_response: falcon.Response | None = None, **params: object) -> dict[str, Any]:
+        """Queue a job running a long admin operation and wake the job executor, instead of running it in this request.
+
+        Args:
+        ----
+            action (str): Route of the operation, one of jobs.JOB_ACTIONS.
+            falcon_response (falcon.Response | None): Response to mark as accepted.
+            **params (object): Request parameters, converted to the operation's parameter types and
+                passed on to it when the job runs.
+
+        Returns:
+        -------
+            Dict[str, Any]: The job_id, action, status (queued) and a message.
+
+        Raises:
+        ------
+            falcon.HTTPBadRequest: If the parameters don't fit the operation's signature, checked
+                here rather than when the job runs, long after this request was accepted.
+
+        """
+        try:
+            params = convert_params_strictly(getattr(self, action), params)
+        except (TypeError, ValueError) as err:
+            raise falcon.HTTPBadRequest(title="Invalid Job Parameters", description=str(err)) from err
+        with self._conn_pool.connection() as conn, conn.cursor() as cursor:
+            job = jobs.queue_job(cursor, action, params)
+        self._job_requested.set()
+        logger.info("Queued job %d: %s(%s)", job["job_id"], action, params)
+        set_no_store_header(falcon_response)
+        if falcon_response is not None:
+            falcon_response.status = falcon.HTTP_ACCEPTED
+        return {
+            "job_id": job["job_id"],
+            "action": action,
+            "status": job["status"],
+            "message": f"Queued {action} as job {job['job_id']}, see job_status?job_id={job['job_id']}",
+        }
+
+    def job_status(
+        self,
+        *,
+        job_id: int | None = None,
+        limit: int = 20,
+        falcon_response: falcon.Response | None = None,
+        **_: object,
+    ) -> dict[str, Any]:
+        """Return a job's status, progress and ETA, and its result once it has finished.
+
+        Args:
+        ----
+            job_id (int | None): The job. If None, the most recently queued jobs are listed.
+            limit (int): How many jobs to list.
+            falcon_response (falcon.Response | None): Response to mark as not cacheable.
+
+        Returns:
+        -------
+            Dict[str, Any]: The job, with its action, params, status (queued, running, succeeded,
+            failed or cancelled), last reported progress (done, total, item, elapsed_seconds and
+            eta_seconds), result, error and times. Without a job_id, {"jobs": [...]}.
+
+        """
+        set_no_store_header(falcon_response)
+        with self._conn_pool.connection() as conn, conn.cursor() as cursor:
+            if job_id is None:
+                return {"jobs": jobs.list_jobs(cursor, limit=limit)}
+            job = jobs.get_job(cursor, job_id)
+        if job is None:
+            raise falcon.HTTPNotFound(description=f"No job {job_id}")
+        return job
+
+    def cancel_job(self, *, job_id: int, falcon_response: falcon.Response | None = None, **_: object) -> dict[str, Any]:
+        """Cancel a job: a queued job never runs, a running one stops the next time it reports progress.
+
+        A running job that reports no progress finishes as if it hadn't been cancelled, and a
+        finished job is left as it is.
+
+        Args:
+        ----
+            job_id (int): The job.
+            falcon_response (falcon.Response | None): Response to mark as not cacheable.
+
+        Returns:
+        -------
+            Dict[str, Any]: The job as it is now, as returned by job_status.
+
+        """
+        set_no_store_header(falcon_response)
+        with self._conn_pool.connection() as conn, conn.cursor() as cursor:
+            job = jobs.request_cancel(cursor, job_id)
+        if job is None:
+            raise falcon.HTTPNotFound(description=f"No job {job_id}")
+        logger.info("Cancel requested for job %d, now %s", job_id, job["status"])
+        return job
+
     def search(  # noqa: PLR0913
         self,
         *,
@@ -603,6 +1128,7 @@ class APIResource:
         limit: int = 100,
         orderby: CardOrdering = CardOrdering.EDHREC,
         prefer: PreferOrder = PreferOrder.DEFAULT,
+        prefer_weights: str | None = None,
         q: str | None = None,
         query: str | None = None,
         unique: UniqueOn = UniqueOn.CARD,
@@ -617,19 +1143,37 @@ class APIResource:
             limit: Maximum number of results to return.
             orderby: Field to sort by.
             unique: Unique on field.
-            prefer: Prefer order (oldest, newest, usd-low, usd-high, promo).
+            prefer: Prefer order (oldest, newest, usd-low, usd-high, promo, custom).
+            prefer_weights: With prefer=custom, the weight of each prefer score component, as
+                component:weight pairs like "frame:2,rarity:0". Unlisted components weigh 1.
 
         Returns:
             Dict containing search results and metadata.
         """
         set_cache_header(falcon_response, duration=timedelta(seconds=90))
+        weights = None
+        if prefer == PreferOrder.CUSTOM:
+            try:
+                # normalized, so equal weightings share cached results
+                weights = parse_prefer_weights(prefer_weights)
+            except ValueError as err:
+                raise falcon.HTTPBadRequest(title="Invalid Prefer Weights", description=str(err)) from err
+        query = query or q
+        try:
+            expressions = get_arithmetic_expressions(query) if query else ()
+        except ValueError:
+            # _search reports the parse error
+            expressions = ()
+        # counted here, ahead of the result cache, so repeats served from it are counted too
+        self._record_arithmetic_expressions(expressions=expressions, searches=1)
         return self._search(
-            query=query or q,
+            query=query,
             orderby=orderby,
             direction=direction,
             limit=limit,
             unique=unique,
             prefer=prefer,
+            prefer_weights=weights,
         )
 
     @cached(
@@ -643,6 +1187,7 @@ class APIResource:
         limit: int = 100,
         orderby: CardOrdering = CardOrdering.EDHREC,
         prefer: PreferOrder = PreferOrder.DEFAULT,
+        prefer_weights: tuple[tuple[str, float], ...] | None = None,
         query: str | None = None,
         unique: UniqueOn = UniqueOn.CARD,
     ) -> dict[str, Any]:
@@ -671,6 +1216,8 @@ class APIResource:
         try:
             with timer("get_where_clause"):
                 where_clause, params = get_where_clause(query)
+                statement_timeout = get_statement_timeout(query)
+                expressions = get_arithmetic_expressions(query)
         except ValueError as err:
             # Handle parsing errors from parse_scryfall_query
             logger.info("ValueError caught for query '%s', raising BadRequest", query)
@@ -711,6 +1258,12 @@ class APIResource:
             prefer,
             ("edhrec_rank", "ASC"),
         )
+        if prefer == PreferOrder.CUSTOM:
+            # the components weighted at query time, so a new weighting needs no backfill
+            # copied, as params is get_where_clause's cached dict, shared by every search with this query
+            params = {**params}
+            prefer_column = get_prefer_rank_expression(prefer_weights or parse_prefer_weights(None), params)
+            prefer_direction = "DESC"
         query_sql = f"""
             WITH distinct_cards AS (
                 SELECT DISTINCT ON ({distinct_on})
@@ -776,7 +1329,21 @@ class APIResource:
         logger.info("Params: %s", params)
         try:
             with timer("run_query"):
-                result_bag = self._run_query(query=query_sql, params=params, explain=False)
+                result_bag = self._run_query(
+                    query=query_sql,
+                    params=params,
+                    explain=False,
+                    statement_timeout=statement_timeout,
+                )
+        except psycopg.errors.QueryCanceled as err:
+            if statement_timeout != UNFILTERED_REGEX_STATEMENT_TIMEOUT:
+                raise
+            logger.info("Unfiltered regex query '%s' timed out, raising BadRequest", query)
+            raise falcon.HTTPBadRequest(
+                title="Search Query Too Broad",
+                description=f"The search query '{query}' uses a regex that has to scan every card. "
+                "Add some literal text to the regex (e.g. /draw.*card/) so it can be narrowed down.",
+            ) from err
         except psycopg.errors.DatatypeMismatch as err:
             # Raise BadRequest error for invalid query syntax
             # This happens with standalone arithmetic expressions like "cmc+1"
@@ -787,6 +1354,12 @@ class APIResource:
                 "Arithmetic expressions like 'cmc+1' need to be part of a comparison (e.g., 'cmc+1>3').",
             ) from err
 
+        self._record_arithmetic_expressions(
+            expressions=expressions,
+            runs=1,
+            duration_ms=result_bag["timings"]["_meta"]["duration_ms"],
+        )
+
         cards = result_bag.pop("result", [])
         count_row = cards.pop()
         total_cards = count_row["total_cards_count"]
@@ -984,6 +1557,84 @@ class APIResource:
             falcon_response.status = falcon.HTTP_500
             falcon_response.text = f"Error reading file {filename}: {e}"
 
+    def _record_arithmetic_expressions(
+        self,
+        *,
+        expressions: tuple[str, ...],
+        searches: int = 0,
+        runs: int = 0,
+        duration_ms: float = 0.0,
+    ) -> None:
+        """Count searches and runs of a search against the arithmetic expressions it used.
+
+        The counts are buffered and written together once ARITHMETIC_STATS_FLUSH_SECONDS have
+        passed since the last write, so searches don't wait on the connection pool for them.
+        Counts still buffered when the worker exits are lost.
+
+        Args:
+            expressions: The search's arithmetic expressions, see get_arithmetic_expressions.
+            searches: The number of searches asked for, whether or not the result cache answered them.
+            runs: The number of times the search query ran.
+            duration_ms: The time those runs took.
+        """
+        if not expressions:
+            return
+        with self._arithmetic_stats_lock:
+            for expression in expressions:
+                counts = self._arithmetic_stats.setdefault(expression, [0, 0, 0.0])
+                counts[0] += searches
+                counts[1] += runs
+                counts[2] += duration_ms
+        if time.monotonic() - self._arithmetic_stats_flushed_at >= ARITHMETIC_STATS_FLUSH_SECONDS:
+            self._flush_arithmetic_expression_stats()
+
+    def _flush_arithmetic_expression_stats(self) -> None:
+        """Write the buffered arithmetic expression statistics in one statement.
+
+        Failures are logged and swallowed, the statistics must never fail a search.
+        """
+        with self._arithmetic_stats_lock:
+            buffered, self._arithmetic_stats = self._arithmetic_stats, {}
+            self._arithmetic_stats_flushed_at = time.monotonic()
+        if not buffered:
+            return
+        try:
+            with self._conn_pool.connection() as conn:
+                conn.execute(
+                    self.read_sql("record_arithmetic_expressions"),
+                    {
+                        "expressions": list(buffered),
+                        "search_counts": [counts[0] for counts in buffered.values()],
+                        "run_counts": [counts[1] for counts in buffered.values()],
+                        "total_ms": [counts[2] for counts in buffered.values()],
+                    },
+                )
+        except psycopg.Error as oops:
+            logger.warning("Failed to record arithmetic expressions %s: %s", list(buffered), oops)
+
+    def get_arithmetic_expression_stats(self, *, limit: int = 50, **_: object) -> dict[str, Any]:
+        """List the arithmetic expressions users search for, as expression index candidates.
+
+        Each expression reports how often it was searched for and how often those searches ran
+        rather than being answered from the result cache, the total and per-run query time, whether it is already served by an index, and the estimated time an expression index
+        would have saved (see summarize_arithmetic_expression_stats).
+
+        Args:
+            limit: Maximum number of expressions to return.
+
+        Returns:
+            Dict with the indexed average and the expressions, most promising index candidate first.
+        """
+        # this worker's counts, at least, are up to date
+        self._flush_arithmetic_expression_stats()
+        # not through _run_query: its result cache would freeze the counts
+        with self._conn_pool.connection() as conn, conn.cursor() as cursor:
+            cursor.execute("SELECT expression, search_count, run_count, total_ms FROM magic.arithmetic_expression_stats")
+            rows = cursor.fetchall()
+        summary = summarize_arithmetic_expression_stats(rows)
+        summary["expressions"] = summary["expressions"][:limit]
+        return summary
+
     def get_migrations(self, **_: object) -> list[dict[str, str]]:
         """Get the migrations from the filesystem.
 
@@ -1031,22 +1682,37 @@ class APIResource:
         Returns:
             Dict with status and count of cards updated
         """
-        logger.info("Starting prefer score backfill")
+        return self._backfill_prefer_scores()
 
+    def _backfill_prefer_scores(
+        self,
+        scryfall_ids: list[uuid.UUID] | None = None,
+        illustration_ids: list[uuid.UUID] | None = None,
+    ) -> dict[str, Any]:
+        """Recalculate prefer scores, of every card or incrementally, writing only the scores that change.
+
+        Args:
+            scryfall_ids: Printings to recalculate, along with every printing sharing an
+                illustration with them. None recalculates every card.
+            illustration_ids: Illustrations whose printings are recalculated too, such as those
+                printings were deleted from. Only used with scryfall_ids.
+
+        Returns:
+            Dict with status and count of cards whose scores changed
+        """
+        mode = "full" if scryfall_ids is None else f"incremental ({len(scryfall_ids)} cards)"
+        logger.info("Starting %s prefer score backfill", mode)
+
+        before = time.monotonic()
         backfill_sql = self.read_sql("backfill_prefer_scores")
         with self._conn_pool.connection() as conn, conn.cursor() as cursor:
             statement_timeout = 60_000
             cursor.execute(f"set statement_timeout = {statement_timeout}")
-            cursor.execute(backfill_sql)
-
-            # Get count of updated cards
-            cursor.execute("SELECT COUNT(*) as count FROM magic.cards WHERE prefer_score IS NOT NULL")
-            result = cursor.fetchone()
-            count = result["count"] if result else 0
-
+            cursor.execute(backfill_sql, {"scryfall_ids": scryfall_ids, "illustration_ids": illustration_ids or []})
+            count = cursor.rowcount
             conn.commit()
 
-        logger.info("Prefer score backfill complete: %d cards updated", count)
+        logger.info("%s prefer score backfill complete in %.2f seconds: %d cards updated", mode, time.monotonic() - before, count)
 
         return {
             "status": "success",
@@ -1075,11 +1741,8 @@ class APIResource:
             msg = "Tag parameter is required"
             raise ValueError(msg)
 
-        # Fetch cards with this tag from Scryfall API (handles pagination)
-        cards = self._scryfall_search(query=f"oracletag:{tag}")
-        card_names = [c["name"] for c in cards]
-
-        if not cards:
+        card_names = self._get_tagged_card_names(query=f"oracletag:{tag}")
+        if not card_names:
             return {
                 "tag": tag,
                 "cards_updated": 0,
@@ -1087,35 +1750,18 @@ class APIResource:
             }
 
         logger.info("Updating %d cards with tag '%s'", len(card_names), tag)
-        # Update cards in database with the new tag
-        updated_count = 0
-        card_names.sort()
-        with self._conn_pool.connection() as conn, conn.cursor() as cursor:
-            # Use SQL update with jsonb concatenation to add the tag
-            for card_name_batch in itertools.batched(card_names, 200):
-                cursor.execute(
-                    """
-                    UPDATE magic.cards
-                    SET card_oracle_tags = card_oracle_tags || %(new_tag)s::jsonb
-                    WHERE card_name = ANY(%(card_names)s)
-                    """,
-                    {
-                        "card_names": list(card_name_batch),
-                        "new_tag": orjson.dumps({tag: True}).decode("utf-8"),
-                    },
-                )
-                updated_count += cursor.rowcount
-                conn.commit()
-
+        applied = self._apply_card_tags(tag_kind="oracle", tagged_card_names=[(tag, card_names)])
         return {
             "tag": tag,
-            "cards_updated": updated_count,
+            "cards_updated": applied["cards_updated"],
             "total_cards_found": len(card_names),
-            "message": f"Successfully updated {updated_count} cards with tag '{tag}'",
+            "message": f"Successfully updated {applied['cards_updated']} cards with tag '{tag}'",
         }
 
     def _add_is_tag_to_cards(self, *, is_tag: str) -> dict[str, Any]:
-        """Add a specific is: tag to all cards matching that tag using Scryfall search.
+        """Add a specific is: tag to all cards matching that tag.
+
+        Tags with a rule in IS_TAG_RULES are derived from the stored cards, others are searched for on Scryfall.
 
         Args:
         ----
@@ -1130,60 +1776,218 @@ class APIResource:
             msg = "is_tag parameter is required"
             raise ValueError(msg)
 
-        # Fetch cards with this is: tag from Scryfall API (handles pagination)
-        cards = self._scryfall_search(query=f"is:{is_tag}")
-        card_names = [c["name"] for c in cards]
-
-        if not cards:
+        if is_tag in IS_TAG_RULES:
+            card_names = self._derive_is_tags(is_tags=[is_tag]).get(is_tag, [])
+            source = "the stored cards"
+        else:
+            card_names = self._get_tagged_card_names(query=f"is:{is_tag}")
+            source = "Scryfall API"
+        if not card_names:
             return {
                 "is_tag": is_tag,
                 "cards_updated": 0,
-                "message": f"No cards found with is:{is_tag} in Scryfall API",
+                "message": f"No cards found with is:{is_tag} in {source}",
             }
 
         logger.info("Updating %d cards with is:%s", len(card_names), is_tag)
-        # Update cards in database with the new is: tag
-        updated_count = 0
-        card_names.sort()
-        with self._conn_pool.connection() as conn, conn.cursor() as cursor:
-            # Use SQL update with jsonb concatenation to add the is: tag
-            for card_name_batch in itertools.batched(card_names, 200):
-                cursor.execute(
-                    """
-                    UPDATE magic.cards
-                    SET card_is_tags = card_is_tags || %(new_tag)s::jsonb
-                    WHERE card_name = ANY(%(card_names)s)
-                    """,
-                    {
-                        "card_names": list(card_name_batch),
-                        "new_tag": orjson.dumps({is_tag: True}).decode("utf-8"),
-                    },
-                )
-                updated_count += cursor.rowcount
-                conn.commit()
-
+        applied = self._apply_card_tags(tag_kind="is", tagged_card_names=[(is_tag, card_names)])
         return {
             "is_tag": is_tag,
-            "cards_updated": updated_count,
+            "cards_updated": applied["cards_updated"],
             "total_cards_found": len(card_names),
-            "message": f"Successfully updated {updated_count} cards with is:{is_tag}",
+            "message": f"Successfully updated {applied['cards_updated']} cards with is:{is_tag}",
         }
 
-    def discover_tags_from_scryfall(self, **_: object) -> list[str]:
-        """Discover all available tags from Scryfall tagger documentation.
+    def _derive_is_tags(self, *, is_tags: Iterable[str] = IS_TAG_RULES) -> dict[str, list[str]]:
+        """Derive is: tags from the stored printings with the rules of IS_TAG_RULES.
+
+        Only the printings _scryfall_search would find are read: paper printings of cards legal in
+        modern, legacy, commander or vintage. Only the blob fields the rules read (IS_TAG_CARD_FIELDS)
+        are fetched, and rows are streamed.
+
+        Args:
+        ----
+            is_tags (Iterable[str]): Tags of IS_TAG_RULES to derive, all of them by default.
 
         Returns:
         -------
-            List[str]: List of all available tag names.
-
-        Raises:
-        ------
-            ValueError: If API request fails or returns invalid data.
+            Dict[str, List[str]]: The sorted, distinct card names of each tag that any card has.
 
         """
-        try:
-            response = self._session.get("https://scryfall.com/docs/tagger-tags", timeout=30)
-            response.raise_for_status()
+        is_tags = list(is_tags)
+        tagged_card_names: dict[str, set[str]] = collections.defaultdict(set)
+        with self._conn_pool.connection() as conn, conn.cursor() as cursor:
+            rows = cursor.stream(
+                """
+                SELECT
+                    card.card_name,
+                    (
+                        SELECT jsonb_object_agg(field.key, field.value)
+                        FROM jsonb_each(blob.raw_card_blob) AS field
+                        WHERE field.key = ANY(%(fields)s)
+                    ) AS card
+                FROM magic.cards AS card
+                JOIN magic.card_blobs AS blob ON blob.scryfall_id = card.scryfall_id
+                WHERE
+                    -- the (f:m or f:l or f:c or f:v) game:paper of _scryfall_search, restricted counting as legal
+                    card.card_games ? 'paper' AND
+                    EXISTS (
+                        SELECT FROM jsonb_each_text(card.card_legalities) AS legality
+                        WHERE legality.key = ANY(%(formats)s) AND legality.value IN ('legal', 'restricted')
+                    )
+                """,
+                {"fields": list(IS_TAG_CARD_FIELDS), "formats": ["modern", "legacy", "commander", "vintage"]},
+            )
+            for row in rows:
+                for is_tag in get_derived_is_tags(row["card"] or {}, is_tags):
+                    tagged_card_names[is_tag].add(row["card_name"])
+        return {is_tag: sorted(tagged_card_names[is_tag]) for is_tag in is_tags if tagged_card_names[is_tag]}
+
+    def _get_tagged_card_names(self, *, query: str) -> list[str]:
+        """Fetch the sorted, distinct names of the cards a Scryfall search finds (handles pagination)."""
+        return sorted({card["name"] for card in self._scryfall_search(query=query)})
+
+    def _apply_card_tags(self, *, tag_kind: str, tagged_card_names: Iterable[tuple[str, list[str]]]) -> dict[str, Any]:
+        """Replace the cards of each given tag and rebuild the tag column of the affected cards.
+
+        Args:
+        ----
+            tag_kind (str): "oracle" or "is", the kind of tags given (see CARD_TAG_COLUMNS).
+            tagged_card_names (Iterable[Tuple[str, List[str]]]): (tag, every card name of the tag)
+                pairs. They are written as they are iterated, so they may still be being fetched.
+
+        Returns:
+        -------
+            Dict[str, Any]: Status, links_added, links_removed and cards_updated.
+
+        """
+        with self._conn_pool.connection() as conn, conn.cursor() as cursor:
+            result = self._write_card_tags(cursor, tag_kind=tag_kind, tagged_card_names=tagged_card_names)
+            conn.commit()
+        if result["cards_updated"]:
+            with self._data_generation.get_lock():
+                self._data_generation.value += 1
+            self._clear_caches()
+        return result
+
+    def _write_card_tags(
+        self,
+        cursor: Cursor,
+        *,
+        tag_kind: str,
+        tagged_card_names: Iterable[tuple[str, list[str]]],
+    ) -> dict[str, Any]:
+        """Write tag links into magic.card_tags and rebuild the tag column of every affected card.
+
+        The links are streamed with one binary COPY as the pairs are iterated. The given tags lose the cards they no longer
+        have, and each card named by a changed or given link gets its tag column rebuilt from
+        magic.card_tags with one aggregate UPDATE, written only where it changes. Committing is up
+        to the caller, and the statement timeout is lifted until it does, since the COPY lasts as long
+        as the fetches feeding it.
+
+        Args:
+        ----
+            cursor (Cursor): Cursor to write with.
+            tag_kind (str): "oracle" or "is", the kind of tags given (see CARD_TAG_COLUMNS).
+            tagged_card_names (Iterable[Tuple[str, List[str]]]): (tag, every card name of the tag) pairs.
+
+        Returns:
+        -------
+            Dict[str, Any]: Status, links_added, links_removed and cards_updated.
+
+        """
+        tag_column = CARD_TAG_COLUMNS[tag_kind]
+        # set local: the setting ends with the transaction, not with the pooled connection, which
+        # may still carry the session statement_timeout of an earlier query
+        cursor.execute("set local statement_timeout = 0")
+        suffix = secrets.token_hex(8)
+        staging_table_name = f"card_tags_staging_{suffix}"
+        affected_table_name = f"card_tags_affected_{suffix}"
+        column_definitions = ", ".join(f"{column_name} {column_type}" for column_name, column_type in CARD_TAG_STAGING_COLUMNS)
+        cursor.execute(f"CREATE TEMPORARY TABLE {staging_table_name} ({column_definitions}) ON COMMIT DROP")
+        cursor.execute(f"CREATE TEMPORARY TABLE {affected_table_name} (card_name text) ON COMMIT DROP")
+        db_utils.copy_rows_binary(
+            cursor,
+            staging_table_name,
+            CARD_TAG_STAGING_COLUMNS,
+            ({"tag": tag, "card_name": card_name} for tag, card_names in tagged_card_names for card_name in card_names),
+        )
+        cursor.execute(f"ANALYZE {staging_table_name}")
+        params = {"tag_kind": tag_kind}
+        cursor.execute(
+            f"""
+            WITH removed AS (
+                DELETE FROM magic.card_tags AS link
+                WHERE
+                    link.tag_kind = %(tag_kind)s
+                    AND link.tag IN (SELECT tag FROM {staging_table_name})
+                    AND NOT EXISTS (
+                        SELECT 1 FROM {staging_table_name} AS staged
+                        WHERE staged.tag = link.tag AND staged.card_name = link.card_name
+                    )
+                RETURNING link.card_name
+            )
+            INSERT INTO {affected_table_name} (card_name) SELECT card_name FROM removed
+            """,
+            params,
+        )
+        links_removed = cursor.rowcount
+        cursor.execute(
+            f"""
+            INSERT INTO magic.card_tags (tag_kind, tag, card_name)
+            SELECT DISTINCT %(tag_kind)s, tag, card_name FROM {staging_table_name}
+            ON CONFLICT DO NOTHING
+            """,
+            params,
+        )
+        links_added = cursor.rowcount
+        # every tagged card, not only those whose links changed, catches up printings loaded since
+        cursor.execute(f"INSERT INTO {affected_table_name} (card_name) SELECT card_name FROM {staging_table_name}")
+        cursor.execute(
+            f"""
+            UPDATE magic.cards AS card SET
+                {tag_column} = tagged.tags
+            FROM (
+                SELECT
+                    affected.card_name,
+                    COALESCE(jsonb_object_agg(link.tag, true) FILTER (WHERE link.tag IS NOT NULL), '{{}}'::jsonb) AS tags
+                FROM
+                    (SELECT DISTINCT card_name FROM {affected_table_name}) AS affected
+                    LEFT JOIN magic.card_tags AS link
+                        ON link.tag_kind = %(tag_kind)s AND link.card_name = affected.card_name
+                GROUP BY affected.card_name
+            ) AS tagged
+            WHERE
+                card.card_name = tagged.card_name
+                AND card.{tag_column} IS DISTINCT FROM tagged.tags
+            """,
+            params,
+        )
+        cards_updated = cursor.rowcount
+        return {
+            "status": "success",
+            "links_added": links_added,
+            "links_removed": links_removed,
+            "cards_updated": cards_updated,
+        }
+
+    def discover_tags_from_scryfall(self, **_: object) -> list[str]:
+        """Discover all available tags from Scryfall tagger documentation.
+
+        Returns:
+        -------
+            List[str]: List of all available tag names.
+
+        Raises:
+        ------
+            ValueError: If API request fails or returns invalid data.
+
+        """
+        try:
+            response = rate_limited_get(
+                self._session, "https://scryfall.com/docs/tagger-tags", rate_limiter=self._scryfall_rate_limiter, timeout=30
+            )
+            response.raise_for_status()
         except requests.RequestException as e:
             msg = f"Failed to fetch tag list from Scryfall: {e}"
             raise ValueError(msg) from e
@@ -1252,7 +2056,9 @@ class APIResource:
 
         """
         try:
-            response = self._session.get("https://scryfall.com/docs/syntax", timeout=30)
+            response = rate_limited_get(
+                self._session, "https://scryfall.com/docs/syntax", rate_limiter=self._scryfall_rate_limiter, timeout=30
+            )
             response.raise_for_status()
         except requests.RequestException as e:
             msg = f"Failed to fetch is: tags from Scryfall syntax: {e}"
@@ -1334,23 +2140,17 @@ class APIResource:
             tags_in_random_order = list(tags)
             random.shuffle(tags_in_random_order)
 
-            for idx, tag in enumerate(tags_in_random_order):
-                if idx:
-                    elapsed_time = time.monotonic() - start_time
-                    fraction_complete = idx / len(tags_in_random_order)
-                    estimated_time_remaining = (elapsed_time / fraction_complete) - elapsed_time
-                    estimated_duration = datetime.timedelta(seconds=round(estimated_time_remaining, 1))
-                else:
-                    estimated_duration = "N/A"
-                logger.info(
-                    "Processing tag %d of %d: %20s (ETA: %s)",
-                    idx + 1,
-                    len(tags_in_random_order),
-                    tag,
-                    estimated_duration,
-                )
+            # relationships are fetched concurrently and written as each tag's arrive
+            fetched = fetch_concurrently(
+                tags_in_random_order,
+                lambda tag: self._get_tag_relationships(tag=tag),
+                max_workers=settings.tag_fetch_workers,
+            )
+            progress = jobs.ProgressLog(len(tags_in_random_order), description="Processing tag", job=self._current_job, log=logger)
+            for tag, future in fetched:
+                progress.step(tag)
 
-                relationships = self._get_tag_relationships(tag=tag)
+                relationships = future.result()
 
                 parent_tags = {r["parent"]["slug"] for r in relationships}
                 child_tags = {r["child"]["slug"] for r in relationships}
@@ -1448,6 +2248,9 @@ class APIResource:
     def import_all_is_tags(self, **_: object) -> dict[str, Any]:
         """Discover and import all is: tags from Scryfall syntax documentation.
 
+        Tags with a rule in IS_TAG_RULES are derived from the stored cards, so only the rest are
+        searched for on Scryfall. The derived tags are applied even if discovery fails.
+
         Returns:
         -------
             Dict[str, Any]: Summary of the bulk is: tag import operation.
@@ -1457,6 +2260,10 @@ class APIResource:
             "success": True,
         }
         logger.info("Starting bulk is: tag discovery and import")
+        start_time = time.monotonic()
+        derived_tags = self._derive_is_tags()
+        derive_duration = time.monotonic() - start_time
+        logger.info("Derived %d is: tags from the stored cards in %.1fs", len(derived_tags), derive_duration)
 
         try:
             all_is_tags = self.discover_is_tags_from_syntax()
@@ -1468,84 +2275,123 @@ class APIResource:
                     "message": "Failed to discover is: tags from Scryfall syntax",
                 },
             )
-            return result
+            if not derived_tags:
+                return result
+            all_is_tags = []
 
-        if not all_is_tags:
+        if not all_is_tags and not derived_tags:
             return {
                 "success": False,
                 "message": "No is: tags discovered from Scryfall syntax",
             }
 
-        # Import card associations for each is: tag
-        start_time = time.monotonic()
+        # Fetch the cards of the remaining is: tags concurrently, writing each tag's as they arrive
+        fetched_is_tags = [is_tag for is_tag in all_is_tags if is_tag not in IS_TAG_RULES]
+        failed_tags: dict[str, str] = {}
         imported_tags = []
-        failed_tags = []
-        total_cards_updated = 0
-
-        for idx, is_tag in enumerate(all_is_tags):
-            try:
-                if idx > 0:
-                    elapsed_time = time.monotonic() - start_time
-                    fraction_complete = idx / len(all_is_tags)
-                    estimated_time_remaining = (elapsed_time / fraction_complete) - elapsed_time
-                    estimated_duration = datetime.timedelta(seconds=round(estimated_time_remaining, 1))
-                    logger.info(
-                        "Importing is: tag %d of %d: %20s (ETA: %s)",
-                        idx + 1,
-                        len(all_is_tags),
-                        is_tag,
-                        estimated_duration,
-                    )
 
-                tag_result = self._add_is_tag_to_cards(is_tag=is_tag)
-                imported_tags.append(
-                    {
-                        "is_tag": is_tag,
-                        "cards_updated": tag_result["cards_updated"],
-                        "total_cards_found": tag_result["total_cards_found"],
-                    },
-                )
-                total_cards_updated += tag_result["cards_updated"]
-
-            except ValueError as e:
-                logger.warning("Failed to import is: tag '%s': %s", is_tag, e)
-                failed_tags.append({"is_tag": is_tag, "error": str(e)})
+        def record_imported_tags(
+            tagged_card_names: Iterable[tuple[str, list[str]]], source: str
+        ) -> Iterator[tuple[str, list[str]]]:
+            for is_tag, card_names in tagged_card_names:
+                imported_tags.append({"is_tag": is_tag, "source": source, "total_cards_found": len(card_names)})
+                yield is_tag, card_names
+
+        applied = self._apply_card_tags(
+            tag_kind="is",
+            tagged_card_names=itertools.chain(
+                record_imported_tags(derived_tags.items(), "derived"),
+                record_imported_tags(
+                    self._iter_tagged_card_names(tags=fetched_is_tags, query_prefix="is:", failed_tags=failed_tags),
+                    "scryfall",
+                ),
+            ),
+        )
 
         result.update(
             {
                 "duration": time.monotonic() - start_time,
+                "derive_duration": derive_duration,
                 "discovered_is_tags": len(all_is_tags),
+                "derived_is_tags": len(derived_tags),
+                "fetched_is_tags": len(fetched_is_tags),
                 "imported_is_tags": len(imported_tags),
                 "failed_is_tags": len(failed_tags),
-                "total_cards_updated": total_cards_updated,
+                "total_cards_updated": applied["cards_updated"],
+                "links_added": applied["links_added"],
+                "links_removed": applied["links_removed"],
                 "imported_tags": imported_tags,
-                "failed_tags": failed_tags,
-                "message": f"Successfully imported {len(imported_tags)} is: tags, {len(failed_tags)} failed",
+                "failed_tags": [{"is_tag": is_tag, "error": error} for is_tag, error in failed_tags.items()],
             },
         )
+        if result["success"]:
+            result["message"] = (
+                f"Successfully imported {len(imported_tags)} is: tags ({len(derived_tags)} derived), {len(failed_tags)} failed"
+            )
 
         return result
 
     def _update_all_card_taggings(self) -> dict[str, Any]:
-        """Update all card taggings."""
+        """Update all card taggings, fetching tags concurrently and writing them in one bulk load."""
         logger.info("Updating all card taggings")
         tags = self._get_all_tags()
         start_time = time.monotonic()
-        for idx, tag in enumerate(tags):
-            if idx:
-                elapsed_time = time.monotonic() - start_time
-                fraction_complete = idx / len(tags)
-                estimated_time_remaining = (elapsed_time / fraction_complete) - elapsed_time
-                estimated_duration = datetime.timedelta(seconds=round(estimated_time_remaining, 1))
-                logger.info("Updating tag %d of %d: %20s (ETA: %s)", idx + 1, len(tags), tag, estimated_duration)
-            self.update_tagged_cards(tag=tag)
+        failed_tags: dict[str, str] = {}
+        applied = self._apply_card_tags(
+            tag_kind="oracle",
+            tagged_card_names=self._iter_tagged_card_names(tags=sorted(tags), query_prefix="oracletag:", failed_tags=failed_tags),
+        )
         return {
             "duration": time.monotonic() - start_time,
             "message": "All card taggings updated successfully",
             "success": True,
             "tags_processed": len(tags),
+            "failed_tags": len(failed_tags),
+            "links_added": applied["links_added"],
+            "links_removed": applied["links_removed"],
+            "cards_updated": applied["cards_updated"],
         }
 
+    def _iter_tagged_card_names(
+        self,
+        *,
+        tags: list[str],
+        query_prefix: str,
+        failed_tags: dict[str, str],
+    ) -> Iterator[tuple[str, list[str]]]:
+        """Fetch the card names of each tag from Scryfall, settings.tag_fetch_workers tags at a time.
+
+        Tags are yielded as their searches finish. Tags whose search fails, or finds no cards, are
+        left out, so applying the result never strips a tag from its cards because of a failed fetch.
+
+        Args:
+        ----
+            tags (List[str]): Tags to fetch.
+            query_prefix (str): Search keyword of the tags, like "oracletag:" or "is:".
+            failed_tags (Dict[str, str]): Filled in with the error of each tag whose search failed.
+
+        Yields:
+        ------
+            Tuple[str, List[str]]: Each tag with the names of its cards.
+
+        """
+        fetched = fetch_concurrently(
+            tags,
+            lambda tag: self._get_tagged_card_names(query=f"{query_prefix}{tag}"),
+            max_workers=settings.tag_fetch_workers,
+        )
+        progress = jobs.ProgressLog(len(tags), description="Fetched tag", job=self._current_job, log=logger)
+        for tag, future in fetched:
+            progress.step(tag)
+            try:
+                card_names = future.result()
+            except ValueError as e:
+                logger.warning("Failed to fetch cards of %s%s: %s", query_prefix, tag, e)
+                failed_tags[tag] = str(e)
+                continue
+            if card_names:
+                yield tag, card_names
+
     def _get_all_tags(self) -> set[str]:
         with self._conn_pool.connection() as conn, conn.cursor() as cursor:
             cursor.execute("SELECT tag FROM magic.tags")
@@ -1644,6 +2490,32 @@ class APIResource:
 
         return load_result
 
+    def _scryfall_get(self, url: str, *, params: dict[str, str]) -> requests.Response:
+        """GET from the Scryfall API within the shared rate limit, retrying 429 Too Many Requests.
+
+        A 429 backs off the limiter for the response's Retry-After, holding back every concurrent
+        request sharing it, before the request is tried again.
+
+        Args:
+        ----
+            url (str): URL to get.
+            params (Dict[str, str]): Query parameters.
+
+        Returns:
+        -------
+            requests.Response: The first response that isn't a 429, or the last 429 once
+            SCRYFALL_REQUEST_ATTEMPTS have been made.
+
+        """
+        return rate_limited_get(
+            self._session,
+            url,
+            rate_limiter=self._scryfall_rate_limiter,
+            attempts=SCRYFALL_REQUEST_ATTEMPTS,
+            params=params,
+            timeout=30,
+        )
+
     def _scryfall_search(self, *, query: str) -> list[dict[str, Any]]:
         """Search Scryfall API for cards matching the given query.
 
@@ -1672,14 +2544,13 @@ class APIResource:
         ]
         full_query = f"({query}) {' '.join(filters)}"
 
-        base_url = "https://api.scryfall.com/cards/search"
+        base_url = SCRYFALL_SEARCH_URL
         params = {"q": full_query, "format": "json"}
         all_cards = []
 
         try:
             while True:
-                time.sleep(1 / 10)  # Rate limiting - 10 requests per second max
-                response = self._session.get(base_url, params=params, timeout=30)
+                response = self._scryfall_get(base_url, params=params)
                 response.raise_for_status()
                 data = orjson.loads(response.content)
 
@@ -1715,20 +2586,23 @@ class APIResource:
     if IMPORT_EXPORT:
 
         def export_card_data(self, **_: object) -> dict[str, Any]:
-            """Export card data tables to JSON files for backup/re-import.
+            """Export card data tables to compressed JSON lines files for backup/re-import.
 
             Exports the three main tables:
-            - magic.cards
+            - magic.cards (with each printing's raw_card_blob)
             - magic.tags
             - magic.tag_relationships
 
-            Files are saved to /data/api/exports/{timestamp}/ directory.
+            Files are saved to /data/api/exports/{timestamp}/ directory, one {table}.jsonl.zst per
+            table, streamed so memory stays flat however large the tables are. A manifest.json,
+            written last, records each file's row count and sha256 checksum.
 
             Returns:
             -------
-                Dict[str, Any]: Export result with status, file paths, and counts.
+                Dict[str, Any]: Export result with status, file paths, counts and checksums.
             """
             logger.info("Starting card data export")
+            start_time = time.monotonic()
 
             # Create timestamped export directory
             timestamp = datetime.datetime.now(tz=datetime.UTC).strftime("%Y%m%d_%H%M%S")
@@ -1745,81 +2619,115 @@ class APIResource:
                         "tag_relationships": self._export_tag_relationships_table(cursor, export_dir),
                     }
 
-                    logger.info("Export completed successfully to %s", export_dir)
-                    return {
-                        "status": "success",
-                        "export_directory": str(export_dir),
-                        "timestamp": timestamp,
-                        "results": export_results,
-                        "message": "Successfully exported cards, tags, and tag relationships",
-                    }
+                manifest = {
+                    "timestamp": timestamp,
+                    "tables": {
+                        table: {"file": pathlib.PurePath(result["file"]).name, "count": result["count"], "sha256": result["sha256"]}
+                        for table, result in export_results.items()
+                    },
+                }
+                (export_dir / EXPORT_MANIFEST_FILE).write_bytes(orjson.dumps(manifest, option=orjson.OPT_INDENT_2))
+
+                duration = time.monotonic() - start_time
+                peak_rss_mib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+                logger.info("Export completed successfully to %s in %.1fs, peak RSS %.0f MiB", export_dir, duration, peak_rss_mib)
+                return {
+                    "status": "success",
+                    "export_directory": str(export_dir),
+                    "timestamp": timestamp,
+                    "results": export_results,
+                    "duration": duration,
+                    "peak_rss_mib": peak_rss_mib,
+                    "message": "Successfully exported cards, tags, and tag relationships",
+                }
 
-            except (OSError, psycopg.Error, ValueError) as e:
+            except (OSError, psycopg.Error, ValueError, zstd.ZstdError) as e:
                 logger.error("Failed to export card data: %s", e)
                 return {
                     "status": "error",
                     "message": f"Export failed: {e}",
                 }
 
-        def _export_cards_table(self, cursor: Cursor, export_dir: pathlib.Path) -> dict[str, Any]:
-            """Export magic.cards table to JSON file."""
-            cards_file = export_dir / "cards.json"
-            logger.info("Exporting magic.cards table to %s file", cards_file)
-            cursor.execute("SELECT * FROM magic.cards ORDER BY card_name")
-
-            cards_data = [dict(row) for row in cursor.fetchall()]
-            cards_count = len(cards_data)
+        def _export_rows(self, cursor: Cursor, export_file: pathlib.Path, query: str) -> dict[str, Any]:
+            """Stream the rows of a query into a zstd-compressed JSON lines file.
 
-            # Write JSON file
-            with cards_file.open("w", encoding="utf-8") as f:
-                f.write(orjson.dumps(cards_data, option=orjson.OPT_INDENT_2).decode("utf-8"))
+            Rows are fetched EXPORT_STREAM_ROWS at a time and compressed as they are written, so
+            only one batch of rows is ever held in memory.
 
-            logger.info("Exported magic.cards table to %s file", cards_file)
-            return {"file": str(cards_file), "count": cards_count}
+            Args:
+            ----
+                cursor (Cursor): Cursor to read with.
+                export_file (pathlib.Path): File to write, one JSON object per row and line.
+                query (str): Query whose rows to export.
 
-        def _export_tags_table(self, cursor: Cursor, export_dir: pathlib.Path) -> dict[str, Any]:
-            """Export magic.tags table to JSON file."""
-            tags_file = export_dir / "tags.json"
-            logger.info("Exporting tags table to %s file", tags_file)
-            cursor.execute("SELECT tag FROM magic.tags ORDER BY tag")
+            Returns:
+            -------
+                Dict[str, Any]: The file, its row count, size in bytes, sha256 checksum and the seconds it took.
 
-            tags_data = [dict(row) for row in cursor.fetchall()]
-            tags_count = len(tags_data)
+            """
+            start_time = time.monotonic()
+            count = 0
+            with export_file.open("wb") as f, zstd.ZstdCompressor(level=EXPORT_ZSTD_LEVEL).stream_writer(f) as writer:
+                for row in cursor.stream(query, size=EXPORT_STREAM_ROWS):
+                    writer.write(orjson.dumps(row, option=orjson.OPT_APPEND_NEWLINE))
+                    count += 1
+            with export_file.open("rb") as f:
+                sha256 = hashlib.file_digest(f, "sha256").hexdigest()
+            return {
+                "file": str(export_file),
+                "count": count,
+                "bytes": export_file.stat().st_size,
+                "sha256": sha256,
+                "seconds": time.monotonic() - start_time,
+            }
 
-            # Write JSON file
-            with tags_file.open("w", encoding="utf-8") as f:
-                f.write(orjson.dumps(tags_data, option=orjson.OPT_INDENT_2).decode("utf-8"))
+        def _export_cards_table(self, cursor: Cursor, export_dir: pathlib.Path) -> dict[str, Any]:
+            """Export magic.cards table, with each printing's raw_card_blob, to a compressed JSON lines file."""
+            cards_file = export_dir / "cards.jsonl.zst"
+            logger.info("Exporting magic.cards table to %s file", cards_file)
+            result = self._export_rows(
+                cursor,
+                cards_file,
+                """
+                SELECT card.*, blob.raw_card_blob
+                FROM magic.cards AS card
+                LEFT JOIN magic.card_blobs AS blob ON blob.scryfall_id = card.scryfall_id
+                """,
+            )
+            logger.info("Exported %d cards to %s file in %.1fs", result["count"], cards_file, result["seconds"])
+            return result
 
+        def _export_tags_table(self, cursor: Cursor, export_dir: pathlib.Path) -> dict[str, Any]:
+            """Export magic.tags table to a compressed JSON lines file."""
+            tags_file = export_dir / "tags.jsonl.zst"
+            logger.info("Exporting tags table to %s file", tags_file)
+            result = self._export_rows(cursor, tags_file, "SELECT tag FROM magic.tags ORDER BY tag")
             logger.info("Exported tags table to %s file", tags_file)
-            return {"file": str(tags_file), "count": tags_count}
+            return result
 
         def _export_tag_relationships_table(self, cursor: Cursor, export_dir: pathlib.Path) -> dict[str, Any]:
-            """Export magic.tag_relationships table to JSON file."""
-            relationships_file = export_dir / "tag_relationships.json"
+            """Export magic.tag_relationships table to a compressed JSON lines file."""
+            relationships_file = export_dir / "tag_relationships.jsonl.zst"
             logger.info("Exporting tag_relationships table to %s file", relationships_file)
-            cursor.execute(
+            result = self._export_rows(
+                cursor,
+                relationships_file,
                 """
                 SELECT child_tag, parent_tag
                 FROM magic.tag_relationships
                 ORDER BY child_tag, parent_tag
-            """,
+                """,
             )
-
-            relationships_data = [dict(row) for row in cursor.fetchall()]
-            relationships_count = len(relationships_data)
-
-            # Write JSON file
-            with relationships_file.open("w", encoding="utf-8") as f:
-                f.write(orjson.dumps(relationships_data, option=orjson.OPT_INDENT_2).decode("utf-8"))
-
             logger.info("Exported tag_relationships table to %s file", relationships_file)
-            return {"file": str(relationships_file), "count": relationships_count}
+            return result
 
         def import_card_data(self, *, timestamp: str | None = None, **_: object) -> dict[str, Any]:
-            """Import card data from JSON files, truncating existing data.
+            """Import card data from export files, truncating existing data.
 
             Imports data from /data/api/exports/{timestamp}/ directory.
-            If timestamp is not provided, uses the most recent export.
+            If timestamp is not provided, uses the most recent export. The files are checked
+            against the export's manifest before anything is deleted, and the restore is rolled
+            back if it doesn't hold every exported row.
 
             Args:
             ----
@@ -1854,13 +2762,13 @@ class APIResource:
                             "message": f"Successfully imported {import_results['cards']} cards, {import_results['tags']} tags, and {import_results['tag_relationships']} tag relationships",
                         }
 
-                    except (OSError, psycopg.Error, ValueError) as e:
+                    except (OSError, psycopg.Error, ValueError, zstd.ZstdError) as e:
                         conn.rollback()
                         raise e
                     finally:
                         conn.autocommit = True
 
-            except (OSError, psycopg.Error, ValueError) as e:
+            except (OSError, psycopg.Error, ValueError, zstd.ZstdError) as e:
                 logger.error("Failed to import card data: %s", e)
                 return {
                     "status": "error",
@@ -1894,91 +2802,150 @@ class APIResource:
             return import_dir, timestamp
 
         def _validate_import_files(self, import_dir: pathlib.Path) -> None:
-            """Validate that all required import files exist."""
-            required_files = [
-                ("cards.json", import_dir / "cards.json"),
-                ("tags.json", import_dir / "tags.json"),
-                ("tag_relationships.json", import_dir / "tag_relationships.json"),
-            ]
-
-            missing_files = [name for name, file_path in required_files if not file_path.exists()]
+            """Validate that all required import files exist and match the manifest's checksums, if there is one."""
+            missing_files = [f"{table}.jsonl.zst" for table in EXPORT_TABLES if self._find_export_file(import_dir, table) is None]
 
             if missing_files:
                 msg = f"Missing required files: {', '.join(missing_files)}"
                 raise ValueError(msg)
 
+            manifest = self._read_export_manifest(import_dir)
+            for entry in manifest.get("tables", {}).values():
+                with (import_dir / entry["file"]).open("rb") as f:
+                    if hashlib.file_digest(f, "sha256").hexdigest() != entry["sha256"]:
+                        msg = f"Checksum mismatch for {entry['file']}, the export is corrupt"
+                        raise ValueError(msg)
+
+        def _read_export_manifest(self, import_dir: pathlib.Path) -> dict[str, Any]:
+            """Read an export's manifest, empty for exports from before manifests were written."""
+            manifest_file = import_dir / EXPORT_MANIFEST_FILE
+            if not manifest_file.exists():
+                return {}
+            return orjson.loads(manifest_file.read_bytes())
+
+        def _find_export_file(self, import_dir: pathlib.Path, table: str) -> pathlib.Path | None:
+            """Find a table's export file, {table}.jsonl.zst or the {table}.json array of older exports."""
+            for export_file in (import_dir / f"{table}.jsonl.zst", import_dir / f"{table}.json"):
+                if export_file.exists():
+                    return export_file
+            return None
+
+        def _iter_export_rows(self, import_dir: pathlib.Path, table: str) -> Iterator[dict[str, Any]]:
+            """Stream the rows of a table's export file, one at a time."""
+            export_file = self._find_export_file(import_dir, table)
+            if export_file is None:
+                msg = f"Missing required files: {table}.jsonl.zst"
+                raise ValueError(msg)
+            if export_file.suffix == ".json":
+                with export_file.open("r", encoding="utf-8") as f:
+                    yield from iter_json_array(f)
+                return
+            with export_file.open("rb") as f, io.BufferedReader(zstd.ZstdDecompressor().stream_reader(f)) as lines:
+                for line in lines:
+                    yield orjson.loads(line)
+
         def _perform_import(self, cursor: Cursor, import_dir: pathlib.Path) -> dict[str, int]:
-            """Perform the actual import operation."""
-            # Delete data from tables in correct order (respecting foreign keys)
+            """Restore the exported tables with COPY, replacing their contents.
+
+            Each export file is streamed into its table with a binary COPY. Tag relationships
+            are loaded with their per-row triggers disabled, then the whole hierarchy is checked
+            for cycles and its closure rebuilt once. The indexes of RESTORE_REINDEXED_TABLES are
+            dropped before loading and rebuilt afterwards with parallel maintenance workers.
+            Everything, the triggers and indexes included, happens in the caller's transaction,
+            so a failed restore leaves the old data in place.
+
+            Args:
+            ----
+                cursor (Cursor): Cursor of the restore's transaction.
+                import_dir (pathlib.Path): Export directory to restore.
+
+            Returns:
+            -------
+                Dict[str, int]: The number of rows restored into each table.
+
+            """
+            # set local: the settings end with the transaction, not with the pooled connection
+            cursor.execute(f"set local statement_timeout = {RELOAD_INDEX_STATEMENT_TIMEOUT}")
+            cursor.execute(f"set local max_parallel_maintenance_workers = {RELOAD_MAINTENANCE_WORKERS}")
+            cursor.execute(f"set local maintenance_work_mem = '{RELOAD_MAINTENANCE_WORK_MEM}'")
+
             logger.info("Deleting existing data")
-            cursor.execute("DELETE FROM magic.tag_relationships")
-            cursor.execute("DELETE FROM magic.tags")
-            cursor.execute("DELETE FROM magic.cards")
+            cursor.execute("TRUNCATE magic.tag_relationships, magic.tags, magic.cards, magic.card_blobs, magic.oracle_cards")
+            index_definitions = []
+            for table_name in RESTORE_REINDEXED_TABLES:
+                for index_name, index_definition in db_utils.get_index_definitions(cursor, table_name):
+                    cursor.execute(f"DROP INDEX magic.{index_name}")
+                    index_definitions.append(index_definition)
 
             import_results = {}
 
             # Import tags first (no dependencies)
             logger.info("Importing tags")
-            tags_file = import_dir / "tags.json"
-            with tags_file.open("r", encoding="utf-8") as f:
-                tags_data = orjson.loads(f.read())
-
-            for tag_record in tags_data:
-                cursor.execute("INSERT INTO magic.tags (tag) VALUES (%(tag)s)", tag_record)
-
+            db_utils.copy_rows_binary(cursor, "magic.tags", [("tag", "text")], self._iter_export_rows(import_dir, "tags"))
             cursor.execute("SELECT COUNT(*) FROM magic.tags")
             import_results["tags"] = cursor.fetchone()["count"]
 
-            # Import tag relationships (depends on tags)
+            # Import tag relationships (depends on tags), validating the hierarchy once rather than per row
             logger.info("Importing tag relationships")
-            relationships_file = import_dir / "tag_relationships.json"
-            with relationships_file.open("r", encoding="utf-8") as f:
-                relationships_data = orjson.loads(f.read())
-
-            for relationship_record in relationships_data:
-                cursor.execute(
-                    "INSERT INTO magic.tag_relationships (child_tag, parent_tag) VALUES (%(child_tag)s, %(parent_tag)s)",
-                    relationship_record,
-                )
-
+            disable_triggers = ", ".join(f"DISABLE TRIGGER {trigger}" for trigger in RESTORE_DISABLED_TAG_TRIGGERS)
+            enable_triggers = ", ".join(f"ENABLE TRIGGER {trigger}" for trigger in RESTORE_DISABLED_TAG_TRIGGERS)
+            cursor.execute(f"ALTER TABLE magic.tag_relationships {disable_triggers}")
+            db_utils.copy_rows_binary(
+                cursor,
+                "magic.tag_relationships",
+                [("child_tag", "text"), ("parent_tag", "text")],
+                self._iter_export_rows(import_dir, "tag_relationships"),
+            )
+            cursor.execute(self.read_sql("find_tag_cycle"))
+            cycle = cursor.fetchone()
+            if cycle is not None:
+                msg = f"Circular reference detected: {cycle['tag']} is its own ancestor"
+                raise ValueError(msg)
+            cursor.execute("SELECT magic.rebuild_tag_closure()")
+            cursor.execute(f"ALTER TABLE magic.tag_relationships {enable_triggers}")
             cursor.execute("SELECT COUNT(*) FROM magic.tag_relationships")
             import_results["tag_relationships"] = cursor.fetchone()["count"]
 
-            # Import cards last (largest table)
+            # Import cards last (largest table), then their blobs in a second pass over the same file
             logger.info("Importing cards")
-            cards_file = import_dir / "cards.json"
-            with cards_file.open("r", encoding="utf-8") as f:
-                cards_data = orjson.loads(f.read())
-
-            num_cards = len(cards_data)
-            page_size = 750
-            num_imported = 0
-            # Import cards in batches using jsonb_populate_record
-            for card_batch in itertools.batched(cards_data, page_size):
-                batch_json = orjson.dumps(card_batch).decode("utf-8")
-                cursor.execute(
-                    """
-                    INSERT INTO magic.cards
-                    SELECT
-                        (jsonb_populate_record(null::magic.cards, value)).*
-                    FROM
-                        jsonb_array_elements(%s::jsonb)
-                """,
-                    (batch_json,),
-                )
-                num_imported += cursor.rowcount
-                logger.info(
-                    "Imported %s of %s cards (%.1f%%)",
-                    f"{num_imported:,}",
-                    f"{num_cards:,}",
-                    num_imported / num_cards * 100,
-                )
-
+            card_columns = db_utils.get_table_columns(cursor, "magic.cards")
+            db_utils.copy_rows_binary(cursor, "magic.cards", card_columns, self._iter_export_cards(import_dir))
+            db_utils.copy_rows_binary(
+                cursor,
+                "magic.card_blobs",
+                CARD_BLOB_COLUMNS,
+                (card for card in self._iter_export_rows(import_dir, "cards") if card.get("raw_card_blob") is not None),
+            )
             cursor.execute("SELECT COUNT(*) FROM magic.cards")
             import_results["cards"] = cursor.fetchone()["count"]
+            logger.info("Imported %s cards", f"{import_results['cards']:,}")
+
+            # a restore that doesn't hold every exported row is rolled back rather than committed
+            for table, entry in self._read_export_manifest(import_dir).get("tables", {}).items():
+                if import_results[table] != entry["count"]:
+                    msg = f"Imported {import_results[table]} rows of {table}, but the export holds {entry['count']}"
+                    raise ValueError(msg)
+
+            cursor.execute(self.read_sql("backfill_oracle_cards"))
+            logger.info("Rebuilding %d indexes", len(index_definitions))
+            for index_definition in index_definitions:
+                cursor.execute(index_definition)
+            for table_name in RESTORE_REINDEXED_TABLES:
+                cursor.execute(f"ANALYZE {table_name}")
+            cursor.execute(self.read_sql("rebuild_card_tags"))
 
             return import_results
 
+        def _iter_export_cards(self, import_dir: pathlib.Path) -> Iterator[dict[str, Any]]:
+            """Stream the cards of an export, deriving the columns older exports are missing."""
+            for card in self._iter_export_rows(import_dir, "cards"):
+                # exports from before the pip count columns existed: derive them from the mana cost
+                if "mana_pips_w" not in card:
+                    mana_cost_text = card.get("mana_cost_text") or ""
+                    card.update(mana_cost_pip_counts(mana_cost_text))
+                    card.update(devotion_counts(mana_cost_text))
+                yield card
+
     def _load_cards_with_staging(
         self,
         cards: list[dict[str, Any]],
@@ -2015,47 +2982,83 @@ class APIResource:
 
         self.setup_schema()
 
-        processed_cards = []
-        for icard in cards:
-            processed_cards.extend(preprocess_card(icard))
-        cards = processed_cards
+        result = self._load_processed_cards(list(iter_preprocessed_cards(cards)))
+        if result["status"] == "success":
+            self._backfill_prefer_scores(result.pop("touched_scryfall_ids"), result.pop("touched_illustration_ids"))
+        return result
 
-        if not cards:
-            return {
-                "status": "no_cards_after_preprocessing",
-                "cards_loaded": 0,
-                "sample_cards": [],
-                "message": "No cards remaining after preprocessing",
-            }
+    def _load_processed_cards(self, cards: Iterable[dict[str, Any]], *, delete_missing: bool = False) -> dict[str, Any]:  # noqa: PLR0915
+        """Upsert already preprocessed cards through a typed staging table, one page at a time.
+
+        cards may be any iterable, including a generator streaming a whole bulk export: only
+        one page of cards is held in memory at a time. Each page is written with a binary COPY
+        straight into a temporary table shaped like magic.cards (plus raw_card_blob and
+        face_idx), then diffed against magic.cards on content_hash with set-based statements:
+        new printings are inserted, printings whose hash changed are updated, and unchanged
+        printings are left alone. Columns maintained outside the import (tags and prefer
+        scores) are never overwritten. The staging table is emptied after each page.
+
+        Args:
+        ----
+            cards (Iterable[Dict[str, Any]]): Preprocessed cards, as returned by preprocess_card.
+            delete_missing (bool): Whether cards is a complete export, so printings in magic.cards
+                that it doesn't contain should be deleted.
 
+        Returns:
+        -------
+            Dict[str, Any]: Result as described in _load_cards_with_staging, plus cards_sent and
+            the cards_inserted, cards_updated, cards_unchanged and cards_deleted counts and
+            diff_seconds, the time spent comparing and applying changes. On success also
+            touched_scryfall_ids, the printings inserted or updated, and touched_illustration_ids,
+            the illustrations printings were updated away from or deleted from: what an
+            incremental prefer score backfill needs to recompute.
+
+        """
         # Generate random staging table name
         staging_suffix = secrets.token_hex(8)
         staging_table_name = f"import_staging_{staging_suffix}"
+        seen_table_name = f"import_seen_{staging_suffix}"
 
         try:
             with self._conn_pool.connection() as conn, conn.cursor() as cursor:
                 statement_timeout = 30_000
                 cursor.execute(f"set statement_timeout = {statement_timeout}")
 
+                card_columns = db_utils.get_table_columns(cursor, "magic.cards")
+                column_list = ", ".join(column_name for column_name, _ in card_columns)
+                updated_columns = [
+                    column_name
+                    for column_name, _ in card_columns
+                    if column_name != "scryfall_id" and column_name not in COLUMNS_NOT_FROM_IMPORT
+                ]
+                update_assignments = ", ".join(f"{column_name} = staged.{column_name}" for column_name in updated_columns)
+                cursor.execute(f"CREATE TEMPORARY TABLE {staging_table_name} (LIKE magic.cards) ON COMMIT DROP")
+                cursor.execute(f"ALTER TABLE {staging_table_name} ADD COLUMN raw_card_blob jsonb, ADD COLUMN face_idx integer")
+                # printings already handled by this load, so a later face of the same printing is skipped
+                cursor.execute(f"CREATE TEMPORARY TABLE {seen_table_name} (scryfall_id uuid PRIMARY KEY) ON COMMIT DROP")
+
                 page_size = 6000
-                cards_loaded = cards_sent = 0
+                cards_sent = cards_inserted = cards_updated = cards_unchanged = cards_deleted = 0
+                diff_seconds = 0.0
+                sample_cards = []
+                # printings written and illustrations whose printings changed, for the prefer score backfill
+                touched_scryfall_ids = set()
+                touched_illustration_ids = set()
                 for page in itertools.batched(cards, page_size):
-                    # Create staging table with unique name
-                    cursor.execute(f"CREATE TEMPORARY TABLE {staging_table_name} (card_blob jsonb)")
-
-                    # Load cards into staging table using COPY for efficiency
-                    with cursor.copy(
-                        f"COPY {staging_table_name} (card_blob) FROM STDIN WITH (FORMAT csv, HEADER false)",
-                    ) as copy_filehandle:
-                        writer = csv.writer(copy_filehandle, quoting=csv.QUOTE_ALL)
-                        writer.writerows([orjson.dumps(card, option=orjson.OPT_SORT_KEYS).decode("utf-8")] for card in page)
+                    db_utils.copy_rows_binary(
+                        cursor,
+                        staging_table_name,
+                        [*card_columns, ("raw_card_blob", "jsonb"), ("face_idx", "integer")],
+                        page,
+                    )
+                    cards_sent += len(page)
 
                     target_sample_size = 10
                     random_threshold = 2 * target_sample_size / len(page)
                     cursor.execute(
                         f"""
                         SELECT
-                            (jsonb_populate_record(null::magic.cards, card_blob)).*
+                            {column_list}
                         FROM
                             {staging_table_name}
                         WHERE
@@ -2065,45 +3068,176 @@ class APIResource:
                     )
                     sample_cards = [dict(r) for r in cursor.fetchall()]
 
-                    # Transfer from staging to main table using direct jsonb_populate_record
-                    insert_query = f"""
-                        INSERT INTO magic.cards
+                    before_diff = time.monotonic()
+                    # one row per printing: its first face, unless an earlier page already had it
+                    cursor.execute(
+                        f"""
+                        DELETE FROM {staging_table_name} AS staged
+                        USING {staging_table_name} AS earlier_face
+                        WHERE
+                            staged.scryfall_id = earlier_face.scryfall_id
+                            AND staged.face_idx > earlier_face.face_idx
+                    """,
+                    )
+                    cursor.execute(
+                        f"DELETE FROM {staging_table_name} AS staged USING {seen_table_name} AS seen "
+                        "WHERE staged.scryfall_id = seen.scryfall_id",
+                    )
+                    cursor.execute(f"INSERT INTO {seen_table_name} SELECT scryfall_id FROM {staging_table_name}")
+
+                    cursor.execute(
+                        f"""
                         SELECT
-                            (jsonb_populate_record(null::magic.cards, card_blob)).*
+                            COUNT(1) AS num_unchanged
                         FROM
-                            {staging_table_name}
-                        ON CONFLICT DO NOTHING
-                    """
-                    # could we update the on conflict to replace?
+                            {staging_table_name} AS staged
+                            JOIN magic.cards AS card ON card.scryfall_id = staged.scryfall_id
+                        WHERE
+                            card.content_hash = staged.content_hash
+                    """,
+                    )
+                    cards_unchanged += cursor.fetchone()["num_unchanged"]
 
-                    cursor.execute(insert_query)
-                    cards_sent += len(page)
-                    cards_loaded += cursor.rowcount
+                    # The raw scryfall payload goes to the cold side table, keyed like magic.cards
+                    cursor.execute(
+                        f"""
+                        INSERT INTO magic.card_blobs (scryfall_id, raw_card_blob)
+                        SELECT
+                            staged.scryfall_id,
+                            staged.raw_card_blob
+                        FROM
+                            {staging_table_name} AS staged
+                        WHERE
+                            NOT EXISTS (
+                                SELECT 1
+                                FROM magic.cards AS card
+                                WHERE card.scryfall_id = staged.scryfall_id AND card.content_hash = staged.content_hash
+                            )
+                        ON CONFLICT (scryfall_id) DO UPDATE SET raw_card_blob = EXCLUDED.raw_card_blob
+                    """,
+                    )
+
+                    # the illustrations changed printings are leaving, their counts drop
+                    cursor.execute(
+                        f"""
+                        SELECT DISTINCT
+                            card.illustration_id
+                        FROM
+                            magic.cards AS card
+                            JOIN {staging_table_name} AS staged ON staged.scryfall_id = card.scryfall_id
+                        WHERE
+                            card.content_hash IS DISTINCT FROM staged.content_hash
+                            AND card.illustration_id IS NOT NULL
+                    """,
+                    )
+                    touched_illustration_ids.update(r["illustration_id"] for r in cursor.fetchall())
+
+                    cursor.execute(
+                        f"""
+                        UPDATE magic.cards AS card SET
+                            {update_assignments}
+                        FROM
+                            {staging_table_name} AS staged
+                        WHERE
+                            card.scryfall_id = staged.scryfall_id
+                            AND card.content_hash IS DISTINCT FROM staged.content_hash
+                        RETURNING card.scryfall_id
+                    """,
+                    )
+                    cards_updated += cursor.rowcount
+                    touched_scryfall_ids.update(r["scryfall_id"] for r in cursor.fetchall())
 
-                    # Drop the staging table
-                    cursor.execute(f"DROP TABLE {staging_table_name}")
+                    cursor.execute(
+                        f"""
+                        INSERT INTO magic.cards ({column_list})
+                        SELECT
+                            {column_list}
+                        FROM
+                            {staging_table_name} AS staged
+                        WHERE
+                            NOT EXISTS (SELECT 1 FROM magic.cards AS card WHERE card.scryfall_id = staged.scryfall_id)
+                        ON CONFLICT DO NOTHING
+                        RETURNING scryfall_id
+                    """,
+                    )
+                    cards_inserted += cursor.rowcount
+                    touched_scryfall_ids.update(r["scryfall_id"] for r in cursor.fetchall())
+                    diff_seconds += time.monotonic() - before_diff
+
+                    cursor.execute(f"TRUNCATE {staging_table_name}")
                     logger.info(
-                        "%d cards loaded, %d cards sent, of %d cards",
-                        cards_loaded,
+                        "%d cards sent: %d inserted, %d updated, %d unchanged",
                         cards_sent,
-                        len(cards),
+                        cards_inserted,
+                        cards_updated,
+                        cards_unchanged,
                     )
 
+                if not cards_sent:
+                    return {
+                        "status": "no_cards_after_preprocessing",
+                        "cards_loaded": 0,
+                        "cards_sent": 0,
+                        "sample_cards": [],
+                        "message": "No cards remaining after preprocessing",
+                    }
+
+                if delete_missing:
+                    if cards_sent < MIN_IMPORT_CARDS:
+                        logger.warning("Only %d cards sent, not deleting printings missing from the import", cards_sent)
+                    else:
+                        before_diff = time.monotonic()
+                        cursor.execute(
+                            f"""
+                            DELETE FROM magic.cards AS card
+                            WHERE NOT EXISTS (SELECT 1 FROM {seen_table_name} AS seen WHERE seen.scryfall_id = card.scryfall_id)
+                            RETURNING card.illustration_id
+                        """,
+                        )
+                        cards_deleted = cursor.rowcount
+                        touched_illustration_ids.update(r["illustration_id"] for r in cursor.fetchall() if r["illustration_id"])
+                        cursor.execute(
+                            f"""
+                            DELETE FROM magic.card_blobs AS blob
+                            WHERE NOT EXISTS (SELECT 1 FROM {seen_table_name} AS seen WHERE seen.scryfall_id = blob.scryfall_id)
+                        """,
+                        )
+                        diff_seconds += time.monotonic() - before_diff
+
+                # Oracle-level search predicates are evaluated against magic.oracle_cards, so every
+                # printing's oracle card must exist there too, and be as up to date as the printing
+                cursor.execute(self.read_sql("backfill_oracle_cards"))
+
                 conn.commit()
 
+                cards_loaded = cards_inserted + cards_updated
+                logger.info(
+                    "Diffed %d cards in %.2f seconds: %d inserted, %d updated, %d unchanged, %d deleted",
+                    cards_sent,
+                    diff_seconds,
+                    cards_inserted,
+                    cards_updated,
+                    cards_unchanged,
+                    cards_deleted,
+                )
                 result = {
                     "status": "success",
                     "cards_loaded": cards_loaded,
+                    "cards_sent": cards_sent,
+                    "cards_inserted": cards_inserted,
+                    "cards_updated": cards_updated,
+                    "cards_unchanged": cards_unchanged,
+                    "cards_deleted": cards_deleted,
+                    "diff_seconds": diff_seconds,
+                    "touched_scryfall_ids": list(touched_scryfall_ids),
+                    "touched_illustration_ids": list(touched_illustration_ids),
                     "sample_cards": sample_cards,
                     "message": f"Successfully loaded {cards_loaded} cards",
                 }
 
                 # Clear caches when cards are successfully loaded
-                if cards_loaded > 0:
-                    self._query_cache.clear()
-                    # Clear the search cache by accessing its cache attribute
-                    if hasattr(self._search, "cache"):
-                        self._search.cache.clear()
+                if cards_loaded or cards_deleted:
+                    self._clear_caches()
 
                 return result
 
@@ -2124,6 +3258,206 @@ class APIResource:
                 "message": f"Error loading cards: {e}",
             }
 
+    def _reload_processed_cards(self, cards: Iterable[dict[str, Any]]) -> dict[str, Any]:  # noqa: PLR0915
+        """Rebuild magic.cards from already preprocessed cards in a fresh table and swap it in.
+
+        Cards are written with a binary COPY into a typed staging table a page at a time and
+        inserted into an unindexed copy of magic.cards, carrying over the tag and prefer score
+        columns of printings already loaded. magic.cards' indexes and foreign keys are then built
+        on the new table, using parallel maintenance workers, and it is analyzed. Finally
+        magic.cards is locked, dropped and replaced by the new table, which takes over its index
+        names. Everything runs in one transaction, so readers see the old table until the swap
+        commits and a failed reload leaves nothing behind.
+
+        Args:
+        ----
+            cards (Iterable[Dict[str, Any]]): Preprocessed cards, as returned by preprocess_card,
+                making up a complete export.
+
+        Returns:
+        -------
+            Dict[str, Any]: Result as described in _load_cards_with_staging, plus cards_sent,
+            cards_deleted and load_seconds, index_seconds and swap_seconds, the time spent in
+            each phase.
+
+        """
+        suffix = secrets.token_hex(8)
+        staging_table_name = f"import_staging_{suffix}"
+        reload_table_name = f"magic.cards_reload_{suffix}"
+
+        try:
+            with self._conn_pool.connection() as conn, conn.cursor() as cursor:
+                statement_timeout = 30_000
+                cursor.execute(f"set statement_timeout = {statement_timeout}")
+                before_load = time.monotonic()
+
+                card_columns = db_utils.get_table_columns(cursor, "magic.cards")
+                column_list = ", ".join(column_name for column_name, _ in card_columns)
+                select_list = ", ".join(
+                    f"COALESCE(live.{column_name}, staged.{column_name})"
+                    if column_name in COLUMNS_NOT_FROM_IMPORT
+                    else f"staged.{column_name}"
+                    for column_name, _ in card_columns
+                )
+                cursor.execute("SELECT COUNT(1) AS num_cards FROM magic.cards")
+                live_cards = cursor.fetchone()["num_cards"]
+                # defaults, check constraints and comments, but no indexes to maintain while loading
+                cursor.execute(f"CREATE TABLE {reload_table_name} (LIKE magic.cards INCLUDING ALL EXCLUDING INDEXES)")
+                cursor.execute(f"CREATE TEMPORARY TABLE {staging_table_name} (LIKE magic.cards) ON COMMIT DROP")
+                cursor.execute(f"ALTER TABLE {staging_table_name} ADD COLUMN raw_card_blob jsonb")
+
+                page_size = 6000
+                cards_sent = 0
+                sample_cards: list[dict[str, Any]] = []
+                # one row per printing: its first face
+                seen_ids: set[str] = set()
+                for page in itertools.batched(cards, page_size):
+                    printings = []
+                    for card in page:
+                        if card["scryfall_id"] not in seen_ids:
+                            seen_ids.add(card["scryfall_id"])
+                            printings.append(card)
+                    db_utils.copy_rows_binary(cursor, staging_table_name, [*card_columns, ("raw_card_blob", "jsonb")], printings)
+                    cards_sent += len(printings)
+
+                    target_sample_size = 10
+                    cursor.execute(
+                        f"SELECT {column_list} FROM {staging_table_name} ORDER BY RANDOM() LIMIT {target_sample_size}",
+                    )
+                    sample_cards = [dict(r) for r in cursor.fetchall()] or sample_cards
+
+                    cursor.execute(
+                        f"""
+                        INSERT INTO {reload_table_name} ({column_list})
+                        SELECT
+                            {select_list}
+                        FROM
+                            {staging_table_name} AS staged
+                            LEFT JOIN magic.cards AS live ON live.scryfall_id = staged.scryfall_id
+                    """,
+                    )
+                    cursor.execute(
+                        f"""
+                        INSERT INTO magic.card_blobs (scryfall_id, raw_card_blob)
+                        SELECT
+                            staged.scryfall_id,
+                            staged.raw_card_blob
+                        FROM
+                            {staging_table_name} AS staged
+                        ON CONFLICT (scryfall_id) DO UPDATE SET raw_card_blob = EXCLUDED.raw_card_blob
+                        WHERE magic.card_blobs.raw_card_blob IS DISTINCT FROM EXCLUDED.raw_card_blob
+                    """,
+                    )
+                    cursor.execute(f"TRUNCATE {staging_table_name}")
+                    logger.info("%d cards sent to %s", cards_sent, reload_table_name)
+
+                if not cards_sent:
+                    conn.rollback()
+                    return {
+                        "status": "no_cards_after_preprocessing",
+                        "cards_loaded": 0,
+                        "cards_sent": 0,
+                        "sample_cards": [],
+                        "message": "No cards remaining after preprocessing",
+                    }
+                if live_cards and cards_sent < MIN_IMPORT_CARDS:
+                    conn.rollback()
+                    logger.warning("Only %d cards sent, not replacing the %d cards in magic.cards", cards_sent, live_cards)
+                    return {
+                        "status": "too_few_cards",
+                        "cards_loaded": 0,
+                        "cards_sent": cards_sent,
+                        "sample_cards": [],
+                        "message": f"Only {cards_sent} cards sent, at least {MIN_IMPORT_CARDS} are needed to replace magic.cards",
+                    }
+
+                before_index = time.monotonic()
+                # set local: the settings end with the transaction, not with the pooled connection
+                cursor.execute(f"set local statement_timeout = {RELOAD_INDEX_STATEMENT_TIMEOUT}")
+                cursor.execute(f"set local max_parallel_maintenance_workers = {RELOAD_MAINTENANCE_WORKERS}")
+                cursor.execute(f"set local maintenance_work_mem = '{RELOAD_MAINTENANCE_WORK_MEM}'")
+                # index names are unique per schema, so the new indexes take over the old names after the swap
+                index_renames = []
+                for index_name, index_definition in db_utils.get_index_definitions(cursor, "magic.cards"):
+                    reload_index_name = f"{index_name}_{suffix}"
+                    cursor.execute(db_utils.retarget_index_definition(index_definition, reload_index_name, reload_table_name))
+                    index_renames.append((reload_index_name, index_name))
+                for constraint_name, constraint_definition in db_utils.get_foreign_key_definitions(cursor, "magic.cards"):
+                    cursor.execute(f"ALTER TABLE {reload_table_name} ADD CONSTRAINT {constraint_name} {constraint_definition}")
+                cursor.execute(f"ANALYZE {reload_table_name}")
+
+                before_swap = time.monotonic()
+                cursor.execute(f"set local lock_timeout = '{RELOAD_SWAP_LOCK_TIMEOUT}'")
+                cursor.execute("LOCK TABLE magic.cards IN ACCESS EXCLUSIVE MODE")
+                cursor.execute(
+                    f"""
+                    SELECT
+                        COUNT(1) AS num_deleted
+                    FROM
+                        magic.cards AS live
+                    WHERE
+                        NOT EXISTS (SELECT 1 FROM {reload_table_name} AS card WHERE card.scryfall_id = live.scryfall_id)
+                """,
+                )
+                cards_deleted = cursor.fetchone()["num_deleted"]
+                # pick up tags and prefer scores written to magic.cards while the new table was loading
+                carried_columns = sorted(COLUMNS_NOT_FROM_IMPORT)
+                cursor.execute(
+                    f"""
+                    UPDATE {reload_table_name} AS card SET
+                        {", ".join(f"{column_name} = live.{column_name}" for column_name in carried_columns)}
+                    FROM
+                        magic.cards AS live
+                    WHERE
+                        live.scryfall_id = card.scryfall_id
+                        AND ({" OR ".join(f"live.{column_name} IS DISTINCT FROM card.{column_name}" for column_name in carried_columns)})
+                """,
+                )
+                cursor.execute("DROP TABLE magic.cards")
+                cursor.execute(f"ALTER TABLE {reload_table_name} RENAME TO cards")
+                for reload_index_name, index_name in index_renames:
+                    cursor.execute(f"ALTER INDEX magic.{reload_index_name} RENAME TO {index_name}")
+                cursor.execute(
+                    """
+                    DELETE FROM magic.card_blobs AS blob
+                    WHERE NOT EXISTS (SELECT 1 FROM magic.cards AS card WHERE card.scryfall_id = blob.scryfall_id)
+                """,
+                )
+                cursor.execute(self.read_sql("backfill_oracle_cards"))
+                conn.commit()
+                after_swap = time.monotonic()
+
+                logger.info(
+                    "Reloaded %d cards: loaded in %.2f seconds, indexed in %.2f seconds, swapped in %.2f seconds",
+                    cards_sent,
+                    before_index - before_load,
+                    before_swap - before_index,
+                    after_swap - before_swap,
+                )
+                self._clear_caches()
+
+                return {
+                    "status": "success",
+                    "cards_loaded": cards_sent,
+                    "cards_sent": cards_sent,
+                    "cards_deleted": cards_deleted,
+                    "load_seconds": before_index - before_load,
+                    "index_seconds": before_swap - before_index,
+                    "swap_seconds": after_swap - before_swap,
+                    "sample_cards": sample_cards,
+                    "message": f"Successfully reloaded {cards_sent} cards",
+                }
+
+        except (psycopg.Error, ValueError, KeyError) as e:
+            # the reload table, its indexes and the swap all roll back with the transaction
+            logger.error("Error reloading cards into %s: %s", reload_table_name, e)
+            return {
+                "status": "database_error",
+                "cards_loaded": 0,
+                "sample_cards": [],
+                "message": f"Error reloading cards: {e}",
+            }
+
     def random_search(self, *, num_cards: int = 1, **_: object) -> list[dict[str, Any]]:
         """Return one or more random cards.
 
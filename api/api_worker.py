@@ -19,6 +19,8 @@ if TYPE_CHECKING:
     from multiprocessing.synchronize import Event as EventType
     from multiprocessing.synchronize import RLock as LockType
 
+    from api.utils.rate_limiter import TokenBucket
+
 # Set up a logger for this module
 logger = logging.getLogger(__name__)
 
@@ -57,6 +59,12 @@ class ApiWorker(multiprocessing.Process):
         import_guard: LockType = multiprocessing_utils.DEFAULT_LOCK,
         last_import_time: Synchronized | None = None,
         schema_setup_event: EventType = multiprocessing_utils.DEFAULT_EVENT,
+        data_generation: Synchronized | None = None,
+        import_status: multiprocessing_utils.ImportStatus | None = None,
+        import_requested: EventType | None = None,
+        job_requested: EventType | None = None,
+        scryfall_rate_limiter: TokenBucket | None = None,
+        tagger_rate_limiter: TokenBucket | None = None,
     ) -> None:
         """Initialize the API worker process.
 
@@ -67,6 +75,14 @@ class ApiWorker(multiprocessing.Process):
             import_guard (multiprocessing.RLock): An optional lock to synchronize imports.
             last_import_time (Synchronized | None): Shared value for last bulk import timestamp (Unix time).
             schema_setup_event (multiprocessing.Event): Event denoting schema setup has been completed.
+            data_generation (Synchronized | None): Shared counter the importer bumps after loading new data.
+            import_status (ImportStatus | None): Shared progress of the background importer.
+            import_requested (multiprocessing.Event | None): Event asking the background importer for an
+                import; when given, the worker never imports itself.
+            job_requested (multiprocessing.Event | None): Event waking the job executor; when given, the
+                worker queues the long admin operations as jobs rather than running them.
+            scryfall_rate_limiter (TokenBucket | None): Limiter shared by every process's Scryfall requests.
+            tagger_rate_limiter (TokenBucket | None): Limiter shared by every process's tagger requests.
             debug (bool): Whether to run in debug mode.
         """
         super().__init__()
@@ -77,13 +93,26 @@ class ApiWorker(multiprocessing.Process):
         self.last_import_time = last_import_time
         self.debug = debug
         self.schema_setup_event = schema_setup_event
+        self.data_generation = data_generation
+        self.import_status = import_status
+        self.import_requested = import_requested
+        self.job_requested = job_requested
+        self.scryfall_rate_limiter = scryfall_rate_limiter
+        self.tagger_rate_limiter = tagger_rate_limiter
 
     @classmethod
-    def get_api(
+    def get_api(  # noqa: PLR0913
         cls: type[ApiWorker],
         import_guard: LockType,
         last_import_time: Synchronized | None,
         schema_setup_event: EventType,
+        *,
+        data_generation: Synchronized | None = None,
+        import_status: multiprocessing_utils.ImportStatus | None = None,
+        import_requested: EventType | None = None,
+        job_requested: EventType | None = None,
+        scryfall_rate_limiter: TokenBucket | None = None,
+        tagger_rate_limiter: TokenBucket | None = None,
     ) -> falcon.App:
         """Create and configure the Falcon API application.
 
@@ -97,7 +126,7 @@ class ApiWorker(multiprocessing.Process):
         api = falcon.App(
             middleware=[
                 TimingMiddleware(),
-                CachingMiddleware(),  # important that this is first
+                CachingMiddleware(data_generation=data_generation),  # important that this is first
                 CompressionMiddleware(),
             ],
         )
@@ -106,6 +135,12 @@ class ApiWorker(multiprocessing.Process):
             import_guard=import_guard,
             last_import_time=last_import_time,
             schema_setup_event=schema_setup_event,
+            data_generation=data_generation,
+            import_status=import_status,
+            import_requested=import_requested,
+            job_requested=job_requested,
+            scryfall_rate_limiter=scryfall_rate_limiter,
+            tagger_rate_limiter=tagger_rate_limiter,
         )  # Create the main API resource
         api.add_sink(sink._handle, prefix="/")  # Route all requests to the sink handler
 
@@ -137,6 +172,12 @@ class ApiWorker(multiprocessing.Process):
                 import_guard=self.import_guard,
                 last_import_time=self.last_import_time,
                 schema_setup_event=self.schema_setup_event,
+                data_generation=self.data_generation,
+                import_status=self.import_status,
+                import_requested=self.import_requested,
+                job_requested=self.job_requested,
+                scryfall_rate_limiter=self.scryfall_rate_limiter,
+                tagger_rate_limiter=self.tagger_rate_limiter,
             )  # Get the Falcon app
             bjoern.run(
                 wsgi_app=app,
@@ -2,15 +2,30 @@
 
 from __future__ import annotations
 
-import copy
+import collections
 import functools
+import hashlib
+import itertools
+import math
+import multiprocessing
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor
 from typing import TYPE_CHECKING, Any
 
-from api.parsing.card_query_nodes import calculate_devotion, mana_cost_str_to_dict
+import orjson
+
+from api.parsing.card_query_nodes import calculate_devotion, devotion_counts, mana_cost_pip_counts, mana_cost_str_to_dict
 
 if TYPE_CHECKING:
-    from collections.abc import Callable
+    from collections.abc import Callable, Iterable, Iterator
+    from concurrent.futures import Future
+
+# cards per task handed to a preprocessing worker: large enough to amortize pickling, small
+# enough that a few chunks in flight per worker stay well within the import's memory budget
+PREPROCESS_CHUNK_SIZE = 2000
+# chunks submitted ahead per worker, so workers never wait on the merge
+PREPROCESS_CHUNKS_IN_FLIGHT_PER_WORKER = 2
 
 
 def extract_image_location_uuid(card: dict[str, Any]) -> str:
@@ -55,6 +70,16 @@ def maybe_int(val: str | int | float | None) -> int | None:
     return int(float(val))
 
 
+def card_prices(card: dict[str, Any]) -> dict[str, float | None]:
+    """Get the price columns of a scryfall card, as floats (None where scryfall has no price)."""
+    prices = card.get("prices") or {}
+    return {
+        "price_usd": maybe_float(prices.get("usd")),
+        "price_eur": maybe_float(prices.get("eur")),
+        "price_tix": maybe_float(prices.get("tix")),
+    }
+
+
 def rarity_text_to_int(rarity_text: str) -> int:
     """Convert rarity text to int."""
     rarity_map = {
@@ -86,91 +111,105 @@ def extract_collector_number_int(collector_number: str | int | float | None) ->
     return None  # Field will be null by default
 
 
-def preprocess_card(card: dict[str, Any]) -> list[dict[str, Any]]:  # noqa: PLR0915,C901,PLR0912
-    """Preprocess a card to remove invalid cards and add necessary fields.
+# magic.cards columns copied from the scryfall card (or card face) as is, when present
+_PASSTHROUGH_COLUMNS = ("set_name", "oracle_id", "type_line", "released_at", "oracle_text", "flavor_text")
+# card-level keys a card face doesn't inherit
+_NOT_INHERITED_BY_FACES = frozenset(
+    ["card_faces", "creature_power", "creature_toughness", "creature_power_text", "creature_toughness_text"],
+)
 
-    For Double-Faced Cards (DFCs), returns multiple dictionaries (one per face).
-    For single-faced cards, returns a list with one dictionary.
-    Returns an empty list for invalid/filtered cards.
-    """
-    if set(card["legalities"].values()) == {"not_legal"}:
-        pass
+
+def _is_unplayable(card: dict[str, Any]) -> bool:
+    """Return True for cards (or card faces) that are never imported."""
     if "playtest" in card.get("promo_types", []):
-        return []
+        return True
     if "paper" not in card.get("games", []):
-        return []
+        return True
     if card.get("set_type") == "funny":
-        return []
-
-    # Filter out unplayable cards: Cards and Tokens
+        return True
+    # Cards and Tokens
     type_line = card.get("type_line")
     if type_line:
-        card_types, card_subtypes = parse_type_line(type_line)
-        if "Card" in card_types or "Token" in card_types:
-            return []
+        card_types, _ = parse_type_line(type_line)
+        return "Card" in card_types or "Token" in card_types
+    return False
+
+
+def preprocess_card(card: dict[str, Any]) -> list[dict[str, Any]]:
+    """Preprocess a card to remove invalid cards and build its database rows.
+
+    For Double-Faced Cards (DFCs), returns multiple rows (one per face).
+    For single-faced cards, returns a list with one row.
+    Returns an empty list for invalid/filtered cards.
 
+    Each row holds only the magic.cards columns plus face_idx and face_name, and the
+    scryfall data it was built from as raw_card_blob. That blob is the card itself (with
+    card_name, face_name and face_idx added) rather than a copy, so the card must not be
+    modified afterwards.
+    """
     if "raw_card_blob" in card:
         # Already processed, don't need to re-process
         return [card]
+    if _is_unplayable(card):
+        return []
 
-    # Lift the card name before processing faces, because it shouldn't be clobbered by card_faces
-    if "card_name" not in card:
-        # Non-recursive case: first time seeing this card
-        card["card_name"] = card.get("name")
-    else:
-        # Recursive case: processing a face
-        card["face_name"] = card.get("name")
-
-    # Handle cards with card_faces (DFCs)
     card_faces = card.get("card_faces")
-    if card_faces:
-        for creature_attribute in ["creature_power", "creature_toughness"]:
-            card.pop(creature_attribute, None)
-            card.pop(f"{creature_attribute}_text", None)
-        processed_faces = []
-        for face_idx, face_data in enumerate(card_faces, start=1):
-            # Merge card-level data with face-specific data
-            # Precedence: face_idx override > face_data (name, type_line, etc.) > card (legalities, games, etc.)
-            merged = copy.deepcopy(card) | face_data | {"face_idx": face_idx}
-            merged.pop("card_faces", None)  # Don't keep recursing
-            processed_faces_for_face = preprocess_card(merged)
-            processed_faces.extend(processed_faces_for_face)
-        return processed_faces
-
-    # Single face case - set defaults
-    card.setdefault("face_name", card.get("name"))
-    card.setdefault("face_idx", 1)
-
-    # Store the original card data before modifications for raw_card_blob
-    raw_card_data = copy.deepcopy(card)
-    card["raw_card_blob"] = raw_card_data
-    card["scryfall_id"] = card["id"]
-
+    if not card_faces:
+        if "card_name" in card:
+            card["face_name"] = card.get("name")
+        else:
+            card["card_name"] = card.get("name")
+        card.setdefault("face_name", card.get("name"))
+        card.setdefault("face_idx", 1)
+        return [_card_face_row(card)]
+
+    # Merge card-level data with face-specific data
+    # Precedence: face_idx override > face_data (name, type_line, etc.) > card (legalities, games, etc.)
+    # The card name is lifted before merging, because it shouldn't be clobbered by the face name
+    card_fields = {key: value for key, value in card.items() if key not in _NOT_INHERITED_BY_FACES}
+    card_fields.setdefault("card_name", card.get("name"))
+    rows = []
+    for face_idx, face_data in enumerate(card_faces, start=1):
+        face = card_fields | face_data | {"face_idx": face_idx}
+        face.pop("card_faces", None)
+        if _is_unplayable(face):
+            continue
+        face["face_name"] = face.get("name")
+        rows.append(_card_face_row(face))
+    return rows
+
+
+def _card_face_row(card: dict[str, Any]) -> dict[str, Any]:  # noqa: PLR0915
+    """Build the database row for a single card face, keeping the face itself as raw_card_blob."""
     card_types, card_subtypes = parse_type_line(card["type_line"])
-    card["card_types"] = card_types
-    card["card_subtypes"] = card_subtypes
+    row = {
+        "raw_card_blob": card,
+        "scryfall_id": card["id"],
+        "face_idx": card["face_idx"],
+        "face_name": card["face_name"],
+        "card_name": card["card_name"],
+        "card_types": card_types,
+        "card_subtypes": card_subtypes,
+        "planeswalker_loyalty": maybe_int(card.get("loyalty")),
+    }
 
-    card["planeswalker_loyalty"] = maybe_int(card.get("loyalty"))
     if "Creature" in card_types or {"Vehicle", "Spacecraft"} & set(card_subtypes):
-        card["creature_power"] = maybe_int(card.get("power"))
-        card["creature_toughness"] = maybe_int(card.get("toughness"))
-        card["creature_power_text"] = card.get("power")
-        card["creature_toughness_text"] = card.get("toughness")
+        row["creature_power"] = maybe_int(card.get("power"))
+        row["creature_toughness"] = maybe_int(card.get("toughness"))
+        row["creature_power_text"] = card.get("power")
+        row["creature_toughness_text"] = card.get("toughness")
     else:
-        # Non-creature face with power/toughness - clean up these fields instead of rejecting
-        # The pop calls set these to None implicitly, and we explicitly reset creature_power/toughness
-        card.pop("creature_power_text", None)
-        card.pop("creature_toughness_text", None)
-        card["creature_power"] = None
-        card["creature_toughness"] = None
+        # Non-creature face with power/toughness - leave these fields out instead of rejecting
+        row["creature_power"] = None
+        row["creature_toughness"] = None
 
     # objects of keys to true
-    card["card_colors"] = dict.fromkeys(card["colors"], True)
-    card["card_color_identity"] = dict.fromkeys(card["color_identity"], True)
-    card["card_keywords"] = dict.fromkeys(card.get("keywords", []), True)
-    card["produced_mana"] = dict.fromkeys(card.get("produced_mana", []), True)
+    row["card_colors"] = dict.fromkeys(card["colors"], True)
+    row["card_color_identity"] = dict.fromkeys(card["color_identity"], True)
+    row["card_keywords"] = dict.fromkeys(card.get("keywords", []), True)
+    row["produced_mana"] = dict.fromkeys(card.get("produced_mana", []), True)
 
-    card["edhrec_rank"] = card.get("edhrec_rank")
+    row["edhrec_rank"] = card.get("edhrec_rank")
 
     # Extract frame data - combine frame version and frame effects into single JSONB object
     frame_data = {}
@@ -179,60 +218,130 @@ def preprocess_card(card: dict[str, Any]) -> list[dict[str, Any]]:  # noqa: PLR0
     if frame_version:
         frame_data[frame_version.title()] = True
     # Add frame effects if present (titlecased for consistency)
-    frame_effects = card.get("frame_effects", [])
-    for effect in frame_effects:
+    for effect in card.get("frame_effects", []):
         frame_data[effect.title()] = True
-    card["card_frame_data"] = frame_data
+    row["card_frame_data"] = frame_data
 
-    # Extract pricing data if available - ensure they are floats for jsonb_populate_record
-    prices = card.get("prices", {})
-    card["price_usd"] = maybe_float(prices.get("usd"))
-    card["price_eur"] = maybe_float(prices.get("eur"))
-    card["price_tix"] = maybe_float(prices.get("tix"))
+    row.update(card_prices(card))
+
+    # Lift the fields the prefer score reads into typed columns, the raw blob lives in magic.card_blobs
+    row["card_lang"] = card.get("lang")
+    row["card_image_status"] = card.get("image_status")
+    row["card_finishes"] = dict.fromkeys(card.get("finishes", []), True)
+    row["card_games"] = dict.fromkeys(card.get("games", []), True)
 
     # Extract set code for dedicated column
-    card["card_set_code"] = card.get("set")
+    row["card_set_code"] = card.get("set")
 
     # Extract layout and border for dedicated columns (lowercased for case-insensitive search)
     if "layout" in card:
-        card["card_layout"] = card["layout"].lower()
+        row["card_layout"] = card["layout"].lower()
     if "border_color" in card:
-        card["card_border"] = card["border_color"].lower()
+        row["card_border"] = card["border_color"].lower()
     if "watermark" in card:
-        card["card_watermark"] = card["watermark"].lower()
+        row["card_watermark"] = card["watermark"].lower()
 
     mana_cost_text = card.get("mana_cost", "")
-    card["mana_cost_jsonb"] = mana_cost_str_to_dict(mana_cost_text)
-    card["devotion"] = calculate_devotion(mana_cost_text)
+    row["mana_cost_jsonb"] = mana_cost_str_to_dict(mana_cost_text)
+    row["devotion"] = calculate_devotion(mana_cost_text)
+    row.update(mana_cost_pip_counts(mana_cost_text))
+    row.update(devotion_counts(mana_cost_text))
 
     # Map field names to match database column names for jsonb_populate_record
-    # Don't overwrite card_name if already set (for DFCs, it's set before processing faces)
-    if "card_name" not in card:
-        card["card_name"] = card.get("name")
-    card["mana_cost_text"] = card.get("mana_cost")
-    card["planeswalker_loyalty_text"] = card.get("loyalty")
-    card["card_artist"] = card.get("artist")
+    row["mana_cost_text"] = card.get("mana_cost")
+    row["planeswalker_loyalty_text"] = card.get("loyalty")
+    row["card_artist"] = card.get("artist")
 
     # Handle CMC and edhrec_rank conversion using helper function
-    card["cmc"] = maybe_int(card.get("cmc"))
+    row["cmc"] = maybe_int(card.get("cmc"))
 
     # Handle rarity conversion - implement in Python to avoid SQL boilerplate
     rarity_text = card.get("rarity", "").lower()
     if rarity_text:
-        card["card_rarity_text"] = rarity_text
-        card["card_rarity_int"] = rarity_text_to_int(rarity_text)
+        row["card_rarity_text"] = rarity_text
+        row["card_rarity_int"] = rarity_text_to_int(rarity_text)
 
     # Handle collector number - implement extraction in Python to avoid SQL boilerplate
     collector_number = card.get("collector_number")
-    card["collector_number"] = collector_number
-    card["collector_number_int"] = extract_collector_number_int(collector_number)
-    card["illustration_id"] = card.get("illustration_id")
+    row["collector_number"] = collector_number
+    row["collector_number_int"] = extract_collector_number_int(collector_number)
+    row["illustration_id"] = card.get("illustration_id")
+
+    row["card_legalities"] = card.get("card_legalities", card.get("legalities", {}))
+    # NOT NULL DEFAULT columns, set to avoid constraint violations
+    row["card_oracle_tags"] = card.get("card_oracle_tags", {})
+    row["card_is_tags"] = card.get("card_is_tags", {})
 
-    # Handle legalities and produced_mana defaults
-    card.setdefault("card_legalities", card.get("legalities", {}))
+    for column in _PASSTHROUGH_COLUMNS:
+        if column in card:
+            row[column] = card[column]
 
-    # Ensure all NOT NULL DEFAULT fields are set to avoid constraint violations
-    for key in ["produced_mana", "card_oracle_tags", "card_is_tags"]:
-        card.setdefault(key, {})
+    row["content_hash"] = card_content_hash(row)
+    return row
 
-    return [card]
+
+def card_content_hash(row: dict[str, Any]) -> str:
+    """Digest everything a card row would write, including its raw blob, to detect changed printings on re-import."""
+    contents = {key: value for key, value in row.items() if key != "content_hash"}
+    return hashlib.blake2b(orjson.dumps(contents, option=orjson.OPT_SORT_KEYS), digest_size=16).hexdigest()
+
+
+def preprocess_cards(cards: Iterable[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Preprocess a chunk of cards, returning every resulting face in input order."""
+    return [processed_card for card in cards for processed_card in preprocess_card(card)]
+
+
+def free_cpu_count() -> int:
+    """Return the number of CPUs this process may use that aren't already busy, at least 1.
+
+    Busy CPUs are estimated from the one minute load average, which includes the API workers
+    currently serving requests.
+    """
+    usable_cpus = os.process_cpu_count() or 1
+    try:
+        busy_cpus = math.ceil(os.getloadavg()[0])
+    except OSError:
+        busy_cpus = 0
+    return max(1, usable_cpus - busy_cpus)
+
+
+def iter_preprocessed_cards(
+    cards: Iterable[dict[str, Any]],
+    *,
+    max_workers: int | None = None,
+    chunk_size: int = PREPROCESS_CHUNK_SIZE,
+) -> Iterator[dict[str, Any]]:
+    """Preprocess cards across a process pool, yielding the faces in input order.
+
+    cards is consumed in chunks of chunk_size, and only a few chunks per worker are in flight
+    at a time, so a streamed bulk export stays streamed. Input that fits in a single chunk is
+    processed in this process, as is everything when only one worker is available.
+
+    Args:
+        cards: Raw Scryfall card objects.
+        max_workers: Number of worker processes, defaults to free_cpu_count().
+        chunk_size: Number of cards per task.
+
+    Yields:
+        The preprocessed faces, exactly as preprocess_card returns them for each card in turn.
+    """
+    chunks = itertools.batched(cards, chunk_size)
+    first_chunk = next(chunks, ())
+    if max_workers is None:
+        max_workers = free_cpu_count()
+    if max_workers <= 1 or len(first_chunk) < chunk_size:
+        yield from preprocess_cards(first_chunk)
+        for chunk in chunks:
+            yield from preprocess_cards(chunk)
+        return
+
+    # spawn, not fork: a forked child would inherit the API worker's listening socket and
+    # database connection pool, threads included
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+        pending: collections.deque[Future[list[dict[str, Any]]]] = collections.deque()
+        for chunk in itertools.chain([first_chunk], chunks):
+            pending.append(executor.submit(preprocess_cards, chunk))
+            if len(pending) >= max_workers * PREPROCESS_CHUNKS_IN_FLIGHT_PER_WORKER:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
@@ -0,0 +1,48 @@
+-- Migration: Move raw_card_blob out of magic.cards into a cold side table
+-- magic.cards keeps only the searchable and display columns; the full scryfall payload
+-- lives in magic.card_blobs keyed by scryfall_id and is only read for exports and tooling.
+-- The scryfall fields the prefer score needs are lifted into typed columns so the backfill
+-- never has to detoast the payload.
+
+CREATE TABLE IF NOT EXISTS magic.card_blobs (
+    scryfall_id uuid NOT NULL,
+    raw_card_blob jsonb NOT NULL,
+    PRIMARY KEY (scryfall_id),
+    CONSTRAINT raw_card_is_object CHECK ((jsonb_typeof(raw_card_blob) = 'object'::text))
+);
+
+COMMENT ON TABLE magic.card_blobs IS 'Raw scryfall card payloads, one per scryfall_id in magic.cards. Not used by search.';
+
+-- typed columns for the fields the prefer score reads (nullable so exports from before this migration still import)
+ALTER TABLE magic.cards ADD COLUMN IF NOT EXISTS card_lang text;
+ALTER TABLE magic.cards ADD COLUMN IF NOT EXISTS card_image_status text;
+ALTER TABLE magic.cards ADD COLUMN IF NOT EXISTS card_finishes jsonb DEFAULT '{}'::jsonb;
+ALTER TABLE magic.cards ADD COLUMN IF NOT EXISTS card_games jsonb DEFAULT '{}'::jsonb;
+
+ALTER TABLE magic.cards ADD CONSTRAINT card_finishes_must_be_object CHECK ((jsonb_typeof(card_finishes) = 'object'::text));
+ALTER TABLE magic.cards ADD CONSTRAINT card_games_must_be_object CHECK ((jsonb_typeof(card_games) = 'object'::text));
+
+COMMENT ON COLUMN magic.cards.card_lang IS 'Scryfall language code of the printing (e.g. "en", "ja")';
+COMMENT ON COLUMN magic.cards.card_image_status IS 'Scryfall image status (e.g. "highres_scan", "lowres", "placeholder")';
+COMMENT ON COLUMN magic.cards.card_finishes IS 'Available finishes stored as object with finishes as keys (e.g. {"foil": true, "nonfoil": true})';
+COMMENT ON COLUMN magic.cards.card_games IS 'Games the printing is available in stored as object with games as keys (e.g. {"paper": true, "mtgo": true})';
+
+-- carry over existing rows
+UPDATE magic.cards SET
+    card_lang = raw_card_blob ->> 'lang',
+    card_image_status = raw_card_blob ->> 'image_status',
+    card_finishes = COALESCE(
+        (SELECT JSONB_OBJECT_AGG(finish, TRUE) FROM JSONB_ARRAY_ELEMENTS_TEXT(raw_card_blob -> 'finishes') AS finish),
+        '{}'::jsonb
+    ),
+    card_games = COALESCE(
+        (SELECT JSONB_OBJECT_AGG(game, TRUE) FROM JSONB_ARRAY_ELEMENTS_TEXT(raw_card_blob -> 'games') AS game),
+        '{}'::jsonb
+    );
+
+INSERT INTO magic.card_blobs (scryfall_id, raw_card_blob)
+SELECT scryfall_id, raw_card_blob FROM magic.cards
+ON CONFLICT (scryfall_id) DO NOTHING;
+
+-- the dropped column's storage is reclaimed by the next full reload (or VACUUM FULL magic.cards)
+ALTER TABLE magic.cards DROP COLUMN raw_card_blob;
@@ -0,0 +1,81 @@
+-- Migration: Add an oracle-level card table
+-- One row per oracle_id holding the fields that are identical across printings (text, types,
+-- colors, keywords, mana cost, stats, legalities). magic.cards stays the printing-level table.
+-- Search predicates that only touch oracle-level columns are evaluated here once per oracle
+-- card and joined back to printings through magic.cards.oracle_id.
+
+CREATE TABLE IF NOT EXISTS magic.oracle_cards (
+    oracle_id uuid NOT NULL,
+
+    -- integer columns
+    cmc integer,
+    creature_power integer,
+    creature_toughness integer,
+    planeswalker_loyalty integer,
+    edhrec_rank integer,
+
+    -- columns
+    card_name text NOT NULL,
+    oracle_text text,
+    type_line text,
+    mana_cost_text text,
+    mana_cost_jsonb jsonb,
+    devotion jsonb,
+    card_types jsonb NOT NULL,
+    card_subtypes jsonb DEFAULT '[]'::jsonb NOT NULL,
+    card_colors jsonb NOT NULL,
+    card_color_identity jsonb NOT NULL,
+    card_keywords jsonb NOT NULL,
+    produced_mana jsonb DEFAULT '{}'::jsonb NOT NULL,
+    card_legalities jsonb DEFAULT '{}'::jsonb NOT NULL,
+    creature_power_text text,
+    creature_toughness_text text,
+    planeswalker_loyalty_text text,
+
+    PRIMARY KEY (oracle_id),
+    CONSTRAINT card_types_must_be_array CHECK ((jsonb_typeof(card_types) = 'array'::text)),
+    CONSTRAINT card_subtypes_must_be_array CHECK ((jsonb_typeof(card_subtypes) = 'array'::text)),
+    CONSTRAINT card_colors_must_be_object CHECK ((jsonb_typeof(card_colors) = 'object'::text)),
+    CONSTRAINT card_color_identity_must_be_object CHECK ((jsonb_typeof(card_color_identity) = 'object'::text)),
+    CONSTRAINT card_keywords_must_be_object CHECK ((jsonb_typeof(card_keywords) = 'object'::text)),
+    CONSTRAINT produced_mana_must_be_object CHECK ((jsonb_typeof(produced_mana) = 'object'::text)),
+    CONSTRAINT card_legalities_must_be_object CHECK ((jsonb_typeof(card_legalities) = 'object'::text))
+);
+
+COMMENT ON TABLE magic.oracle_cards IS 'One row per oracle_id with the printing-independent card fields. Fed from the oracle_cards bulk export and topped up from magic.cards.';
+
+CREATE INDEX IF NOT EXISTS idx_oracle_cards_cardname_trgm ON magic.oracle_cards USING gin (card_name magic.gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_oracle_cards_oracle_text_trgm ON magic.oracle_cards USING gin (oracle_text magic.gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_oracle_cards_name ON magic.oracle_cards USING btree (card_name);
+CREATE INDEX IF NOT EXISTS idx_oracle_cards_cardtypes_gin ON magic.oracle_cards USING gin (card_types);
+CREATE INDEX IF NOT EXISTS idx_oracle_cards_cardsubtypes_gin ON magic.oracle_cards USING gin (card_subtypes);
+CREATE INDEX IF NOT EXISTS idx_oracle_cards_colors_gin ON magic.oracle_cards USING gin (card_colors);
+CREATE INDEX IF NOT EXISTS idx_oracle_cards_color_identity_gin ON magic.oracle_cards USING gin (card_color_identity);
+CREATE INDEX IF NOT EXISTS idx_oracle_cards_keywords_gin ON magic.oracle_cards USING gin (card_keywords);
+CREATE INDEX IF NOT EXISTS idx_oracle_cards_produced_mana ON magic.oracle_cards USING gin (produced_mana);
+CREATE INDEX IF NOT EXISTS idx_oracle_cards_devotion ON magic.oracle_cards USING gin (devotion);
+CREATE INDEX IF NOT EXISTS idx_oracle_cards_legalities ON magic.oracle_cards USING gin (card_legalities);
+CREATE INDEX IF NOT EXISTS idx_oracle_cards_cmc_btree ON magic.oracle_cards USING btree (cmc);
+CREATE INDEX IF NOT EXISTS idx_oracle_cards_creature_power_btree ON magic.oracle_cards USING btree (creature_power) WHERE (creature_power IS NOT NULL);
+CREATE INDEX IF NOT EXISTS idx_oracle_cards_creature_toughness_btree ON magic.oracle_cards USING btree (creature_toughness) WHERE (creature_toughness IS NOT NULL);
+CREATE INDEX IF NOT EXISTS idx_oracle_cards_edhrec_rank_btree ON magic.oracle_cards USING btree (edhrec_rank);
+
+-- printings are joined back to oracle cards through oracle_id
+CREATE INDEX IF NOT EXISTS idx_cards_oracle_id ON magic.cards USING btree (oracle_id) WHERE (oracle_id IS NOT NULL);
+
+-- seed from the printings already loaded
+INSERT INTO magic.oracle_cards (
+    oracle_id, cmc, creature_power, creature_toughness, planeswalker_loyalty, edhrec_rank,
+    card_name, oracle_text, type_line, mana_cost_text, mana_cost_jsonb, devotion,
+    card_types, card_subtypes, card_colors, card_color_identity, card_keywords, produced_mana, card_legalities,
+    creature_power_text, creature_toughness_text, planeswalker_loyalty_text
+)
+SELECT DISTINCT ON (oracle_id)
+    oracle_id, cmc, creature_power, creature_toughness, planeswalker_loyalty, edhrec_rank,
+    card_name, oracle_text, type_line, mana_cost_text, mana_cost_jsonb, devotion,
+    card_types, card_subtypes, card_colors, card_color_identity, card_keywords, produced_mana, card_legalities,
+    creature_power_text, creature_toughness_text, planeswalker_loyalty_text
+FROM magic.cards
+WHERE oracle_id IS NOT NULL
+ORDER BY oracle_id, prefer_score DESC NULLS LAST
+ON CONFLICT (oracle_id) DO NOTHING;
@@ -0,0 +1,116 @@
+-- Migration: Add integer mana pip and devotion count columns
+-- Mana cost and devotion comparisons on plain colored pips compile to integer comparisons
+-- over these columns instead of jsonb containment on mana_cost_jsonb / devotion.
+-- The jsonb columns stay: hybrid, phyrexian and other symbols are still matched exactly there.
+-- The columns live on both magic.cards and magic.oracle_cards, since mana predicates are routed
+-- to the oracle table when they can be.
+
+ALTER TABLE magic.cards
+    ADD COLUMN IF NOT EXISTS mana_pips_w integer DEFAULT 0 NOT NULL,
+    ADD COLUMN IF NOT EXISTS mana_pips_u integer DEFAULT 0 NOT NULL,
+    ADD COLUMN IF NOT EXISTS mana_pips_b integer DEFAULT 0 NOT NULL,
+    ADD COLUMN IF NOT EXISTS mana_pips_r integer DEFAULT 0 NOT NULL,
+    ADD COLUMN IF NOT EXISTS mana_pips_g integer DEFAULT 0 NOT NULL,
+    ADD COLUMN IF NOT EXISTS mana_pips_c integer DEFAULT 0 NOT NULL,
+    ADD COLUMN IF NOT EXISTS mana_generic integer DEFAULT 0 NOT NULL,
+    ADD COLUMN IF NOT EXISTS mana_hybrid integer DEFAULT 0 NOT NULL,
+    ADD COLUMN IF NOT EXISTS mana_phyrexian integer DEFAULT 0 NOT NULL,
+    ADD COLUMN IF NOT EXISTS mana_other_symbols integer DEFAULT 0 NOT NULL,
+    ADD COLUMN IF NOT EXISTS devotion_w integer DEFAULT 0 NOT NULL,
+    ADD COLUMN IF NOT EXISTS devotion_u integer DEFAULT 0 NOT NULL,
+    ADD COLUMN IF NOT EXISTS devotion_b integer DEFAULT 0 NOT NULL,
+    ADD COLUMN IF NOT EXISTS devotion_r integer DEFAULT 0 NOT NULL,
+    ADD COLUMN IF NOT EXISTS devotion_g integer DEFAULT 0 NOT NULL,
+    ADD COLUMN IF NOT EXISTS devotion_c integer DEFAULT 0 NOT NULL;
+
+ALTER TABLE magic.oracle_cards
+    ADD COLUMN IF NOT EXISTS mana_pips_w integer DEFAULT 0 NOT NULL,
+    ADD COLUMN IF NOT EXISTS mana_pips_u integer DEFAULT 0 NOT NULL,
+    ADD COLUMN IF NOT EXISTS mana_pips_b integer DEFAULT 0 NOT NULL,
+    ADD COLUMN IF NOT EXISTS mana_pips_r integer DEFAULT 0 NOT NULL,
+    ADD COLUMN IF NOT EXISTS mana_pips_g integer DEFAULT 0 NOT NULL,
+    ADD COLUMN IF NOT EXISTS mana_pips_c integer DEFAULT 0 NOT NULL,
+    ADD COLUMN IF NOT EXISTS mana_generic integer DEFAULT 0 NOT NULL,
+    ADD COLUMN IF NOT EXISTS mana_hybrid integer DEFAULT 0 NOT NULL,
+    ADD COLUMN IF NOT EXISTS mana_phyrexian integer DEFAULT 0 NOT NULL,
+    ADD COLUMN IF NOT EXISTS mana_other_symbols integer DEFAULT 0 NOT NULL,
+    ADD COLUMN IF NOT EXISTS devotion_w integer DEFAULT 0 NOT NULL,
+    ADD COLUMN IF NOT EXISTS devotion_u integer DEFAULT 0 NOT NULL,
+    ADD COLUMN IF NOT EXISTS devotion_b integer DEFAULT 0 NOT NULL,
+    ADD COLUMN IF NOT EXISTS devotion_r integer DEFAULT 0 NOT NULL,
+    ADD COLUMN IF NOT EXISTS devotion_g integer DEFAULT 0 NOT NULL,
+    ADD COLUMN IF NOT EXISTS devotion_c integer DEFAULT 0 NOT NULL;
+
+-- backfill from the jsonb columns, matching mana_cost_pip_counts / devotion_counts in api/parsing/card_query_nodes.py:
+-- symbols ending in /P are phyrexian, other symbols with a / are hybrid, anything else that isn't
+-- a colored pip (X, S, ...) is an other symbol, and generic mana is the sum of the numeric symbols
+UPDATE magic.cards AS card SET
+    mana_pips_w = COALESCE(jsonb_array_length(card.mana_cost_jsonb -> 'W'), 0),
+    mana_pips_u = COALESCE(jsonb_array_length(card.mana_cost_jsonb -> 'U'), 0),
+    mana_pips_b = COALESCE(jsonb_array_length(card.mana_cost_jsonb -> 'B'), 0),
+    mana_pips_r = COALESCE(jsonb_array_length(card.mana_cost_jsonb -> 'R'), 0),
+    mana_pips_g = COALESCE(jsonb_array_length(card.mana_cost_jsonb -> 'G'), 0),
+    mana_pips_c = COALESCE(jsonb_array_length(card.mana_cost_jsonb -> 'C'), 0),
+    mana_generic = COALESCE((
+        SELECT sum(generic[1]::integer) FROM regexp_matches(COALESCE(card.mana_cost_text, ''), '\{(\d+)\}', 'g') AS generic
+    ), 0),
+    mana_hybrid = COALESCE((
+        SELECT sum(jsonb_array_length(symbol.value)) FROM jsonb_each(card.mana_cost_jsonb) AS symbol
+        WHERE symbol.key LIKE '%/%' AND symbol.key NOT LIKE '%/P'
+    ), 0),
+    mana_phyrexian = COALESCE((
+        SELECT sum(jsonb_array_length(symbol.value)) FROM jsonb_each(card.mana_cost_jsonb) AS symbol
+        WHERE symbol.key LIKE '%/P'
+    ), 0),
+    mana_other_symbols = COALESCE((
+        SELECT sum(jsonb_array_length(symbol.value)) FROM jsonb_each(card.mana_cost_jsonb) AS symbol
+        WHERE symbol.key NOT LIKE '%/%' AND symbol.key NOT IN ('W', 'U', 'B', 'R', 'G', 'C')
+    ), 0),
+    devotion_w = COALESCE(jsonb_array_length(card.devotion -> 'W'), 0),
+    devotion_u = COALESCE(jsonb_array_length(card.devotion -> 'U'), 0),
+    devotion_b = COALESCE(jsonb_array_length(card.devotion -> 'B'), 0),
+    devotion_r = COALESCE(jsonb_array_length(card.devotion -> 'R'), 0),
+    devotion_g = COALESCE(jsonb_array_length(card.devotion -> 'G'), 0),
+    devotion_c = COALESCE(jsonb_array_length(card.devotion -> 'C'), 0);
+
+UPDATE magic.oracle_cards AS card SET
+    mana_pips_w = COALESCE(jsonb_array_length(card.mana_cost_jsonb -> 'W'), 0),
+    mana_pips_u = COALESCE(jsonb_array_length(card.mana_cost_jsonb -> 'U'), 0),
+    mana_pips_b = COALESCE(jsonb_array_length(card.mana_cost_jsonb -> 'B'), 0),
+    mana_pips_r = COALESCE(jsonb_array_length(card.mana_cost_jsonb -> 'R'), 0),
+    mana_pips_g = COALESCE(jsonb_array_length(card.mana_cost_jsonb -> 'G'), 0),
+    mana_pips_c = COALESCE(jsonb_array_length(card.mana_cost_jsonb -> 'C'), 0),
+    mana_generic = COALESCE((
+        SELECT sum(generic[1]::integer) FROM regexp_matches(COALESCE(card.mana_cost_text, ''), '\{(\d+)\}', 'g') AS generic
+    ), 0),
+    mana_hybrid = COALESCE((
+        SELECT sum(jsonb_array_length(symbol.value)) FROM jsonb_each(card.mana_cost_jsonb) AS symbol
+        WHERE symbol.key LIKE '%/%' AND symbol.key NOT LIKE '%/P'
+    ), 0),
+    mana_phyrexian = COALESCE((
+        SELECT sum(jsonb_array_length(symbol.value)) FROM jsonb_each(card.mana_cost_jsonb) AS symbol
+        WHERE symbol.key LIKE '%/P'
+    ), 0),
+    mana_other_symbols = COALESCE((
+        SELECT sum(jsonb_array_length(symbol.value)) FROM jsonb_each(card.mana_cost_jsonb) AS symbol
+        WHERE symbol.key NOT LIKE '%/%' AND symbol.key NOT IN ('W', 'U', 'B', 'R', 'G', 'C')
+    ), 0),
+    devotion_w = COALESCE(jsonb_array_length(card.devotion -> 'W'), 0),
+    devotion_u = COALESCE(jsonb_array_length(card.devotion -> 'U'), 0),
+    devotion_b = COALESCE(jsonb_array_length(card.devotion -> 'B'), 0),
+    devotion_r = COALESCE(jsonb_array_length(card.devotion -> 'R'), 0),
+    devotion_g = COALESCE(jsonb_array_length(card.devotion -> 'G'), 0),
+    devotion_c = COALESCE(jsonb_array_length(card.devotion -> 'C'), 0);
+
+CREATE INDEX IF NOT EXISTS idx_cards_mana_pips_btree ON magic.cards USING btree (
+    mana_pips_w, mana_pips_u, mana_pips_b, mana_pips_r, mana_pips_g, mana_pips_c, cmc
+);
+CREATE INDEX IF NOT EXISTS idx_cards_devotion_counts_btree ON magic.cards USING btree (
+    devotion_w, devotion_u, devotion_b, devotion_r, devotion_g, devotion_c
+);
+CREATE INDEX IF NOT EXISTS idx_oracle_cards_mana_pips_btree ON magic.oracle_cards USING btree (
+    mana_pips_w, mana_pips_u, mana_pips_b, mana_pips_r, mana_pips_g, mana_pips_c, cmc
+);
+CREATE INDEX IF NOT EXISTS idx_oracle_cards_devotion_counts_btree ON magic.oracle_cards USING btree (
+    devotion_w, devotion_u, devotion_b, devotion_r, devotion_g, devotion_c
+);
@@ -0,0 +1,25 @@
+-- Migration: Expression indexes and usage statistics for arithmetic searches
+-- Searches like power-toughness=0 or power>toughness are rewritten by the query generator to
+-- compare exactly these expressions (see INDEXED_EXPRESSIONS in api/parsing/derived_expressions.py),
+-- so the planner can serve them from an index instead of computing them for every row.
+-- Expression indexes rather than stored generated columns: an index adds nothing to the rows, so
+-- loads COPY the same columns as before, and indexing another expression doesn't rewrite
+-- magic.cards the way adding a stored generated column does.
+
+CREATE INDEX IF NOT EXISTS idx_cards_power_minus_toughness ON magic.cards USING btree ((creature_power - creature_toughness));
+CREATE INDEX IF NOT EXISTS idx_cards_power_plus_toughness ON magic.cards USING btree ((creature_power + creature_toughness));
+CREATE INDEX IF NOT EXISTS idx_oracle_cards_power_minus_toughness ON magic.oracle_cards USING btree ((creature_power - creature_toughness));
+CREATE INDEX IF NOT EXISTS idx_oracle_cards_power_plus_toughness ON magic.oracle_cards USING btree ((creature_power + creature_toughness));
+
+-- How often each arithmetic expression is searched for and how long those searches take,
+-- keyed by the normalized expression (see expression_key in api/parsing/derived_expressions.py)
+CREATE TABLE IF NOT EXISTS magic.arithmetic_expression_stats (
+    expression text NOT NULL,
+    search_count bigint DEFAULT 0 NOT NULL,
+    total_ms double precision DEFAULT 0 NOT NULL,
+    last_searched_at timestamp with time zone DEFAULT now() NOT NULL,
+
+    PRIMARY KEY (expression)
+);
+
+COMMENT ON TABLE magic.arithmetic_expression_stats IS 'Search counts and total query time per arithmetic expression, for choosing expression indexes.';
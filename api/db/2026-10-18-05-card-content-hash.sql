@@ -0,0 +1,9 @@
+-- Migration: Content hash per printing for incremental imports
+-- Each preprocessed card row carries a digest of its contents (see card_content_hash in
+-- api/card_processing.py). A re-import compares it with the stored one to insert only new
+-- printings, update only changed ones and delete printings that are gone from the export.
+-- Existing rows start out NULL, so the first import after this migration refreshes all of them.
+
+ALTER TABLE magic.cards ADD COLUMN IF NOT EXISTS content_hash text;
+
+COMMENT ON COLUMN magic.cards.content_hash IS 'Digest of the preprocessed card row and its raw scryfall payload, compared on import to skip unchanged printings';
@@ -0,0 +1,36 @@
+-- Migration: One real column per prefer score component
+-- prefer_score is the sum of the components in prefer_score_components. Keeping each component in
+-- its own column lets searches rank printings by a custom weighting of the components at query
+-- time (prefer=custom) without rewriting prefer_score. The backfill writes the columns together
+-- with prefer_score_components; existing scores are copied over from the jsonb here.
+
+ALTER TABLE magic.cards
+    ADD COLUMN IF NOT EXISTS prefer_illustration_count real,
+    ADD COLUMN IF NOT EXISTS prefer_rarity real,
+    ADD COLUMN IF NOT EXISTS prefer_border real,
+    ADD COLUMN IF NOT EXISTS prefer_frame real,
+    ADD COLUMN IF NOT EXISTS prefer_extended_art real,
+    ADD COLUMN IF NOT EXISTS prefer_highres_scan real,
+    ADD COLUMN IF NOT EXISTS prefer_has_paper real,
+    ADD COLUMN IF NOT EXISTS prefer_language real,
+    ADD COLUMN IF NOT EXISTS prefer_legendary_frame real,
+    ADD COLUMN IF NOT EXISTS prefer_non_showcase real,
+    ADD COLUMN IF NOT EXISTS prefer_finish real,
+    ADD COLUMN IF NOT EXISTS prefer_artwork_set real;
+
+UPDATE magic.cards
+SET
+    prefer_illustration_count = (prefer_score_components ->> 'illustration_count')::real,
+    prefer_rarity = (prefer_score_components ->> 'rarity')::real,
+    prefer_border = (prefer_score_components ->> 'border')::real,
+    prefer_frame = (prefer_score_components ->> 'frame')::real,
+    prefer_extended_art = (prefer_score_components ->> 'extended_art')::real,
+    prefer_highres_scan = (prefer_score_components ->> 'highres_scan')::real,
+    prefer_has_paper = (prefer_score_components ->> 'has_paper')::real,
+    prefer_language = (prefer_score_components ->> 'language')::real,
+    prefer_legendary_frame = (prefer_score_components ->> 'legendary_frame')::real,
+    prefer_non_showcase = (prefer_score_components ->> 'non_showcase')::real,
+    prefer_finish = (prefer_score_components ->> 'finish')::real,
+    prefer_artwork_set = (prefer_score_components ->> 'artwork_set')::real
+WHERE
+    prefer_score_components IS NOT NULL;
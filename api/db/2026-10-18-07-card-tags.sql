@@ -0,0 +1,28 @@
+-- Migration: Normalized (tag, card_name) links behind card_oracle_tags and card_is_tags
+-- Tag imports used to add each tag to magic.cards with its own UPDATE per batch of 200 names, so a
+-- heavily tagged card's row (and its GIN index entries) was rewritten once per tag. Imports now COPY
+-- the full mapping into magic.card_tags and rebuild each affected card's jsonb once from it.
+-- The links already in magic.cards are carried over here, so rebuilding from the table keeps them.
+
+CREATE TABLE IF NOT EXISTS magic.card_tags (
+    tag_kind text NOT NULL,
+    tag text NOT NULL,
+    card_name text NOT NULL,
+    PRIMARY KEY (tag_kind, tag, card_name),
+    CONSTRAINT card_tags_known_kind CHECK ((tag_kind = ANY (ARRAY['oracle'::text, 'is'::text])))
+);
+
+CREATE INDEX IF NOT EXISTS idx_card_tags_card_name ON magic.card_tags USING btree (tag_kind, card_name);
+
+COMMENT ON TABLE magic.card_tags IS 'Tags by card name, the source card_oracle_tags (tag_kind oracle) and card_is_tags (tag_kind is) are rebuilt from';
+
+-- carry over existing links
+INSERT INTO magic.card_tags (tag_kind, tag, card_name)
+SELECT DISTINCT 'oracle', tag.key, card.card_name
+FROM magic.cards AS card, jsonb_each(card.card_oracle_tags) AS tag
+ON CONFLICT DO NOTHING;
+
+INSERT INTO magic.card_tags (tag_kind, tag, card_name)
+SELECT DISTINCT 'is', tag.key, card.card_name
+FROM magic.cards AS card, jsonb_each(card.card_is_tags) AS tag
+ON CONFLICT DO NOTHING;
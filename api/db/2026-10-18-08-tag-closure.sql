@@ -0,0 +1,147 @@
+-- Migration: Materialized transitive closure of the tag hierarchy
+-- get_tag_ancestors, get_tag_descendants and the check_circular_reference trigger each walked
+-- magic.tag_relationships with a recursive CTE, the trigger once per inserted relationship, so
+-- populating the hierarchy slowed down as it grew. magic.tag_closure holds every (ancestor,
+-- descendant) pair with the length of the shortest path between them. Inserting a relationship
+-- adds its new pairs incrementally, the cycle check is a single lookup in it, and descendant-aware
+-- oracle tag searches (otagtree:) resolve a tag's descendants from it.
+
+CREATE TABLE IF NOT EXISTS magic.tag_closure (
+    ancestor text NOT NULL,
+    descendant text NOT NULL,
+    depth integer NOT NULL,
+    PRIMARY KEY (ancestor, descendant),
+    CONSTRAINT tag_closure_no_self_reference CHECK ((ancestor <> descendant)),
+    CONSTRAINT tag_closure_positive_depth CHECK ((depth > 0))
+);
+
+CREATE INDEX IF NOT EXISTS idx_tag_closure_descendant ON magic.tag_closure USING btree (descendant, ancestor);
+
+COMMENT ON TABLE magic.tag_closure IS 'Every (ancestor, descendant) pair of magic.tag_relationships, maintained by triggers on it';
+COMMENT ON COLUMN magic.tag_closure.depth IS 'Length of the shortest path from descendant up to ancestor, 1 for a direct parent';
+
+
+CREATE OR REPLACE FUNCTION magic.rebuild_tag_closure() RETURNS void
+    LANGUAGE plpgsql
+    AS $$
+BEGIN
+    DELETE FROM magic.tag_closure;
+    INSERT INTO magic.tag_closure (ancestor, descendant, depth)
+    WITH RECURSIVE paths AS (
+        SELECT tr.parent_tag AS ancestor, tr.child_tag AS descendant, 1 AS depth
+        FROM magic.tag_relationships tr
+        UNION
+        SELECT tr.parent_tag, p.descendant, p.depth + 1
+        FROM magic.tag_relationships tr
+        JOIN paths p ON tr.child_tag = p.ancestor
+        WHERE p.depth < 100 -- prevent infinite recursion
+    )
+    SELECT ancestor, descendant, min(depth)
+    FROM paths
+    GROUP BY ancestor, descendant;
+END;
+$$;
+
+
+CREATE OR REPLACE FUNCTION magic.check_circular_reference() RETURNS trigger
+    LANGUAGE plpgsql
+    AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        -- child -> parent closes a cycle exactly when parent already descends from child
+        IF EXISTS (
+            SELECT 1 FROM magic.tag_closure
+            WHERE ancestor = NEW.child_tag AND descendant = NEW.parent_tag
+        ) THEN
+            RAISE EXCEPTION 'Circular reference detected: % -> %', NEW.child_tag, NEW.parent_tag;
+        END IF;
+    -- the closure still holds the paths through the row being updated, so walk the hierarchy without it
+    ELSIF EXISTS (
+        WITH RECURSIVE hierarchy AS (
+            SELECT NEW.parent_tag as tag, 1 as depth
+            UNION ALL
+            SELECT tr.parent_tag, h.depth + 1
+            FROM magic.tag_relationships tr
+            JOIN hierarchy h ON tr.child_tag = h.tag
+            WHERE h.depth < 100 -- prevent infinite recursion
+                AND (tr.child_tag, tr.parent_tag) IS DISTINCT FROM (OLD.child_tag, OLD.parent_tag)
+        )
+        SELECT 1 FROM hierarchy WHERE tag = NEW.child_tag
+    ) THEN
+        RAISE EXCEPTION 'Circular reference detected: % -> %', NEW.child_tag, NEW.parent_tag;
+    END IF;
+
+    RETURN NEW;
+END;
+$$;
+
+
+CREATE OR REPLACE FUNCTION magic.add_tag_closure() RETURNS trigger
+    LANGUAGE plpgsql
+    AS $$
+BEGIN
+    -- every ancestor of the parent (and the parent) now reaches every descendant of the child (and the child)
+    INSERT INTO magic.tag_closure (ancestor, descendant, depth)
+    SELECT a.ancestor, d.descendant, a.depth + 1 + d.depth
+    FROM (
+        SELECT NEW.parent_tag AS ancestor, 0 AS depth
+        UNION ALL
+        SELECT ancestor, depth FROM magic.tag_closure WHERE descendant = NEW.parent_tag
+    ) a
+    CROSS JOIN (
+        SELECT NEW.child_tag AS descendant, 0 AS depth
+        UNION ALL
+        SELECT descendant, depth FROM magic.tag_closure WHERE ancestor = NEW.child_tag
+    ) d
+    ON CONFLICT (ancestor, descendant)
+    DO UPDATE SET depth = LEAST(magic.tag_closure.depth, EXCLUDED.depth)
+    WHERE EXCLUDED.depth < magic.tag_closure.depth;
+
+    RETURN NULL;
+END;
+$$;
+
+
+CREATE OR REPLACE FUNCTION magic.refresh_tag_closure() RETURNS trigger
+    LANGUAGE plpgsql
+    AS $$
+BEGIN
+    -- removing a relationship can remove paths that others still provide, so recompute rather than subtract
+    PERFORM magic.rebuild_tag_closure();
+    RETURN NULL;
+END;
+$$;
+
+
+DROP TRIGGER IF EXISTS add_tag_closure ON magic.tag_relationships;
+CREATE TRIGGER add_tag_closure AFTER INSERT ON magic.tag_relationships FOR EACH ROW EXECUTE FUNCTION magic.add_tag_closure();
+
+DROP TRIGGER IF EXISTS refresh_tag_closure ON magic.tag_relationships;
+CREATE TRIGGER refresh_tag_closure AFTER UPDATE OR DELETE OR TRUNCATE ON magic.tag_relationships
+    FOR EACH STATEMENT EXECUTE FUNCTION magic.refresh_tag_closure();
+
+
+CREATE OR REPLACE FUNCTION magic.get_tag_ancestors(target_tag text) RETURNS TABLE(tag text, level integer)
+    LANGUAGE sql STABLE
+    AS $$
+    SELECT tc.ancestor, tc.depth
+    FROM magic.tag_closure tc
+    WHERE tc.descendant = target_tag
+    ORDER BY tc.depth;
+$$;
+
+
+CREATE OR REPLACE FUNCTION magic.get_tag_descendants(target_tag text) RETURNS TABLE(tag text, level integer)
+    LANGUAGE sql STABLE
+    AS $$
+    SELECT tc.descendant, tc.depth
+    FROM magic.tag_closure tc
+    WHERE tc.ancestor = target_tag
+    ORDER BY tc.depth;
+$$;
+
+
+SELECT magic.rebuild_tag_closure();
+
+-- otag: and otagtree: searches test card_oracle_tags with @> and ?|, which a GIN index serves
+CREATE INDEX IF NOT EXISTS idx_cards_oracle_tags_gin ON magic.cards USING gin (card_oracle_tags);
@@ -0,0 +1,30 @@
+-- Migration: Durable queue of background jobs
+-- Long admin operations (tag imports, prefer score backfills, exports and restores) used to run
+-- inside the request that asked for them, holding a serving worker for minutes or hours and dying
+-- with the client's connection. Their routes now queue a row here and return its job_id; the job
+-- executor process claims queued jobs, records their progress and ETA as they run, and keeps
+-- their result. A job is cancelled by setting cancel_requested, which the job checks as it
+-- reports progress.
+
+CREATE TABLE IF NOT EXISTS magic.jobs (
+    job_id bigint GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
+    action text NOT NULL,
+    params jsonb NOT NULL DEFAULT '{}'::jsonb,
+    status text NOT NULL DEFAULT 'queued',
+    progress jsonb,
+    result jsonb,
+    error text,
+    cancel_requested boolean NOT NULL DEFAULT false,
+    created_at timestamp with time zone NOT NULL DEFAULT now(),
+    started_at timestamp with time zone,
+    updated_at timestamp with time zone NOT NULL DEFAULT now(),
+    finished_at timestamp with time zone,
+    CONSTRAINT jobs_known_status CHECK ((status = ANY (ARRAY['queued'::text, 'running'::text, 'succeeded'::text, 'failed'::text, 'cancelled'::text])))
+);
+
+-- the executor claims the oldest queued job
+CREATE INDEX IF NOT EXISTS idx_jobs_queued ON magic.jobs USING btree (job_id) WHERE (status = 'queued'::text);
+
+COMMENT ON TABLE magic.jobs IS 'Long admin operations queued by their routes and run by the job executor process';
+COMMENT ON COLUMN magic.jobs.progress IS 'Last progress the running job reported: done, total, item, elapsed_seconds and eta_seconds';
+COMMENT ON COLUMN magic.jobs.cancel_requested IS 'Set by cancel_job; a running job stops the next time it reports progress';
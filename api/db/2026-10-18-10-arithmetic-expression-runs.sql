@@ -0,0 +1,8 @@
+-- Migration: Count arithmetic expression searches apart from the runs that took time
+-- Searches are counted before the 60 second search result cache, so repeats it answers are
+-- counted too, but only the searches that actually ran add to total_ms. run_count counts those,
+-- and is what mean and savings estimates divide by. Every search counted before now ran.
+
+ALTER TABLE magic.arithmetic_expression_stats ADD COLUMN IF NOT EXISTS run_count bigint DEFAULT 0 NOT NULL;
+
+UPDATE magic.arithmetic_expression_stats SET run_count = search_count WHERE run_count = 0;
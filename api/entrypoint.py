@@ -8,7 +8,13 @@ import signal
 from types import FrameType
 
 from api.api_worker import ApiWorker
+from api.importer_worker import ImporterWorker
+from api.job_worker import JobWorker
+from api.settings import settings
+from api.tagger_client import TAGGER_REQUESTS_PER_SECOND
 from api.utils.deployment_reporting import report_deployment
+from api.utils.multiprocessing_utils import ImportStatus
+from api.utils.rate_limiter import TokenBucket
 
 logger = logging.getLogger("api")
 
@@ -32,7 +38,7 @@ def run_server(
 ) -> None:
     """Run the server."""
     logging.basicConfig(level=logging.INFO)
-    workers: list[ApiWorker] = []
+    workers: list[ApiWorker | ImporterWorker | JobWorker] = []
     logger.info("Starting %d workers on port %d...", num_workers, port)
     os.getpid()
 
@@ -55,6 +61,43 @@ def run_server(
     import_guard = multiprocessing.RLock()
     last_import_time = multiprocessing.Value("d", 0.0, lock=True)
     schema_setup_event = multiprocessing.Event()
+    data_generation = multiprocessing.Value("i", 0, lock=True)
+    import_status = ImportStatus()
+    import_requested = multiprocessing.Event()
+    job_requested = multiprocessing.Event()
+    # every process's requests to Scryfall, and to the tagger, are held to one rate between them
+    scryfall_rate_limiter = TokenBucket(rate=settings.scryfall_requests_per_second)
+    tagger_rate_limiter = TokenBucket(rate=TAGGER_REQUESTS_PER_SECOND)
+
+    # imports run in their own process, so the serving workers start without waiting on one
+    workers.append(
+        ImporterWorker(
+            exit_flag=exit_flag,
+            import_guard=import_guard,
+            last_import_time=last_import_time,
+            schema_setup_event=schema_setup_event,
+            data_generation=data_generation,
+            import_status=import_status,
+            import_requested=import_requested,
+            scryfall_rate_limiter=scryfall_rate_limiter,
+            tagger_rate_limiter=tagger_rate_limiter,
+        ),
+    )
+    # so do the long admin operations, which the serving workers queue as jobs
+    workers.append(
+        JobWorker(
+            exit_flag=exit_flag,
+            import_guard=import_guard,
+            last_import_time=last_import_time,
+            schema_setup_event=schema_setup_event,
+            data_generation=data_generation,
+            import_status=import_status,
+            import_requested=import_requested,
+            job_requested=job_requested,
+            scryfall_rate_limiter=scryfall_rate_limiter,
+            tagger_rate_limiter=tagger_rate_limiter,
+        ),
+    )
 
     # start workers
     for _ in range(num_workers):
@@ -65,6 +108,12 @@ def run_server(
             last_import_time=last_import_time,
             port=port,
             schema_setup_event=schema_setup_event,
+            data_generation=data_generation,
+            import_status=import_status,
+            import_requested=import_requested,
+            job_requested=job_requested,
+            scryfall_rate_limiter=scryfall_rate_limiter,
+            tagger_rate_limiter=tagger_rate_limiter,
         )
         workers.append(iworker)
 
@@ -20,6 +20,7 @@ class PreferOrder(enum.StrEnum):
     USD_LOW = enum.auto()
     USD_HIGH = enum.auto()
     PROMO = enum.auto()
+    CUSTOM = enum.auto()
 
 
 class CardOrdering(enum.StrEnum):
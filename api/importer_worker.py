@@ -0,0 +1,220 @@
+"""Background importer process."""
+
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import os
+import time
+from typing import TYPE_CHECKING
+
+import requests
+
+from api.scryfall_bulk_data_fetcher import BulkDataKey, ScryfallBulkDataFetcher
+from api.settings import settings
+from api.utils import multiprocessing_utils
+
+if TYPE_CHECKING:
+    from multiprocessing.sharedctypes import Synchronized
+    from multiprocessing.synchronize import Event as EventType
+    from multiprocessing.synchronize import RLock as LockType
+
+    from api.api_resource import APIResource
+    from api.utils.rate_limiter import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+# how often the importer checks whether Scryfall has regenerated the bulk export
+IMPORT_POLL_SECONDS = 15 * 60
+
+
+def import_due(  # noqa: PLR0913
+    *,
+    requested: bool,
+    last_import_time: float,
+    now: float,
+    interval_seconds: float,
+    imported_updated_at: str | None,
+    updated_at: str | None,
+) -> bool:
+    """Decide whether the background importer should run an import now.
+
+    Args:
+        requested: Whether a serving worker asked for an import.
+        last_import_time: Unix time of the last successful import, 0 if there was none.
+        now: The current Unix time.
+        interval_seconds: Seconds after which to re-import regardless of the export.
+        imported_updated_at: updated_at of the bulk export as of the last import.
+        updated_at: updated_at of the bulk export now, None if it couldn't be fetched.
+
+    Returns:
+        True if an import was requested, none succeeded yet, the export has been regenerated
+        since the last one, or the interval has passed.
+    """
+    if requested or not last_import_time:
+        return True
+    if updated_at is not None and updated_at != imported_updated_at:
+        return True
+    return now - last_import_time >= interval_seconds
+
+
+def price_refresh_due(*, last_refresh_time: float, now: float, interval_seconds: float) -> bool:
+    """Decide whether the background importer should refresh prices now, when no import is due.
+
+    Args:
+        last_refresh_time: Unix time of the last import or price refresh, which both load prices.
+        now: The current Unix time.
+        interval_seconds: Seconds between price refreshes, 0 to never refresh prices on their own.
+
+    Returns:
+        True if price refreshes are enabled and the interval has passed.
+    """
+    return interval_seconds > 0 and now - last_refresh_time >= interval_seconds
+
+
+class ImporterWorker(multiprocessing.Process):
+    """A process that runs bulk imports in the background, so serving workers never block on them.
+
+    The importer runs the initial import as it starts, on its own connection pool, then re-imports
+    when Scryfall regenerates the bulk export, when the import interval has passed, or when a
+    serving worker sets import_requested. Between imports it refreshes only the prices, once per
+    price refresh interval. After each successful import it bumps data_generation,
+    which tells the serving workers to drop their caches, and it reports progress through
+    import_status.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        *,
+        exit_flag: EventType | None = None,
+        import_guard: LockType = multiprocessing_utils.DEFAULT_LOCK,
+        last_import_time: Synchronized,
+        schema_setup_event: EventType = multiprocessing_utils.DEFAULT_EVENT,
+        data_generation: Synchronized,
+        import_status: multiprocessing_utils.ImportStatus,
+        import_requested: EventType,
+        scryfall_rate_limiter: TokenBucket | None = None,
+        tagger_rate_limiter: TokenBucket | None = None,
+        interval_seconds: float | None = None,
+        price_refresh_seconds: float | None = None,
+        poll_seconds: float = IMPORT_POLL_SECONDS,
+    ) -> None:
+        """Initialize the importer process.
+
+        Args:
+            exit_flag (multiprocessing.Event | None): An optional event to signal process exit.
+            import_guard (multiprocessing.RLock): Lock to synchronize schema setup with the workers.
+            last_import_time (Synchronized): Shared value for last bulk import timestamp (Unix time).
+            schema_setup_event (multiprocessing.Event): Event denoting schema setup has been completed.
+            data_generation (Synchronized): Shared counter bumped after each successful import.
+            import_status (ImportStatus): Shared import progress, updated as imports run.
+            import_requested (multiprocessing.Event): Event serving workers set to ask for an import.
+            scryfall_rate_limiter (TokenBucket | None): Limiter shared by every process's Scryfall requests.
+            tagger_rate_limiter (TokenBucket | None): Limiter shared by every process's tagger requests.
+            interval_seconds (float | None): Seconds after which to re-import regardless of the export.
+                Defaults to settings.import_interval_hours.
+            price_refresh_seconds (float | None): Seconds between price-only refreshes, 0 to disable them.
+                Defaults to settings.price_refresh_hours.
+            poll_seconds (float): Seconds between checks of the bulk export's updated_at.
+        """
+        super().__init__(name="importer")
+        self.exit_flag = exit_flag
+        self.import_guard = import_guard
+        self.last_import_time = last_import_time
+        self.schema_setup_event = schema_setup_event
+        self.data_generation = data_generation
+        self.import_status = import_status
+        self.import_requested = import_requested
+        self.interval_seconds = interval_seconds if interval_seconds is not None else settings.import_interval_hours * 3600
+        self.price_refresh_seconds = (
+            price_refresh_seconds if price_refresh_seconds is not None else settings.price_refresh_hours * 3600
+        )
+        self.poll_seconds = poll_seconds
+        self.scryfall_rate_limiter = scryfall_rate_limiter
+        self.tagger_rate_limiter = tagger_rate_limiter
+
+    def _get_updated_at(self, fetcher: ScryfallBulkDataFetcher) -> str | None:
+        """Get the bulk export's updated_at from a freshly fetched catalog, or None if Scryfall can't be reached."""
+        try:
+            return fetcher.refresh_catalog()[BulkDataKey(settings.bulk_data_key)]["updated_at"]
+        except (requests.RequestException, KeyError, ValueError) as oops:
+            logger.warning("Failed to check the bulk export for updates: %s", oops)
+            return None
+
+    def _run_import(self, api: APIResource) -> bool:
+        """Run one import, recording an unexpected failure in the import status rather than exiting.
+
+        The import flow is run directly under the import lock, not through import_data: that only
+        sets import_requested on a resource built with it, and its result cache skips any import
+        asked for within MIN_IMPORT_INTERVAL of the last call.
+
+        Returns:
+            True if the import finished, False if it failed or was skipped as recent.
+        """
+        last_import_time = self.last_import_time.get_obj().value
+        try:
+            with self.last_import_time.get_lock():
+                api._run_import_under_lock()
+        except Exception as oops:
+            logger.error("Background import failed: %s", oops, exc_info=True)
+            self.import_status.update(stage="failed", finished_at=time.time(), message=str(oops))
+            return False
+        return self.last_import_time.get_obj().value != last_import_time
+
+    def _refresh_prices(self, api: APIResource) -> None:
+        """Refresh prices, logging an unexpected failure rather than exiting."""
+        try:
+            api.refresh_prices()
+        except Exception as oops:
+            logger.error("Background price refresh failed: %s", oops, exc_info=True)
+
+    def run(self) -> None:
+        """Run imports until the exit flag is set."""
+        logging.basicConfig(level=logging.INFO)
+        logger.info("Starting importer with pid %d", os.getpid())
+        try:
+            # Importing here (post-fork), as the serving workers do
+            from api.api_resource import APIResource  # pylint: disable=import-outside-toplevel
+
+            fetcher = ScryfallBulkDataFetcher(rate_limiter=self.scryfall_rate_limiter)
+            updated_at = self._get_updated_at(fetcher)
+            # given import_requested, the resource leaves the import to us rather than running it as it is constructed
+            api = APIResource(
+                import_guard=self.import_guard,
+                last_import_time=self.last_import_time,
+                schema_setup_event=self.schema_setup_event,
+                data_generation=self.data_generation,
+                import_status=self.import_status,
+                import_requested=self.import_requested,
+                scryfall_rate_limiter=self.scryfall_rate_limiter,
+                tagger_rate_limiter=self.tagger_rate_limiter,
+            )
+            # the initial import: a failure is retried at the next poll rather than stopping the server
+            imported_updated_at = updated_at if self._run_import(api) else None
+            prices_refreshed_at = time.time()
+            while not (self.exit_flag and self.exit_flag.is_set()):
+                requested = self.import_requested.wait(self.poll_seconds)
+                updated_at = self._get_updated_at(fetcher)
+                now = time.time()
+                due = import_due(
+                    requested=requested,
+                    last_import_time=self.last_import_time.get_obj().value,
+                    now=now,
+                    interval_seconds=self.interval_seconds,
+                    imported_updated_at=imported_updated_at,
+                    updated_at=updated_at,
+                )
+                if due:
+                    self.import_requested.clear()
+                    logger.info("Running background import (requested: %s, bulk export updated at %s)", requested, updated_at)
+                    if self._run_import(api):
+                        imported_updated_at = updated_at
+                        prices_refreshed_at = time.time()
+                elif price_refresh_due(last_refresh_time=prices_refreshed_at, now=now, interval_seconds=self.price_refresh_seconds):
+                    logger.info("Running background price refresh")
+                    self._refresh_prices(api)
+                    prices_refreshed_at = time.time()
+        except Exception as oops:
+            logger.error("Error running importer: %s", oops, exc_info=True)
+            if self.exit_flag:
+                self.exit_flag.set()  # Signal exit if an exit flag is provided
@@ -0,0 +1,146 @@
+"""Background job executor process."""
+
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import os
+from typing import TYPE_CHECKING, Any
+
+import orjson
+
+from api.utils import db_utils, jobs, multiprocessing_utils
+
+if TYPE_CHECKING:
+    from multiprocessing.sharedctypes import Synchronized
+    from multiprocessing.synchronize import Event as EventType
+    from multiprocessing.synchronize import RLock as LockType
+
+    import psycopg_pool
+
+    from api.api_resource import APIResource
+    from api.utils.rate_limiter import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+# how often the executor checks magic.jobs for queued jobs when no serving worker has woken it
+JOB_POLL_SECONDS = 60
+
+
+class JobWorker(multiprocessing.Process):
+    """A process that runs the jobs queued in magic.jobs, one at a time, so admin work never holds a serving worker.
+
+    Serving workers queue a job and set job_requested; the executor also polls, so jobs queued
+    while it was down still run. Each job calls its route on the executor's own APIResource,
+    which reports progress to it. After a job that changed the card data succeeds, the executor
+    bumps data_generation, which tells the serving workers to drop their caches.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        *,
+        exit_flag: EventType | None = None,
+        import_guard: LockType = multiprocessing_utils.DEFAULT_LOCK,
+        last_import_time: Synchronized,
+        schema_setup_event: EventType = multiprocessing_utils.DEFAULT_EVENT,
+        data_generation: Synchronized,
+        import_status: multiprocessing_utils.ImportStatus,
+        import_requested: EventType,
+        job_requested: EventType,
+        scryfall_rate_limiter: TokenBucket | None = None,
+        tagger_rate_limiter: TokenBucket | None = None,
+        poll_seconds: float = JOB_POLL_SECONDS,
+    ) -> None:
+        """Initialize the job executor process.
+
+        Args:
+            exit_flag (multiprocessing.Event | None): An optional event to signal process exit.
+            import_guard (multiprocessing.RLock): Lock to synchronize schema setup with the workers.
+            last_import_time (Synchronized): Shared value for last bulk import timestamp (Unix time).
+            schema_setup_event (multiprocessing.Event): Event denoting schema setup has been completed.
+            data_generation (Synchronized): Shared counter bumped after each job that changes the card data.
+            import_status (ImportStatus): Shared progress of the background importer.
+            import_requested (multiprocessing.Event): Event asking the background importer for an import.
+            job_requested (multiprocessing.Event): Event serving workers set after queueing a job.
+            scryfall_rate_limiter (TokenBucket | None): Limiter shared by every process's Scryfall requests.
+            tagger_rate_limiter (TokenBucket | None): Limiter shared by every process's tagger requests.
+            poll_seconds (float): Seconds between checks for queued jobs when job_requested isn't set.
+        """
+        super().__init__(name="job-executor")
+        self.exit_flag = exit_flag
+        self.import_guard = import_guard
+        self.last_import_time = last_import_time
+        self.schema_setup_event = schema_setup_event
+        self.data_generation = data_generation
+        self.import_status = import_status
+        self.import_requested = import_requested
+        self.job_requested = job_requested
+        self.poll_seconds = poll_seconds
+        self.scryfall_rate_limiter = scryfall_rate_limiter
+        self.tagger_rate_limiter = tagger_rate_limiter
+
+    def _run_job(self, api: APIResource, pool: psycopg_pool.ConnectionPool, job: dict[str, Any]) -> None:
+        """Run one claimed job and record how it ended, whatever its action raises."""
+        job_id, action = job["job_id"], job["action"]
+        logger.info("Running job %d: %s(%s)", job_id, action, job["params"])
+        result = error = None
+        api._current_job = jobs.RunningJob(pool, job_id)
+        try:
+            # values JSON has no type for, like Decimal, are kept as their strings
+            result = orjson.loads(orjson.dumps(api.action_map[action](**job["params"]), default=str))
+            status = "succeeded"
+        except jobs.JobCancelledError:
+            status = "cancelled"
+        except Exception as oops:
+            logger.error("Job %d (%s) failed: %s", job_id, action, oops, exc_info=True)
+            status = "failed"
+            error = str(oops)
+        finally:
+            api._current_job = None
+        with pool.connection() as conn, conn.cursor() as cursor:
+            jobs.finish_job(cursor, job_id, status=status, result=result, error=error)
+        logger.info("Job %d (%s) %s", job_id, action, status)
+        # a cancelled job may have committed part of its work too
+        if status != "failed" and action not in jobs.READ_ONLY_JOB_ACTIONS:
+            with self.data_generation.get_lock():
+                self.data_generation.value += 1
+
+    def run(self) -> None:
+        """Run queued jobs until the exit flag is set."""
+        logging.basicConfig(level=logging.INFO)
+        logger.info("Starting job executor with pid %d", os.getpid())
+        try:
+            # Importing here (post-fork), as the serving workers do
+            from api.api_resource import APIResource  # pylint: disable=import-outside-toplevel
+
+            # no job_requested: this resource runs the job routes rather than queueing them, and
+            # with import_requested it leaves bulk imports to the importer
+            api = APIResource(
+                import_guard=self.import_guard,
+                last_import_time=self.last_import_time,
+                schema_setup_event=self.schema_setup_event,
+                data_generation=self.data_generation,
+                import_status=self.import_status,
+                import_requested=self.import_requested,
+                scryfall_rate_limiter=self.scryfall_rate_limiter,
+                tagger_rate_limiter=self.tagger_rate_limiter,
+            )
+            # job bookkeeping gets its own connections, so progress commits while a job's transaction is open
+            pool = db_utils.make_pool()
+            with pool.connection() as conn, conn.cursor() as cursor:
+                interrupted = jobs.fail_interrupted_jobs(cursor)
+            if interrupted:
+                logger.warning("Failed %d jobs interrupted by the last executor stopping", interrupted)
+            while not (self.exit_flag and self.exit_flag.is_set()):
+                # cleared before claiming, so a job queued while claiming sets it again
+                self.job_requested.clear()
+                with pool.connection() as conn, conn.cursor() as cursor:
+                    job = jobs.claim_next_job(cursor)
+                if job is None:
+                    self.job_requested.wait(self.poll_seconds)
+                    continue
+                self._run_job(api, pool, job)
+        except Exception as oops:
+            logger.error("Error running job executor: %s", oops, exc_info=True)
+            if self.exit_flag:
+                self.exit_flag.set()  # Signal exit if an exit flag is provided
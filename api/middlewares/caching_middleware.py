@@ -12,6 +12,7 @@ from api.settings import settings
 
 if TYPE_CHECKING:
     from collections.abc import MutableMapping
+    from multiprocessing.sharedctypes import Synchronized
 
     import falcon
 
@@ -23,15 +24,23 @@ CacheKey = tuple[str, tuple[tuple, ...], tuple[tuple, ...]]
 class CachingMiddleware:
     """Middleware to cache the request and response."""
 
-    def __init__(self: CachingMiddleware, cache: MutableMapping | None = None) -> None:
+    def __init__(
+        self: CachingMiddleware,
+        cache: MutableMapping | None = None,
+        data_generation: Synchronized | None = None,
+    ) -> None:
         """Initialize the caching middleware with an optional cache instance.
 
         Args:
             cache: Optional cache instance. If None, creates an LRUCache with maxsize 10,000.
+            data_generation: Optional shared counter bumped by the importer; the cache is
+                cleared whenever it changes.
         """
         if cache is None:
             cache = LRUCache(maxsize=10_000)
         self.cache: MutableMapping[CacheKey, falcon.Response] = cache
+        self.data_generation = data_generation
+        self.seen_data_generation = data_generation.get_obj().value if data_generation is not None else 0
 
     def _cache_key(self: CachingMiddleware, req: falcon.Request) -> CacheKey:
         cached_headers = [
@@ -53,6 +62,11 @@ class CachingMiddleware:
         if not settings.enable_cache:
             return
 
+        if self.data_generation is not None and self.data_generation.get_obj().value != self.seen_data_generation:
+            logger.info("Data generation changed, clearing %d cached responses", len(self.cache))
+            self.seen_data_generation = self.data_generation.get_obj().value
+            self.cache.clear()
+
         cache_key = self._cache_key(req)
         cached_value: falcon.Response | None = self.cache.get(cache_key)
         if cached_value is not None:
@@ -86,6 +100,9 @@ class CachingMiddleware:
             return
 
         del resource, req_succeeded
+        # responses that are out of date as soon as they are sent, like a job's status
+        if resp.get_header("Cache-Control") == "no-store":
+            return
         cache_key = self._cache_key(req)
         cached_val = self.cache.get(cache_key)
         if cached_val is None:
@@ -1,5 +1,6 @@
 """Query parsing and AST generation for Scryfall search queries."""
 
+from api.parsing.derived_expressions import arithmetic_expressions, is_indexed_expression
 from api.parsing.nodes import (
     AndNode,
     AttributeNode,
@@ -13,7 +14,14 @@ from api.parsing.nodes import (
     RegexValueNode,
     StringValueNode,
 )
-from api.parsing.parsing_f import balance_partial_query, generate_sql_query, parse_scryfall_query, parse_search_query
+from api.parsing.parsing_f import (
+    balance_partial_query,
+    generate_routed_sql_query,
+    generate_sql_query,
+    parse_scryfall_query,
+    parse_search_query,
+)
+from api.parsing.regex_literals import extract_required_literals, has_unfiltered_regex
 
 node_types = [
     AndNode,
@@ -28,5 +36,15 @@ node_types = [
     RegexValueNode,
     StringValueNode,
 ]
-functions = [parse_search_query, generate_sql_query, parse_scryfall_query, balance_partial_query]
+functions = [
+    parse_search_query,
+    generate_sql_query,
+    generate_routed_sql_query,
+    parse_scryfall_query,
+    balance_partial_query,
+    extract_required_literals,
+    has_unfiltered_regex,
+    arithmetic_expressions,
+    is_indexed_expression,
+]
 __all__ = [x.__name__ for x in node_types + functions]
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import re
+from typing import TYPE_CHECKING
 
 from titlecase import titlecase
 
@@ -14,6 +15,7 @@ from api.parsing.db_info import (
     COLOR_NAME_TO_CODE,
     DB_NAME_TO_FIELD_TYPE,
     FORMAT_CODE_TO_NAME,
+    ORACLE_TAG_TREE_ALIASES,
     FieldType,
     ParserClass,
 )
@@ -31,6 +33,10 @@ from api.parsing.nodes import (
     StringValueNode,
     param_name,
 )
+from api.parsing.regex_literals import escape_like, extract_required_literals
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
 
 """
 
@@ -381,6 +387,72 @@ def calculate_devotion(mana_cost_str: str) -> dict:
     return {color: color_devotion for color, color_devotion in devotion.items() if color_devotion}
 
 
+# Integer pip count columns, kept in step with mana_cost_jsonb and devotion by preprocess_card
+MANA_PIP_COLUMNS = {
+    "W": "mana_pips_w",
+    "U": "mana_pips_u",
+    "B": "mana_pips_b",
+    "R": "mana_pips_r",
+    "G": "mana_pips_g",
+    "C": "mana_pips_c",
+}
+# counts of the mana_cost_jsonb symbols that aren't plain colored pips
+NON_PIP_SYMBOL_COLUMNS = ("mana_hybrid", "mana_phyrexian", "mana_other_symbols")
+DEVOTION_COLUMNS = {
+    "W": "devotion_w",
+    "U": "devotion_u",
+    "B": "devotion_b",
+    "R": "devotion_r",
+    "G": "devotion_g",
+    "C": "devotion_c",
+}
+
+
+def mana_cost_pip_counts(mana_cost_str: str) -> dict[str, int]:
+    """Count the symbols of a mana cost string into the integer pip count columns.
+
+    Colored pips are counted per color exactly as mana_cost_str_to_dict counts them, other
+    symbols are counted as hybrid ({W/U}, {2/W}), phyrexian ({W/P}, {W/U/P}) or other ({X}, {S}),
+    and generic mana is summed.
+
+    Args:
+        mana_cost_str: The mana cost string, e.g. "{2}{W}{W}".
+
+    Returns:
+        Mapping of column name to count.
+    """
+    counts = dict.fromkeys([*MANA_PIP_COLUMNS.values(), *NON_PIP_SYMBOL_COLUMNS, "mana_generic"], 0)
+    for symbol, pips in mana_cost_str_to_dict(mana_cost_str).items():
+        if symbol in MANA_PIP_COLUMNS:
+            column = MANA_PIP_COLUMNS[symbol]
+        elif symbol.endswith("/P"):
+            column = "mana_phyrexian"
+        elif "/" in symbol:
+            column = "mana_hybrid"
+        else:
+            column = "mana_other_symbols"
+        counts[column] += len(pips)
+
+    mana_cost_upper = mana_cost_str.upper()
+    braced_generic = [symbol for symbol in re.findall(r"{([^}]*)}", mana_cost_upper) if symbol.isdigit()]
+    unbraced_generic = re.findall(r"\d+", re.sub(r"{[^}]*}", " ", mana_cost_upper))
+    counts["mana_generic"] = sum(int(amount) for amount in braced_generic + unbraced_generic)
+    return counts
+
+
+def devotion_counts(mana_cost_str: str) -> dict[str, int]:
+    """Count devotion per color into the integer devotion columns.
+
+    Args:
+        mana_cost_str: The mana cost string, e.g. "{R/G}{G}".
+
+    Returns:
+        Mapping of column name to devotion count.
+    """
+    devotion = calculate_devotion(mana_cost_str)
+    return {column: len(devotion.get(color, [])) for color, column in DEVOTION_COLUMNS.items()}
+
+
 class CardBinaryOperatorNode(BinaryOperatorNode):
     """Card-specific binary operator node with custom SQL generation."""
 
@@ -514,6 +586,11 @@ class CardBinaryOperatorNode(BinaryOperatorNode):
         query_mana_dict = mana_cost_str_to_dict(mana_cost_str)
         query_cmc = calculate_cmc(mana_cost_str)
 
+        # Plain colored pips (the common case) can be compared on the integer pip count columns;
+        # hybrid, phyrexian and other symbols need the exact symbols in mana_cost_jsonb
+        if set(query_mana_dict) <= set(MANA_PIP_COLUMNS):
+            return self._handle_mana_pip_comparison(context, query_mana_dict, query_cmc)
+
         # Prepare parameters
         mana_param = param_name(query_mana_dict)
         cmc_param = param_name(query_cmc)
@@ -560,6 +637,82 @@ class CardBinaryOperatorNode(BinaryOperatorNode):
         msg = f"Unsupported mana cost operator: {self.operator}"
         raise ValueError(msg)
 
+    def _handle_mana_pip_comparison(self, context: dict, query_mana_dict: dict, query_cmc: int) -> str:
+        """Compile a mana cost comparison to integer comparisons over the pip count columns.
+
+        Equivalent to the mana_cost_jsonb containment comparison for queries made only of
+        plain colored pips: a card's jsonb is contained in the query's exactly when it has no
+        more pips of any color and no other symbols.
+        """
+        query_pips = {column: len(query_mana_dict.get(color, [])) for color, column in MANA_PIP_COLUMNS.items()}
+        cmc_param = param_name(query_cmc)
+        context[cmc_param] = query_cmc
+
+        def compare(sql_operator: str, columns: Iterable[str]) -> list[str]:
+            clauses = []
+            for column in columns:
+                pname = param_name(query_pips[column])
+                context[pname] = query_pips[column]
+                clauses.append(f"card.{column} {sql_operator} %({pname})s")
+            return clauses
+
+        no_other_symbols = [f"card.{column} = 0" for column in NON_PIP_SYMBOL_COLUMNS]
+
+        if self.operator == "=":
+            clauses = [*compare("=", query_pips), *no_other_symbols, f"card.cmc = %({cmc_param})s"]
+        elif self.operator in ("<=", "<"):
+            # no more pips of any color, nothing but colored pips, and no more total mana
+            clauses = [*compare("<=", query_pips), *no_other_symbols, f"card.cmc <= %({cmc_param})s"]
+            if self.operator == "<":
+                clauses.append(f"NOT ({' AND '.join(compare('=', query_pips))})")
+        elif self.operator in (">=", ">"):
+            # at least the query's pips of each color it asks for, and at least as much total mana
+            wanted = [column for column, count in query_pips.items() if count]
+            clauses = [*compare(">=", wanted), f"card.cmc >= %({cmc_param})s"]
+            if self.operator == ">":
+                clauses.append(f"NOT ({' AND '.join([*compare('=', query_pips), *no_other_symbols])})")
+        else:
+            msg = f"Unsupported mana cost operator: {self.operator}"
+            raise ValueError(msg)
+        return f"({' AND '.join(clauses)})"
+
+    def _handle_devotion_comparison(self, context: dict) -> str:
+        """Compile a devotion comparison to integer comparisons over the devotion count columns."""
+        query_devotion = calculate_devotion(self.rhs.value.strip())
+        query_counts = {column: len(query_devotion.get(color, [])) for color, column in DEVOTION_COLUMNS.items()}
+
+        def compare(sql_operator: str, columns: Iterable[str]) -> list[str]:
+            clauses = []
+            for column in columns:
+                pname = param_name(query_counts[column])
+                context[pname] = query_counts[column]
+                clauses.append(f"card.{column} {sql_operator} %({pname})s")
+            return clauses
+
+        def same_devotion() -> str:
+            return " AND ".join(compare("=", query_counts))
+
+        def at_least() -> list[str]:
+            # containment: at least the devotion asked for, in the colors asked for
+            return compare(">=", [column for column, count in query_counts.items() if count]) or ["TRUE"]
+
+        if self.operator == "=":
+            clauses = [same_devotion()]
+        elif self.operator in (">=", ":"):
+            clauses = at_least()
+        elif self.operator == "<=":
+            clauses = compare("<=", query_counts)
+        elif self.operator == ">":
+            clauses = [*at_least(), f"NOT ({same_devotion()})"]
+        elif self.operator == "<":
+            clauses = [*compare("<=", query_counts), f"NOT ({same_devotion()})"]
+        elif self.operator in ("!=", "<>"):
+            clauses = [f"NOT ({same_devotion()})"]
+        else:
+            msg = f"Unknown operator: {self.operator}"
+            raise ValueError(msg)
+        return f"({' AND '.join(clauses)})"
+
     def _handle_date_search(self, context: dict) -> str:
         """Handle date search queries.
 
@@ -659,8 +812,16 @@ class CardBinaryOperatorNode(BinaryOperatorNode):
             regex_pattern = self.rhs.value
             _param_name = param_name(regex_pattern)
             context[_param_name] = regex_pattern
-            # Use PostgreSQL ~* operator for case-insensitive regex matching
-            return f"({lhs_sql} ~* %({_param_name})s)"
+            # ILIKE prefilters on the literals every match must contain let the trigram
+            # indexes narrow the rows; ~* then rechecks the exact (case-insensitive) regex
+            clauses = []
+            for literal in extract_required_literals(regex_pattern):
+                like_pattern = f"%{escape_like(literal)}%"
+                like_param_name = param_name(like_pattern)
+                context[like_param_name] = like_pattern
+                clauses.append(f"{lhs_sql} ILIKE %({like_param_name})s")
+            clauses.append(f"{lhs_sql} ~* %({_param_name})s")
+            return f"({' AND '.join(clauses)})"
 
         # Regular text pattern matching with ILIKE
         if isinstance(self.rhs, StringValueNode | ManaValueNode):
@@ -698,23 +859,20 @@ class CardBinaryOperatorNode(BinaryOperatorNode):
     query ?& col AND not(col ?& query) # as array
     """
 
-    def _handle_jsonb_object(self, context: dict) -> str:  # noqa: PLR0912
+    def _handle_jsonb_object(self, context: dict) -> str:  # noqa: C901, PLR0912
         # Produce the query as a jsonb object
         lhs_sql = self.lhs.to_sql(context)
         attr = self.lhs.attribute_name
         is_color_identity = False
+        if attr == "devotion":
+            # Devotion uses mana cost syntax and is compared on the integer devotion count columns
+            return self._handle_devotion_comparison(context)
         if attr in ("card_colors", "card_color_identity", "produced_mana"):
             rhs = get_colors_comparison_object(self.rhs.value.strip().lower())
             pname = param_name(rhs)
             context[pname] = rhs
             # Color identity has inverted semantics for the : operator only
             is_color_identity = attr == "card_color_identity"
-        elif attr == "devotion":
-            # Devotion uses mana cost syntax, so we need to convert it to color comparison
-            # Extract color codes from mana cost syntax like {G}, {R}{G}, etc.
-            query_devotion = calculate_devotion(self.rhs.value.strip())
-            pname = param_name(query_devotion)
-            context[pname] = query_devotion
         elif attr == "card_keywords":
             rhs = get_keywords_comparison_object(self.rhs.value.strip())
             pname = param_name(rhs)
@@ -725,6 +883,8 @@ class CardBinaryOperatorNode(BinaryOperatorNode):
             pname = param_name(rhs)
             context[pname] = rhs
         elif attr == "card_oracle_tags":
+            if getattr(self.lhs, "original_attribute", attr) in ORACLE_TAG_TREE_ALIASES:
+                return self._handle_oracle_tag_tree(lhs_sql, context)
             # Oracle tags are stored in lowercase, unlike keywords
             rhs = get_oracle_tags_comparison_object(self.rhs.value.strip())
             pname = param_name(rhs)
@@ -762,6 +922,22 @@ class CardBinaryOperatorNode(BinaryOperatorNode):
         msg = f"Unknown operator: {self.operator}"
         raise ValueError(msg)
 
+    def _handle_oracle_tag_tree(self, lhs_sql: str, context: dict) -> str:
+        """Match cards tagged with an oracle tag or any of its descendants.
+
+        The descendants come from magic.tag_closure, so the whole subtree is a single ?| test
+        against card_oracle_tags rather than a walk of the tag hierarchy.
+        """
+        if self.operator not in (">=", ":"):
+            msg = f"Oracle tag trees only support the : operator, got {self.operator}"
+            raise ValueError(msg)
+        # Oracle tags are stored in lowercase
+        tag = self.rhs.value.strip().lower()
+        pname = param_name(tag)
+        context[pname] = tag
+        subtree = f"SELECT %({pname})s::text UNION ALL SELECT descendant FROM magic.tag_closure WHERE ancestor = %({pname})s"
+        return f"({lhs_sql} ?| ARRAY({subtree}))"
+
     def _handle_jsonb_array(self, context: dict) -> str:
         # TODO: this should produce the query as an array, not jsonb
         rhs_val = self.rhs.value.strip().title()
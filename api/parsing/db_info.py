@@ -175,12 +175,6 @@ DB_COLUMNS = [
         search_aliases=["produces"],
         parser_class=ParserClass.COLOR,
     ),
-    FieldInfo(
-        db_column_name="raw_card_blob",
-        field_type=FieldType.JSONB_OBJECT,
-        search_aliases=[],
-        parser_class=ParserClass.TEXT,
-    ),
     FieldInfo(
         db_column_name="oracle_text",
         field_type=FieldType.TEXT,
@@ -196,7 +190,7 @@ DB_COLUMNS = [
     FieldInfo(
         db_column_name="card_oracle_tags",
         field_type=FieldType.JSONB_OBJECT,
-        search_aliases=["oracle_tags", "otag"],
+        search_aliases=["oracle_tags", "otag", "oracle_tag_tree", "otagtree"],
         parser_class=ParserClass.TEXT,
     ),
     FieldInfo(
@@ -291,6 +285,34 @@ for col in DB_COLUMNS:
         SEARCH_NAME_TO_DB_NAME[ialias.lower()] = col.db_column_name
 
 
+# Oracle tag aliases that also match the tag's descendants in the tag hierarchy (magic.tag_closure)
+ORACLE_TAG_TREE_ALIASES = frozenset({"oracle_tag_tree", "otagtree"})
+
+# Columns whose values are the same for every printing of an oracle card. These are also
+# stored in magic.oracle_cards, so predicates on them can be evaluated once per oracle card.
+ORACLE_LEVEL_COLUMNS = frozenset(
+    {
+        "card_color_identity",
+        "card_colors",
+        "card_keywords",
+        "card_legalities",
+        "card_name",
+        "card_subtypes",
+        "card_types",
+        "cmc",
+        "creature_power",
+        "creature_toughness",
+        "devotion",
+        "edhrec_rank",
+        "mana_cost_jsonb",
+        "mana_cost_text",
+        "oracle_text",
+        "planeswalker_loyalty",
+        "produced_mana",
+    },
+)
+
+
 CARD_SUPERTYPES = {
     "Basic",
     "Legendary",
@@ -0,0 +1,215 @@
+"""Index-friendly rewriting and tracking of arithmetic search expressions.
+
+Searches like ``power-toughness=0`` or ``cmc+1<power`` compile to row-by-row arithmetic that
+no plain column index can serve. Comparisons between sums and differences of numeric
+attributes are normalized to ``<expression> <op> <constant>`` by moving every constant to the
+right-hand side. When the expression is one of INDEXED_EXPRESSIONS (or a single column) the
+comparison is rewritten to exactly that expression, so the planner can use the matching
+expression index from ``api/db/2026-10-18-04-arithmetic-expressions.sql``.
+
+The normalized expression doubles as a stable key, which the API uses to count the arithmetic
+expressions users actually search for and to suggest new expression indexes.
+"""
+
+from __future__ import annotations
+
+from api.parsing.card_query_nodes import CardAttributeNode, CardBinaryOperatorNode
+from api.parsing.db_info import ParserClass
+from api.parsing.nodes import BinaryOperatorNode, NaryOperatorNode, NotNode, NumericValueNode, Query, QueryNode
+
+ARITHMETIC_OPERATORS = frozenset(("+", "-", "*", "/"))
+FLIPPED_COMPARISONS = {"<": ">", "<=": ">=", "=": "=", "!=": "!=", ">=": "<=", ">": "<"}
+
+# expressions with an expression index on magic.cards and magic.oracle_cards, as (column, sign) terms
+INDEXED_EXPRESSIONS: tuple[tuple[tuple[str, int], ...], ...] = (
+    (("creature_power", 1), ("creature_toughness", -1)),
+    (("creature_power", 1), ("creature_toughness", 1)),
+)
+
+
+def _linear_form(node: QueryNode) -> tuple[dict[str, float], float] | None:
+    """Return (column coefficients, constant) for a sum/difference of numeric attributes and numbers."""
+    if isinstance(node, CardAttributeNode):
+        if node.matched_parser_class != ParserClass.NUMERIC:
+            return None
+        return {node.attribute_name: 1}, 0
+    if isinstance(node, NumericValueNode):
+        return {}, node.value
+    if isinstance(node, BinaryOperatorNode) and node.operator in ("+", "-"):
+        lhs = _linear_form(node.lhs)
+        rhs = _linear_form(node.rhs)
+        if lhs is None or rhs is None:
+            return None
+        sign = 1 if node.operator == "+" else -1
+        coefficients = dict(lhs[0])
+        for column, coefficient in rhs[0].items():
+            coefficients[column] = coefficients.get(column, 0) + sign * coefficient
+        return coefficients, lhs[1] + sign * rhs[1]
+    return None
+
+
+def _is_arithmetic(node: QueryNode) -> bool:
+    return isinstance(node, BinaryOperatorNode) and node.operator in ARITHMETIC_OPERATORS
+
+
+def _is_tracked_comparison(node: QueryNode) -> bool:
+    """Arithmetic on either side, or an attribute compared to another attribute."""
+    if not isinstance(node, BinaryOperatorNode) or node.operator not in (*FLIPPED_COMPARISONS, ":"):
+        return False
+    if _is_arithmetic(node.lhs) or _is_arithmetic(node.rhs):
+        return True
+    return isinstance(node.lhs, CardAttributeNode) and isinstance(node.rhs, CardAttributeNode)
+
+
+def _comparisons(node: QueryNode) -> list[BinaryOperatorNode]:
+    """Return the tracked comparisons in a query subtree."""
+    if isinstance(node, Query):
+        return _comparisons(node.root)
+    if isinstance(node, NotNode):
+        return _comparisons(node.operand)
+    if isinstance(node, NaryOperatorNode):
+        return [comparison for operand in node.operands for comparison in _comparisons(operand)]
+    if _is_tracked_comparison(node):
+        return [node]
+    return []
+
+
+def _normalized_comparison(node: BinaryOperatorNode) -> tuple[dict[str, float], str, float] | None:
+    """Return (column coefficients, operator, constant) with all the columns on the left.
+
+    The first column (alphabetically) always has a positive coefficient, so ``a - b < 1`` and
+    ``b - a > -1`` normalize identically.
+    """
+    lhs = _linear_form(node.lhs)
+    rhs = _linear_form(node.rhs)
+    if lhs is None or rhs is None:
+        return None
+    coefficients = dict(lhs[0])
+    for column, coefficient in rhs[0].items():
+        coefficients[column] = coefficients.get(column, 0) - coefficient
+    coefficients = {column: coefficient for column, coefficient in sorted(coefficients.items()) if coefficient}
+    if not coefficients:
+        return None
+    operator = "=" if node.operator == ":" else node.operator
+    constant = rhs[1] - lhs[1]
+    if next(iter(coefficients.values())) < 0:
+        coefficients = {column: -coefficient for column, coefficient in coefficients.items()}
+        operator = FLIPPED_COMPARISONS[operator]
+        constant = -constant
+    return coefficients, operator, constant
+
+
+def _format_terms(terms: list[tuple[str, float]]) -> str:
+    parts = []
+    for idx, (column, coefficient) in enumerate(terms):
+        magnitude = abs(coefficient)
+        term = column if magnitude == 1 else f"{magnitude:g} * {column}"
+        if idx == 0:
+            parts.append(term if coefficient > 0 else f"-{term}")
+        else:
+            parts.append(f"{'+' if coefficient > 0 else '-'} {term}")
+    return " ".join(parts)
+
+
+def _format_node(node: QueryNode) -> str:
+    """Render an arithmetic subtree with its numbers elided."""
+    if isinstance(node, BinaryOperatorNode):
+        return f"({_format_node(node.lhs)} {node.operator} {_format_node(node.rhs)})"
+    if isinstance(node, CardAttributeNode):
+        return node.attribute_name
+    return "?"
+
+
+def _indexed_match(coefficients: dict[str, float]) -> tuple[tuple[tuple[str, int], ...], int] | None:
+    """Return the indexed expression equal to the coefficients, and the sign relating them."""
+    for expression in INDEXED_EXPRESSIONS:
+        terms = dict(expression)
+        if coefficients == terms:
+            return expression, 1
+        if coefficients == {column: -sign for column, sign in terms.items()}:
+            return expression, -1
+    return None
+
+
+def expression_key(node: BinaryOperatorNode) -> str:
+    """Return the stable key of a comparison's arithmetic expression.
+
+    Sums and differences of attributes are keyed by their normalized form with constants moved
+    away (``cmc+1<power`` and ``power-cmc>1`` both give ``cmc - creature_power``), written the
+    way the matching expression index is when there is one. Anything else (``*``, ``/``) is
+    keyed by the shape of its left minus right side, with the numbers elided.
+    """
+    normalized = _normalized_comparison(node)
+    if normalized is None:
+        return " - ".join(_format_node(side) for side in (node.lhs, node.rhs) if not isinstance(side, NumericValueNode))
+    coefficients = normalized[0]
+    match = _indexed_match(coefficients)
+    if match is not None:
+        return _format_terms(list(match[0]))
+    return _format_terms(list(coefficients.items()))
+
+
+def arithmetic_expressions(query: Query) -> list[str]:
+    """Return the keys of the arithmetic expressions searched for by a query, in order and deduplicated."""
+    return list(dict.fromkeys(expression_key(comparison) for comparison in _comparisons(query)))
+
+
+def is_indexed_expression(key: str) -> bool:
+    """Return True if an expression key is served by an index (a single column or an INDEXED_EXPRESSIONS entry)."""
+    return " " not in key or key in {_format_terms(list(expression)) for expression in INDEXED_EXPRESSIONS}
+
+
+def _attribute_nodes(node: QueryNode) -> dict[str, CardAttributeNode]:
+    if isinstance(node, CardAttributeNode):
+        return {node.attribute_name: node}
+    if isinstance(node, BinaryOperatorNode):
+        return _attribute_nodes(node.lhs) | _attribute_nodes(node.rhs)
+    return {}
+
+
+def _as_number(value: float) -> float:
+    return int(value) if float(value).is_integer() else value
+
+
+def _rewrite_comparison(node: BinaryOperatorNode) -> None:
+    normalized = _normalized_comparison(node)
+    if normalized is None:
+        return
+    coefficients, operator, constant = normalized
+    attributes = _attribute_nodes(node)
+
+    if len(coefficients) == 1 and next(iter(coefficients.values())) == 1:
+        # plain column comparison, served by the column's own index
+        (column,) = coefficients
+        node.lhs = attributes[column]
+    else:
+        match = _indexed_match(coefficients)
+        if match is None:
+            return
+        expression, sign = match
+        if sign < 0:
+            operator = FLIPPED_COMPARISONS[operator]
+            constant = -constant
+        (first_column, _), (second_column, second_sign) = expression
+        node.lhs = CardBinaryOperatorNode(attributes[first_column], "+" if second_sign > 0 else "-", attributes[second_column])
+    node.operator = operator
+    node.rhs = NumericValueNode(_as_number(constant))
+
+
+def rewrite_indexed_expressions(query: Query) -> Query:
+    """Rewrite arithmetic comparisons in place so they use indexed expressions where possible.
+
+    ``toughness+power>=10`` becomes ``(creature_power + creature_toughness) >= 10``,
+    ``power>toughness`` becomes ``(creature_power - creature_toughness) > 0`` and
+    ``power+1>3`` becomes ``creature_power > 2``. Comparisons without a matching index are
+    left exactly as they were.
+
+    Args:
+        query: A card query AST (as returned by to_card_query_ast).
+
+    Returns:
+        The same query, for chaining.
+    """
+    for comparison in _comparisons(query):
+        _rewrite_comparison(comparison)
+    return query
@@ -26,13 +26,16 @@ from api.parsing.card_query_nodes import CardAttributeNode, to_card_query_ast
 from api.parsing.db_info import (
     COLOR_NAME_TO_CODE,
     KNOWN_CARD_ATTRIBUTES,
+    ORACLE_LEVEL_COLUMNS,
     PARSER_CLASS_TO_FIELD_INFOS,
     ParserClass,
 )
+from api.parsing.derived_expressions import rewrite_indexed_expressions
 from api.parsing.nodes import (
     AndNode,
     BinaryOperatorNode,
     ManaValueNode,
+    NaryOperatorNode,
     NotNode,
     NumericValueNode,
     OrNode,
@@ -972,3 +975,57 @@ def generate_sql_query(parsed_query: Query) -> tuple[str, dict]:
     scryfall_ast = to_card_query_ast(parsed_query)
     query_context = {}
     return scryfall_ast.to_sql(query_context), query_context
+
+
+def referenced_columns(node: QueryNode) -> set[str]:
+    """Return the database columns referenced by the attributes in a query subtree."""
+    if isinstance(node, CardAttributeNode):
+        return {node.attribute_name}
+    if isinstance(node, Query):
+        return referenced_columns(node.root)
+    if isinstance(node, NotNode):
+        return referenced_columns(node.operand)
+    if isinstance(node, NaryOperatorNode):
+        return set().union(*(referenced_columns(operand) for operand in node.operands))
+    if isinstance(node, BinaryOperatorNode):
+        return referenced_columns(node.lhs) | referenced_columns(node.rhs)
+    return set()
+
+
+def is_oracle_level(node: QueryNode) -> bool:
+    """Return True if a query subtree only references columns stored in magic.oracle_cards."""
+    columns = referenced_columns(node)
+    return bool(columns) and columns <= ORACLE_LEVEL_COLUMNS
+
+
+def generate_routed_sql_query(parsed_query: Query) -> tuple[str, dict]:
+    """Generate a SQL WHERE clause over magic.cards that evaluates oracle-level predicates per oracle card.
+
+    Top-level AND terms that only reference oracle-level columns are moved into a subquery over
+    magic.oracle_cards (aliased as card, so the generated column references resolve there) and
+    joined back to printings by oracle_id. Everything else, including OR/NOT trees that mix
+    levels, is evaluated against the printing as usual. Arithmetic comparisons are first
+    rewritten onto indexed expressions where possible (see rewrite_indexed_expressions).
+
+    Args:
+        parsed_query: The parsed query.
+
+    Returns:
+        Tuple of (SQL WHERE clause, parameter dictionary).
+    """
+    scryfall_ast = rewrite_indexed_expressions(to_card_query_ast(parsed_query))
+    root = scryfall_ast.root
+    terms = root.operands if isinstance(root, AndNode) else [root]
+    oracle_terms = [term for term in terms if is_oracle_level(term)]
+    if not oracle_terms:
+        return generate_sql_query(scryfall_ast)
+
+    query_context = {}
+    oracle_sql = AndNode(oracle_terms).to_sql(query_context)
+    clauses = [
+        f"(card.oracle_id IN (SELECT card.oracle_id FROM magic.oracle_cards AS card WHERE {oracle_sql}))",
+    ]
+    printing_terms = [term for term in terms if not is_oracle_level(term)]
+    if printing_terms:
+        clauses.append(AndNode(printing_terms).to_sql(query_context))
+    return " AND ".join(clauses), query_context
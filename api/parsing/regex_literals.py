@@ -0,0 +1,254 @@
+"""Required-literal extraction for regex searches.
+
+A regex like ``^{T}: add`` can only match text that contains the literal ``{T}: add``.
+Handing that literal to postgres as an ``ILIKE '%{T}: add%'`` prefilter lets the trigram
+indexes narrow the candidate rows before the (much more expensive) regex recheck runs.
+
+The analysis is deliberately conservative: a literal is only reported when every possible
+match of the pattern must contain it. Anything we don't understand makes us give up and
+report no literals, which is always safe because the exact regex is still applied.
+"""
+
+from __future__ import annotations
+
+from api.parsing.nodes import BinaryOperatorNode, NaryOperatorNode, NotNode, Query, QueryNode, RegexValueNode
+
+# pg_trgm can't extract a trigram from anything shorter, so shorter literals don't help the index
+MIN_LITERAL_LENGTH = 3
+
+# escapes followed by a fixed number of hex digits (\uhhhh, \Uhhhhhhhh)
+FIXED_WIDTH_HEX_ESCAPES = {"u": 4, "U": 8}
+HEX_DIGITS = frozenset("0123456789abcdefABCDEF")
+
+
+class _UnsupportedPatternError(Exception):
+    """Raised internally when a pattern uses syntax we don't analyze."""
+
+
+def _skip_escape(pattern: str, idx: int) -> int:
+    """Return the index just past the backslash escape starting at idx."""
+    if idx + 1 >= len(pattern):
+        raise _UnsupportedPatternError
+    escaped = pattern[idx + 1]
+    end = idx + 2
+    if escaped == "x":
+        while end < len(pattern) and pattern[end] in HEX_DIGITS:
+            end += 1
+    elif escaped in FIXED_WIDTH_HEX_ESCAPES:
+        end += FIXED_WIDTH_HEX_ESCAPES[escaped]
+    elif escaped == "c":
+        end += 1
+    elif escaped.isdigit():
+        while end < len(pattern) and pattern[end].isdigit():
+            end += 1
+    return min(end, len(pattern))
+
+
+def _skip_bracket_expression(pattern: str, idx: int) -> int:
+    """Return the index just past the bracket expression ``[...]`` starting at idx."""
+    end = idx + 1
+    if end < len(pattern) and pattern[end] == "^":
+        end += 1
+    if end < len(pattern) and pattern[end] == "]":
+        end += 1
+    while end < len(pattern):
+        char = pattern[end]
+        if char == "\\":
+            end += 2
+        elif char == "[" and end + 1 < len(pattern) and pattern[end + 1] in ":.=":
+            # posix classes like [:alpha:], collating elements and equivalence classes
+            closer = pattern[end + 1] + "]"
+            close_idx = pattern.find(closer, end + 2)
+            if close_idx == -1:
+                raise _UnsupportedPatternError
+            end = close_idx + 2
+        elif char == "]":
+            return end + 1
+        else:
+            end += 1
+    raise _UnsupportedPatternError
+
+
+def _find_group_end(pattern: str, idx: int) -> int:
+    """Return the index of the ``)`` closing the group opened at idx."""
+    depth = 0
+    end = idx
+    while end < len(pattern):
+        char = pattern[end]
+        if char == "\\":
+            end = _skip_escape(pattern, end)
+            continue
+        if char == "[":
+            end = _skip_bracket_expression(pattern, end)
+            continue
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+            if depth == 0:
+                return end
+        end += 1
+    raise _UnsupportedPatternError
+
+
+def _parse_quantifier(pattern: str, idx: int) -> tuple[int | None, int]:
+    """Parse a quantifier at idx.
+
+    Returns:
+        Tuple of (minimum repetitions or None if there is no quantifier, index past the quantifier).
+    """
+    if idx >= len(pattern):
+        return None, idx
+    char = pattern[idx]
+    if char in "*?":
+        min_reps, end = 0, idx + 1
+    elif char == "+":
+        min_reps, end = 1, idx + 1
+    elif char == "{" and idx + 1 < len(pattern) and pattern[idx + 1].isdigit():
+        close_idx = pattern.find("}", idx)
+        if close_idx == -1:
+            raise _UnsupportedPatternError
+        lower_bound = pattern[idx + 1 : close_idx].partition(",")[0]
+        if not lower_bound.isdigit():
+            raise _UnsupportedPatternError
+        min_reps, end = int(lower_bound), close_idx + 1
+    else:
+        return None, idx
+    # non-greedy marker
+    if end < len(pattern) and pattern[end] == "?":
+        end += 1
+    return min_reps, end
+
+
+def _read_atom(pattern: str, idx: int) -> tuple[str | None, int]:
+    """Read a single non-group atom at idx.
+
+    Returns:
+        Tuple of (the literal character, or None if the atom can match varying text, index past the atom).
+    """
+    char = pattern[idx]
+    if char == "\\":
+        escape_end = _skip_escape(pattern, idx)
+        escaped = pattern[idx + 1]
+        # escaped punctuation like \. or \{ is a literal character, \d or \x41 are not
+        if escape_end == idx + 2 and not escaped.isalnum():
+            return escaped, escape_end
+        return None, escape_end
+    if char == "[":
+        return None, _skip_bracket_expression(pattern, idx)
+    if char in ".^$":
+        return None, idx + 1
+    if char in "*+?" or (char == "{" and idx + 1 < len(pattern) and pattern[idx + 1].isdigit()):
+        # quantifier with nothing to apply to
+        raise _UnsupportedPatternError
+    # includes { not followed by a digit, which postgres treats as an ordinary character
+    return char, idx + 1
+
+
+def _read_group(pattern: str, idx: int) -> tuple[list[str], int]:
+    """Read the group opened at idx along with any quantifier applied to it.
+
+    Returns:
+        Tuple of (the literal runs every match of the group must contain, index past the group).
+    """
+    group_end = _find_group_end(pattern, idx)
+    body = pattern[idx + 1 : group_end]
+    if body.startswith("?"):
+        if body.startswith("?:"):
+            body = body[2:]
+        elif body[1:2] in ("=", "!", "<"):
+            # lookaround: zero-width, contributes nothing we can rely on
+            body = ""
+        else:
+            # embedded options like (?i) or (?x) change how the rest of the pattern reads
+            raise _UnsupportedPatternError
+    min_reps, end = _parse_quantifier(pattern, group_end + 1)
+    if min_reps == 0:
+        return [], end
+    return _required_runs(body), end
+
+
+def _required_runs(pattern: str) -> list[str]:
+    """Return the literal runs that every match of pattern must contain."""
+    runs: list[str] = []
+    current: list[str] = []
+
+    def finish_run() -> None:
+        if current:
+            runs.append("".join(current))
+            current.clear()
+
+    idx = 0
+    while idx < len(pattern):
+        if pattern[idx] == "|":
+            # top level alternation: no single literal is required by every branch
+            return []
+        if pattern[idx] == "(":
+            finish_run()
+            group_runs, idx = _read_group(pattern, idx)
+            runs.extend(group_runs)
+            continue
+
+        literal, idx = _read_atom(pattern, idx)
+        min_reps, idx = _parse_quantifier(pattern, idx)
+        if literal is not None and min_reps != 0:
+            current.append(literal)
+        if literal is None or min_reps is not None:
+            # a repeated literal still has to appear once, but whatever follows it may not be adjacent
+            finish_run()
+    finish_run()
+    return runs
+
+
+def extract_required_literals(pattern: str) -> list[str]:
+    """Extract literal substrings that every match of a regex pattern must contain.
+
+    Only literals at least MIN_LITERAL_LENGTH characters long are returned, since shorter
+    strings can't be served by a trigram index. Literals that are contained in another
+    returned literal are dropped as redundant.
+
+    Args:
+        pattern: The regex pattern (postgres ARE syntax, as used with ``~*``).
+
+    Returns:
+        The required literals in pattern order, or an empty list if none could be found.
+    """
+    if pattern.startswith("***"):
+        # director prefixes switch postgres into a different regex flavor
+        return []
+    try:
+        runs = _required_runs(pattern)
+    except _UnsupportedPatternError:
+        return []
+    long_runs = [run for run in dict.fromkeys(runs) if len(run) >= MIN_LITERAL_LENGTH]
+    return [run for run in long_runs if not any(run != other and run.lower() in other.lower() for other in long_runs)]
+
+
+def escape_like(literal: str) -> str:
+    r"""Escape LIKE wildcards (and the default \ escape character) in a literal."""
+    return literal.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def has_unfiltered_regex(node: QueryNode) -> bool:
+    """Return True if the query contains a regex search with no extractable literal.
+
+    Such searches can't be narrowed by the trigram indexes and have to run the regex
+    against every row's text.
+
+    Args:
+        node: The query (or any subtree of it) to inspect.
+
+    Returns:
+        True if any regex value in the tree has no required literal.
+    """
+    if isinstance(node, RegexValueNode):
+        return not extract_required_literals(node.value)
+    if isinstance(node, Query):
+        return has_unfiltered_regex(node.root)
+    if isinstance(node, NotNode):
+        return has_unfiltered_regex(node.operand)
+    if isinstance(node, NaryOperatorNode):
+        return any(has_unfiltered_regex(operand) for operand in node.operands)
+    if isinstance(node, BinaryOperatorNode):
+        return has_unfiltered_regex(node.lhs) or has_unfiltered_regex(node.rhs)
+    return False
@@ -0,0 +1,76 @@
+"""Tests for rewriting arithmetic comparisons onto indexed expressions."""
+
+import pytest
+
+from api import parsing
+from api.parsing.derived_expressions import arithmetic_expressions, is_indexed_expression, rewrite_indexed_expressions
+from api.parsing.parsing_f import generate_routed_sql_query, generate_sql_query
+
+
+@pytest.mark.parametrize(
+    ("query", "expected_expressions"),
+    [
+        ("power-toughness=0", ["creature_power - creature_toughness"]),
+        ("toughness-power>1", ["creature_power - creature_toughness"]),
+        ("pow>tou", ["creature_power - creature_toughness"]),
+        ("toughness+power>=10", ["creature_power + creature_toughness"]),
+        ("cmc+1<power", ["cmc - creature_power"]),
+        ("power-cmc>1 or cmc>=power+2", ["cmc - creature_power"]),
+        ("power+1>3", ["creature_power"]),
+        ("power*2>toughness", ["(creature_power * ?) - creature_toughness"]),
+        ("-(pow>tou) cmc+pow=5", ["creature_power - creature_toughness", "cmc + creature_power"]),
+        ("cmc>3 t:creature", []),
+    ],
+)
+def test_arithmetic_expressions(query: str, expected_expressions: list[str]) -> None:
+    """Test that arithmetic comparisons are keyed by their normalized expression."""
+    assert arithmetic_expressions(parsing.parse_scryfall_query(query)) == expected_expressions
+
+
+@pytest.mark.parametrize(
+    ("expression", "expected"),
+    [
+        ("creature_power - creature_toughness", True),
+        ("creature_power + creature_toughness", True),
+        ("creature_power", True),
+        ("cmc - creature_power", False),
+        ("(creature_power * ?) - creature_toughness", False),
+    ],
+)
+def test_is_indexed_expression(expression: str, expected: bool) -> None:
+    """Test which expression keys are served by an index."""
+    assert is_indexed_expression(expression) is expected
+
+
+@pytest.mark.parametrize(
+    ("query", "expected_sql", "expected_params"),
+    [
+        ("power-toughness=0", "((card.creature_power - card.creature_toughness) = %(p_int_MA)s)", {"p_int_MA": 0}),
+        ("toughness-power>1", "((card.creature_power - card.creature_toughness) < %(p_int_LTE)s)", {"p_int_LTE": -1}),
+        ("pow>tou", "((card.creature_power - card.creature_toughness) > %(p_int_MA)s)", {"p_int_MA": 0}),
+        ("tou>=pow", "((card.creature_power - card.creature_toughness) <= %(p_int_MA)s)", {"p_int_MA": 0}),
+        ("toughness+power>=10", "((card.creature_power + card.creature_toughness) >= %(p_int_MTA)s)", {"p_int_MTA": 10}),
+        ("power+1>3", "(card.creature_power > %(p_int_Mg)s)", {"p_int_Mg": 2}),
+        ("3<1+power", "(card.creature_power > %(p_int_Mg)s)", {"p_int_Mg": 2}),
+    ],
+)
+def test_rewrite_indexed_expressions(query: str, expected_sql: str, expected_params: dict) -> None:
+    """Test that comparisons matching an indexed expression are rewritten to exactly that expression."""
+    rewritten = rewrite_indexed_expressions(parsing.parse_scryfall_query(query))
+    params = {}
+    assert rewritten.to_sql(params) == expected_sql
+    assert params == expected_params
+
+
+@pytest.mark.parametrize("query", ["cmc+1<power", "power*2>toughness", "cmc>3", "o:flying"])
+def test_rewrite_leaves_unindexed_expressions(query: str) -> None:
+    """Test that comparisons without a matching index compile exactly as before."""
+    rewritten = rewrite_indexed_expressions(parsing.parse_scryfall_query(query))
+    assert generate_sql_query(rewritten) == generate_sql_query(parsing.parse_scryfall_query(query))
+
+
+def test_routed_sql_uses_indexed_expressions() -> None:
+    """Test that the search SQL generator applies the rewrite."""
+    sql, params = generate_routed_sql_query(parsing.parse_scryfall_query("t:creature pow>tou"))
+    assert "(card.creature_power - card.creature_toughness) > %(p_int_MA)s" in sql
+    assert params["p_int_MA"] == 0
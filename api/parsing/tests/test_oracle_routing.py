@@ -0,0 +1,80 @@
+"""Tests for routing oracle-level predicates to magic.oracle_cards."""
+
+import pytest
+
+from api import parsing
+from api.parsing.db_info import COLNAME_TO_FIELD_INFOS, ORACLE_LEVEL_COLUMNS
+from api.parsing.parsing_f import generate_routed_sql_query, generate_sql_query, is_oracle_level, referenced_columns
+
+ORACLE_SUBQUERY = "card.oracle_id IN (SELECT card.oracle_id FROM magic.oracle_cards AS card WHERE"
+
+
+def test_oracle_level_columns_are_searchable() -> None:
+    """Every oracle-level column should be a known search column (mana_cost_text rides along with mana_cost_jsonb)."""
+    assert ORACLE_LEVEL_COLUMNS - {"mana_cost_text"} <= set(COLNAME_TO_FIELD_INFOS)
+
+
+@pytest.mark.parametrize(
+    ("query", "expected_columns"),
+    [
+        ("o:flying", {"oracle_text"}),
+        ("t:creature cmc=3", {"card_types", "cmc"}),
+        ("power>toughness", {"creature_power", "creature_toughness"}),
+        ("(o:draw or set:iko) -a:rebecca", {"oracle_text", "card_set_code", "card_artist"}),
+    ],
+)
+def test_referenced_columns(query: str, expected_columns: set[str]) -> None:
+    """Test that the columns referenced by a query are collected from the whole tree."""
+    assert referenced_columns(parsing.parse_scryfall_query(query)) == expected_columns
+
+
+@pytest.mark.parametrize(
+    ("query", "expected"),
+    [
+        ("o:flying", True),
+        ("-c:r", True),
+        ("bolt", True),
+        ("f:modern", True),
+        ("o:draw or t:instant", True),
+        ("set:iko", False),
+        ("usd<1", False),
+        ("o:draw or set:iko", False),
+        ("year=2020", False),
+        ("is:fullart", False),
+    ],
+)
+def test_is_oracle_level(query: str, expected: bool) -> None:
+    """Test classification of query terms as oracle-level."""
+    assert is_oracle_level(parsing.parse_scryfall_query(query)) is expected
+
+
+@pytest.mark.parametrize(
+    ("query", "oracle_fragments", "printing_fragments"),
+    [
+        ("t:creature cmc=3", ["card.card_types", "card.cmc"], []),
+        ("o:flying set:iko", ["card.oracle_text"], ["card.card_set_code"]),
+        ("bolt usd<1", ["card.card_name"], ["card.price_usd"]),
+        ("(o:draw or set:iko) c:r", ["card.card_colors"], ["card.oracle_text", "card.card_set_code"]),
+        ("-o:flying a:rebecca", ["NOT", "card.oracle_text"], ["card.card_artist"]),
+    ],
+)
+def test_routed_sql_splits_terms(query: str, oracle_fragments: list[str], printing_fragments: list[str]) -> None:
+    """Test that oracle-level AND terms go to the oracle subquery and the rest stay on the printing."""
+    sql, params = generate_routed_sql_query(parsing.parse_scryfall_query(query))
+    _, plain_params = generate_sql_query(parsing.parse_scryfall_query(query))
+
+    assert sql.startswith(f"({ORACLE_SUBQUERY}")
+    oracle_sql, _, printing_sql = sql.partition(")) AND ")
+    for fragment in oracle_fragments:
+        assert fragment in oracle_sql
+    for fragment in printing_fragments:
+        assert fragment in printing_sql
+    assert params == plain_params
+
+
+@pytest.mark.parametrize("query", ["set:iko", "usd<1 a:rebecca", "o:draw or set:iko", "year=2020"])
+def test_routed_sql_without_oracle_terms_is_unchanged(query: str) -> None:
+    """Test that queries with no oracle-level terms compile exactly as before."""
+    routed = generate_routed_sql_query(parsing.parse_scryfall_query(query))
+    plain = generate_sql_query(parsing.parse_scryfall_query(query))
+    assert routed == plain
@@ -13,7 +13,13 @@ from api.parsing import (
     QueryNode,
     StringValueNode,
 )
-from api.parsing.card_query_nodes import CardAttributeNode, calculate_cmc, mana_cost_str_to_dict
+from api.parsing.card_query_nodes import (
+    CardAttributeNode,
+    calculate_cmc,
+    devotion_counts,
+    mana_cost_pip_counts,
+    mana_cost_str_to_dict,
+)
 from api.parsing.db_info import ParserClass
 
 
@@ -840,48 +846,63 @@ def test_mana_cost_sql_generation() -> None:
     result1 = parsing.parse_scryfall_query("mana:{1}{G}")
     context1 = {}
     sql1 = result1.to_sql(context1)
-    assert sql1 == "(%(p_dict_eydHJzogWzFdfQ)s <@ card.mana_cost_jsonb AND card.cmc >= %(p_int_Mg)s)"
-    assert mana_cost_str_to_dict("{1}{G}") in context1.values()
-    assert calculate_cmc("{1}{G}") in context1.values()
+    assert sql1 == "(card.mana_pips_g >= %(p_int_MQ)s AND card.cmc >= %(p_int_Mg)s)"
+    assert context1 == {"p_int_MQ": 1, "p_int_Mg": calculate_cmc("{1}{G}")}
 
     result1 = parsing.parse_scryfall_query("mana={1}{G}")
     context1 = {}
     sql1 = result1.to_sql(context1)
-    assert sql1 == "(card.mana_cost_jsonb = %(p_dict_eydHJzogWzFdfQ)s AND card.cmc = %(p_int_Mg)s)"
-    assert mana_cost_str_to_dict("{1}{G}") in context1.values()
-    assert calculate_cmc("{1}{G}") in context1.values()
+    assert sql1 == (
+        "(card.mana_pips_w = %(p_int_MA)s AND card.mana_pips_u = %(p_int_MA)s AND card.mana_pips_b = %(p_int_MA)s"
+        " AND card.mana_pips_r = %(p_int_MA)s AND card.mana_pips_g = %(p_int_MQ)s AND card.mana_pips_c = %(p_int_MA)s"
+        " AND card.mana_hybrid = 0 AND card.mana_phyrexian = 0 AND card.mana_other_symbols = 0 AND card.cmc = %(p_int_Mg)s)"
+    )
+    assert context1 == {"p_int_MA": 0, "p_int_MQ": 1, "p_int_Mg": calculate_cmc("{1}{G}")}
 
-    # Test <= operator generates containment + cmc check
+    # Test <= operator bounds every color, rules out other symbols and checks cmc
     result2 = parsing.parse_scryfall_query("mana<={2}{R}{R}")
     context2 = {}
     sql2 = result2.to_sql(context2)
-    assert "card.mana_cost_jsonb <@" in sql2
-    assert "card.cmc <=" in sql2
-    assert mana_cost_str_to_dict("{2}{R}{R}") in context2.values()
-    assert calculate_cmc("{2}{R}{R}") in context2.values()  # CMC of {2}{R}{R}
+    assert "card.mana_pips_r <= %(p_int_Mg)s" in sql2
+    assert "card.mana_pips_w <= %(p_int_MA)s" in sql2
+    assert "card.mana_hybrid = 0" in sql2
+    assert "card.cmc <= %(p_int_NA)s" in sql2
+    assert context2 == {"p_int_MA": 0, "p_int_Mg": 2, "p_int_NA": calculate_cmc("{2}{R}{R}")}
 
     # Test < operator includes inequality check
     result3 = parsing.parse_scryfall_query("mana<{1}{G}")
     context3 = {}
     sql3 = result3.to_sql(context3)
-    assert "card.mana_cost_jsonb <@" in sql3
+    assert "card.mana_pips_g <=" in sql3
     assert "card.cmc <=" in sql3
-    assert "card.mana_cost_jsonb <>" in sql3
+    assert "NOT (card.mana_pips_w = " in sql3
 
-    # Test >= operator reverses containment direction
+    # Test >= operator only checks the colors asked for
     result4 = parsing.parse_scryfall_query("mana>={W}{U}")
     context4 = {}
     sql4 = result4.to_sql(context4)
-    assert "<@ card.mana_cost_jsonb" in sql4
-    assert "card.cmc >=" in sql4
+    assert sql4 == "(card.mana_pips_w >= %(p_int_MQ)s AND card.mana_pips_u >= %(p_int_MQ)s AND card.cmc >= %(p_int_Mg)s)"
 
     # Test > operator includes inequality
     result5 = parsing.parse_scryfall_query("mana>{0}")
     context5 = {}
     sql5 = result5.to_sql(context5)
-    assert "<@ card.mana_cost_jsonb" in sql5
     assert "card.cmc >=" in sql5
-    assert "card.mana_cost_jsonb <>" in sql5
+    assert "NOT (card.mana_pips_w = " in sql5
+    assert "card.mana_other_symbols = 0)" in sql5
+
+
+@pytest.mark.parametrize(
+    argnames=("query", "expected_sql"),
+    argvalues=[
+        ("mana:{W/U}", "(%(p_dict_eydXL1UnOiBbMV19)s <@ card.mana_cost_jsonb AND card.cmc >= %(p_int_MQ)s)"),
+        ("mana<={G/P}", "(card.mana_cost_jsonb <@ %(p_dict_eydHL1AnOiBbMV19)s AND card.cmc <= %(p_int_MQ)s)"),
+        ("mana={X}{R}", "(card.mana_cost_jsonb = %(p_dict_eydYJzogWzFdLCAnUic6IFsxXX0)s AND card.cmc = %(p_int_MQ)s)"),
+    ],
+)
+def test_mana_cost_sql_generation_non_pip_symbols(query: str, expected_sql: str) -> None:
+    """Test mana costs with hybrid, phyrexian or other symbols still compare mana_cost_jsonb."""
+    assert parsing.parse_scryfall_query(query).to_sql({}) == expected_sql
 
 
 @pytest.mark.parametrize(
@@ -945,6 +966,41 @@ def test_mana_cost_dict_conversion(mana_cost_str: str, expected_dict: dict) -> N
     assert mana_cost_str_to_dict(mana_cost_str) == expected_dict
 
 
+@pytest.mark.parametrize(
+    argnames=("mana_cost_str", "expected_counts"),
+    argvalues=[
+        ("", {}),
+        ("{2}{W}{W}", {"mana_pips_w": 2, "mana_generic": 2}),
+        ("{10}{C}", {"mana_pips_c": 1, "mana_generic": 10}),
+        ("{X}{R}{G}", {"mana_pips_r": 1, "mana_pips_g": 1, "mana_other_symbols": 1}),
+        ("{W/U}{2/B}", {"mana_hybrid": 2}),
+        ("{G/P}{W/U/P}", {"mana_phyrexian": 2}),
+        ("2RRG", {"mana_pips_r": 2, "mana_pips_g": 1, "mana_generic": 2}),
+    ],
+)
+def test_mana_cost_pip_counts(mana_cost_str: str, expected_counts: dict) -> None:
+    """Test mana cost pip counts, with every count column present."""
+    observed = mana_cost_pip_counts(mana_cost_str)
+    assert {column: count for column, count in observed.items() if count} == expected_counts
+    assert len(observed) == 10
+
+
+@pytest.mark.parametrize(
+    argnames=("mana_cost_str", "expected_counts"),
+    argvalues=[
+        ("", {}),
+        ("{1}{G}{G}", {"devotion_g": 2}),
+        ("{R/G}{G}", {"devotion_r": 1, "devotion_g": 2}),
+        ("{C}{W/P}", {"devotion_w": 1, "devotion_c": 1}),
+    ],
+)
+def test_devotion_counts(mana_cost_str: str, expected_counts: dict) -> None:
+    """Test devotion counts, with every color column present."""
+    observed = devotion_counts(mana_cost_str)
+    assert {column: count for column, count in observed.items() if count} == expected_counts
+    assert len(observed) == 6
+
+
 @pytest.mark.parametrize(
     argnames=("test_input", "expected_ast"),
     argvalues=[
@@ -990,23 +1046,29 @@ def test_devotion_sql_generation() -> None:
     result1 = parsing.parse_scryfall_query("devotion:{G}")
     context1 = {}
     sql1 = result1.to_sql(context1)
-    assert "card.devotion" in sql1
-    assert "G" in str(context1.values())
+    assert sql1 == "(card.devotion_g >= %(p_int_MQ)s)"
+    assert context1 == {"p_int_MQ": 1}
 
     # Test >= operator generates containment check
     result2 = parsing.parse_scryfall_query("devotion>={G}")
     context2 = {}
     sql2 = result2.to_sql(context2)
-    assert "card.devotion" in sql2
-    assert ">=" in sql2 or "@>" in sql2
+    assert "card.devotion_g" in sql2
+    assert ">=" in sql2
 
     # Test >= operator with multiple colors
     result3 = parsing.parse_scryfall_query("devotion>={G}{R}")
     context3 = {}
     sql3 = result3.to_sql(context3)
-    assert "card.devotion" in sql3
-    assert "G" in str(context3.values())
-    assert "R" in str(context3.values())
+    assert sql3 == "(card.devotion_r >= %(p_int_MQ)s AND card.devotion_g >= %(p_int_MQ)s)"
+
+    # Test hybrid symbols count towards both colors
+    result4 = parsing.parse_scryfall_query("devotion<={R/G}")
+    context4 = {}
+    sql4 = result4.to_sql(context4)
+    assert "card.devotion_r <= %(p_int_MQ)s" in sql4
+    assert "card.devotion_g <= %(p_int_MQ)s" in sql4
+    assert "card.devotion_w <= %(p_int_MA)s" in sql4
 
 
 @pytest.mark.parametrize(
@@ -1031,9 +1093,9 @@ def test_mana_cost_string_format_comparisons(query: str, description: str) -> No
     context = {}
     sql = result.to_sql(context)
     assert sql is not None, f"Failed to generate SQL for {query}"
-    assert "card.mana_cost_jsonb" in sql, f"Should use JSONB containment for {query}"
+    assert "card.mana_pips_g" in sql, f"Should use the pip count columns for {query}"
     assert "card.cmc" in sql, f"Should use CMC check for {query}"
-    assert context == {"p_dict_eydHJzogWzEsIDIsIDNdfQ": {"G": [1, 2, 3]}, "p_int_Mw": 3}
+    assert context["p_int_Mw"] == 3
 
 
 @pytest.mark.parametrize(
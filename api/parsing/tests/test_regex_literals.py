@@ -0,0 +1,91 @@
+"""Tests for required-literal extraction from regex patterns."""
+
+import pytest
+
+from api import parsing
+from api.parsing.regex_literals import escape_like, extract_required_literals, has_unfiltered_regex
+
+
+class TestExtractRequiredLiterals:
+    """Test which literals are reported as required by a regex."""
+
+    @pytest.mark.parametrize(
+        ("pattern", "expected"),
+        [
+            ("izzet", ["izzet"]),
+            ("^{T}:", ["{T}:"]),
+            (r"\bizzet\b", ["izzet"]),
+            (".*flavor.*", ["flavor"]),
+            ("a/b", ["a/b"]),
+            ("draw a card$", ["draw a card"]),
+            (".*?draw.*?", ["draw"]),
+            (r"\.\.\.abc", ["...abc"]),
+            ("draw.*card", ["draw", "card"]),
+            ("(draw) a card", ["draw", " a card"]),
+            ("(?:draw)+ a card", ["draw", " a card"]),
+            ("(draw)? a card", [" a card"]),
+            ("(draw|cast) a spell", [" a spell"]),
+            ("cards?", ["card"]),
+            ("drawn{1,2} a", ["drawn"]),
+            ("[Tt]apped", ["apped"]),
+            ("(?=lookahead)abc", ["abc"]),
+            ("draw.*draw", ["draw"]),
+            ("card.*cards", ["cards"]),
+        ],
+    )
+    def test_literals_extracted(self, pattern: str, expected: list[str]) -> None:
+        """Test that the literals every match must contain are found."""
+        assert extract_required_literals(pattern) == expected
+
+    @pytest.mark.parametrize(
+        "pattern",
+        [
+            "exile|destroy",
+            r"\spp",
+            r"\w+",
+            r"\d+",
+            "[Tt]ap",
+            "(?!non)",
+            "ab",
+            "ab+cd",
+            r"\x41bcd",
+            "(?i)abc",
+            "***=abc",
+            "(unclosed",
+            "[unclosed",
+            "*abc",
+        ],
+    )
+    def test_no_literals(self, pattern: str) -> None:
+        """Test that patterns with no safe required literal report none."""
+        assert extract_required_literals(pattern) == []
+
+
+@pytest.mark.parametrize(
+    ("literal", "expected"),
+    [
+        ("draw", "draw"),
+        ("100%", r"100\%"),
+        ("a_b", r"a\_b"),
+        ("a\\b", r"a\\b"),
+    ],
+)
+def test_escape_like(literal: str, expected: str) -> None:
+    """Test that LIKE wildcards in literals are escaped."""
+    assert escape_like(literal) == expected
+
+
+@pytest.mark.parametrize(
+    ("query", "expected"),
+    [
+        ("name:/izzet/", False),
+        ("o:/exile|destroy/", True),
+        ("t:creature o:/\\w+/", True),
+        ("t:creature (o:draw or -o:/[Tt]ap/)", True),
+        ("t:creature o:/draw.*card/", False),
+        ("t:creature", False),
+    ],
+)
+def test_has_unfiltered_regex(query: str, expected: bool) -> None:
+    """Test detection of regexes that can't be narrowed by an index."""
+    assert has_unfiltered_regex(parsing.parse_scryfall_query(query)) is expected
@@ -67,28 +67,50 @@ class TestRegexSQLGeneration:
     """Test SQL generation for regex patterns."""
 
     @pytest.mark.parametrize(
-        ("query", "expected_operator", "expected_pattern"),
+        ("query", "expected_operator", "expected_pattern", "expected_prefilter"),
         [
-            ("name:/izzet/", "~*", "izzet"),
-            ("o:/^{T}:/", "~*", "^{T}:"),
-            (r"name:/\bizzet\b/", "~*", r"\bizzet\b"),
-            ("flavor:/.*flavor.*/", "~*", ".*flavor.*"),
+            ("name:/izzet/", "~*", "izzet", "%izzet%"),
+            ("o:/^{T}:/", "~*", "^{T}:", "%{T}:%"),
+            (r"name:/\bizzet\b/", "~*", r"\bizzet\b", "%izzet%"),
+            ("flavor:/.*flavor.*/", "~*", ".*flavor.*", "%flavor%"),
         ],
     )
-    def test_regex_sql_generation(self, query: str, expected_operator: str, expected_pattern: str) -> None:
+    def test_regex_sql_generation(
+        self,
+        query: str,
+        expected_operator: str,
+        expected_pattern: str,
+        expected_prefilter: str,
+    ) -> None:
         """Test that regex patterns generate correct PostgreSQL regex SQL."""
         result = parsing.parse_scryfall_query(query)
         sql, params = generate_sql_query(result)
 
         # Should use PostgreSQL case-insensitive regex operator
         assert expected_operator in sql
-        # Should not use ILIKE operator
-        assert "ILIKE" not in sql
+        # Should prefilter on the required literal with ILIKE so trigram indexes can be used
+        assert "ILIKE" in sql
+
+        # Should have the regex pattern and the prefilter pattern as parameters
+        assert sorted(params.values()) == sorted([expected_pattern, expected_prefilter])
+
+    @pytest.mark.parametrize(
+        "query",
+        [
+            "o:/exile|destroy/",
+            r"o:/\spp/",
+            r"o:/\w+/",
+            "o:/[Tt]ap/",
+            "o:/(?!non)/",
+        ],
+    )
+    def test_regex_without_literals_has_no_prefilter(self, query: str) -> None:
+        """Test that regexes with no required literal only use the regex operator."""
+        result = parsing.parse_scryfall_query(query)
+        sql, params = generate_sql_query(result)
 
-        # Should have exactly one parameter containing the regex pattern
+        assert "ILIKE" not in sql
         assert len(params) == 1
-        param_value = next(iter(params.values()))
-        assert param_value == expected_pattern
 
     def test_regex_on_name_attribute(self) -> None:
         """Test regex on name attribute generates correct SQL."""
@@ -96,7 +118,8 @@ class TestRegexSQLGeneration:
         sql, params = generate_sql_query(result)
 
         assert "card.card_name ~*" in sql
-        assert len(params) == 1
+        assert "card.card_name ILIKE" in sql
+        assert len(params) == 2
         assert r"\bizzet\b" in params.values()
 
     def test_regex_on_oracle_attribute(self) -> None:
@@ -105,7 +128,8 @@ class TestRegexSQLGeneration:
         sql, params = generate_sql_query(result)
 
         assert "card.oracle_text ~*" in sql
-        assert len(params) == 1
+        assert "card.oracle_text ILIKE" in sql
+        assert len(params) == 2
         assert "^{T}:" in params.values()
 
     def test_regex_on_flavor_attribute(self) -> None:
@@ -114,7 +138,8 @@ class TestRegexSQLGeneration:
         sql, params = generate_sql_query(result)
 
         assert "card.flavor_text ~*" in sql
-        assert len(params) == 1
+        assert "card.flavor_text ILIKE" in sql
+        assert len(params) == 2
         assert "magic" in params.values()
 
     def test_combined_regex_and_text_search_sql(self) -> None:
@@ -126,8 +151,8 @@ class TestRegexSQLGeneration:
         assert "card.card_types" in sql
         assert "card.oracle_text ~*" in sql
 
-        # Should have two parameters
-        assert len(params) == 2
+        # Should have the type parameter plus the regex and its prefilter
+        assert len(params) == 3
 
     def test_regular_text_search_still_uses_ilike(self) -> None:
         """Test that regular text searches still use ILIKE, not regex."""
@@ -232,5 +257,5 @@ class TestRegexSupportedAttributes:
         assert expected_attribute in sql
         # Should use regex operator
         assert "~*" in sql
-        # Should have exactly one parameter
-        assert len(params) == 1
+        # Should have the regex parameter and its literal prefilter
+        assert sorted(params.values()) == ["%test%", "test"]
@@ -115,18 +115,18 @@ def test_full_sql_translation(input_query: str, expected_sql: str, expected_para
         # devotion tests
         (
             "devotion:{G}",
-            r"(card.devotion @> %(p_dict_eydHJzogWzFdfQ)s)",
-            {"p_dict_eydHJzogWzFdfQ": {"G": [1]}},
+            r"(card.devotion_g >= %(p_int_MQ)s)",
+            {"p_int_MQ": 1},
         ),
         (
             "devotion>={G}",
-            r"(card.devotion @> %(p_dict_eydHJzogWzFdfQ)s)",
-            {"p_dict_eydHJzogWzFdfQ": {"G": [1]}},
+            r"(card.devotion_g >= %(p_int_MQ)s)",
+            {"p_int_MQ": 1},
         ),
         (
             "devotion>={G}{R}",
-            r"(card.devotion @> %(p_dict_eydSJzogWzFdLCAnRyc6IFsxXX0)s)",
-            {"p_dict_eydSJzogWzFdLCAnRyc6IFsxXX0": {"G": [1], "R": [1]}},
+            r"(card.devotion_r >= %(p_int_MQ)s AND card.devotion_g >= %(p_int_MQ)s)",
+            {"p_int_MQ": 1},
         ),
     ],
 )
@@ -401,6 +401,49 @@ def test_oracle_tag_sql_translation(input_query: str, expected_sql: str, expecte
     assert context == expected_parameters, f"\nExpected params: {expected_parameters}\nObserved params: {context}"
 
 
+@pytest.mark.parametrize(
+    argnames=("input_query", "expected_sql", "expected_parameters"),
+    argvalues=[
+        # The tag or any of its descendants, resolved through the tag closure
+        (
+            "otagtree:ramp",
+            r"(card.card_oracle_tags ?| ARRAY(SELECT %(p_str_cmFtcA)s::text UNION ALL "
+            r"SELECT descendant FROM magic.tag_closure WHERE ancestor = %(p_str_cmFtcA)s))",
+            {"p_str_cmFtcA": "ramp"},
+        ),
+        # Hyphenated and mixed case tags with the long alias
+        (
+            "oracle_tag_tree:Mana-Rock",
+            r"(card.card_oracle_tags ?| ARRAY(SELECT %(p_str_bWFuYS1yb2Nr)s::text UNION ALL "
+            r"SELECT descendant FROM magic.tag_closure WHERE ancestor = %(p_str_bWFuYS1yb2Nr)s))",
+            {"p_str_bWFuYS1yb2Nr": "mana-rock"},
+        ),
+        # Negated
+        (
+            "-otagtree:ramp",
+            r"NOT ((card.card_oracle_tags ?| ARRAY(SELECT %(p_str_cmFtcA)s::text UNION ALL "
+            r"SELECT descendant FROM magic.tag_closure WHERE ancestor = %(p_str_cmFtcA)s)))",
+            {"p_str_cmFtcA": "ramp"},
+        ),
+    ],
+)
+def test_oracle_tag_tree_sql_translation(input_query: str, expected_sql: str, expected_parameters: dict) -> None:
+    """Test that descendant-aware oracle tag search tests the whole subtree with one ?| array check."""
+    parsed = parsing.parse_scryfall_query(input_query)
+    context = {}
+    observed_sql = parsed.to_sql(context)
+    assert observed_sql == expected_sql, f"\nExpected: {expected_sql}\nObserved: {observed_sql}"
+    assert context == expected_parameters, f"\nExpected params: {expected_parameters}\nObserved params: {context}"
+
+
+def test_oracle_tag_tree_rejects_other_operators() -> None:
+    """Test that descendant-aware oracle tag search only supports inclusion."""
+    parsed = parsing.parse_scryfall_query("otagtree=ramp")
+
+    with pytest.raises(ValueError, match="Oracle tag trees only support the : operator"):
+        generate_sql_query(parsed)
+
+
 @pytest.mark.parametrize(
     argnames=("input_query", "expected_sql", "expected_parameters"),
     argvalues=[
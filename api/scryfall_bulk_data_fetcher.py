@@ -1,18 +1,41 @@
 """Fetcher for Scryfall bulk data."""
 
+from __future__ import annotations
+
+import datetime as dt
+import email.utils
+import io
 import logging
+import os
 import pathlib
+import threading
 import time
 from enum import StrEnum
+from http import HTTPStatus
+from typing import TYPE_CHECKING, Any
 
 import orjson
 import requests
 import zstandard as zstd
-from cachebox import TTLCache
-from cachebox import cached as cachebox_cached
+
+from api.settings import settings
+from api.utils.json_stream import iter_json_array
+from api.utils.rate_limiter import TokenBucket, get_retry_after_seconds
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
 
 logger = logging.getLogger(__name__)
 MINUTE = 60
+DOWNLOAD_CHUNK_SIZE = 1 << 20
+# the download is compressed into one zstd frame per this many bytes, the granularity of resumes
+DOWNLOAD_FRAME_BYTES = 64 << 20
+DOWNLOAD_ATTEMPTS = 3
+BULK_DATA_URI = "https://api.scryfall.com/bulk-data"
+CATALOG_FILE_NAME = "bulk_data_catalog.json"
+# a catalog older than this is refreshed in the background, at most once per CATALOG_RETRY_SECONDS
+CATALOG_TTL_SECONDS = 5 * MINUTE
+CATALOG_RETRY_SECONDS = MINUTE
 
 
 class BulkDataKey(StrEnum):
@@ -28,86 +51,342 @@ class BulkDataKey(StrEnum):
 class ScryfallBulkDataFetcher:
     """Fetches bulk data from Scryfall."""
 
-    def __init__(self) -> None:
-        """Initialize the fetcher."""
+    def __init__(self, *, rate_limiter: TokenBucket | None = None) -> None:
+        """Initialize the fetcher.
+
+        Args:
+            rate_limiter: Limiter for requests to the Scryfall API, shared with its other clients.
+                Downloads of the exports themselves come from Scryfall's file servers, which have no
+                rate limit.
+        """
         self.cache_directory = pathlib.Path("/data/api")
         if not self.cache_directory.exists():
             self.cache_directory = pathlib.Path("/tmp/api")  # noqa: S108
             self.cache_directory.mkdir(parents=True, exist_ok=True)
         self.session = requests.Session()
+        self.rate_limiter = rate_limiter or TokenBucket(rate=settings.scryfall_requests_per_second)
+        self._catalog: dict[BulkDataKey, dict] | None = None
+        self._catalog_fetched_at = 0.0
+        self._catalog_attempted_at = 0.0
+        self._catalog_lock = threading.Lock()
+        self._catalog_refresh: threading.Thread | None = None
+
+    @property
+    def catalog_path(self) -> pathlib.Path:
+        """Where the last fetched catalog is persisted, next to the cached exports."""
+        return self.cache_directory / CATALOG_FILE_NAME
 
-    @cachebox_cached(cache=TTLCache(maxsize=2, ttl=5 * MINUTE))
     def list_bulk_data(self) -> dict[BulkDataKey, dict]:
-        """Fetch bulk data from Scryfall."""
-        return {BulkDataKey(r["type"]): r for r in self.session.get("https://api.scryfall.com/bulk-data", timeout=5).json()["data"]}
+        """Return the catalog of Scryfall's bulk exports, without waiting on Scryfall if a copy is at hand.
+
+        The catalog is kept in memory and persisted next to the cached exports, so a restarted
+        process (or another worker) picks it up. A catalog older than CATALOG_TTL_SECONDS is
+        still returned, and refreshed in a background thread. Scryfall is only waited on when
+        there is no catalog at all.
+
+        Raises:
+            requests.RequestException: If there is no catalog and Scryfall can't be reached.
+        """
+        age = self.catalog_age_seconds()
+        if age is None or age >= CATALOG_TTL_SECONDS:
+            # another process may have refreshed it
+            self._load_persisted_catalog()
+            age = self.catalog_age_seconds()
+        if age is None:
+            return self.refresh_catalog()
+        if age >= CATALOG_TTL_SECONDS:
+            self._refresh_catalog_in_background()
+        return self._catalog
+
+    def refresh_catalog(self) -> dict[BulkDataKey, dict]:
+        """Fetch the catalog from Scryfall and persist it next to the cached exports."""
+        self._catalog_attempted_at = time.time()
+        self.rate_limiter.acquire()
+        response = self.session.get(BULK_DATA_URI, timeout=5)
+        if response.status_code == HTTPStatus.TOO_MANY_REQUESTS:
+            # holds back every Scryfall request sharing the limiter, not only the next refresh
+            self.rate_limiter.back_off(get_retry_after_seconds(response.headers.get("Retry-After")))
+        response.raise_for_status()
+        data = response.json()["data"]
+        fetched_at = time.time()
+        self._set_catalog(data, fetched_at)
+        # written aside and renamed, so other processes never read a partial catalog
+        temporary_path = self.catalog_path.with_name(f"{CATALOG_FILE_NAME}.{os.getpid()}.{threading.get_ident()}")
+        temporary_path.write_bytes(orjson.dumps({"fetched_at": fetched_at, "data": data}))
+        temporary_path.replace(self.catalog_path)
+        return self._catalog
+
+    def catalog_age_seconds(self) -> float | None:
+        """Seconds since the catalog in use was fetched from Scryfall, None if there is none yet."""
+        if self._catalog is None:
+            return None
+        return time.time() - self._catalog_fetched_at
+
+    def _set_catalog(self, data: list[dict], fetched_at: float) -> None:
+        """Use a catalog fetched at fetched_at, unless the one in use is newer."""
+        with self._catalog_lock:
+            if self._catalog is None or fetched_at > self._catalog_fetched_at:
+                self._catalog = {BulkDataKey(r["type"]): r for r in data}
+                self._catalog_fetched_at = fetched_at
+
+    def _load_persisted_catalog(self) -> None:
+        """Use the persisted catalog if it's newer than the one in use."""
+        try:
+            persisted = orjson.loads(self.catalog_path.read_bytes())
+        except (FileNotFoundError, orjson.JSONDecodeError):
+            return
+        self._set_catalog(persisted["data"], persisted["fetched_at"])
+
+    def _refresh_catalog_in_background(self) -> None:
+        """Start refreshing the catalog in a thread, unless one is running or an attempt was just made."""
+        with self._catalog_lock:
+            if self._catalog_refresh is not None and self._catalog_refresh.is_alive():
+                return
+            if time.time() - self._catalog_attempted_at < CATALOG_RETRY_SECONDS:
+                return
+            self._catalog_attempted_at = time.time()
+            self._catalog_refresh = threading.Thread(target=self._refresh_catalog_quietly, name="catalog-refresh", daemon=True)
+            self._catalog_refresh.start()
+
+    def _refresh_catalog_quietly(self) -> None:
+        """Refresh the catalog, logging rather than raising if Scryfall can't be reached."""
+        try:
+            self.refresh_catalog()
+        except (requests.RequestException, OSError, KeyError, ValueError) as oops:
+            logger.warning("Failed to refresh the bulk data catalog (%.0f seconds old): %s", self.catalog_age_seconds(), oops)
 
     def get_download_uri_for_key(self, data_key: BulkDataKey) -> str:
         """Get the download URI for a given data key."""
         return self.list_bulk_data()[data_key]["download_uri"]
 
+    def get_updated_at_for_key(self, data_key: BulkDataKey) -> str:
+        """Get when Scryfall last regenerated the export for a given data key, as an ISO 8601 timestamp."""
+        return self.list_bulk_data()[data_key]["updated_at"]
+
     def get_data_for_key(self, data_key: BulkDataKey) -> list[dict]:
-        """Get the data for a given data key."""
-
-        def _load_data(decompressed_data: bytes) -> list[dict]:
-            """Load data from a bytes object."""
-            before = time.monotonic()
-            data = orjson.loads(decompressed_data)
-            logger.info(
-                "Parsed %d bytes to objects in %.3f seconds using orjson",
-                len(decompressed_data),
-                time.monotonic() - before,
-            )
-            return data
-
-        download_uri = self.get_download_uri_for_key(data_key)
+        """Get the data for a given data key, fully loaded into memory.
+
+        Fine for the smaller exports; use iter_data_for_key for the card exports.
+        """
+        cache_file_path = self.get_cache_file_for_key(data_key)
+        before = time.monotonic()
+        with cache_file_path.open("rb") as f, zstd.ZstdDecompressor().stream_reader(f, read_across_frames=True) as reader:
+            decompressed_data = reader.readall()
+        logger.info(
+            "Decompressed %d bytes from %s in %.3f seconds",
+            len(decompressed_data),
+            cache_file_path,
+            time.monotonic() - before,
+        )
+        before = time.monotonic()
+        data = orjson.loads(decompressed_data)
+        logger.info(
+            "Parsed %d bytes to objects in %.3f seconds using orjson",
+            len(decompressed_data),
+            time.monotonic() - before,
+        )
+        return data
+
+    def iter_data_for_key(self, data_key: BulkDataKey) -> Iterator[dict]:
+        """Stream the objects of a bulk export one at a time.
+
+        The cached file is decompressed as a stream and the JSON array parsed incrementally,
+        so memory use stays bounded however large the export is (including ALL_CARDS).
+        """
+        cache_file_path = self.get_cache_file_for_key(data_key)
+        with (
+            cache_file_path.open("rb") as f,
+            zstd.ZstdDecompressor().stream_reader(f, read_across_frames=True) as reader,
+            io.TextIOWrapper(reader, encoding="utf-8") as text_reader,
+        ):
+            yield from iter_json_array(text_reader)
+
+    def get_cache_file_for_key(self, data_key: BulkDataKey) -> pathlib.Path:
+        """Return the local zstd-compressed copy of a bulk export, downloading it first if needed.
+
+        A cached copy at least as new as the export's updated_at is reused without downloading,
+        and the download itself is conditional on the cached copy being out of date. Files of
+        older exports are only pruned once the new one has been downloaded and verified.
+
+        If Scryfall can't be reached, for the catalog or the download, the newest cached copy is
+        used instead, however old it is.
+        """
+        try:
+            bulk_data = self.list_bulk_data()[data_key]
+        except requests.RequestException as oops:
+            return self._fall_back_to_cache_file(self.cache_directory / data_key, oops)
+        download_uri = bulk_data["download_uri"]
+        updated_at = dt.datetime.fromisoformat(bulk_data["updated_at"]).timestamp()
         suffix = download_uri.rpartition("/")[-1]
         cache_file_path = self.cache_directory / data_key / suffix
         cache_file_path = cache_file_path.with_suffix(".json.zstd")
         cache_file_path.parent.mkdir(parents=True, exist_ok=True)
-        # if it exists, load and return
+        if cache_file_path.exists():
+            return cache_file_path
+
+        previous_path = self._get_latest_cache_file(cache_file_path.parent)
+        if previous_path is not None and previous_path.stat().st_mtime >= updated_at:
+            logger.info("%s is already as new as the export (updated %s)", previous_path, bulk_data["updated_at"])
+            return previous_path
+
         try:
-            with cache_file_path.open("rb") as f:
-                before = time.monotonic()
-                compressed_data = f.read()
-                logger.info(
-                    "Read %d bytes from %s in %.3f seconds",
-                    len(compressed_data),
-                    cache_file_path,
-                    time.monotonic() - before,
-                )
-
-            # decompress
-            before = time.monotonic()
-            decompressed_data = zstd.decompress(compressed_data)
-            logger.info(
-                "Decompressed %d bytes from %s in %.3f seconds",
-                len(decompressed_data),
-                cache_file_path,
-                time.monotonic() - before,
-            )
-            return _load_data(decompressed_data)
-        except FileNotFoundError:
-            pass
+            downloaded = self._download_compressed(download_uri, cache_file_path, previous_path)
+        except requests.RequestException as oops:
+            return self._fall_back_to_cache_file(cache_file_path.parent, oops)
+        if not downloaded:
+            logger.info("%s was not modified since %s was downloaded", download_uri, previous_path)
+            os.utime(previous_path, (time.time(), updated_at))
+            return previous_path
 
+        # the file's mtime records which export it holds, for the checks above on later calls
+        os.utime(cache_file_path, (time.time(), updated_at))
         # prune other files from the directory - they've been superseded
         for ifile in cache_file_path.parent.iterdir():
-            ifile.unlink()
+            if ifile != cache_file_path:
+                ifile.unlink()
+        return cache_file_path
+
+    def _fall_back_to_cache_file(self, directory: pathlib.Path, oops: requests.RequestException) -> pathlib.Path:
+        """Return the newest cached export in directory when Scryfall can't be reached, re-raising oops if there is none."""
+        fallback_path = self._get_latest_cache_file(directory)
+        if fallback_path is None:
+            raise oops
+        logger.warning("Can't reach Scryfall (%s), using the cached export %s", oops, fallback_path)
+        return fallback_path
+
+    @staticmethod
+    def _get_latest_cache_file(directory: pathlib.Path) -> pathlib.Path | None:
+        """Return the most recently updated complete cache file in directory, if there is one."""
+        cache_files = list(directory.glob("*.json.zstd"))
+        return max(cache_files, key=lambda path: path.stat().st_mtime, default=None)
 
-        # if it doesn't exist, download and cache
+    def _download_compressed(self, download_uri: str, cache_file_path: pathlib.Path, previous_path: pathlib.Path | None) -> bool:
+        """Stream a download through a zstd compressor into cache_file_path.
+
+        The download is written to a partial file, one zstd frame per DOWNLOAD_FRAME_BYTES of
+        the export, with a checkpoint recording where the last complete frame ends. An
+        interrupted download is resumed from that checkpoint with a Range request, both by the
+        retries here and by later calls. Only a complete, verified download is moved to
+        cache_file_path.
+
+        Args:
+            download_uri: URI of the export.
+            cache_file_path: Where to store the compressed export.
+            previous_path: A cached copy of an older export; the download is skipped if the
+                server reports the export unchanged since then.
+
+        Returns:
+            True if the export was downloaded, False if it wasn't modified since previous_path.
+        """
         before = time.monotonic()
-        response = self.session.get(download_uri, timeout=30)
-        response.raise_for_status()
+        partial_path = cache_file_path.with_name(f"{cache_file_path.name}.partial")
+        checkpoint_path = cache_file_path.with_name(f"{cache_file_path.name}.checkpoint")
+        for attempt in range(1, DOWNLOAD_ATTEMPTS + 1):
+            checkpoint = self._read_checkpoint(checkpoint_path, partial_path, download_uri)
+            # the bytes as stored, so the bytes counted, Content-Length and Range offsets all agree
+            headers = {"Accept-Encoding": "identity"}
+            if checkpoint["raw_bytes"] and checkpoint["validator"]:
+                headers |= {"Range": f"bytes={checkpoint['raw_bytes']}-", "If-Range": checkpoint["validator"]}
+            elif previous_path is not None:
+                headers["If-Modified-Since"] = email.utils.formatdate(previous_path.stat().st_mtime, usegmt=True)
+            try:
+                with self.session.get(download_uri, headers=headers, timeout=30, stream=True) as response:
+                    if response.status_code == HTTPStatus.NOT_MODIFIED:
+                        return False
+                    response.raise_for_status()
+                    expected_bytes = self._write_frames(response, partial_path, checkpoint_path, checkpoint)
+            except requests.RequestException as oops:
+                if attempt == DOWNLOAD_ATTEMPTS:
+                    raise
+                logger.warning("Download of %s interrupted (attempt %d): %s, resuming", download_uri, attempt, oops)
+                continue
+            break
+
+        self._verify_download(partial_path, checkpoint_path, expected_bytes)
+        # only a complete download ever appears under the final name
+        partial_path.replace(cache_file_path)
+        checkpoint_path.unlink()
         logger.info(
             "Downloaded %d bytes from %s in %.3f seconds",
-            len(response.content),
+            expected_bytes,
             download_uri,
             time.monotonic() - before,
         )
-        compressed_data = zstd.compress(data=response.content)
-        with cache_file_path.open("wb") as f:
-            f.write(compressed_data)
+        return True
+
+    @staticmethod
+    def _read_checkpoint(checkpoint_path: pathlib.Path, partial_path: pathlib.Path, download_uri: str) -> dict[str, Any]:
+        """Read the checkpoint of a partial download of download_uri, or an empty one to start over."""
+        try:
+            checkpoint = orjson.loads(checkpoint_path.read_bytes())
+        except (FileNotFoundError, orjson.JSONDecodeError):
+            checkpoint = None
+        if not checkpoint or checkpoint["download_uri"] != download_uri or not partial_path.exists():
+            return {"download_uri": download_uri, "validator": None, "raw_bytes": 0, "compressed_bytes": 0}
+        return checkpoint
+
+    @staticmethod
+    def _write_frames(
+        response: requests.Response,
+        partial_path: pathlib.Path,
+        checkpoint_path: pathlib.Path,
+        checkpoint: dict[str, Any],
+    ) -> int:
+        """Compress a download response into partial_path, checkpointing after every frame.
+
+        Returns:
+            The size of the whole export in bytes.
+        """
+        if response.status_code == HTTPStatus.PARTIAL_CONTENT:
+            # resuming: drop whatever was written after the last complete frame
+            total_bytes = response.headers["Content-Range"].rpartition("/")[-1]
+            mode = "r+b"
+        else:
+            # a full response, either a fresh download or the export changed since the checkpoint
+            checkpoint.update(raw_bytes=0, compressed_bytes=0)
+            total_bytes = response.headers.get("Content-Length", "*")
+            mode = "wb"
+        checkpoint["validator"] = response.headers.get("ETag") or response.headers.get("Last-Modified")
+
+        compressor = zstd.ZstdCompressor()
+        with partial_path.open(mode) as f:
+            f.truncate(checkpoint["compressed_bytes"])
+            f.seek(checkpoint["compressed_bytes"])
+            checkpoint_path.write_bytes(orjson.dumps(checkpoint))
+            with compressor.stream_writer(f, closefd=False) as writer:
+                frame_bytes = 0
+                for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                    writer.write(chunk)
+                    checkpoint["raw_bytes"] += len(chunk)
+                    frame_bytes += len(chunk)
+                    if frame_bytes >= DOWNLOAD_FRAME_BYTES:
+                        writer.flush(zstd.FLUSH_FRAME)
+                        f.flush()
+                        checkpoint["compressed_bytes"] = f.tell()
+                        checkpoint_path.write_bytes(orjson.dumps(checkpoint))
+                        frame_bytes = 0
+        return checkpoint["raw_bytes"] if total_bytes == "*" else int(total_bytes)
+
+    @staticmethod
+    def _verify_download(partial_path: pathlib.Path, checkpoint_path: pathlib.Path, expected_bytes: int) -> None:
+        """Check a finished download decompresses to expected_bytes of a JSON array.
 
-        return _load_data(response.content)
+        Raises:
+            ValueError: If the download is truncated or isn't a JSON array. The partial file and
+                its checkpoint are removed, so the next attempt starts over.
+        """
+        num_bytes = 0
+        first = last = b""
+        with partial_path.open("rb") as f, zstd.ZstdDecompressor().stream_reader(f, read_across_frames=True) as reader:
+            while chunk := reader.read(DOWNLOAD_CHUNK_SIZE):
+                first = first or chunk.lstrip()[:1]
+                last = chunk.rstrip()[-1:] or last
+                num_bytes += len(chunk)
+        if num_bytes != expected_bytes or (first, last) != (b"[", b"]"):
+            partial_path.unlink()
+            checkpoint_path.unlink()
+            msg = f"Download to {partial_path} is incomplete: {num_bytes} of {expected_bytes} bytes"
+            raise ValueError(msg)
 
 
 def main() -> None:
@@ -25,6 +25,12 @@ class Settings:
     def __init__(self) -> None:
         """Initialize settings from environment variables."""
         self._enable_cache = _is_truthy(os.environ.get("ENABLE_CACHE", "false"))
+        self._bulk_data_key = os.environ.get("BULK_DATA_KEY", "default_cards")
+        self._full_reload = _is_truthy(os.environ.get("FULL_RELOAD", "false"))
+        self._import_interval_hours = float(os.environ.get("IMPORT_INTERVAL_HOURS", "24"))
+        self._price_refresh_hours = float(os.environ.get("PRICE_REFRESH_HOURS", "6"))
+        self._scryfall_requests_per_second = float(os.environ.get("SCRYFALL_REQUESTS_PER_SECOND", "10"))
+        self._tag_fetch_workers = int(os.environ.get("TAG_FETCH_WORKERS", "8"))
 
     @property
     def enable_cache(self) -> bool:
@@ -36,6 +42,36 @@ class Settings:
         """Set caching enabled state."""
         self._enable_cache = value
 
+    @property
+    def bulk_data_key(self) -> str:
+        """Scryfall bulk export imported into magic.cards (default_cards, or all_cards for every language)."""
+        return self._bulk_data_key
+
+    @property
+    def full_reload(self) -> bool:
+        """Check if imports rebuild magic.cards in a fresh table and swap it in, instead of upserting changed printings."""
+        return self._full_reload
+
+    @property
+    def import_interval_hours(self) -> float:
+        """Hours after which the background importer re-imports, even if the bulk export looks unchanged."""
+        return self._import_interval_hours
+
+    @property
+    def price_refresh_hours(self) -> float:
+        """Hours between the background importer's price-only refreshes, between full imports (0 disables them)."""
+        return self._price_refresh_hours
+
+    @property
+    def scryfall_requests_per_second(self) -> float:
+        """Requests per second made to the Scryfall API, shared by every concurrent fetch of a worker."""
+        return self._scryfall_requests_per_second
+
+    @property
+    def tag_fetch_workers(self) -> int:
+        """Tags fetched at once by tag imports."""
+        return self._tag_fetch_workers
+
 
 # Global settings instance
 settings = Settings()
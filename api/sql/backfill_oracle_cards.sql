@@ -0,0 +1,89 @@
+-- Refresh magic.oracle_cards from the printings in magic.cards, one row per oracle_id
+-- Adds the oracle cards of printings loaded outside the oracle_cards bulk export, and updates
+-- oracle cards whose printings changed (a ban, an errata, a new EDHREC rank), so searches routed
+-- through the oracle table match what they would find in magic.cards. Rows that are already up
+-- to date are left alone.
+
+INSERT INTO magic.oracle_cards AS oracle_card (
+    oracle_id, cmc, creature_power, creature_toughness, planeswalker_loyalty, edhrec_rank,
+    card_name, oracle_text, type_line, mana_cost_text, mana_cost_jsonb, devotion,
+    card_types, card_subtypes, card_colors, card_color_identity, card_keywords, produced_mana, card_legalities,
+    creature_power_text, creature_toughness_text, planeswalker_loyalty_text,
+    mana_pips_w, mana_pips_u, mana_pips_b, mana_pips_r, mana_pips_g, mana_pips_c,
+    mana_generic, mana_hybrid, mana_phyrexian, mana_other_symbols,
+    devotion_w, devotion_u, devotion_b, devotion_r, devotion_g, devotion_c
+)
+SELECT DISTINCT ON (card.oracle_id)
+    card.oracle_id, card.cmc, card.creature_power, card.creature_toughness, card.planeswalker_loyalty, card.edhrec_rank,
+    card.card_name, card.oracle_text, card.type_line, card.mana_cost_text, card.mana_cost_jsonb, card.devotion,
+    card.card_types, card.card_subtypes, card.card_colors, card.card_color_identity, card.card_keywords,
+    card.produced_mana, card.card_legalities,
+    card.creature_power_text, card.creature_toughness_text, card.planeswalker_loyalty_text,
+    card.mana_pips_w, card.mana_pips_u, card.mana_pips_b, card.mana_pips_r, card.mana_pips_g, card.mana_pips_c,
+    card.mana_generic, card.mana_hybrid, card.mana_phyrexian, card.mana_other_symbols,
+    card.devotion_w, card.devotion_u, card.devotion_b, card.devotion_r, card.devotion_g, card.devotion_c
+FROM magic.cards AS card
+WHERE
+    card.oracle_id IS NOT NULL
+ORDER BY card.oracle_id, card.prefer_score DESC NULLS LAST, card.scryfall_id
+ON CONFLICT (oracle_id) DO UPDATE SET
+    cmc = EXCLUDED.cmc,
+    creature_power = EXCLUDED.creature_power,
+    creature_toughness = EXCLUDED.creature_toughness,
+    planeswalker_loyalty = EXCLUDED.planeswalker_loyalty,
+    edhrec_rank = EXCLUDED.edhrec_rank,
+    card_name = EXCLUDED.card_name,
+    oracle_text = EXCLUDED.oracle_text,
+    type_line = EXCLUDED.type_line,
+    mana_cost_text = EXCLUDED.mana_cost_text,
+    mana_cost_jsonb = EXCLUDED.mana_cost_jsonb,
+    devotion = EXCLUDED.devotion,
+    card_types = EXCLUDED.card_types,
+    card_subtypes = EXCLUDED.card_subtypes,
+    card_colors = EXCLUDED.card_colors,
+    card_color_identity = EXCLUDED.card_color_identity,
+    card_keywords = EXCLUDED.card_keywords,
+    produced_mana = EXCLUDED.produced_mana,
+    card_legalities = EXCLUDED.card_legalities,
+    creature_power_text = EXCLUDED.creature_power_text,
+    creature_toughness_text = EXCLUDED.creature_toughness_text,
+    planeswalker_loyalty_text = EXCLUDED.planeswalker_loyalty_text,
+    mana_pips_w = EXCLUDED.mana_pips_w,
+    mana_pips_u = EXCLUDED.mana_pips_u,
+    mana_pips_b = EXCLUDED.mana_pips_b,
+    mana_pips_r = EXCLUDED.mana_pips_r,
+    mana_pips_g = EXCLUDED.mana_pips_g,
+    mana_pips_c = EXCLUDED.mana_pips_c,
+    mana_generic = EXCLUDED.mana_generic,
+    mana_hybrid = EXCLUDED.mana_hybrid,
+    mana_phyrexian = EXCLUDED.mana_phyrexian,
+    mana_other_symbols = EXCLUDED.mana_other_symbols,
+    devotion_w = EXCLUDED.devotion_w,
+    devotion_u = EXCLUDED.devotion_u,
+    devotion_b = EXCLUDED.devotion_b,
+    devotion_r = EXCLUDED.devotion_r,
+    devotion_g = EXCLUDED.devotion_g,
+    devotion_c = EXCLUDED.devotion_c
+WHERE
+    (
+        oracle_card.cmc, oracle_card.creature_power, oracle_card.creature_toughness, oracle_card.planeswalker_loyalty,
+        oracle_card.edhrec_rank, oracle_card.card_name, oracle_card.oracle_text, oracle_card.type_line,
+        oracle_card.mana_cost_text, oracle_card.mana_cost_jsonb, oracle_card.devotion, oracle_card.card_types,
+        oracle_card.card_subtypes, oracle_card.card_colors, oracle_card.card_color_identity, oracle_card.card_keywords,
+        oracle_card.produced_mana, oracle_card.card_legalities, oracle_card.creature_power_text,
+        oracle_card.creature_toughness_text, oracle_card.planeswalker_loyalty_text, oracle_card.mana_pips_w,
+        oracle_card.mana_pips_u, oracle_card.mana_pips_b, oracle_card.mana_pips_r, oracle_card.mana_pips_g,
+        oracle_card.mana_pips_c, oracle_card.mana_generic, oracle_card.mana_hybrid, oracle_card.mana_phyrexian,
+        oracle_card.mana_other_symbols, oracle_card.devotion_w, oracle_card.devotion_u, oracle_card.devotion_b,
+        oracle_card.devotion_r, oracle_card.devotion_g, oracle_card.devotion_c
+    ) IS DISTINCT FROM (
+        EXCLUDED.cmc, EXCLUDED.creature_power, EXCLUDED.creature_toughness, EXCLUDED.planeswalker_loyalty,
+        EXCLUDED.edhrec_rank, EXCLUDED.card_name, EXCLUDED.oracle_text, EXCLUDED.type_line, EXCLUDED.mana_cost_text,
+        EXCLUDED.mana_cost_jsonb, EXCLUDED.devotion, EXCLUDED.card_types, EXCLUDED.card_subtypes, EXCLUDED.card_colors,
+        EXCLUDED.card_color_identity, EXCLUDED.card_keywords, EXCLUDED.produced_mana, EXCLUDED.card_legalities,
+        EXCLUDED.creature_power_text, EXCLUDED.creature_toughness_text, EXCLUDED.planeswalker_loyalty_text,
+        EXCLUDED.mana_pips_w, EXCLUDED.mana_pips_u, EXCLUDED.mana_pips_b, EXCLUDED.mana_pips_r, EXCLUDED.mana_pips_g,
+        EXCLUDED.mana_pips_c, EXCLUDED.mana_generic, EXCLUDED.mana_hybrid, EXCLUDED.mana_phyrexian,
+        EXCLUDED.mana_other_symbols, EXCLUDED.devotion_w, EXCLUDED.devotion_u, EXCLUDED.devotion_b,
+        EXCLUDED.devotion_r, EXCLUDED.devotion_g, EXCLUDED.devotion_c
+    );
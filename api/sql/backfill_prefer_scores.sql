@@ -1,111 +1,161 @@
--- Backfill prefer_score and prefer_score_components for all cards
--- This script recalculates the prefer score for all existing cards based on multiple attributes
+-- Backfill prefer_score, its component columns and prefer_score_components
+-- Recalculates the prefer score of cards based on multiple attributes. With %(scryfall_ids)s NULL
+-- every card is recalculated; otherwise only the given printings and every printing sharing an
+-- illustration with them or with %(illustration_ids)s (whose illustration counts may have changed).
+-- Only rows whose scores actually change are written.
 
-UPDATE magic.cards update_target_cards
-SET prefer_score_components = JSONB_BUILD_OBJECT(
-    'illustration_count', (
-        SELECT 
-            23 * LN(1 + COUNT(*)) / LN(40)
-        FROM magic.cards query_target_cards
-        WHERE (
-            query_target_cards.illustration_id = update_target_cards.illustration_id AND 
-            query_target_cards.illustration_id IS NOT NULL AND
-            query_target_cards.card_name = update_target_cards.card_name
+WITH affected_cards AS (
+    SELECT
+        scryfall_id, illustration_id, card_name, card_rarity_int, card_border, card_frame_data,
+        card_image_status, card_games, card_lang, card_finishes, card_set_code
+    FROM magic.cards
+    WHERE
+        %(scryfall_ids)s::uuid[] IS NULL OR
+        scryfall_id = ANY(%(scryfall_ids)s::uuid[]) OR
+        illustration_id = ANY(%(illustration_ids)s::uuid[])
+),
+-- how many printings share each illustration, counted once per group rather than once per row
+illustration_counts AS (
+    SELECT
+        illustration_id,
+        card_name,
+        COUNT(*) AS num_cards
+    FROM magic.cards
+    WHERE illustration_id IN (SELECT illustration_id FROM affected_cards)
+    GROUP BY illustration_id, card_name
+),
+scored_components AS (
+    SELECT
+        card.scryfall_id,
+        23 * LN(1 + COALESCE(illustration_counts.num_cards, 0)) / LN(40) AS illustration_count,
+        CASE
+            WHEN card.card_rarity_int = 0 THEN 16  -- common
+            WHEN card.card_rarity_int = 1 THEN 16  -- uncommon
+            WHEN card.card_rarity_int = 2 THEN 11  -- rare
+            WHEN card.card_rarity_int = 3 THEN 0   -- mythic
+            ELSE 0
+        END AS rarity,
+        CASE
+            WHEN card.card_border = 'black' THEN 14
+            WHEN card.card_border = 'white' THEN 0
+            WHEN card.card_border = 'borderless' THEN 0
+            ELSE 0
+        END AS border,
+        CASE
+            WHEN card.card_frame_data ? '2015' THEN 42
+            WHEN card.card_frame_data ? '2003' THEN 30
+            WHEN card.card_frame_data ? '1997' THEN 25
+            WHEN card.card_frame_data ? '1993' THEN 10
+            ELSE 0
+        END AS frame,
+        CASE
+            WHEN card.card_frame_data ? 'Extendedart' THEN 12
+            ELSE 0
+        END AS extended_art,
+        CASE
+            WHEN card.card_image_status = 'highres_scan' THEN 16
+            ELSE 0
+        END AS highres_scan,
+        CASE
+            WHEN card.card_games ? 'paper' THEN 6
+            ELSE 0
+        END AS has_paper,
+        CASE
+            WHEN card.card_lang = 'en' THEN 40
+            ELSE 0
+        END AS language,
+        CASE
+            WHEN card.card_frame_data ? 'Legendary' THEN 5
+            ELSE 0
+        END AS legendary_frame,
+        CASE
+            WHEN NOT (card.card_frame_data ? 'Showcase') THEN 10
+            ELSE 0
+        END AS non_showcase,
+        CASE
+            WHEN card.card_finishes ? 'nonfoil' THEN 10
+            WHEN card.card_finishes ? 'foil' THEN 5
+            WHEN card.card_finishes ? 'etched' THEN 0
+            ELSE 0
+        END AS finish,
+        CASE
+            WHEN card.card_set_code IS NULL OR card.card_set_code NOT IN ('dbl') THEN 20
+            ELSE 0
+        END AS artwork_set
+    FROM affected_cards AS card
+    LEFT JOIN illustration_counts ON
+        illustration_counts.illustration_id = card.illustration_id AND
+        illustration_counts.card_name = card.card_name
+),
+-- each component is kept in its own column, for query-time weighting (prefer=custom), and in
+-- prefer_score_components; prefer_score is the sum of all component values
+scored_cards AS (
+    SELECT
+        scryfall_id,
+        illustration_count::real AS prefer_illustration_count,
+        rarity::real AS prefer_rarity,
+        border::real AS prefer_border,
+        frame::real AS prefer_frame,
+        extended_art::real AS prefer_extended_art,
+        highres_scan::real AS prefer_highres_scan,
+        has_paper::real AS prefer_has_paper,
+        language::real AS prefer_language,
+        legendary_frame::real AS prefer_legendary_frame,
+        non_showcase::real AS prefer_non_showcase,
+        finish::real AS prefer_finish,
+        artwork_set::real AS prefer_artwork_set,
+        JSONB_BUILD_OBJECT(
+            'illustration_count', illustration_count,
+            'rarity', rarity,
+            'border', border,
+            'frame', frame,
+            'extended_art', extended_art,
+            'highres_scan', highres_scan,
+            'has_paper', has_paper,
+            'language', language,
+            'legendary_frame', legendary_frame,
+            'non_showcase', non_showcase,
+            'finish', finish,
+            'artwork_set', artwork_set
+        ) AS prefer_score_components
+    FROM scored_components
+),
+scored_totals AS (
+    SELECT
+        *,
+        (SELECT SUM(value::numeric) FROM JSONB_EACH(prefer_score_components))::real AS prefer_score
+    FROM scored_cards
+)
+UPDATE magic.cards AS card
+SET
+    prefer_illustration_count = scored_cards.prefer_illustration_count,
+    prefer_rarity = scored_cards.prefer_rarity,
+    prefer_border = scored_cards.prefer_border,
+    prefer_frame = scored_cards.prefer_frame,
+    prefer_extended_art = scored_cards.prefer_extended_art,
+    prefer_highres_scan = scored_cards.prefer_highres_scan,
+    prefer_has_paper = scored_cards.prefer_has_paper,
+    prefer_language = scored_cards.prefer_language,
+    prefer_legendary_frame = scored_cards.prefer_legendary_frame,
+    prefer_non_showcase = scored_cards.prefer_non_showcase,
+    prefer_finish = scored_cards.prefer_finish,
+    prefer_artwork_set = scored_cards.prefer_artwork_set,
+    prefer_score_components = scored_cards.prefer_score_components,
+    prefer_score = scored_cards.prefer_score
+FROM scored_totals AS scored_cards
+WHERE
+    card.scryfall_id = scored_cards.scryfall_id AND (
+        card.prefer_score_components IS DISTINCT FROM scored_cards.prefer_score_components OR
+        card.prefer_score IS DISTINCT FROM scored_cards.prefer_score OR
+        (
+            card.prefer_illustration_count, card.prefer_rarity, card.prefer_border,
+            card.prefer_frame, card.prefer_extended_art, card.prefer_highres_scan,
+            card.prefer_has_paper, card.prefer_language, card.prefer_legendary_frame,
+            card.prefer_non_showcase, card.prefer_finish, card.prefer_artwork_set
+        ) IS DISTINCT FROM (
+            scored_cards.prefer_illustration_count, scored_cards.prefer_rarity, scored_cards.prefer_border,
+            scored_cards.prefer_frame, scored_cards.prefer_extended_art, scored_cards.prefer_highres_scan,
+            scored_cards.prefer_has_paper, scored_cards.prefer_language, scored_cards.prefer_legendary_frame,
+            scored_cards.prefer_non_showcase, scored_cards.prefer_finish, scored_cards.prefer_artwork_set
         )
-    ),
-    'rarity', (
-        SELECT 
-            CASE 
-                WHEN card_rarity_int = 0 THEN 16  -- common
-                WHEN card_rarity_int = 1 THEN 16  -- uncommon
-                WHEN card_rarity_int = 2 THEN 11  -- rare
-                WHEN card_rarity_int = 3 THEN 0   -- mythic
-                ELSE 0
-            END
-    ),
-    'border', (
-        SELECT 
-            CASE 
-                WHEN card_border = 'black' THEN 14
-                WHEN card_border = 'white' THEN 0
-                WHEN card_border = 'borderless' THEN 0
-                ELSE 0
-            END
-    ),
-    'frame', (
-        SELECT 
-            CASE 
-                WHEN card_frame_data ? '2015' THEN 42
-                WHEN card_frame_data ? '2003' THEN 30
-                WHEN card_frame_data ? '1997' THEN 25
-                WHEN card_frame_data ? '1993' THEN 10
-                ELSE 0
-            END
-    ),
-    'extended_art', (
-        SELECT 
-            CASE 
-                WHEN card_frame_data ? 'Extendedart' THEN 12
-                ELSE 0
-            END
-    ),
-    'highres_scan', (
-        SELECT 
-            CASE 
-                WHEN raw_card_blob ->> 'image_status' = 'highres_scan' THEN 16
-                ELSE 0
-            END
-    ),
-    'has_paper', (
-        SELECT 
-            CASE 
-                WHEN raw_card_blob -> 'games' ? 'paper' THEN 6
-                ELSE 0
-            END
-    ),
-    'language', (
-        SELECT 
-            CASE 
-                WHEN raw_card_blob ->> 'lang' = 'en' THEN 40
-                ELSE 0
-            END
-    ),
-    'legendary_frame', (
-        SELECT 
-            CASE 
-                WHEN raw_card_blob -> 'frame_effects' ? 'legendary' THEN 5
-                ELSE 0
-            END
-    ),
-    'non_showcase', (
-        SELECT 
-            CASE 
-                WHEN NOT (COALESCE(raw_card_blob -> 'frame_effects', '[]'::jsonb) ? 'showcase') THEN 10
-                ELSE 0
-            END
-    ),
-    'finish', (
-        SELECT 
-            CASE 
-                WHEN raw_card_blob -> 'finishes' ? 'nonfoil' THEN 10
-                WHEN raw_card_blob -> 'finishes' ? 'foil' THEN 5
-                WHEN raw_card_blob -> 'finishes' ? 'etched' THEN 0
-                ELSE 0
-            END
-    ),
-    'artwork_set', (
-        SELECT 
-            CASE 
-                WHEN card_set_code IS NULL OR card_set_code NOT IN ('dbl') THEN 20
-                ELSE 0
-            END
-    )
-);
-
-
--- Update prefer_score to be the sum of all component values
-UPDATE magic.cards 
-SET prefer_score = (
-    SELECT SUM(value::numeric)
-    FROM jsonb_each(prefer_score_components)
-);
+    );
@@ -0,0 +1,18 @@
+-- Find a tag that is its own ancestor through magic.tag_relationships, if any
+-- Used after relationships are loaded in bulk with the per-row check_circular_reference trigger
+-- disabled, such as when restoring an export, to validate the whole hierarchy at once. UNION
+-- keeps each (tag, ancestor) pair once, so the walk ends even when the hierarchy has a cycle
+
+WITH RECURSIVE reachable AS (
+    SELECT child_tag AS tag, parent_tag AS ancestor
+    FROM magic.tag_relationships
+    UNION
+    SELECT reachable.tag, relationship.parent_tag
+    FROM reachable
+    JOIN magic.tag_relationships AS relationship ON relationship.child_tag = reachable.ancestor
+)
+SELECT tag
+FROM reachable
+WHERE tag = ancestor
+ORDER BY tag
+LIMIT 1;
@@ -0,0 +1,13 @@
+-- Rebuild magic.card_tags from the card_oracle_tags and card_is_tags of magic.cards
+-- Used after cards are restored with their tags, such as from an export, so tag imports keep
+-- rebuilding those columns from the same links
+
+DELETE FROM magic.card_tags;
+
+INSERT INTO magic.card_tags (tag_kind, tag, card_name)
+SELECT DISTINCT 'oracle', tag.key, card.card_name
+FROM magic.cards AS card, jsonb_each(card.card_oracle_tags) AS tag;
+
+INSERT INTO magic.card_tags (tag_kind, tag, card_name)
+SELECT DISTINCT 'is', tag.key, card.card_name
+FROM magic.cards AS card, jsonb_each(card.card_is_tags) AS tag;
@@ -0,0 +1,16 @@
+-- Add a worker's buffered searches, runs and run time to each arithmetic expression's totals
+INSERT INTO magic.arithmetic_expression_stats AS stats (expression, search_count, run_count, total_ms, last_searched_at)
+SELECT
+    buffered.expression,
+    buffered.search_count,
+    buffered.run_count,
+    buffered.total_ms,
+    now()
+FROM
+    unnest(%(expressions)s::text[], %(search_counts)s::bigint[], %(run_counts)s::bigint[], %(total_ms)s::float8[])
+        AS buffered (expression, search_count, run_count, total_ms)
+ON CONFLICT (expression) DO UPDATE SET
+    search_count = stats.search_count + EXCLUDED.search_count,
+    run_count = stats.run_count + EXCLUDED.run_count,
+    total_ms = stats.total_ms + EXCLUDED.total_ms,
+    last_searched_at = EXCLUDED.last_searched_at
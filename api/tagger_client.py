@@ -4,20 +4,32 @@ import collections
 import logging
 import re
 import time
+from http import HTTPStatus
 
 import requests
 import tenacity
 from cachebox import TTLCache, cached
 
+from api.utils.rate_limiter import TokenBucket, get_retry_after_seconds
+
 logger = logging.getLogger(__name__)
 
+# the tagger has no documented rate limit, so requests keep the pace of one per 0.43 seconds
+TAGGER_REQUESTS_PER_SECOND = 1 / 0.43
+
 
 class TaggerClient:
     """Client for interacting with Scryfall Tagger GraphQL API."""
 
-    def __init__(self) -> None:
-        """Initialize the TaggerClient."""
+    def __init__(self, *, rate_limiter: TokenBucket | None = None) -> None:
+        """Initialize the TaggerClient.
+
+        Args:
+            rate_limiter: Limiter shared by every request of this client, and of any other client
+                given it. Defaults to one allowing TAGGER_REQUESTS_PER_SECOND.
+        """
         self.session = requests.Session()
+        self.rate_limiter = rate_limiter or TokenBucket(rate=TAGGER_REQUESTS_PER_SECOND)
         self.csrf_token: str | None = None
         self.base_url = "https://tagger.scryfall.com"
 
@@ -92,8 +104,8 @@ class TaggerClient:
         """
         self.authenticate()
 
-        # Set referer to the specific tag page
-        self.session.headers["Referer"] = f"{self.base_url}/tags/card/{tag}"
+        # Set referer to the specific tag page, per request as tags may be fetched concurrently
+        headers = {"Referer": f"{self.base_url}/tags/card/{tag}"}
 
         variables = {
             "slug": tag,
@@ -199,7 +211,7 @@ class TaggerClient:
         )
 
         def get_response() -> requests.Response:
-            time.sleep(0.43)
+            self.rate_limiter.acquire()
             response = retryer(self.session.post)(
                 f"{self.base_url}/graphql",
                 json={
@@ -207,8 +219,12 @@ class TaggerClient:
                     "variables": variables,
                     "operationName": "FetchTag",
                 },
+                headers=headers,
                 timeout=30,
             )
+            if response.status_code == HTTPStatus.TOO_MANY_REQUESTS:
+                # hold back every fetch sharing the limiter, then let the retryer try again
+                self.rate_limiter.back_off(get_retry_after_seconds(response.headers.get("Retry-After")))
 
             response.raise_for_status()
             self._request_timestamps.append(time.monotonic())
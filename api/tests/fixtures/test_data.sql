@@ -2,7 +2,7 @@
 
 -- Insert some test cards
 INSERT INTO magic.cards (
-    scryfall_id, card_name, cmc, mana_cost_text, mana_cost_jsonb, raw_card_blob,
+    scryfall_id, card_name, cmc, mana_cost_text, mana_cost_jsonb, mana_pips_w, mana_pips_r, mana_generic,
     card_types, card_subtypes, card_colors, card_color_identity, card_keywords,
     oracle_text, creature_power, creature_toughness, card_oracle_tags, collector_number, collector_number_int,
     released_at
@@ -13,7 +13,9 @@ INSERT INTO magic.cards (
     1,
     '{R}',
     '{"R": 1}',
-    '{"name": "Lightning Bolt", "type": "Instant", "collector_number": "123"}',
+    0,
+    1,
+    0,
     '["Instant"]',
     '[]',
     '{"R": true}',
@@ -33,7 +35,9 @@ INSERT INTO magic.cards (
     5,
     '{3}{W}{W}',
     '{"3": 3, "W": 2}',
-    '{"name": "Serra Angel", "type": "Creature", "collector_number": "45a"}',
+    2,
+    0,
+    3,
     '["Creature"]',
     '["Angel"]',
     '{"W": true}',
@@ -53,7 +57,9 @@ INSERT INTO magic.cards (
     0,
     '{0}',
     '{}',
-    '{"name": "Black Lotus", "type": "Artifact", "collector_number": "1"}',
+    0,
+    0,
+    0,
     '["Artifact"]',
     '[]',
     '{}',
@@ -68,6 +74,13 @@ INSERT INTO magic.cards (
     '2024-02-23'
 ) ON CONFLICT (scryfall_id) DO NOTHING;
 
+-- Insert the raw scryfall payloads for the test cards
+INSERT INTO magic.card_blobs (scryfall_id, raw_card_blob) VALUES
+('00000000-0000-0000-0000-000000000001', '{"name": "Lightning Bolt", "type": "Instant", "collector_number": "123"}'),
+('00000000-0000-0000-0000-000000000002', '{"name": "Serra Angel", "type": "Creature", "collector_number": "45a"}'),
+('00000000-0000-0000-0000-000000000003', '{"name": "Black Lotus", "type": "Artifact", "collector_number": "1"}')
+ON CONFLICT (scryfall_id) DO NOTHING;
+
 -- Insert test tags
 INSERT INTO magic.tags (tag) VALUES
 ('flying'),
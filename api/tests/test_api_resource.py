@@ -1,5 +1,6 @@
 """Comprehensive tests for APIResource class functionality."""
 
+import copy
 import multiprocessing
 import os
 import time
@@ -12,8 +13,10 @@ import falcon
 import pytest
 import requests
 
-from api.api_resource import APIResource
+from api.api_resource import ARITHMETIC_STATS_FLUSH_SECONDS, APIResource
 from api.settings import settings
+from api.utils.multiprocessing_utils import ImportStatus
+from api.utils.rate_limiter import TokenBucket
 
 
 def create_test_card(  # noqa: PLR0913
@@ -159,6 +162,27 @@ class TestAPIResourceInitializationNewStyle(TestBaseAPIResourceTest):
 
         assert api_resource._import_guard == custom_guard
 
+    def test_shared_rate_limiters_are_used_by_every_client(self) -> None:
+        """Test the rate limiters the entrypoint shares hold back the searches, the bulk data catalog and the tagger."""
+        scryfall_rate_limiter = TokenBucket(rate=10)
+        tagger_rate_limiter = TokenBucket(rate=2)
+        api_resource = APIResource(
+            last_import_time=multiprocessing.Value("d", time.time(), lock=True),
+            scryfall_rate_limiter=scryfall_rate_limiter,
+            tagger_rate_limiter=tagger_rate_limiter,
+        )
+        mock_response = MagicMock()
+
+        assert api_resource._bulk_data_fetcher.rate_limiter is scryfall_rate_limiter
+        assert api_resource._tagger_client.rate_limiter is tagger_rate_limiter
+        with patch("requests.Session.get", return_value=mock_response):
+            assert api_resource._scryfall_get("https://api.scryfall.com/cards/search", params={}) is mock_response
+
+        stats = api_resource.rate_limits(falcon_response=mock_response)
+        assert stats["scryfall"]["requests"] == 1
+        assert stats["tagger"]["rate"] == 2
+        mock_response.set_header.assert_called_once_with("Cache-Control", "no-store")
+
     def test_action_map_includes_all_public_methods(self) -> None:
         """Test that action_map includes all public methods."""
         api_resource = self.api_resource
@@ -170,6 +194,448 @@ class TestAPIResourceInitializationNewStyle(TestBaseAPIResourceTest):
             assert method in api_resource.action_map
 
 
+class TestAPIResourceBackgroundImport(TestBaseAPIResourceTest):
+    """Test serving workers that leave imports to the background importer."""
+
+    def test_construction_leaves_the_import_to_the_importer(self) -> None:
+        """Test a resource given import_requested doesn't import while being constructed."""
+        with patch.object(APIResource, "_run_import_under_lock") as mock_run_import:
+            APIResource(
+                last_import_time=multiprocessing.Value("d", 0.0, lock=True),
+                import_requested=multiprocessing.Event(),
+            )
+
+        mock_run_import.assert_not_called()
+
+    def test_import_data_requests_a_background_import(self) -> None:
+        """Test import_data sets import_requested and returns without importing."""
+        import_requested = multiprocessing.Event()
+        api_resource = APIResource(
+            last_import_time=multiprocessing.Value("d", 0.0, lock=True),
+            import_requested=import_requested,
+        )
+
+        with patch.object(APIResource, "_run_import_under_lock") as mock_run_import:
+            assert api_resource.import_data() is None
+
+        mock_run_import.assert_not_called()
+        assert import_requested.is_set()
+
+    def test_caches_clear_when_data_generation_changes(self) -> None:
+        """Test the next request after the importer bumps data_generation clears this worker's caches."""
+        data_generation = multiprocessing.Value("i", 0, lock=True)
+        api_resource = APIResource(
+            last_import_time=multiprocessing.Value("d", time.time(), lock=True),
+            data_generation=data_generation,
+        )
+        api_resource._query_cache["test_key"] = "test_value"
+        request = MagicMock(path="/get_pid", relative_uri="/get_pid", params={})
+
+        api_resource._handle(request, MagicMock(complete=False))
+        assert "test_key" in api_resource._query_cache
+
+        data_generation.value += 1
+        api_resource._handle(request, MagicMock(complete=False))
+        assert "test_key" not in api_resource._query_cache
+
+    def test_import_status_reports_shared_progress(self) -> None:
+        """Test import_status returns the progress the importer shares, plus this worker's view."""
+        import_status = ImportStatus()
+        import_status.update(stage="loading", cards_sent=12000)
+        api_resource = APIResource(
+            last_import_time=multiprocessing.Value("d", 0.0, lock=True),
+            import_status=import_status,
+            import_requested=multiprocessing.Event(),
+        )
+
+        status = api_resource.import_status()
+
+        assert status["stage"] == "loading"
+        assert status["cards_sent"] == 12000
+        assert status["last_import_time"] is None
+        assert status["data_generation"] == 0
+        assert status["background_import"] is True
+        assert status["bulk_data_catalog_age_seconds"] is None
+
+
+class TestAPIResourceJobs(TestBaseAPIResourceTest):
+    """Test serving workers that leave long admin operations to the job executor."""
+
+    def _mock_cursor(self, api_resource: APIResource) -> MagicMock:
+        api_resource._conn_pool = self.mock_conn_pool
+        mock_cursor = MagicMock()
+        self.mock_conn_pool.connection.return_value.__enter__.return_value.cursor.return_value.__enter__.return_value = mock_cursor
+        return mock_cursor
+
+    def test_job_routes_run_in_the_request_without_an_executor(self) -> None:
+        """Test a resource without job_requested runs the long operations itself."""
+        assert self.api_resource.action_map["backfill_prefer_scores"] == self.api_resource.backfill_prefer_scores
+
+    def test_job_routes_queue_a_job(self) -> None:
+        """Test a job route queues a job, wakes the executor and answers 202 without running the operation."""
+        job_requested = multiprocessing.Event()
+        api_resource = APIResource(
+            last_import_time=multiprocessing.Value("d", time.time(), lock=True),
+            job_requested=job_requested,
+        )
+        mock_cursor = self._mock_cursor(api_resource)
+        mock_cursor.fetchone.return_value = {"job_id": 7, "status": "queued"}
+        mock_response = MagicMock()
+
+        with patch.object(APIResource, "_backfill_prefer_scores") as mock_backfill:
+            result = api_resource.action_map["backfill_prefer_scores"](falcon_response=mock_response)
+
+        mock_backfill.assert_not_called()
+        assert job_requested.is_set()
+        assert result["job_id"] == 7
+        assert result["status"] == "queued"
+        assert mock_response.status == falcon.HTTP_ACCEPTED
+        mock_response.set_header.assert_called_once_with("Cache-Control", "no-store")
+        assert "INSERT INTO magic.jobs" in mock_cursor.execute.call_args.args[0]
+        assert mock_cursor.execute.call_args.args[1]["action"] == "backfill_prefer_scores"
+
+    def test_price_refresh_route_queues_a_job(self) -> None:
+        """Test refresh_prices runs in the job executor rather than holding the import lock in a serving worker."""
+        api_resource = APIResource(
+            last_import_time=multiprocessing.Value("d", time.time(), lock=True),
+            job_requested=multiprocessing.Event(),
+        )
+        mock_cursor = self._mock_cursor(api_resource)
+        mock_cursor.fetchone.return_value = {"job_id": 8, "status": "queued"}
+
+        with patch.object(APIResource, "_load_prices") as mock_load_prices:
+            result = api_resource.action_map["refresh_prices"](falcon_response=MagicMock())
+
+        mock_load_prices.assert_not_called()
+        assert result["job_id"] == 8
+        assert mock_cursor.execute.call_args.args[1]["action"] == "refresh_prices"
+
+    def test_job_routes_reject_parameters_the_operation_cant_take(self) -> None:
+        """Test job parameters are converted as the request is made, and a mismatch is a 400 rather than a queued job."""
+        api_resource = APIResource(
+            last_import_time=multiprocessing.Value("d", time.time(), lock=True),
+            job_requested=multiprocessing.Event(),
+        )
+        mock_cursor = self._mock_cursor(api_resource)
+        mock_cursor.fetchone.return_value = {"job_id": 9, "status": "queued"}
+
+        with pytest.raises(falcon.HTTPBadRequest) as exc_info:
+            api_resource.action_map["discover_and_import_all_tags"](import_cards="maybe")
+        assert exc_info.value.title == "Invalid Job Parameters"
+        mock_cursor.execute.assert_not_called()
+
+        api_resource.action_map["discover_and_import_all_tags"](import_cards="no", import_hierarchy="yes")
+        assert mock_cursor.execute.call_args.args[1]["params"].obj == {"import_cards": False, "import_hierarchy": True}
+
+    def test_job_status_of_unknown_job_is_not_found(self) -> None:
+        """Test job_status raises 404 for a job id that doesn't exist."""
+        mock_cursor = self._mock_cursor(self.api_resource)
+        mock_cursor.fetchone.return_value = None
+
+        with pytest.raises(falcon.HTTPNotFound):
+            self.api_resource.job_status(job_id=12)
+
+
+class TestAPIResourcePriceRefresh(TestBaseAPIResourceTest):
+    """Test the price-only refresh."""
+
+    def test_refresh_prices_copies_only_ids_and_prices(self) -> None:
+        """Test each card of the export becomes one narrow price row and the changed ones are updated."""
+        cards = [
+            create_test_card(card_id="00000000-0000-0000-0000-000000000001", prices={"usd": "0.25", "eur": None, "tix": "0.02"}),
+            create_test_card(card_id="00000000-0000-0000-0000-000000000002", prices={}),
+        ]
+        mock_cursor = MagicMock()
+        mock_cursor.rowcount = 1
+        mock_copy = mock_cursor.copy.return_value.__enter__.return_value
+        self.mock_conn_pool.connection.return_value.__enter__.return_value.cursor.return_value.__enter__.return_value = mock_cursor
+        data_generation = self.api_resource._data_generation.value
+
+        with (
+            patch.object(self.api_resource._bulk_data_fetcher, "get_cache_file_for_key"),
+            patch.object(self.api_resource._bulk_data_fetcher, "iter_data_for_key", return_value=iter(cards)),
+        ):
+            result = self.api_resource.refresh_prices()
+
+        assert result["status"] == "success"
+        assert result["cards_sent"] == 2
+        assert result["cards_updated"] == 1
+        mock_copy.set_types.assert_called_once_with(["uuid", "real", "real", "real"])
+        assert [call.args[0] for call in mock_copy.write_row.call_args_list] == [
+            [uuid.UUID("00000000-0000-0000-0000-000000000001"), 0.25, None, 0.02],
+            [uuid.UUID("00000000-0000-0000-0000-000000000002"), None, None, None],
+        ]
+        update_sql = next(call.args[0] for call in mock_cursor.execute.call_args_list if "UPDATE magic.cards" in call.args[0])
+        assert "IS DISTINCT FROM" in update_sql
+        # the hash covers the prices, so the next import must not match the row against it
+        assert "content_hash = NULL" in update_sql
+        assert self.api_resource._data_generation.value == data_generation + 1
+
+
+class TestAPIResourceOracleCards(TestBaseAPIResourceTest):
+    """Test keeping magic.oracle_cards up to date."""
+
+    def test_load_oracle_cards_streams_and_updates_changed_cards(self) -> None:
+        """Test the oracle export is streamed into staging and upserted, updating only the changed oracle cards."""
+        mock_cursor = MagicMock()
+        mock_cursor.rowcount = 1
+        self.mock_conn_pool.connection.return_value.__enter__.return_value.cursor.return_value.__enter__.return_value = mock_cursor
+        oracle_id = str(uuid.uuid4())
+        oracle_cards = [create_test_card(oracle_id=oracle_id), create_test_card()]
+        copied_rows = []
+
+        with (
+            patch.object(
+                self.api_resource._bulk_data_fetcher,
+                "iter_data_for_key",
+                return_value=iter(oracle_cards),
+            ) as mock_iter_data,
+            patch.object(self.api_resource._bulk_data_fetcher, "get_data_for_key") as mock_get_data,
+            patch("api.api_resource.db_utils.get_table_columns", return_value=[("oracle_id", "uuid"), ("edhrec_rank", "integer")]),
+            patch(
+                "api.api_resource.db_utils.copy_rows_binary",
+                side_effect=lambda *args: copied_rows.extend(args[3]) or len(copied_rows),
+            ),
+        ):
+            assert self.api_resource._load_oracle_cards() == 1
+
+        mock_iter_data.assert_called_once()
+        mock_get_data.assert_not_called()
+        # the card without an oracle_id is skipped
+        assert [row["oracle_id"] for row in copied_rows] == [oracle_id]
+        upsert_sql = mock_cursor.execute.call_args.args[0]
+        assert "ON CONFLICT (oracle_id) DO UPDATE SET" in upsert_sql
+        assert "edhrec_rank = EXCLUDED.edhrec_rank" in upsert_sql
+        assert "IS DISTINCT FROM" in upsert_sql
+        assert "DO NOTHING" not in upsert_sql
+
+    def test_load_oracle_cards_keeps_the_first_face_of_a_double_faced_card(self) -> None:
+        """Test both faces of a double faced card are staged with their face_idx and the first face is the one kept."""
+        mock_cursor = MagicMock()
+        self.mock_conn_pool.connection.return_value.__enter__.return_value.cursor.return_value.__enter__.return_value = mock_cursor
+        oracle_id = str(uuid.uuid4())
+        double_faced_card = create_test_card(
+            oracle_id=oracle_id,
+            name="Delver of Secrets // Insectile Aberration",
+            card_faces=[
+                {"name": "Delver of Secrets", "type_line": "Creature — Human Wizard"},
+                {"name": "Insectile Aberration", "type_line": "Creature — Human Insect"},
+            ],
+        )
+        copied_columns = []
+        copied_rows = []
+
+        def copy_rows_binary(_cursor: Any, _table_name: str, columns: list, rows: Any) -> int:
+            copied_columns.extend(columns)
+            copied_rows.extend(rows)
+            return len(copied_rows)
+
+        with (
+            patch.object(self.api_resource._bulk_data_fetcher, "iter_data_for_key", return_value=iter([double_faced_card])),
+            patch("api.api_resource.db_utils.get_table_columns", return_value=[("oracle_id", "uuid"), ("type_line", "text")]),
+            patch("api.api_resource.db_utils.copy_rows_binary", side_effect=copy_rows_binary),
+        ):
+            self.api_resource._load_oracle_cards()
+
+        assert ("face_idx", "integer") in copied_columns
+        # every face carries the full card name, so only face_idx tells them apart
+        assert [(row["card_name"], row["face_idx"]) for row in copied_rows] == [
+            ("Delver of Secrets // Insectile Aberration", 1),
+            ("Delver of Secrets // Insectile Aberration", 2),
+        ]
+        upsert_sql = mock_cursor.execute.call_args.args[0]
+        assert "SELECT DISTINCT ON (oracle_id)" in upsert_sql
+        assert "oracle_id, face_idx" in upsert_sql
+
+    def test_backfill_refreshes_existing_oracle_cards(self) -> None:
+        """Test the backfill from printings updates stale oracle cards rather than only adding missing ones."""
+        backfill_sql = self.api_resource.read_sql("backfill_oracle_cards")
+
+        assert "ON CONFLICT (oracle_id) DO UPDATE SET" in backfill_sql
+        assert "card_legalities = EXCLUDED.card_legalities" in backfill_sql
+        assert "IS DISTINCT FROM" in backfill_sql
+        assert "NOT EXISTS" not in backfill_sql
+
+
+class TestAPIResourceArithmeticExpressionStats(TestBaseAPIResourceTest):
+    """Test counting arithmetic expression searches."""
+
+    def test_search_counts_repeats_answered_from_the_result_cache(self) -> None:
+        """Test every search is counted, though only the first one runs."""
+        self.api_resource._search.cache.clear()
+        result_bag = {"result": [{"total_cards_count": 0}], "timings": {"_meta": {"duration_ms": 8.0}}}
+        original_setting = settings.enable_cache
+        try:
+            settings.enable_cache = True
+            with (
+                patch.object(self.api_resource, "_setup_complete", return_value=True),
+                patch.object(self.api_resource, "_run_query", side_effect=lambda **_: copy.deepcopy(result_bag)) as mock_run_query,
+            ):
+                self.api_resource.search(q="pow>tou")
+                self.api_resource.search(q="pow>tou")
+                self.api_resource.search(q="cmc:3")
+        finally:
+            settings.enable_cache = original_setting
+            self.api_resource._search.cache.clear()
+
+        assert mock_run_query.call_count == 2
+        assert self.api_resource._arithmetic_stats == {"creature_power - creature_toughness": [2, 1, 8.0]}
+        self.mock_conn_pool.connection.assert_not_called()
+
+    def test_buffered_counts_are_written_in_one_statement(self) -> None:
+        """Test the counts are written together once the flush interval has passed."""
+        mock_conn = self.mock_conn_pool.connection.return_value.__enter__.return_value
+        expressions = ("creature_power - creature_toughness", "cmc - creature_power")
+        self.api_resource._record_arithmetic_expressions(expressions=expressions, searches=1)
+        self.api_resource._record_arithmetic_expressions(expressions=expressions, runs=1, duration_ms=5.0)
+        mock_conn.execute.assert_not_called()
+
+        self.api_resource._arithmetic_stats_flushed_at -= ARITHMETIC_STATS_FLUSH_SECONDS
+        self.api_resource._record_arithmetic_expressions(expressions=expressions[:1], searches=1)
+
+        mock_conn.execute.assert_called_once()
+        assert mock_conn.execute.call_args.args[1] == {
+            "expressions": list(expressions),
+            "search_counts": [2, 1],
+            "run_counts": [1, 1],
+            "total_ms": [5.0, 5.0],
+        }
+        assert self.api_resource._arithmetic_stats == {}
+
+
+class TestAPIResourcePreferScoreBackfill(TestBaseAPIResourceTest):
+    """Test the prefer score backfill."""
+
+    def _run_backfill(self, *args: object) -> tuple[dict, MagicMock]:
+        mock_cursor = MagicMock()
+        mock_cursor.rowcount = 3
+        self.mock_conn_pool.connection.return_value.__enter__.return_value.cursor.return_value.__enter__.return_value = mock_cursor
+        return self.api_resource._backfill_prefer_scores(*args), mock_cursor
+
+    def test_backfill_recomputes_every_card(self) -> None:
+        """Test the full backfill passes no printings and reports the rows whose scores changed."""
+        result, mock_cursor = self._run_backfill()
+
+        mock_cursor.execute.assert_called_with(
+            self.api_resource.read_sql("backfill_prefer_scores"),
+            {"scryfall_ids": None, "illustration_ids": []},
+        )
+        assert result["cards_updated"] == 3
+
+    def test_incremental_backfill_is_limited_to_touched_cards(self) -> None:
+        """Test the incremental backfill passes the touched printings and illustrations."""
+        scryfall_ids = [uuid.UUID(int=1)]
+        illustration_ids = [uuid.UUID(int=2)]
+
+        _, mock_cursor = self._run_backfill(scryfall_ids, illustration_ids)
+
+        assert mock_cursor.execute.call_args.args[1] == {"scryfall_ids": scryfall_ids, "illustration_ids": illustration_ids}
+
+    def test_backfill_sql_has_no_correlated_subquery(self) -> None:
+        """Test illustration counts are aggregated once rather than per row."""
+        backfill_sql = self.api_resource.read_sql("backfill_prefer_scores")
+
+        assert "GROUP BY illustration_id, card_name" in backfill_sql
+        assert "update_target_cards" not in backfill_sql
+        assert "IS DISTINCT FROM" in backfill_sql
+
+
+class TestAPIResourceCardTags(TestBaseAPIResourceTest):
+    """Test bulk tag application."""
+
+    def test_all_tags_are_written_with_one_bulk_write(self) -> None:
+        """Test the cards of every tag are streamed into one COPY and applied with one UPDATE."""
+        cards_by_query = {
+            "oracletag:flying": [{"name": "Serra Angel"}, {"name": "Serra Angel"}, {"name": "Air Elemental"}],
+            "oracletag:ramp": [{"name": "Sol Ring"}],
+            "oracletag:none": [],
+        }
+        mock_cursor = MagicMock()
+        mock_cursor.rowcount = 2
+        mock_copy = mock_cursor.copy.return_value.__enter__.return_value
+        self.mock_conn_pool.connection.return_value.__enter__.return_value.cursor.return_value.__enter__.return_value = mock_cursor
+
+        with (
+            patch.object(self.api_resource, "_get_all_tags", return_value={"flying", "ramp", "none"}),
+            patch.object(self.api_resource, "_scryfall_search", side_effect=lambda query: cards_by_query[query]),
+        ):
+            result = self.api_resource._update_all_card_taggings()
+
+        assert result["success"] is True
+        assert result["tags_processed"] == 3
+        assert result["cards_updated"] == 2
+        mock_cursor.copy.assert_called_once()
+        # tags are written in the order their searches finish
+        assert sorted(call.args[0] for call in mock_copy.write_row.call_args_list) == [
+            ["flying", "Air Elemental"],
+            ["flying", "Serra Angel"],
+            ["ramp", "Sol Ring"],
+        ]
+        update_sqls = [call.args[0] for call in mock_cursor.execute.call_args_list if "UPDATE magic.cards" in call.args[0]]
+        assert len(update_sqls) == 1
+        assert "jsonb_object_agg" in update_sqls[0]
+        assert "card_oracle_tags IS DISTINCT FROM" in update_sqls[0]
+
+    def test_failed_tags_are_left_out(self) -> None:
+        """Test a tag whose search fails is not written, so its cards keep it."""
+
+        def scryfall_search(query: str) -> list[dict[str, str]]:
+            if query == "is:broken":
+                msg = "Failed to fetch data from Scryfall API"
+                raise ValueError(msg)
+            return [{"name": "Llanowar Elves"}]
+
+        failed_tags = {}
+        with patch.object(self.api_resource, "_scryfall_search", side_effect=scryfall_search):
+            tagged_card_names = dict(
+                self.api_resource._iter_tagged_card_names(tags=["broken", "creature"], query_prefix="is:", failed_tags=failed_tags),
+            )
+
+        assert tagged_card_names == {"creature": ["Llanowar Elves"]}
+        assert list(failed_tags) == ["broken"]
+
+    def test_is_tags_with_rules_are_derived_not_searched(self) -> None:
+        """Test only the is: tags without a local rule are searched for on Scryfall."""
+        mock_cursor = MagicMock()
+        mock_cursor.rowcount = 1
+        mock_cursor.stream.return_value = [
+            {"card_name": "Grizzly Bears", "card": {"type_line": "Creature — Bear", "cmc": 2.0, "power": "2", "toughness": "2"}},
+        ]
+        mock_copy = mock_cursor.copy.return_value.__enter__.return_value
+        self.mock_conn_pool.connection.return_value.__enter__.return_value.cursor.return_value.__enter__.return_value = mock_cursor
+
+        with (
+            patch.object(self.api_resource, "discover_is_tags_from_syntax", return_value=["bear", "permanent", "spikey"]),
+            patch.object(self.api_resource, "_scryfall_search", return_value=[{"name": "Arcbound Ravager"}]) as mock_search,
+        ):
+            result = self.api_resource.import_all_is_tags()
+
+        mock_search.assert_called_once_with(query="is:spikey")
+        assert result["success"] is True
+        assert result["fetched_is_tags"] == 1
+        assert {tag["is_tag"]: tag["source"] for tag in result["imported_tags"]} == {
+            "permanent": "derived",
+            "spell": "derived",
+            "vanilla": "derived",
+            "bear": "derived",
+            "spikey": "scryfall",
+        }
+        assert ["bear", "Grizzly Bears"] in [call.args[0] for call in mock_copy.write_row.call_args_list]
+
+    def test_derived_is_tags_read_the_printings_scryfall_searches_find(self) -> None:
+        """Test derivation applies the paper and format legality filters of _scryfall_search."""
+        mock_cursor = MagicMock()
+        mock_cursor.stream.return_value = [{"card_name": "Grizzly Bears", "card": {"type_line": "Creature — Bear"}}]
+        self.mock_conn_pool.connection.return_value.__enter__.return_value.cursor.return_value.__enter__.return_value = mock_cursor
+
+        assert self.api_resource._derive_is_tags(is_tags=["permanent"]) == {"permanent": ["Grizzly Bears"]}
+
+        derive_sql, derive_params = mock_cursor.stream.call_args.args
+        assert "card.card_games ? 'paper'" in derive_sql
+        assert "card.card_legalities" in derive_sql
+        assert derive_params["formats"] == ["modern", "legacy", "commander", "vintage"]
+
+
 class TestAPIResourceCoreMethods(unittest.TestCase):
     """Test core APIResource methods."""
 
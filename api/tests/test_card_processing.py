@@ -2,17 +2,23 @@
 
 from __future__ import annotations
 
+import copy
 import json
 import pathlib
 import uuid
 from typing import Any
 
-from api.card_processing import preprocess_card
+import pytest
+
+from api.card_processing import card_content_hash, card_prices, iter_preprocessed_cards, preprocess_card
 from api.parsing.card_query_nodes import extract_frame_data_from_raw_card
 
 # Project root directory for accessing sample data
 _PROJECT_ROOT = pathlib.Path(__file__).parent.parent.parent
 _SAMPLE_DATA_DIR = _PROJECT_ROOT / "docs" / "sample_data"
+# rows preprocess_card produced for each sample card, projected onto the magic.cards columns
+# plus face_idx, face_name and raw_card_blob
+_GOLDEN_ROWS_FILE = pathlib.Path(__file__).parent / "fixtures" / "preprocessed_sample_cards.json"
 
 
 def create_test_card(  # noqa: PLR0913
@@ -220,6 +226,51 @@ class TestCardProcessing:
         result = result[0]
         assert result["card_frame_data"] == {}  # Should be empty object when no frame data present
 
+    def test_preprocess_card_lifts_prefer_score_fields(self) -> None:
+        """Test preprocess_card lifts the fields the prefer score reads into typed columns."""
+        card = create_test_card(
+            games=["paper", "mtgo"],
+            lang="en",
+            image_status="highres_scan",
+            finishes=["nonfoil", "foil"],
+        )
+
+        result = preprocess_card(card)
+
+        assert len(result) == 1
+        result = result[0]
+        assert result["card_lang"] == "en"
+        assert result["card_image_status"] == "highres_scan"
+        assert result["card_finishes"] == {"nonfoil": True, "foil": True}
+        assert result["card_games"] == {"paper": True, "mtgo": True}
+
+    def test_preprocess_card_prefer_score_fields_default_empty(self) -> None:
+        """Test preprocess_card defaults the lifted prefer score fields when absent."""
+        result = preprocess_card(create_test_card())
+
+        assert len(result) == 1
+        result = result[0]
+        assert result["card_lang"] is None
+        assert result["card_image_status"] is None
+        assert result["card_finishes"] == {}
+        assert result["card_games"] == {"paper": True}
+
+    def test_preprocess_card_counts_mana_pips(self) -> None:
+        """Test preprocess_card fills the integer mana pip and devotion count columns."""
+        card = create_test_card(mana_cost="{2}{R}{R/G}{X}")
+
+        result = preprocess_card(card)
+
+        assert len(result) == 1
+        result = result[0]
+        assert result["mana_pips_r"] == 1
+        assert result["mana_pips_g"] == 0
+        assert result["mana_generic"] == 2
+        assert result["mana_hybrid"] == 1
+        assert result["mana_other_symbols"] == 1
+        assert result["devotion_r"] == 2
+        assert result["devotion_g"] == 1
+
     def test_extract_frame_data_from_raw_card_with_frame_and_effects(self) -> None:
         """Test extract_frame_data_from_raw_card with frame and frame_effects."""
         raw_card = {
@@ -339,3 +390,93 @@ class TestCardProcessing:
         assert back.get("creature_power") is None
         assert front["card_types"] == ["Creature"]
         assert back["card_types"] == ["Instant"]
+
+    @pytest.mark.parametrize("sample_name", sorted(path.name for path in _SAMPLE_DATA_DIR.glob("*.json")))
+    def test_preprocess_sample_cards_match_golden_rows(self, sample_name: str) -> None:
+        """Test preprocess_card builds exactly the golden rows for each sample card."""
+        golden_rows = json.loads(_GOLDEN_ROWS_FILE.read_text())
+        card = json.loads((_SAMPLE_DATA_DIR / sample_name).read_text())
+
+        rows = preprocess_card(card)
+
+        # the golden rows predate content_hash, which digests the rest of the row
+        assert [{key: value for key, value in row.items() if key != "content_hash"} for row in rows] == golden_rows[sample_name]
+        assert all(row["content_hash"] == card_content_hash(row) for row in rows)
+
+    def test_preprocess_card_keeps_card_as_raw_blob(self) -> None:
+        """Test single faced cards become their own raw_card_blob instead of being copied."""
+        card = create_test_card(keywords=["Haste"])
+
+        (row,) = preprocess_card(card)
+
+        assert row["raw_card_blob"] is card
+        assert card["face_idx"] == 1
+        assert card["card_name"] == "Test Card"
+        assert "card_keywords" not in card
+        assert "keywords" not in row
+
+    def test_content_hash_tracks_card_changes(self) -> None:
+        """Test the content hash is stable for identical cards and changes with prices or legalities."""
+        card_id = str(uuid.uuid4())
+
+        def content_hash(**kwargs: Any) -> str:
+            (row,) = preprocess_card(create_test_card(card_id=card_id, **kwargs))
+            return row["content_hash"]
+
+        baseline = content_hash()
+        assert content_hash() == baseline
+        assert content_hash(prices={"usd": "1.50"}) != baseline
+        assert content_hash(legalities={"standard": "banned", "modern": "legal"}) != baseline
+        assert len(baseline) == 32
+
+    @pytest.mark.parametrize(
+        ("prices", "expected"),
+        [
+            ({"usd": "0.25", "eur": "1.5", "tix": None}, {"price_usd": 0.25, "price_eur": 1.5, "price_tix": None}),
+            ({}, {"price_usd": None, "price_eur": None, "price_tix": None}),
+            (None, {"price_usd": None, "price_eur": None, "price_tix": None}),
+        ],
+    )
+    def test_card_prices(self, prices: dict | None, expected: dict) -> None:
+        """Test the price columns are read from the card's prices, missing ones as None."""
+        assert card_prices({"prices": prices}) == expected
+
+
+class TestIterPreprocessedCards:
+    """Test preprocessing cards across a process pool."""
+
+    @staticmethod
+    def _make_cards() -> list[dict]:
+        """A mix of single faced, double faced and filtered out cards."""
+        cards = []
+        for i in range(25):
+            if i % 5 == 0:
+                cards.append(
+                    create_test_card(
+                        name=f"Card {i}",
+                        card_faces=[
+                            {"name": f"Front {i}", "type_line": "Creature — Human"},
+                            {"name": f"Back {i}", "type_line": "Instant"},
+                        ],
+                    ),
+                )
+            elif i % 7 == 0:
+                cards.append(create_test_card(name=f"Card {i}", games=["mtgo"]))
+            else:
+                cards.append(create_test_card(name=f"Card {i}", collector_number=str(i)))
+        return cards
+
+    @pytest.mark.parametrize(("max_workers", "chunk_size"), [(1, 4), (2, 4), (3, 1), (2, 100)])
+    def test_matches_serial_preprocessing_in_order(self, max_workers: int, chunk_size: int) -> None:
+        """Test the pooled result is exactly the serial result, in input order."""
+        cards = self._make_cards()
+        expected = [processed for card in copy.deepcopy(cards) for processed in preprocess_card(card)]
+
+        result = list(iter_preprocessed_cards(iter(cards), max_workers=max_workers, chunk_size=chunk_size))
+
+        assert result == expected
+        assert [card["face_name"] for card in result][:3] == ["Front 0", "Back 0", "Card 1"]
+
+    def test_empty_input(self) -> None:
+        """Test no cards yields no faces."""
+        assert list(iter_preprocessed_cards([], max_workers=2, chunk_size=4)) == []
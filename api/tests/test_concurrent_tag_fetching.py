@@ -0,0 +1,182 @@
+"""Tests for fetching tags concurrently within Scryfall's rate limit, against a local stand-in server."""
+
+import threading
+import time
+import urllib.parse
+from collections.abc import Iterator
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import MagicMock, patch
+
+import orjson
+import pytest
+
+from api import api_resource as api_resource_module
+from api.api_resource import APIResource
+from api.settings import settings
+from api.utils.rate_limiter import TokenBucket
+
+LATENCY_SECONDS = 0.05
+RATE = 40.0
+PAGE_SIZE = 2
+
+
+class SearchServer(ThreadingHTTPServer):
+    """A local stand-in for Scryfall's card search, slow to answer and asking for the first try of each query to back off."""
+
+    daemon_threads = True
+
+    def __init__(self) -> None:
+        """Listen on a free local port."""
+        super().__init__(("127.0.0.1", 0), SearchHandler)
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.request_times: list[float] = []
+        self.throttled: set[str] = set()
+        # card names of each tag; tags not listed fail with a server error
+        self.tagged_card_names: dict[str, list[str]] = {}
+
+    @property
+    def url(self) -> str:
+        """The stand-in for the search endpoint."""
+        return f"http://127.0.0.1:{self.server_address[1]}/cards/search"
+
+
+class SearchHandler(BaseHTTPRequestHandler):
+    """Answer oracletag: searches a page at a time, with a 429 for the first request of every query."""
+
+    server: SearchServer
+
+    def log_message(self, *_: object) -> None:
+        """Keep the test output quiet."""
+
+    def _send_json(self, status: HTTPStatus, body: dict, headers: dict[str, str] | None = None) -> None:
+        payload = orjson.dumps(body)
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self) -> None:
+        """Serve one page of a search."""
+        with self.server.lock:
+            self.server.in_flight += 1
+            self.server.max_in_flight = max(self.server.max_in_flight, self.server.in_flight)
+            self.server.request_times.append(time.monotonic())
+        try:
+            time.sleep(LATENCY_SECONDS)
+            params = dict(urllib.parse.parse_qsl(urllib.parse.urlsplit(self.path).query))
+            query = params["q"]
+            with self.server.lock:
+                first_try = query not in self.server.throttled
+                self.server.throttled.add(query)
+            if first_try:
+                self._send_json(HTTPStatus.TOO_MANY_REQUESTS, {"object": "error"}, {"Retry-After": "0.1"})
+                return
+            tag = query.removeprefix("(oracletag:").split(")", 1)[0]
+            if tag not in self.server.tagged_card_names:
+                self._send_json(HTTPStatus.INTERNAL_SERVER_ERROR, {"object": "error"})
+                return
+            card_names = self.server.tagged_card_names[tag]
+            page = int(params.get("page", "1"))
+            has_more = page * PAGE_SIZE < len(card_names)
+            body = {
+                "data": [{"name": name} for name in card_names[(page - 1) * PAGE_SIZE : page * PAGE_SIZE]],
+                "has_more": has_more,
+            }
+            if has_more:
+                body["next_page"] = f"{self.server.url}?{urllib.parse.urlencode({'q': query, 'page': page + 1})}"
+            self._send_json(HTTPStatus.OK, body)
+        finally:
+            with self.server.lock:
+                self.server.in_flight -= 1
+
+
+@pytest.fixture(name="search_server")
+def search_server_fixture() -> Iterator[SearchServer]:
+    """Run the stand-in server, pointing Scryfall searches at it."""
+    server = SearchServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        with patch.object(api_resource_module, "SCRYFALL_SEARCH_URL", server.url):
+            yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture(name="api_resource")
+def api_resource_fixture() -> APIResource:
+    """An APIResource without a database, rate limited to RATE requests per second."""
+    with patch("api.api_resource.db_utils.make_pool", return_value=MagicMock()):
+        api_resource = APIResource(import_requested=MagicMock())
+    api_resource._scryfall_rate_limiter = TokenBucket(rate=RATE)
+    return api_resource
+
+
+def test_tags_are_fetched_concurrently_within_the_rate_limit(search_server: SearchServer, api_resource: APIResource) -> None:
+    """Test many tags are in flight at once, 429s are retried, and the shared rate holds across them."""
+    search_server.tagged_card_names = {f"tag-{idx}": [f"Card {idx}-{card}" for card in range(idx % 4 + 1)] for idx in range(12)}
+    failed_tags = {}
+
+    with patch.object(settings, "_tag_fetch_workers", 6):
+        before = time.monotonic()
+        fetched = dict(
+            api_resource._iter_tagged_card_names(
+                tags=list(search_server.tagged_card_names),
+                query_prefix="oracletag:",
+                failed_tags=failed_tags,
+            ),
+        )
+        duration = time.monotonic() - before
+
+    assert failed_tags == {}
+    assert fetched == {tag: sorted(names) for tag, names in search_server.tagged_card_names.items()}
+    assert search_server.max_in_flight > 1
+    # every query was told to back off once, and every page of it was fetched after
+    num_pages = sum((len(names) + PAGE_SIZE - 1) // PAGE_SIZE for names in search_server.tagged_card_names.values())
+    num_requests = len(search_server.request_times)
+    assert num_requests == num_pages + len(search_server.tagged_card_names)
+    # the limiter spaced every request after the first, however many threads made them
+    assert duration >= (num_requests - 1) / RATE * 0.9
+    intervals = [
+        later - earlier for earlier, later in zip(search_server.request_times, search_server.request_times[1:], strict=False)
+    ]
+    assert min(intervals) >= 1 / RATE * 0.5
+
+
+def test_results_stream_out_as_they_arrive(search_server: SearchServer, api_resource: APIResource) -> None:
+    """Test the first tag is handed out while later tags are still being fetched."""
+    search_server.tagged_card_names = {f"tag-{idx}": ["Sol Ring"] for idx in range(8)}
+
+    with patch.object(settings, "_tag_fetch_workers", 2):
+        fetched = api_resource._iter_tagged_card_names(
+            tags=list(search_server.tagged_card_names),
+            query_prefix="oracletag:",
+            failed_tags={},
+        )
+        next(fetched)
+        requests_at_first_result = len(search_server.request_times)
+        remaining = list(fetched)
+
+    assert len(remaining) == 7
+    assert requests_at_first_result < len(search_server.request_times)
+
+
+def test_failed_tags_are_reported_not_yielded(search_server: SearchServer, api_resource: APIResource) -> None:
+    """Test a tag whose search keeps failing is recorded and left out, and the others still arrive."""
+    search_server.tagged_card_names = {"flying": ["Serra Angel"]}
+    failed_tags = {}
+
+    with patch.object(settings, "_tag_fetch_workers", 2):
+        fetched = dict(
+            api_resource._iter_tagged_card_names(tags=["flying", "broken"], query_prefix="oracletag:", failed_tags=failed_tags),
+        )
+
+    assert fetched == {"flying": ["Serra Angel"]}
+    assert list(failed_tags) == ["broken"]
+    assert "Failed to fetch data from Scryfall API" in failed_tags["broken"]
@@ -0,0 +1,87 @@
+"""Tests for database utility functions."""
+
+from __future__ import annotations
+
+import datetime as dt
+import uuid
+from unittest.mock import MagicMock
+
+import pytest
+
+from api.utils.db_utils import copy_rows_binary, retarget_index_definition
+
+
+def test_copy_rows_binary_writes_typed_values_in_column_order() -> None:
+    """Test rows are written in column order, with uuid and date strings converted and missing keys as NULL."""
+    cursor = MagicMock()
+    copy = cursor.copy.return_value.__enter__.return_value
+    columns = [
+        ("scryfall_id", "uuid"),
+        ("released_at", "date"),
+        ("cmc", "integer"),
+        ("card_types", "jsonb"),
+        ("card_watermark", "text"),
+    ]
+    rows = [
+        {
+            "scryfall_id": "0000579f-7b35-4ed3-b44c-db2a538066fe",
+            "released_at": "2019-10-04",
+            "cmc": 3,
+            "card_types": ["Creature"],
+            "not_a_column": "ignored",
+        },
+    ]
+
+    num_rows = copy_rows_binary(cursor, "staging", columns, rows)
+
+    assert num_rows == 1
+    cursor.copy.assert_called_once_with(
+        "COPY staging (scryfall_id, released_at, cmc, card_types, card_watermark) FROM STDIN (FORMAT BINARY)",
+    )
+    copy.set_types.assert_called_once_with(["uuid", "date", "integer", "jsonb", "text"])
+    copy.write_row.assert_called_once_with(
+        [uuid.UUID("0000579f-7b35-4ed3-b44c-db2a538066fe"), dt.date(2019, 10, 4), 3, ["Creature"], None],
+    )
+
+
+def test_copy_rows_binary_without_rows() -> None:
+    """Test an empty iterable writes nothing."""
+    cursor = MagicMock()
+
+    assert copy_rows_binary(cursor, "staging", [("cmc", "integer")], []) == 0
+    cursor.copy.return_value.__enter__.return_value.write_row.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    argnames=("index_definition", "expected"),
+    argvalues=[
+        (
+            "CREATE UNIQUE INDEX idx_cards_scryfall_id ON magic.cards USING btree (scryfall_id)",
+            "CREATE UNIQUE INDEX idx_cards_scryfall_id_0a1b ON magic.cards_reload_0a1b USING btree (scryfall_id)",
+        ),
+        (
+            "CREATE INDEX idx_cards_oracle_text_trgm ON magic.cards USING gin (oracle_text magic.gin_trgm_ops)",
+            "CREATE INDEX idx_cards_scryfall_id_0a1b ON magic.cards_reload_0a1b USING gin (oracle_text magic.gin_trgm_ops)",
+        ),
+        (
+            "CREATE INDEX idx_cards_artist_trgm ON ONLY magic.cards USING gin (card_artist magic.gin_trgm_ops) "
+            "WHERE (card_artist IS NOT NULL)",
+            "CREATE INDEX idx_cards_scryfall_id_0a1b ON magic.cards_reload_0a1b USING gin (card_artist magic.gin_trgm_ops) "
+            "WHERE (card_artist IS NOT NULL)",
+        ),
+        (
+            "CREATE INDEX idx_cards_power_plus_toughness ON magic.cards USING btree (((creature_power + creature_toughness)))",
+            "CREATE INDEX idx_cards_scryfall_id_0a1b ON magic.cards_reload_0a1b "
+            "USING btree (((creature_power + creature_toughness)))",
+        ),
+    ],
+)
+def test_retarget_index_definition(index_definition: str, expected: str) -> None:
+    """Test an index definition is rewritten onto another table under another name, keeping its method and predicate."""
+    assert retarget_index_definition(index_definition, "idx_cards_scryfall_id_0a1b", "magic.cards_reload_0a1b") == expected
+
+
+def test_retarget_index_definition_rejects_other_statements() -> None:
+    """Test anything but a CREATE INDEX statement is refused."""
+    with pytest.raises(ValueError, match="Unrecognized index definition"):
+        retarget_index_definition("ALTER TABLE magic.cards ADD COLUMN x int", "idx_x", "magic.cards_reload")
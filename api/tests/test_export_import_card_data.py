@@ -1,14 +1,18 @@
 """Tests for card data export/import functionality."""
 
+import contextlib
+import hashlib
 import inspect
 import multiprocessing
 import pathlib
 import tempfile
 import time
+from collections.abc import Iterable, Iterator
 from unittest import mock
 
 import orjson
 import pytest
+import zstandard as zstd
 
 from api.api_resource import APIResource
 
@@ -19,6 +23,48 @@ def get_api_resource() -> APIResource:
     )
 
 
+def write_jsonl_zst(path: pathlib.Path, rows: list[dict]) -> None:
+    with path.open("wb") as f, zstd.ZstdCompressor().stream_writer(f) as writer:
+        for row in rows:
+            writer.write(orjson.dumps(row, option=orjson.OPT_APPEND_NEWLINE))
+
+
+def read_jsonl_zst(path: pathlib.Path) -> list[dict]:
+    with path.open("rb") as f, zstd.ZstdDecompressor().stream_reader(f) as reader:
+        return [orjson.loads(line) for line in reader.read().splitlines()]
+
+
+def write_export(export_dir: pathlib.Path, tables: dict[str, list[dict]]) -> None:
+    """Write an export in the current format: a .jsonl.zst file per table and a manifest."""
+    manifest = {"tables": {}}
+    for table, rows in tables.items():
+        write_jsonl_zst(export_dir / f"{table}.jsonl.zst", rows)
+        sha256 = hashlib.sha256((export_dir / f"{table}.jsonl.zst").read_bytes()).hexdigest()
+        manifest["tables"][table] = {"file": f"{table}.jsonl.zst", "count": len(rows), "sha256": sha256}
+    (export_dir / "manifest.json").write_bytes(orjson.dumps(manifest))
+
+
+@contextlib.contextmanager
+def recorded_copies() -> Iterator[dict[str, list[dict]]]:
+    """Record the rows each COPY of a restore writes, by table, instead of sending them."""
+    copies: dict[str, list[dict]] = {}
+
+    def copy_rows_binary(_cursor: object, table_name: str, _columns: object, rows: Iterable[dict]) -> int:
+        copies[table_name] = [dict(row) for row in rows]
+        return len(copies[table_name])
+
+    index_definitions = {"magic.cards": [("idx_cards_name", "CREATE INDEX idx_cards_name ON magic.cards USING btree (card_name)")]}
+    with (
+        mock.patch("api.api_resource.db_utils.copy_rows_binary", side_effect=copy_rows_binary),
+        mock.patch("api.api_resource.db_utils.get_table_columns", return_value=[("card_name", "text")]),
+        mock.patch(
+            "api.api_resource.db_utils.get_index_definitions",
+            side_effect=lambda _cursor, table_name: index_definitions.get(table_name, []),
+        ),
+    ):
+        yield copies
+
+
 class TestExportImportCardData:
     """Test suite for export_card_data and import_card_data methods."""
 
@@ -58,7 +104,7 @@ class TestExportImportCardData:
     def test_export_card_data_creates_directory(self, mock_path: mock.Mock) -> None:
         """Test that export_card_data creates the proper directory structure."""
         # Setup mocks
-        mock_export_dir = mock.Mock()
+        mock_export_dir = mock.MagicMock()
         mock_path.return_value.__truediv__.return_value = mock_export_dir
 
         # Create API resource and mock its connection pool
@@ -81,13 +127,15 @@ class TestExportImportCardData:
             mock.patch.object(
                 api_resource,
                 "_export_cards_table",
-                return_value={"file": "cards.json", "count": 0},
+                return_value={"file": "cards.jsonl.zst", "count": 0, "sha256": "a"},
+            ),
+            mock.patch.object(
+                api_resource, "_export_tags_table", return_value={"file": "tags.jsonl.zst", "count": 0, "sha256": "b"}
             ),
-            mock.patch.object(api_resource, "_export_tags_table", return_value={"file": "tags.json", "count": 0}),
             mock.patch.object(
                 api_resource,
                 "_export_tag_relationships_table",
-                return_value={"file": "relations.json", "count": 0},
+                return_value={"file": "tag_relationships.jsonl.zst", "count": 0, "sha256": "c"},
             ),
         ):
             result = api_resource.export_card_data()
@@ -95,6 +143,9 @@ class TestExportImportCardData:
         # Verify directory creation was called
         mock_export_dir.mkdir.assert_called_once_with(parents=True, exist_ok=True)
         assert result["status"] == "success"
+        # the manifest is written last, recording every file
+        manifest = orjson.loads(mock_export_dir.__truediv__.return_value.write_bytes.call_args.args[0])
+        assert manifest["tables"]["tags"] == {"file": "tags.jsonl.zst", "count": 0, "sha256": "b"}
 
     @mock.patch("api.api_resource.pathlib.Path")
     def test_find_import_directory_with_timestamp(self, mock_path: mock.Mock) -> None:
@@ -192,7 +243,20 @@ class TestExportImportCardData:
             # Create only one file
             (import_dir / "cards.json").touch()
 
-            with pytest.raises(ValueError, match=r"Missing required files: tags\.json, tag_relationships\.json"):
+            with pytest.raises(ValueError, match=r"Missing required files: tags\.jsonl\.zst, tag_relationships\.jsonl\.zst"):
+                api_resource._validate_import_files(import_dir)
+
+    def test_validate_import_files_checksum_mismatch(self) -> None:
+        """Test _validate_import_files rejects files that don't match the manifest's checksums."""
+        api_resource = get_api_resource()
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            import_dir = pathlib.Path(temp_dir)
+            write_export(import_dir, {"cards": [], "tags": [{"tag": "haste"}], "tag_relationships": []})
+            api_resource._validate_import_files(import_dir)
+
+            write_jsonl_zst(import_dir / "tags.jsonl.zst", [{"tag": "flying"}])
+            with pytest.raises(ValueError, match=r"Checksum mismatch for tags\.jsonl\.zst"):
                 api_resource._validate_import_files(import_dir)
 
     def test_export_cards_table(self) -> None:
@@ -221,24 +285,25 @@ class TestExportImportCardData:
         }
 
         mock_cursor = mock.Mock()
-        mock_cursor.fetchall.return_value = [mock_row]
+        mock_cursor.stream.return_value = iter([mock_row])
 
         with tempfile.TemporaryDirectory() as temp_dir:
             export_dir = pathlib.Path(temp_dir)
             result = api_resource._export_cards_table(mock_cursor, export_dir)
 
             assert result["count"] == 1
-            assert "cards.json" in result["file"]
+            assert "cards.jsonl.zst" in result["file"]
 
-            # Verify JSON file was created
-            cards_file = export_dir / "cards.json"
+            # Verify the compressed JSON lines file was created
+            cards_file = export_dir / "cards.jsonl.zst"
             assert cards_file.exists()
+            assert result["sha256"] == hashlib.sha256(cards_file.read_bytes()).hexdigest()
 
             # Verify JSON content
-            with cards_file.open("r", encoding="utf-8") as f:
-                data = orjson.loads(f.read())
-                assert len(data) == 1
-                assert data[0]["card_name"] == "Lightning Bolt"
+            data = read_jsonl_zst(cards_file)
+            assert len(data) == 1
+            assert data[0]["card_name"] == "Lightning Bolt"
+            assert data[0]["raw_card_blob"] == {"name": "Lightning Bolt"}
 
     def test_export_tags_table(self) -> None:
         """Test _export_tags_table helper method."""
@@ -249,25 +314,24 @@ class TestExportImportCardData:
         mock_row2 = {"tag": "flying"}
 
         mock_cursor = mock.Mock()
-        mock_cursor.fetchall.return_value = [mock_row1, mock_row2]
+        mock_cursor.stream.return_value = iter([mock_row1, mock_row2])
 
         with tempfile.TemporaryDirectory() as temp_dir:
             export_dir = pathlib.Path(temp_dir)
             result = api_resource._export_tags_table(mock_cursor, export_dir)
 
             assert result["count"] == 2
-            assert "tags.json" in result["file"]
+            assert "tags.jsonl.zst" in result["file"]
 
-            # Verify JSON file was created
-            tags_file = export_dir / "tags.json"
+            # Verify the compressed JSON lines file was created
+            tags_file = export_dir / "tags.jsonl.zst"
             assert tags_file.exists()
 
             # Verify JSON content
-            with tags_file.open("r", encoding="utf-8") as f:
-                data = orjson.loads(f.read())
-                assert len(data) == 2
-                assert data[0]["tag"] == "haste"
-                assert data[1]["tag"] == "flying"
+            data = read_jsonl_zst(tags_file)
+            assert len(data) == 2
+            assert data[0]["tag"] == "haste"
+            assert data[1]["tag"] == "flying"
 
     def test_export_tag_relationships_table(self) -> None:
         """Test _export_tag_relationships_table helper method."""
@@ -278,41 +342,38 @@ class TestExportImportCardData:
         mock_row2 = {"child_tag": "flying", "parent_tag": "keyword"}
 
         mock_cursor = mock.Mock()
-        mock_cursor.fetchall.return_value = [mock_row1, mock_row2]
+        mock_cursor.stream.return_value = iter([mock_row1, mock_row2])
 
         with tempfile.TemporaryDirectory() as temp_dir:
             export_dir = pathlib.Path(temp_dir)
             result = api_resource._export_tag_relationships_table(mock_cursor, export_dir)
 
             assert result["count"] == 2
-            assert "tag_relationships.json" in result["file"]
+            assert "tag_relationships.jsonl.zst" in result["file"]
 
-            # Verify JSON file was created
-            relationships_file = export_dir / "tag_relationships.json"
+            # Verify the compressed JSON lines file was created
+            relationships_file = export_dir / "tag_relationships.jsonl.zst"
             assert relationships_file.exists()
 
             # Verify JSON content
-            with relationships_file.open("r", encoding="utf-8") as f:
-                data = orjson.loads(f.read())
-                assert len(data) == 2
-                assert data[0]["child_tag"] == "haste"
-                assert data[0]["parent_tag"] == "keyword"
+            data = read_jsonl_zst(relationships_file)
+            assert len(data) == 2
+            assert data[0]["child_tag"] == "haste"
+            assert data[0]["parent_tag"] == "keyword"
 
     def test_perform_import(self) -> None:
-        """Test _perform_import helper method."""
+        """Test _perform_import COPYs each table of a legacy .json export."""
         api_resource = get_api_resource()
 
-        # Mock cursor
         mock_cursor = mock.Mock()
         mock_cursor.fetchone.side_effect = [
             {"count": 1},  # tags count
+            None,  # no tag cycle
             {"count": 1},  # relationships count
             {"count": 1},  # cards count
         ]
-        # Mock rowcount for progress tracking
-        mock_cursor.rowcount = 1
 
-        with tempfile.TemporaryDirectory() as temp_dir:
+        with tempfile.TemporaryDirectory() as temp_dir, recorded_copies() as copies:
             import_dir = pathlib.Path(temp_dir)
 
             # Create JSON files with sample data
@@ -350,80 +411,135 @@ class TestExportImportCardData:
 
             result = api_resource._perform_import(mock_cursor, import_dir)
 
-            assert result["tags"] == 1
-            assert result["tag_relationships"] == 1
-            assert result["cards"] == 1
-
-            # Verify delete operations and inserts were called
-            # Should include: 3 deletes + 1 tag insert + 1 relationship insert + 1 card batch insert + 3 counts
-            assert mock_cursor.execute.call_count >= 8
+        assert result == {"tags": 1, "tag_relationships": 1, "cards": 1}
+        assert copies["magic.tags"] == tags_data
+        assert copies["magic.tag_relationships"] == relationships_data
+        assert [card["card_name"] for card in copies["magic.cards"]] == ["Lightning Bolt"]
+        # exports from before the pip count columns existed get them derived
+        assert copies["magic.cards"][0]["mana_pips_r"] == 1
+        assert [card["raw_card_blob"] for card in copies["magic.card_blobs"]] == [{"name": "Lightning Bolt"}]
 
     def test_perform_import_large_batch(self) -> None:
-        """Test _perform_import with larger dataset to verify batch processing."""
+        """Test _perform_import COPYs a whole table in one COPY, however many rows it has."""
         api_resource = get_api_resource()
 
-        # Mock cursor
         mock_cursor = mock.Mock()
         mock_cursor.fetchone.side_effect = [
             {"count": 5},  # tags count
+            None,  # no tag cycle
             {"count": 3},  # relationships count
             {"count": 1000},  # cards count
         ]
-        # Mock rowcount for progress tracking - simulate 750 cards per batch
-        mock_cursor.rowcount = 750
 
-        with tempfile.TemporaryDirectory() as temp_dir:
+        with tempfile.TemporaryDirectory() as temp_dir, recorded_copies() as copies:
             import_dir = pathlib.Path(temp_dir)
 
-            # Create JSON files with larger sample data
             tags_data = [{"tag": f"tag_{i}"} for i in range(5)]
-            with (import_dir / "tags.json").open("w", encoding="utf-8") as f:
-                f.write(orjson.dumps(tags_data).decode("utf-8"))
-
             relationships_data = [
                 {"child_tag": "tag_0", "parent_tag": "tag_1"},
                 {"child_tag": "tag_1", "parent_tag": "tag_2"},
                 {"child_tag": "tag_2", "parent_tag": "tag_3"},
             ]
-            with (import_dir / "tag_relationships.json").open("w", encoding="utf-8") as f:
-                f.write(orjson.dumps(relationships_data).decode("utf-8"))
+            # every other card has no blob, as printings exported without one
+            cards_data = [
+                {
+                    "card_name": f"Test Card {i}",
+                    "cmc": i % 10,
+                    "mana_cost_text": "{R}",
+                    "raw_card_blob": {"name": f"Test Card {i}"} if i % 2 else None,
+                    "oracle_text": f"Test card {i}",
+                }
+                for i in range(1000)
+            ]
+            write_export(import_dir, {"cards": cards_data, "tags": tags_data, "tag_relationships": relationships_data})
 
-            # Create 1000 test cards to test batch processing
-            cards_data = []
-            for i in range(1000):
-                cards_data.append(
-                    {
-                        "card_name": f"Test Card {i}",
-                        "cmc": i % 10,
-                        "mana_cost_text": "{R}",
-                        "mana_cost_jsonb": {"R": 1},
-                        "raw_card_blob": {"name": f"Test Card {i}"},
-                        "card_types": ["Instant"],
-                        "card_subtypes": [],
-                        "card_colors": {"R": True},
-                        "card_color_identity": {"R": True},
-                        "card_keywords": {},
-                        "oracle_text": f"Test card {i}",
-                        "edhrec_rank": None,
-                        "creature_power": None,
-                        "creature_power_text": None,
-                        "creature_toughness": None,
-                        "creature_toughness_text": None,
-                        "card_oracle_tags": {},
-                    },
-                )
-            with (import_dir / "cards.json").open("w", encoding="utf-8") as f:
-                f.write(orjson.dumps(cards_data).decode("utf-8"))
+            result = api_resource._perform_import(mock_cursor, import_dir)
+
+        assert result == {"tags": 5, "tag_relationships": 3, "cards": 1000}
+        assert len(copies["magic.cards"]) == 1000
+        assert len(copies["magic.card_blobs"]) == 500
+        assert not [call for call in mock_cursor.execute.call_args_list if "INSERT INTO magic.cards" in call.args[0]]
+
+    def test_perform_import_rebuilds_indexes_and_tag_triggers(self) -> None:
+        """Test _perform_import drops indexes before loading and rebuilds them, and disables tag triggers only while loading."""
+        api_resource = get_api_resource()
+
+        mock_cursor = mock.Mock()
+        mock_cursor.fetchone.side_effect = [{"count": 1}, None, {"count": 0}, {"count": 1}]
+
+        with tempfile.TemporaryDirectory() as temp_dir, recorded_copies():
+            import_dir = pathlib.Path(temp_dir)
+            cards = [{"card_name": "Test Card", "mana_cost_text": "{R}"}]
+            write_export(import_dir, {"cards": cards, "tags": [{"tag": "haste"}], "tag_relationships": []})
+
+            api_resource._perform_import(mock_cursor, import_dir)
+
+        statements = [call.args[0] for call in mock_cursor.execute.call_args_list]
+        index_definition = "CREATE INDEX idx_cards_name ON magic.cards USING btree (card_name)"
+        drop_index = statements.index("DROP INDEX magic.idx_cards_name")
+        disable = statements.index(
+            "ALTER TABLE magic.tag_relationships DISABLE TRIGGER prevent_circular_references, DISABLE TRIGGER add_tag_closure",
+        )
+        rebuild_closure = statements.index("SELECT magic.rebuild_tag_closure()")
+        enable = statements.index(
+            "ALTER TABLE magic.tag_relationships ENABLE TRIGGER prevent_circular_references, ENABLE TRIGGER add_tag_closure",
+        )
+        assert drop_index < disable < rebuild_closure < enable < statements.index(index_definition)
+        assert "ANALYZE magic.cards" in statements
+
+    def test_perform_import_rejects_tag_cycle(self) -> None:
+        """Test _perform_import fails, so the restore is rolled back, when the tag hierarchy has a cycle."""
+        api_resource = get_api_resource()
+
+        mock_cursor = mock.Mock()
+        mock_cursor.fetchone.side_effect = [{"count": 2}, {"tag": "haste"}]
+
+        with tempfile.TemporaryDirectory() as temp_dir, recorded_copies():
+            import_dir = pathlib.Path(temp_dir)
+            relationships = [{"child_tag": "haste", "parent_tag": "keyword"}, {"child_tag": "keyword", "parent_tag": "haste"}]
+            write_export(
+                import_dir,
+                {"cards": [], "tags": [{"tag": "haste"}, {"tag": "keyword"}], "tag_relationships": relationships},
+            )
+
+            with pytest.raises(ValueError, match="Circular reference detected: haste is its own ancestor"):
+                api_resource._perform_import(mock_cursor, import_dir)
+
+    def test_perform_import_streams_jsonl_export(self) -> None:
+        """Test _perform_import reads .jsonl.zst exports and checks the counts against the manifest."""
+        api_resource = get_api_resource()
+
+        mock_cursor = mock.Mock()
+        mock_cursor.fetchone.side_effect = [{"count": 1}, None, {"count": 0}, {"count": 2}]
+
+        with tempfile.TemporaryDirectory() as temp_dir, recorded_copies() as copies:
+            import_dir = pathlib.Path(temp_dir)
+            cards = [
+                {"card_name": f"Test Card {i}", "mana_cost_text": "{R}", "raw_card_blob": {"name": f"Test Card {i}"}}
+                for i in range(2)
+            ]
+            write_export(import_dir, {"cards": cards, "tags": [{"tag": "haste"}], "tag_relationships": []})
 
             result = api_resource._perform_import(mock_cursor, import_dir)
 
-            assert result["tags"] == 5
-            assert result["tag_relationships"] == 3
-            assert result["cards"] == 1000
+        assert result == {"tags": 1, "tag_relationships": 0, "cards": 2}
+        assert copies["magic.tags"] == [{"tag": "haste"}]
+        assert [card["card_name"] for card in copies["magic.cards"]] == ["Test Card 0", "Test Card 1"]
+
+    def test_perform_import_rejects_missing_rows(self) -> None:
+        """Test _perform_import fails, so the restore is rolled back, when rows of the export went missing."""
+        api_resource = get_api_resource()
+
+        mock_cursor = mock.Mock()
+        mock_cursor.fetchone.side_effect = [{"count": 1}, None, {"count": 0}, {"count": 1}]
+
+        with tempfile.TemporaryDirectory() as temp_dir, recorded_copies():
+            import_dir = pathlib.Path(temp_dir)
+            cards = [{"card_name": f"Test Card {i}", "mana_cost_text": "{R}"} for i in range(2)]
+            write_export(import_dir, {"cards": cards, "tags": [{"tag": "haste"}], "tag_relationships": []})
 
-            # Verify batch processing: with 1000 cards and batch size 750, we expect 2 batches
-            # Total calls: 3 deletes + 5 tag inserts + 3 relationship inserts + 2 card batch inserts + 3 counts = 16
-            assert mock_cursor.execute.call_count >= 16
+            with pytest.raises(ValueError, match="Imported 1 rows of cards, but the export holds 2"):
+                api_resource._perform_import(mock_cursor, import_dir)
 
     def test_export_import_integration_structure(self) -> None:
         """Test that export/import methods have compatible interfaces."""
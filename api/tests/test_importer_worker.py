@@ -0,0 +1,167 @@
+"""Tests for the background importer."""
+
+from __future__ import annotations
+
+import multiprocessing
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from api.importer_worker import ImporterWorker, import_due, price_refresh_due
+from api.utils.multiprocessing_utils import ImportStatus
+
+HOUR = 3600
+NOW = 1_800_000_000.0
+
+
+@pytest.mark.parametrize(
+    argnames=("requested", "last_import_time", "imported_updated_at", "updated_at", "expected"),
+    argvalues=[
+        # nothing imported yet
+        (False, 0.0, None, None, True),
+        # asked for by a serving worker
+        (True, NOW - 60, "2026-10-18T09:00:00+00:00", "2026-10-18T09:00:00+00:00", True),
+        # scryfall regenerated the export
+        (False, NOW - 60, "2026-10-18T09:00:00+00:00", "2026-10-19T09:00:00+00:00", True),
+        # unchanged export, interval not yet passed
+        (False, NOW - 60, "2026-10-18T09:00:00+00:00", "2026-10-18T09:00:00+00:00", False),
+        # scryfall unreachable, interval not yet passed
+        (False, NOW - 60, "2026-10-18T09:00:00+00:00", None, False),
+        # interval passed
+        (False, NOW - 25 * HOUR, "2026-10-18T09:00:00+00:00", "2026-10-18T09:00:00+00:00", True),
+        (False, NOW - 25 * HOUR, "2026-10-18T09:00:00+00:00", None, True),
+    ],
+)
+def test_import_due(
+    requested: bool,
+    last_import_time: float,
+    imported_updated_at: str | None,
+    updated_at: str | None,
+    expected: bool,
+) -> None:
+    """Test when the importer decides to run an import."""
+    due = import_due(
+        requested=requested,
+        last_import_time=last_import_time,
+        now=NOW,
+        interval_seconds=24 * HOUR,
+        imported_updated_at=imported_updated_at,
+        updated_at=updated_at,
+    )
+    assert due is expected
+
+
+@pytest.mark.parametrize(
+    argnames=("last_refresh_time", "interval_seconds", "expected"),
+    argvalues=[
+        # refreshed, or imported, an hour ago
+        (NOW - HOUR, 6 * HOUR, False),
+        # interval passed
+        (NOW - 6 * HOUR, 6 * HOUR, True),
+        # price refreshes disabled
+        (NOW - 25 * HOUR, 0, False),
+    ],
+)
+def test_price_refresh_due(last_refresh_time: float, interval_seconds: float, expected: bool) -> None:
+    """Test when the importer refreshes prices between imports."""
+    assert price_refresh_due(last_refresh_time=last_refresh_time, now=NOW, interval_seconds=interval_seconds) is expected
+
+
+def make_importer(exit_flag: MagicMock | None = None) -> ImporterWorker:
+    """An importer with fresh shared state, not started."""
+    return ImporterWorker(
+        exit_flag=exit_flag,
+        last_import_time=multiprocessing.Value("d", 0.0, lock=True),
+        data_generation=multiprocessing.Value("i", 0, lock=True),
+        import_status=ImportStatus(),
+        import_requested=multiprocessing.Event(),
+    )
+
+
+def test_run_import_runs_the_import_flow_directly() -> None:
+    """Test the importer runs the import itself rather than through import_data and its result cache."""
+    importer = make_importer()
+    api = MagicMock()
+    api._run_import_under_lock.side_effect = lambda: setattr(importer.last_import_time, "value", NOW)
+
+    assert importer._run_import(api) is True
+
+    api._run_import_under_lock.assert_called_once_with()
+    api.import_data.assert_not_called()
+
+
+def test_run_import_records_a_failure_without_raising() -> None:
+    """Test a failed import is reported in the import status and not counted as imported."""
+    importer = make_importer()
+    api = MagicMock()
+    api._run_import_under_lock.side_effect = OSError("disk full")
+
+    assert importer._run_import(api) is False
+
+    assert importer.import_status.snapshot()["stage"] == "failed"
+    assert importer.import_status.snapshot()["message"] == "disk full"
+
+
+def test_failed_initial_import_leaves_the_server_running() -> None:
+    """Test the initial import runs after the resource is built, and its failure doesn't set the exit flag."""
+    exit_flag = MagicMock()
+    exit_flag.is_set.return_value = True
+    importer = make_importer(exit_flag)
+    api = MagicMock()
+    api._run_import_under_lock.side_effect = OSError("no network")
+
+    with (
+        patch("api.api_resource.APIResource", return_value=api) as mock_api_resource,
+        patch.object(ImporterWorker, "_get_updated_at", return_value=None),
+    ):
+        importer.run()
+
+    # built to leave the import to the importer, rather than importing in its constructor
+    assert mock_api_resource.call_args.kwargs["import_requested"] is importer.import_requested
+    api._run_import_under_lock.assert_called_once_with()
+    assert importer.import_status.snapshot()["stage"] == "failed"
+    exit_flag.set.assert_not_called()
+
+
+def test_prices_are_refreshed_between_imports() -> None:
+    """Test a poll with no import due refreshes prices in the importer, once the price refresh interval has passed."""
+    exit_flag = MagicMock()
+    exit_flag.is_set.side_effect = [False, True]
+    importer = make_importer(exit_flag)
+    importer.poll_seconds = 0
+    api = MagicMock()
+    api._run_import_under_lock.side_effect = lambda: setattr(importer.last_import_time, "value", NOW)
+
+    with (
+        patch("api.api_resource.APIResource", return_value=api),
+        patch.object(ImporterWorker, "_get_updated_at", return_value="2026-10-18T09:00:00+00:00"),
+        patch("api.importer_worker.price_refresh_due", return_value=True),
+    ):
+        importer.run()
+
+    # only the initial import
+    api._run_import_under_lock.assert_called_once_with()
+    api.refresh_prices.assert_called_once_with()
+    exit_flag.set.assert_not_called()
+
+
+def test_import_status_updates_merge_fields() -> None:
+    """Test each update keeps the fields it doesn't set."""
+    import_status = ImportStatus()
+    assert import_status.snapshot() == {}
+
+    import_status.update(stage="loading", cards_sent=0)
+    import_status.update(cards_sent=6000)
+
+    assert import_status.snapshot() == {"stage": "loading", "cards_sent": 6000}
+
+
+def test_import_status_rejects_oversized_status() -> None:
+    """Test a status too large for the shared buffer is refused, leaving the previous one."""
+    import_status = ImportStatus(size=64)
+    import_status.update(stage="idle")
+
+    with pytest.raises(ValueError, match="doesn't fit"):
+        import_status.update(message="x" * 100)
+
+    assert import_status.snapshot() == {"stage": "idle"}
@@ -2,10 +2,13 @@
 
 from __future__ import annotations
 
+import copy
+import json
 import multiprocessing
 import os
 import pathlib
 import time
+import uuid
 from typing import TYPE_CHECKING
 
 import psycopg
@@ -343,6 +346,58 @@ class TestContainerIntegration:
         shorthand_names = {card["name"] for card in shorthand_found_cards}
         assert found_names == shorthand_names, "set: and s: searches should return identical results"
 
+    def test_reimport_updates_only_changed_cards(self: TestContainerIntegration, api_resource: APIResource) -> None:
+        """Test re-importing a card leaves it alone when unchanged and updates it when its content changed."""
+        sample_card = json.loads((pathlib.Path(__file__).parents[2] / "docs" / "sample_data" / "sol_ring.json").read_text())
+        sample_card["id"] = str(uuid.uuid4())
+        sample_card["prices"] = {"usd": "1.00"}
+
+        first_result = api_resource._load_cards_with_staging([copy.deepcopy(sample_card)])
+        assert first_result["cards_inserted"] == 1
+
+        unchanged_result = api_resource._load_cards_with_staging([copy.deepcopy(sample_card)])
+        assert unchanged_result["cards_unchanged"] == 1
+        assert unchanged_result["cards_inserted"] == unchanged_result["cards_updated"] == 0
+
+        sample_card["prices"] = {"usd": "2.50"}
+        changed_result = api_resource._load_cards_with_staging([copy.deepcopy(sample_card)])
+        assert changed_result["cards_updated"] == 1
+        assert changed_result["cards_inserted"] == changed_result["cards_unchanged"] == 0
+
+        with api_resource._conn_pool.connection() as conn, conn.cursor() as cursor:
+            cursor.execute("SELECT price_usd FROM magic.cards WHERE scryfall_id = %s", (sample_card["id"],))
+            assert cursor.fetchone()["price_usd"] == pytest.approx(2.5)
+            cursor.execute(
+                "SELECT raw_card_blob -> 'prices' ->> 'usd' AS usd FROM magic.card_blobs WHERE scryfall_id = %s",
+                (sample_card["id"],),
+            )
+            assert cursor.fetchone()["usd"] == "2.50"
+            cursor.execute("DELETE FROM magic.cards WHERE scryfall_id = %s", (sample_card["id"],))
+            cursor.execute("DELETE FROM magic.card_blobs WHERE scryfall_id = %s", (sample_card["id"],))
+            conn.commit()
+
+    def test_slow_tag_fetch_outlasts_inherited_timeout(self: TestContainerIntegration, api_resource: APIResource) -> None:
+        """Test a tag COPY fed by slow fetches is not cancelled by a session statement_timeout left on a pooled connection."""
+        pool = api_resource._conn_pool
+        with pool.connection() as first_conn, pool.connection() as second_conn:
+            for conn in (first_conn, second_conn):
+                conn.execute("set statement_timeout = 100")
+                conn.commit()
+
+        def slow_tagged_card_names() -> Generator[tuple[str, list[str]]]:
+            time.sleep(0.5)
+            yield ("slow-fetch-test", ["Slow Fetch Test Card"])
+
+        try:
+            result = api_resource._apply_card_tags(tag_kind="oracle", tagged_card_names=slow_tagged_card_names())
+            assert result["links_added"] == 1
+        finally:
+            with pool.connection() as first_conn, pool.connection() as second_conn:
+                for conn in (first_conn, second_conn):
+                    conn.execute("reset statement_timeout")
+                    conn.execute("DELETE FROM magic.card_tags WHERE tag = 'slow-fetch-test'")
+                    conn.commit()
+
     def test_artist_search_integration(self: TestContainerIntegration, api_resource: APIResource) -> None:
         """Test end-to-end artist search functionality with real database."""
         # Import Brainstorm card which has "Willian Murai" as artist
@@ -0,0 +1,80 @@
+"""Tests for deriving is: tags from stored card data."""
+
+import pytest
+
+from api.utils.is_tags import IS_TAG_CARD_FIELDS, IS_TAG_RULES, get_derived_is_tags
+
+GRIZZLY_BEARS = {
+    "type_line": "Creature — Bear",
+    "oracle_text": "",
+    "mana_cost": "{1}{G}",
+    "cmc": 2.0,
+    "power": "2",
+    "toughness": "2",
+    "layout": "normal",
+    "keywords": [],
+    "finishes": ["nonfoil"],
+    "reprint": True,
+}
+SERRA_ANGEL = {
+    "type_line": "Creature — Angel",
+    "oracle_text": "Flying\nVigilance (Attacking doesn't cause this creature to tap.)",
+    "mana_cost": "{3}{W}{W}",
+    "cmc": 5.0,
+    "power": "4",
+    "toughness": "4",
+    "layout": "normal",
+    "keywords": ["Flying", "Vigilance"],
+    "finishes": ["nonfoil", "foil"],
+}
+CHARMED_SLEEP = {
+    "type_line": "Instant",
+    "oracle_text": "Choose one —\n• Counter target spell.\n• Draw a card.",
+    "mana_cost": "{U/R}{G/P}",
+    "cmc": 2.0,
+    "layout": "normal",
+    "keywords": [],
+}
+LEGENDARY_BACK_FACE = {
+    "type_line": "Legendary Creature — Human Wizard",
+    "oracle_text": "Whenever you cast a spell, draw a card.",
+    "mana_cost": "",
+    "layout": "transform",
+    "keywords": [],
+    "face_idx": 2,
+}
+
+
+@pytest.mark.parametrize(
+    ("card", "expected"),
+    [
+        (GRIZZLY_BEARS, ["permanent", "spell", "vanilla", "bear", "reprint", "nonfoil"]),
+        (SERRA_ANGEL, ["permanent", "spell", "french_vanilla", "foil", "nonfoil"]),
+        (CHARMED_SLEEP, ["spell", "modal", "hybrid", "phyrexian"]),
+        (LEGENDARY_BACK_FACE, ["permanent", "spell", "historic", "party", "dfc", "transform"]),
+    ],
+)
+def test_derived_is_tags(card: dict, expected: list[str]) -> None:
+    """Each rule picks out the faces with its tag, and a back face can't be a commander."""
+    assert get_derived_is_tags(card) == expected
+
+
+def test_derived_is_tags_can_be_limited() -> None:
+    """Only the requested tags are checked."""
+    assert get_derived_is_tags(GRIZZLY_BEARS, ["bear", "historic"]) == ["bear"]
+
+
+def test_commander() -> None:
+    """Legendary creature fronts and cards saying so can be commanders, other legendaries can't."""
+    assert get_derived_is_tags({**LEGENDARY_BACK_FACE, "face_idx": 1}, ["commander"]) == ["commander"]
+    assert get_derived_is_tags({"type_line": "Legendary Artifact", "oracle_text": "Tap: add {C}."}, ["commander"]) == []
+    planeswalker = {"type_line": "Legendary Planeswalker — Teferi", "oracle_text": "Teferi can be your commander."}
+    assert get_derived_is_tags(planeswalker, ["commander"]) == ["commander"]
+
+
+def test_rules_only_read_fetched_fields() -> None:
+    """The rules see only IS_TAG_CARD_FIELDS of a stored card, so they must not need anything else."""
+    full_card = {**SERRA_ANGEL, "name": "Serra Angel", "set": "lea", "legalities": {"vintage": "legal"}}
+    fetched = {field: value for field, value in full_card.items() if field in IS_TAG_CARD_FIELDS}
+    assert get_derived_is_tags(fetched) == get_derived_is_tags(full_card)
+    assert set(IS_TAG_RULES) >= {"permanent", "spell", "vanilla", "french_vanilla", "dfc", "modal", "commander"}
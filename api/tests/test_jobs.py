@@ -0,0 +1,113 @@
+"""Tests for background job bookkeeping, progress and cancellation."""
+
+from __future__ import annotations
+
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+
+from api.utils.jobs import JobCancelledError, ProgressLog, RunningJob, estimate_seconds_remaining
+
+
+class FakeClock:
+    """A clock that only moves when told to."""
+
+    def __init__(self) -> None:
+        """Start at zero."""
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        """The current time."""
+        return self.now
+
+
+class RecordingJob:
+    """A running job that keeps what it is told."""
+
+    def __init__(self) -> None:
+        """Start with no reports."""
+        self.reports: list[dict[str, Any]] = []
+
+    def report(self, progress: dict[str, Any]) -> None:
+        """Keep the progress."""
+        self.reports.append(progress)
+
+
+def make_pool(*, cancel_requested: bool = False) -> tuple[MagicMock, MagicMock]:
+    """A pool whose cursor answers the progress update with cancel_requested."""
+    pool = MagicMock()
+    cursor = pool.connection.return_value.__enter__.return_value.cursor.return_value.__enter__.return_value
+    cursor.fetchone.return_value = {"cancel_requested": cancel_requested}
+    return pool, cursor
+
+
+@pytest.mark.parametrize(
+    argnames=("elapsed", "done", "total", "expected"),
+    argvalues=[
+        # nothing done yet
+        (5.0, 0, 10, None),
+        (0.0, 0, 0, None),
+        # a quarter done in 10s leaves 30s
+        (10.0, 25, 100, 30.0),
+        # all done
+        (10.0, 100, 100, 0.0),
+    ],
+)
+def test_estimate_seconds_remaining(elapsed: float, done: int, total: int, expected: float | None) -> None:
+    """Test the estimate assumes the remaining steps go as fast as the done ones."""
+    assert estimate_seconds_remaining(elapsed, done, total) == expected
+
+
+def test_progress_log_reports_each_step_to_the_job() -> None:
+    """Test each step reports the steps done before it and the ETA they give."""
+    clock = FakeClock()
+    job = RecordingJob()
+    progress = ProgressLog(4, description="Fetched tag", job=job, clock=clock)
+
+    progress.step("flying")
+    clock.now = 10.0
+    progress.step("haste")
+
+    assert job.reports == [
+        {"description": "Fetched tag", "done": 0, "total": 4, "item": "flying", "elapsed_seconds": 0.0, "eta_seconds": None},
+        {"description": "Fetched tag", "done": 1, "total": 4, "item": "haste", "elapsed_seconds": 10.0, "eta_seconds": 30.0},
+    ]
+    assert progress.done == 2
+
+
+def test_progress_log_without_a_job_only_logs() -> None:
+    """Test an operation not running as a job still counts its steps."""
+    progress = ProgressLog(2, description="Processing tag", clock=FakeClock())
+
+    progress.step("flying")
+
+    assert progress.done == 1
+
+
+def test_running_job_throttles_progress_writes() -> None:
+    """Test progress is written at most once per report_interval."""
+    clock = FakeClock()
+    pool, cursor = make_pool()
+    job = RunningJob(pool, 7, report_interval=1.0, clock=clock)
+
+    job.report({"done": 0})
+    clock.now = 0.5
+    job.report({"done": 1})
+    clock.now = 1.0
+    job.report({"done": 2})
+
+    assert cursor.execute.call_count == 2
+    assert cursor.execute.call_args.args[1]["job_id"] == 7
+    assert cursor.execute.call_args.args[1]["progress"].obj == {"done": 2}
+
+
+def test_running_job_raises_when_cancelled() -> None:
+    """Test a progress write that finds cancel_requested stops the job."""
+    pool, _ = make_pool(cancel_requested=True)
+    progress = ProgressLog(3, description="Fetched tag", job=RunningJob(pool, 7, clock=FakeClock()), clock=FakeClock())
+
+    with pytest.raises(JobCancelledError, match="Job 7 was cancelled"):
+        progress.step("flying")
+
+    assert progress.done == 0
@@ -0,0 +1,51 @@
+"""Tests for incremental JSON array parsing."""
+
+from __future__ import annotations
+
+import io
+import json
+
+import pytest
+
+from api.utils.json_stream import iter_json_array
+
+SAMPLE_ARRAY = [
+    {"name": "Lightning Bolt", "oracle_text": 'Deals 3 damage. "Quotes", [brackets] and {braces}', "cmc": 1},
+    {"name": "Black Lotus", "nested": [{"a": [1, 2, {"b": None}]}], "price": 12345.678},
+    12345,
+    -2.5e-3,
+    "plain string",
+    None,
+    True,
+    [],
+    {},
+]
+
+
+@pytest.mark.parametrize("indent", [None, 2])
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 64, 1 << 20])
+def test_iter_json_array_matches_json_loads(indent: int | None, chunk_size: int) -> None:
+    """Test that elements come out identical however the input is chunked."""
+    text = json.dumps(SAMPLE_ARRAY, indent=indent)
+    assert list(iter_json_array(io.StringIO(text), chunk_size=chunk_size)) == SAMPLE_ARRAY
+
+
+@pytest.mark.parametrize("text", ["[]", " [ ]\n", "[\n]"])
+def test_iter_json_array_empty(text: str) -> None:
+    """Test that empty arrays yield nothing."""
+    assert list(iter_json_array(io.StringIO(text), chunk_size=1)) == []
+
+
+def test_iter_json_array_is_lazy() -> None:
+    """Test that elements are yielded before the rest of the stream has been read."""
+    stream = io.StringIO('[{"a": 1}, {"b": 2}, ' + " " * 10_000 + "]")
+    elements = iter_json_array(stream, chunk_size=16)
+    assert next(elements) == {"a": 1}
+    assert stream.tell() < 100
+
+
+@pytest.mark.parametrize("text", ["", "{}", "[1", "[1,", "[1,]", "[1 2]", "[1x]", "[1] x"])
+def test_iter_json_array_rejects_malformed_input(text: str) -> None:
+    """Test that malformed or truncated arrays raise ValueError."""
+    with pytest.raises(ValueError, match=r"."):
+        list(iter_json_array(io.StringIO(text), chunk_size=1))
@@ -5,8 +5,12 @@ import time
 import unittest
 from unittest.mock import MagicMock, patch
 
-from api.api_resource import APIResource
+import falcon
+import pytest
+
+from api.api_resource import APIResource, get_where_clause
 from api.enums import PreferOrder
+from api.settings import settings
 
 
 class TestPreferOrder(unittest.TestCase):
@@ -31,6 +35,7 @@ class TestPreferOrder(unittest.TestCase):
         assert PreferOrder.USD_LOW == "usd_low"
         assert PreferOrder.USD_HIGH == "usd_high"
         assert PreferOrder.PROMO == "promo"
+        assert PreferOrder.CUSTOM == "custom"
 
     def test_search_accepts_prefer_parameter(self) -> None:
         """Test that search method accepts prefer parameter."""
@@ -115,3 +120,61 @@ class TestPreferOrder(unittest.TestCase):
                 prefer=PreferOrder.DEFAULT,
             )
             assert "prefer_score" in result["compiled"]
+
+    def test_search_custom_prefer_weights(self) -> None:
+        """Test that custom prefer weights rank by the weighted component columns."""
+        with (
+            patch.object(self.api_resource, "_conn_pool") as mock_pool,
+            patch.object(
+                self.api_resource,
+                "_setup_complete",
+            ) as mock_setup,
+        ):
+            mock_setup.return_value = True
+            mock_conn = MagicMock()
+            mock_cursor = MagicMock()
+            mock_cursor.fetchall.return_value = [
+                {"total_cards_count": 0, "name": None},
+            ]
+            mock_conn.cursor.return_value.__enter__.return_value = mock_cursor
+            mock_pool.connection.return_value.__enter__.return_value = mock_conn
+
+            result = self.api_resource.search(
+                query="cmc=3",
+                prefer=PreferOrder.CUSTOM,
+                prefer_weights="frame:2,rarity:0",
+            )
+            assert "prefer_frame" in result["compiled"]
+            assert "prefer_rarity" not in result["compiled"]
+
+            with pytest.raises(falcon.HTTPBadRequest):
+                self.api_resource.search(
+                    query="cmc=3",
+                    prefer=PreferOrder.CUSTOM,
+                    prefer_weights="colour:2",
+                )
+
+    def test_custom_prefer_weights_leave_the_cached_where_clause_alone(self) -> None:
+        """Test the weights are bound in a copy of the params get_where_clause caches for the query."""
+        original_setting = settings.enable_cache
+        try:
+            settings.enable_cache = True
+            get_where_clause.cache.clear()
+            _, cached_params = get_where_clause("cmc=3")
+            cached_keys = set(cached_params)
+            with (
+                patch.object(self.api_resource, "_conn_pool") as mock_pool,
+                patch.object(self.api_resource, "_setup_complete", return_value=True),
+            ):
+                mock_cursor = mock_pool.connection.return_value.__enter__.return_value.cursor.return_value.__enter__.return_value
+                mock_cursor.fetchall.return_value = [{"total_cards_count": 0, "name": None}]
+
+                result = self.api_resource._search(query="cmc=3", prefer=PreferOrder.CUSTOM, prefer_weights=(("frame", 2.0),))
+
+            assert result["params"]["prefer_weight_frame"] == 2.0
+            assert get_where_clause("cmc=3")[1] is cached_params
+            assert set(cached_params) == cached_keys
+        finally:
+            settings.enable_cache = original_setting
+            get_where_clause.cache.clear()
+            self.api_resource._search.cache.clear()
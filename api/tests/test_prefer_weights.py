@@ -0,0 +1,60 @@
+"""Tests for custom prefer score weightings."""
+
+import pytest
+
+from api.utils.prefer_weights import PREFER_SCORE_COMPONENTS, get_prefer_rank_expression, parse_prefer_weights
+
+
+def test_no_weights_weigh_every_component_one() -> None:
+    """Without weights every component weighs 1, ranking like prefer_score."""
+    assert parse_prefer_weights(None) == tuple((component, 1.0) for component in PREFER_SCORE_COMPONENTS)
+    assert parse_prefer_weights("") == parse_prefer_weights(None)
+
+
+def test_weights_are_normalized() -> None:
+    """Equal weightings parse equal however they are written."""
+    first = parse_prefer_weights("frame:2,rarity:0")
+    second = parse_prefer_weights(" Rarity:0.0 , FRAME:2,")
+    assert first == second
+    weights = dict(first)
+    assert weights["frame"] == 2.0
+    assert weights["rarity"] == 0.0
+    assert weights["border"] == 1.0
+    assert [component for component, _ in first] == list(PREFER_SCORE_COMPONENTS)
+
+
+@pytest.mark.parametrize(
+    ("prefer_weights", "match"),
+    [
+        ("colour:2", "component:weight"),
+        ("frame", "component:weight"),
+        ("frame:high", "could not convert"),
+        ("frame:nan", "within"),
+        ("frame:inf", "within"),
+        ("frame:1001", "within"),
+        ("frame:-1001", "within"),
+    ],
+)
+def test_invalid_weights_raise(prefer_weights: str, match: str) -> None:
+    """Unknown components, malformed pairs and unreasonable weights are rejected."""
+    with pytest.raises(ValueError, match=match):
+        parse_prefer_weights(prefer_weights)
+
+
+def test_rank_expression_binds_weights_and_skips_zeros() -> None:
+    """The expression binds each nonzero weight as a parameter and leaves zero weights out."""
+    params = {}
+    expression = get_prefer_rank_expression(parse_prefer_weights("frame:2.5,rarity:0"), params)
+    assert "%(prefer_weight_frame)s * prefer_frame" in expression
+    assert "prefer_rarity" not in expression
+    assert params["prefer_weight_frame"] == 2.5
+    assert "prefer_weight_rarity" not in params
+    assert len(params) == len(PREFER_SCORE_COMPONENTS) - 1
+
+
+def test_rank_expression_with_all_zero_weights() -> None:
+    """All zero weights rank every printing equally."""
+    params = {}
+    weights = parse_prefer_weights(",".join(f"{component}:0" for component in PREFER_SCORE_COMPONENTS))
+    assert get_prefer_rank_expression(weights, params) == "0"
+    assert params == {}
@@ -0,0 +1,219 @@
+"""Tests for the token bucket rate limiter."""
+
+import email.utils
+import multiprocessing
+import threading
+import time
+from http import HTTPStatus
+from unittest.mock import MagicMock
+
+import pytest
+
+from api.utils.rate_limiter import (
+    DEFAULT_RETRY_AFTER_SECONDS,
+    MIN_RATE_FRACTION,
+    TokenBucket,
+    get_retry_after_seconds,
+    rate_limited_get,
+)
+
+
+class FakeClock:
+    """A clock that only moves when something sleeps on it."""
+
+    def __init__(self) -> None:
+        """Start at zero."""
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        """The current time."""
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        """Advance the time."""
+        self.now += seconds
+
+
+def make_bucket(clock: FakeClock, *, rate: float = 10.0, capacity: float = 1.0) -> TokenBucket:
+    """A bucket on the fake clock."""
+    return TokenBucket(rate=rate, capacity=capacity, clock=clock, sleep=clock.sleep)
+
+
+def test_requests_are_spaced_by_the_rate() -> None:
+    """Test each request after the first waits 1 / rate."""
+    clock = FakeClock()
+    bucket = make_bucket(clock)
+
+    waits = [bucket.acquire() for _ in range(5)]
+
+    assert waits[0] == 0
+    assert waits[1:] == pytest.approx([0.1] * 4)
+    assert clock.now == pytest.approx(0.4)
+
+
+def test_capacity_allows_bursts() -> None:
+    """Test a full bucket hands out capacity tokens at once, then refills at the rate."""
+    clock = FakeClock()
+    bucket = make_bucket(clock, capacity=3)
+
+    assert [bucket.acquire() for _ in range(3)] == [0, 0, 0]
+    assert bucket.acquire() == pytest.approx(0.1)
+
+
+def test_pause_holds_back_every_request() -> None:
+    """Test a pause delays the next token until it's over, starting from an empty bucket."""
+    clock = FakeClock()
+    bucket = make_bucket(clock, capacity=3)
+
+    bucket.pause(2.0)
+
+    assert bucket.acquire() == pytest.approx(2.1)
+    # a shorter pause doesn't cut a longer one short
+    bucket.pause(5.0)
+    bucket.pause(1.0)
+    assert bucket.acquire() == pytest.approx(5.1)
+
+
+def test_threads_share_the_rate() -> None:
+    """Test threads sharing a bucket are held to its rate together."""
+    bucket = TokenBucket(rate=100)
+    before = time.monotonic()
+    threads = [threading.Thread(target=lambda: [bucket.acquire() for _ in range(5)]) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # 20 tokens at 100 per second, the first one free
+    assert time.monotonic() - before >= 0.19 - 0.01
+
+
+def test_processes_share_the_rate() -> None:
+    """Test processes forked after the bucket was created are held to its rate together."""
+    bucket = TokenBucket(rate=100)
+    context = multiprocessing.get_context("fork")
+    before = time.monotonic()
+    processes = [context.Process(target=lambda: [bucket.acquire() for _ in range(5)]) for _ in range(4)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+    assert all(process.exitcode == 0 for process in processes)
+    assert time.monotonic() - before >= 0.19 - 0.01
+    assert bucket.stats()["requests"] == 20
+
+
+def test_back_off_halves_the_rate_until_requests_win_it_back() -> None:
+    """Test a 429 pauses the bucket and halves its rate, which grows back as tokens are handed out."""
+    clock = FakeClock()
+    bucket = make_bucket(clock)
+
+    bucket.back_off(1.0)
+
+    assert bucket.stats()["current_rate"] == pytest.approx(5.0)
+    assert bucket.acquire() == pytest.approx(1.2)
+    for _ in range(20):
+        bucket.acquire()
+    assert bucket.stats()["current_rate"] == pytest.approx(10.0)
+
+
+def test_back_off_slows_down_once_per_pause() -> None:
+    """Test the 429s of requests in flight together halve the rate once, and never below MIN_RATE_FRACTION."""
+    clock = FakeClock()
+    bucket = make_bucket(clock)
+
+    for _ in range(3):
+        bucket.back_off(1.0)
+    assert bucket.stats()["current_rate"] == pytest.approx(5.0)
+
+    for _ in range(10):
+        clock.sleep(2.0)
+        bucket.back_off(1.0)
+    assert bucket.stats()["current_rate"] == pytest.approx(10.0 * MIN_RATE_FRACTION)
+    assert bucket.stats()["throttled"] == 13
+
+
+def test_stats_report_throughput_and_waits() -> None:
+    """Test stats count the requests, their rate and the time spent waiting for tokens."""
+    clock = FakeClock()
+    bucket = make_bucket(clock)
+
+    for _ in range(5):
+        bucket.acquire()
+    clock.sleep(0.1)
+    stats = bucket.stats()
+
+    assert stats["requests"] == 5
+    assert stats["requests_per_second"] == pytest.approx(10.0)
+    assert stats["waited_seconds"] == pytest.approx(0.4)
+    assert stats["average_wait_seconds"] == pytest.approx(0.08)
+    assert stats["throttled"] == 0
+    assert stats["paused_for_seconds"] == 0
+
+
+def make_response(status: HTTPStatus, retry_after: str | None = None) -> MagicMock:
+    """A response with a status and, optionally, a Retry-After header."""
+    response = MagicMock(status_code=status)
+    response.headers = {"Retry-After": retry_after} if retry_after else {}
+    return response
+
+
+def test_rate_limited_get_backs_off_and_retries() -> None:
+    """Test a 429 backs off the bucket for its Retry-After before the request is made again."""
+    clock = FakeClock()
+    bucket = make_bucket(clock)
+    session = MagicMock()
+    session.get.side_effect = [make_response(HTTPStatus.TOO_MANY_REQUESTS, "2"), make_response(HTTPStatus.OK)]
+
+    response = rate_limited_get(session, "https://api.scryfall.com/cards/search", rate_limiter=bucket, params={"q": "t:goblin"})
+
+    assert response.status_code == HTTPStatus.OK
+    assert session.get.call_count == 2
+    session.get.assert_called_with("https://api.scryfall.com/cards/search", params={"q": "t:goblin"})
+    # paused for the Retry-After, then one token at the halved rate
+    assert clock.now == pytest.approx(2.2)
+    assert bucket.stats()["throttled"] == 1
+
+
+def test_rate_limited_get_gives_up_after_attempts() -> None:
+    """Test the last 429 is returned once every attempt has been told to back off."""
+    clock = FakeClock()
+    session = MagicMock()
+    session.get.return_value = make_response(HTTPStatus.TOO_MANY_REQUESTS)
+
+    response = rate_limited_get(session, "https://api.scryfall.com/cards/search", rate_limiter=make_bucket(clock), attempts=3)
+
+    assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS
+    assert session.get.call_count == 3
+
+
+def test_rejects_nonsense_rates() -> None:
+    """Test a bucket needs a positive rate and room for one token."""
+    with pytest.raises(ValueError, match="positive rate"):
+        TokenBucket(rate=0)
+    with pytest.raises(ValueError, match="positive rate"):
+        TokenBucket(rate=1, capacity=0.5)
+
+
+@pytest.mark.parametrize(
+    ("retry_after", "expected"),
+    [
+        (None, DEFAULT_RETRY_AFTER_SECONDS),
+        ("", DEFAULT_RETRY_AFTER_SECONDS),
+        ("3", 3.0),
+        ("0.5", 0.5),
+        ("-2", 0.0),
+        ("soon", DEFAULT_RETRY_AFTER_SECONDS),
+    ],
+)
+def test_get_retry_after_seconds(retry_after: str | None, expected: float) -> None:
+    """Test Retry-After given in seconds, or missing or unparseable."""
+    assert get_retry_after_seconds(retry_after) == expected
+
+
+def test_get_retry_after_seconds_from_http_date() -> None:
+    """Test Retry-After given as an HTTP date."""
+    retry_after = email.utils.formatdate(time.time() + 30, usegmt=True)
+
+    assert 28 <= get_retry_after_seconds(retry_after) <= 30
@@ -0,0 +1,333 @@
+"""Tests for the Scryfall bulk data fetcher."""
+
+from __future__ import annotations
+
+import datetime as dt
+import email.utils
+import gzip
+import os
+import threading
+import time
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import TYPE_CHECKING
+from unittest.mock import patch
+
+import orjson
+import pytest
+import requests
+import zstandard as zstd
+
+from api import scryfall_bulk_data_fetcher
+from api.scryfall_bulk_data_fetcher import BulkDataKey, ScryfallBulkDataFetcher
+
+if TYPE_CHECKING:
+    import pathlib
+    from collections.abc import Iterator
+
+DOWNLOAD_URI = "https://data.scryfall.io/default-cards/default-cards-20261018090000.json"
+UPDATED_AT = "2026-10-18T09:00:00.000+00:00"
+CARDS = [{"id": f"00000000-0000-0000-0000-{idx:012d}", "name": f"Card {idx}"} for idx in range(100)]
+EXPORT = orjson.dumps(CARDS, option=orjson.OPT_INDENT_2)
+
+
+class ExportServer(ThreadingHTTPServer):
+    """A local stand-in for Scryfall's bulk data host, serving EXPORT at every path."""
+
+    def __init__(self) -> None:
+        """Listen on a free local port."""
+        super().__init__(("127.0.0.1", 0), ExportHandler)
+        self.etag = '"export-1"'
+        self.last_modified = dt.datetime.fromisoformat(UPDATED_AT).timestamp()
+        # bodies of the next responses are cut off after this many bytes, None to send them whole
+        self.cut_after: list[int | None] = []
+        # send only this prefix of the export, as if it were the whole file
+        self.truncate_to: int | None = None
+        # gzip-encode the export for clients that accept it, as Scryfall's file servers do
+        self.gzip = False
+        self.request_headers: list[dict[str, str]] = []
+        self.catalog = [
+            {"type": BulkDataKey.DEFAULT_CARDS, "download_uri": self.uri("default-cards.json"), "updated_at": UPDATED_AT}
+        ]
+
+    def uri(self, name: str) -> str:
+        """The URI of an export file on this server."""
+        return f"http://127.0.0.1:{self.server_address[1]}/default-cards/{name}"
+
+
+class ExportHandler(BaseHTTPRequestHandler):
+    """Serve the export, honoring If-Modified-Since and Range/If-Range like a static file host."""
+
+    server: ExportServer
+
+    def do_GET(self) -> None:
+        """Serve the export, or the bulk data catalog at /bulk-data."""
+        if self.path == "/bulk-data":
+            body = orjson.dumps({"data": self.server.catalog})
+            self.send_response(HTTPStatus.OK)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        self.server.request_headers.append(dict(self.headers))
+        if_modified_since = self.headers.get("If-Modified-Since")
+        if if_modified_since and email.utils.parsedate_to_datetime(if_modified_since).timestamp() >= self.server.last_modified:
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.end_headers()
+            return
+
+        body = EXPORT[: self.server.truncate_to]
+        gzip_encoded = self.server.gzip and "gzip" in self.headers.get("Accept-Encoding", "")
+        if gzip_encoded:
+            # Content-Length and ranges then count the encoded bytes
+            body = gzip.compress(body)
+        start = 0
+        range_header = self.headers.get("Range")
+        if range_header and self.headers.get("If-Range") == self.server.etag:
+            start = int(range_header.removeprefix("bytes=").rstrip("-"))
+            self.send_response(HTTPStatus.PARTIAL_CONTENT)
+            self.send_header("Content-Range", f"bytes {start}-{len(body) - 1}/{len(body)}")
+        else:
+            self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Length", str(len(body) - start))
+        if gzip_encoded:
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("ETag", self.server.etag)
+        self.send_header("Last-Modified", email.utils.formatdate(self.server.last_modified, usegmt=True))
+        self.end_headers()
+        cut_after = self.server.cut_after.pop(0) if self.server.cut_after else None
+        self.wfile.write(body[start:][:cut_after])
+        if cut_after is not None:
+            self.close_connection = True
+
+    def log_message(self, *_args: object) -> None:
+        """Keep the test output quiet."""
+
+
+@pytest.fixture
+def export_server() -> Iterator[ExportServer]:
+    """A running ExportServer."""
+    server = ExportServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _make_fetcher(tmp_path: pathlib.Path, download_uri: str) -> Iterator[ScryfallBulkDataFetcher]:
+    fetcher = ScryfallBulkDataFetcher()
+    fetcher.cache_directory = tmp_path
+    listing = {BulkDataKey.DEFAULT_CARDS: {"download_uri": download_uri, "updated_at": UPDATED_AT}}
+    with (
+        patch.object(ScryfallBulkDataFetcher, "list_bulk_data", return_value=listing),
+        patch.object(scryfall_bulk_data_fetcher, "DOWNLOAD_CHUNK_SIZE", 256),
+        patch.object(scryfall_bulk_data_fetcher, "DOWNLOAD_FRAME_BYTES", 1024),
+    ):
+        yield fetcher
+
+
+@pytest.fixture
+def fetcher(tmp_path: pathlib.Path) -> Iterator[ScryfallBulkDataFetcher]:
+    """A fetcher caching into tmp_path, with the bulk data listing stubbed out."""
+    yield from _make_fetcher(tmp_path, DOWNLOAD_URI)
+
+
+@pytest.fixture
+def catalog_fetcher(tmp_path: pathlib.Path, export_server: ExportServer) -> Iterator[ScryfallBulkDataFetcher]:
+    """A fetcher caching into tmp_path, fetching its catalog from export_server."""
+    fetcher = ScryfallBulkDataFetcher()
+    fetcher.cache_directory = tmp_path
+    with patch.object(scryfall_bulk_data_fetcher, "BULK_DATA_URI", f"http://127.0.0.1:{export_server.server_address[1]}/bulk-data"):
+        yield fetcher
+
+
+@pytest.fixture
+def local_fetcher(tmp_path: pathlib.Path, export_server: ExportServer) -> Iterator[ScryfallBulkDataFetcher]:
+    """A fetcher caching into tmp_path and downloading from export_server, in small frames."""
+    yield from _make_fetcher(tmp_path, export_server.uri("default-cards-20261018090000.json"))
+
+
+def _write_cache_file(fetcher: ScryfallBulkDataFetcher, compressed: bytes) -> pathlib.Path:
+    cache_file_path = fetcher.cache_directory / BulkDataKey.DEFAULT_CARDS / "default-cards-20261018090000.json.zstd"
+    cache_file_path.parent.mkdir(parents=True)
+    cache_file_path.write_bytes(compressed)
+    return cache_file_path
+
+
+def test_iter_data_for_key_streams_cached_file(fetcher: ScryfallBulkDataFetcher) -> None:
+    """Test that a cached export is streamed card by card without downloading."""
+    _write_cache_file(fetcher, zstd.compress(orjson.dumps(CARDS)))
+
+    with patch.object(fetcher.session, "get") as mock_get:
+        assert list(fetcher.iter_data_for_key(BulkDataKey.DEFAULT_CARDS)) == CARDS
+        assert fetcher.get_data_for_key(BulkDataKey.DEFAULT_CARDS) == CARDS
+    mock_get.assert_not_called()
+
+
+def test_iter_data_for_key_reads_streamed_frames(fetcher: ScryfallBulkDataFetcher) -> None:
+    """Test that files written by a streaming compressor (no content size in the frame) are readable."""
+    compressor = zstd.ZstdCompressor()
+    chunker = compressor.chunker(chunk_size=256)
+    compressed = b"".join([*chunker.compress(orjson.dumps(CARDS)), *chunker.finish()])
+    _write_cache_file(fetcher, compressed)
+
+    assert list(fetcher.iter_data_for_key(BulkDataKey.DEFAULT_CARDS)) == CARDS
+    assert fetcher.get_data_for_key(BulkDataKey.DEFAULT_CARDS) == CARDS
+
+
+def _write_previous_export(fetcher: ScryfallBulkDataFetcher, updated_at: float) -> pathlib.Path:
+    previous_path = _write_cache_file(fetcher, zstd.compress(orjson.dumps(CARDS[:10])))
+    previous_path = previous_path.rename(previous_path.with_name("default-cards-20261017090000.json.zstd"))
+    os.utime(previous_path, (updated_at, updated_at))
+    return previous_path
+
+
+def test_download_is_compressed_in_frames(local_fetcher: ScryfallBulkDataFetcher, export_server: ExportServer) -> None:
+    """Test a fresh download is stored compressed in several frames, stamped with the export's updated_at."""
+    cache_file_path = local_fetcher.get_cache_file_for_key(BulkDataKey.DEFAULT_CARDS)
+
+    assert list(local_fetcher.iter_data_for_key(BulkDataKey.DEFAULT_CARDS)) == CARDS
+    assert cache_file_path.read_bytes().count(zstd.FRAME_HEADER) > 1
+    assert cache_file_path.stat().st_mtime == export_server.last_modified
+    assert [path.name for path in cache_file_path.parent.iterdir()] == [cache_file_path.name]
+    assert len(export_server.request_headers) == 1
+
+
+def test_interrupted_download_resumes_with_range(local_fetcher: ScryfallBulkDataFetcher, export_server: ExportServer) -> None:
+    """Test a download cut off mid-way is resumed from its last complete frame rather than restarted."""
+    export_server.cut_after = [3000, 2500]
+
+    local_fetcher.get_cache_file_for_key(BulkDataKey.DEFAULT_CARDS)
+
+    assert list(local_fetcher.iter_data_for_key(BulkDataKey.DEFAULT_CARDS)) == CARDS
+    first, *resumes = export_server.request_headers
+    assert "Range" not in first
+    assert [headers["If-Range"] for headers in resumes] == [export_server.etag, export_server.etag]
+    offsets = [int(headers["Range"].removeprefix("bytes=").rstrip("-")) for headers in resumes]
+    assert 0 < offsets[0] < offsets[1] < len(EXPORT)
+
+
+def test_download_asks_for_the_export_unencoded(local_fetcher: ScryfallBulkDataFetcher, export_server: ExportServer) -> None:
+    """Test downloads and resumes ask for identity encoding, so the bytes counted match Content-Length and Range offsets."""
+    export_server.gzip = True
+    export_server.cut_after = [3000]
+
+    local_fetcher.get_cache_file_for_key(BulkDataKey.DEFAULT_CARDS)
+
+    assert list(local_fetcher.iter_data_for_key(BulkDataKey.DEFAULT_CARDS)) == CARDS
+    assert [headers["Accept-Encoding"] for headers in export_server.request_headers] == ["identity", "identity"]
+    assert "Range" in export_server.request_headers[1]
+
+
+def test_interrupted_download_resumes_on_next_call(local_fetcher: ScryfallBulkDataFetcher, export_server: ExportServer) -> None:
+    """Test a download that ran out of attempts falls back to the old export, and is resumed by the next call."""
+    previous_path = _write_previous_export(local_fetcher, export_server.last_modified - 86400)
+    export_server.cut_after = [3000] * scryfall_bulk_data_fetcher.DOWNLOAD_ATTEMPTS
+
+    assert local_fetcher.get_cache_file_for_key(BulkDataKey.DEFAULT_CARDS) == previous_path
+
+    cache_file_path = local_fetcher.get_cache_file_for_key(BulkDataKey.DEFAULT_CARDS)
+
+    assert list(local_fetcher.iter_data_for_key(BulkDataKey.DEFAULT_CARDS)) == CARDS
+    assert export_server.request_headers[-1]["Range"] != "bytes=0-"
+    assert [path.name for path in cache_file_path.parent.iterdir()] == [cache_file_path.name]
+
+
+def test_changed_export_restarts_download(local_fetcher: ScryfallBulkDataFetcher, export_server: ExportServer) -> None:
+    """Test a resume against a different version of the export (If-Range mismatch) starts over."""
+    export_server.cut_after = [3000] * scryfall_bulk_data_fetcher.DOWNLOAD_ATTEMPTS
+    with pytest.raises(requests.RequestException):
+        local_fetcher.get_cache_file_for_key(BulkDataKey.DEFAULT_CARDS)
+    export_server.etag = '"export-2"'
+
+    local_fetcher.get_cache_file_for_key(BulkDataKey.DEFAULT_CARDS)
+
+    assert list(local_fetcher.iter_data_for_key(BulkDataKey.DEFAULT_CARDS)) == CARDS
+
+
+def test_up_to_date_export_is_not_downloaded(local_fetcher: ScryfallBulkDataFetcher, export_server: ExportServer) -> None:
+    """Test a cached export at least as new as updated_at is used without asking the server."""
+    previous_path = _write_previous_export(local_fetcher, export_server.last_modified)
+
+    assert local_fetcher.get_cache_file_for_key(BulkDataKey.DEFAULT_CARDS) == previous_path
+    assert export_server.request_headers == []
+
+
+def test_not_modified_export_keeps_previous_file(local_fetcher: ScryfallBulkDataFetcher, export_server: ExportServer) -> None:
+    """Test the download is conditional on the cached export and a 304 keeps using it."""
+    previous_path = _write_previous_export(local_fetcher, export_server.last_modified - 60)
+    export_server.last_modified -= 3600
+
+    assert local_fetcher.get_cache_file_for_key(BulkDataKey.DEFAULT_CARDS) == previous_path
+
+    assert "If-Modified-Since" in export_server.request_headers[0]
+    # marked as holding the current export, so the next call doesn't ask again
+    assert local_fetcher.get_cache_file_for_key(BulkDataKey.DEFAULT_CARDS) == previous_path
+    assert len(export_server.request_headers) == 1
+
+
+def test_truncated_download_is_rejected(local_fetcher: ScryfallBulkDataFetcher, export_server: ExportServer) -> None:
+    """Test a download that doesn't check out is discarded without pruning the previous export."""
+    previous_path = _write_previous_export(local_fetcher, export_server.last_modified - 86400)
+    export_server.truncate_to = len(EXPORT) // 2
+
+    with pytest.raises(ValueError, match="incomplete"):
+        local_fetcher.get_cache_file_for_key(BulkDataKey.DEFAULT_CARDS)
+
+    assert [path.name for path in previous_path.parent.glob("*.zstd*")] == [previous_path.name]
+
+
+def _persist_catalog(fetcher: ScryfallBulkDataFetcher, updated_at: str, fetched_at: float) -> None:
+    catalog = [{"type": BulkDataKey.DEFAULT_CARDS, "download_uri": DOWNLOAD_URI, "updated_at": updated_at}]
+    fetcher.catalog_path.write_bytes(orjson.dumps({"fetched_at": fetched_at, "data": catalog}))
+
+
+def test_catalog_is_persisted(catalog_fetcher: ScryfallBulkDataFetcher, export_server: ExportServer) -> None:
+    """Test a fetched catalog is persisted, so a new fetcher starts from it without a request."""
+    assert catalog_fetcher.catalog_age_seconds() is None
+    assert catalog_fetcher.get_updated_at_for_key(BulkDataKey.DEFAULT_CARDS) == UPDATED_AT
+    assert catalog_fetcher.catalog_age_seconds() < 60
+
+    restarted = ScryfallBulkDataFetcher()
+    restarted.cache_directory = catalog_fetcher.cache_directory
+    with patch.object(restarted.session, "get") as mock_get:
+        assert restarted.get_download_uri_for_key(BulkDataKey.DEFAULT_CARDS) == export_server.uri("default-cards.json")
+    mock_get.assert_not_called()
+
+
+def test_stale_catalog_is_refreshed_in_background(catalog_fetcher: ScryfallBulkDataFetcher) -> None:
+    """Test a stale catalog is returned at once while a fresh one is fetched in the background."""
+    _persist_catalog(catalog_fetcher, "2026-10-17T09:00:00.000+00:00", time.time() - 3600)
+
+    assert catalog_fetcher.get_updated_at_for_key(BulkDataKey.DEFAULT_CARDS) == "2026-10-17T09:00:00.000+00:00"
+    assert catalog_fetcher.catalog_age_seconds() >= 3600
+    catalog_fetcher._catalog_refresh.join(timeout=10)
+
+    assert catalog_fetcher.get_updated_at_for_key(BulkDataKey.DEFAULT_CARDS) == UPDATED_AT
+    assert catalog_fetcher.catalog_age_seconds() < 60
+    assert orjson.loads(catalog_fetcher.catalog_path.read_bytes())["data"][0]["updated_at"] == UPDATED_AT
+
+
+def test_unreachable_scryfall_falls_back_to_cached_export(fetcher: ScryfallBulkDataFetcher) -> None:
+    """Test that without a catalog or network, the newest cached export is used."""
+    previous_path = _write_previous_export(fetcher, time.time() - 86400)
+
+    with (
+        patch.object(ScryfallBulkDataFetcher, "list_bulk_data", side_effect=requests.ConnectionError("offline")),
+        patch.object(fetcher.session, "get", side_effect=requests.ConnectionError("offline")),
+    ):
+        assert fetcher.get_cache_file_for_key(BulkDataKey.DEFAULT_CARDS) == previous_path
+        assert list(fetcher.iter_data_for_key(BulkDataKey.DEFAULT_CARDS)) == CARDS[:10]
+
+
+def test_unreachable_scryfall_without_cached_export_raises(tmp_path: pathlib.Path) -> None:
+    """Test that without a catalog, network or cached export, the connection error is raised."""
+    fetcher = ScryfallBulkDataFetcher()
+    fetcher.cache_directory = tmp_path
+
+    with (
+        patch.object(fetcher.session, "get", side_effect=requests.ConnectionError("offline")),
+        pytest.raises(requests.ConnectionError),
+    ):
+        fetcher.get_cache_file_for_key(BulkDataKey.DEFAULT_CARDS)
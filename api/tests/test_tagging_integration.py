@@ -2,7 +2,7 @@
 
 import multiprocessing
 import time
-from collections.abc import Generator
+from collections.abc import Generator, Iterable
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -85,13 +85,15 @@ class TestTaggingIntegration:
         )
 
     @patch("api.api_resource.APIResource.discover_tags_from_scryfall")
-    @patch("api.api_resource.APIResource.update_tagged_cards")
+    @patch("api.api_resource.APIResource._apply_card_tags")
+    @patch("api.api_resource.APIResource._get_tagged_card_names")
     @patch("api.api_resource.APIResource._get_all_tags")
     def test_discover_and_import_all_tags_with_mocked_data(
         self,
-        mock_discover_tags: MagicMock,
-        mock_update_tagged_cards: MagicMock,
         mock_get_all_tags: MagicMock,
+        mock_get_tagged_card_names: MagicMock,
+        mock_apply_card_tags: MagicMock,
+        mock_discover_tags: MagicMock,
     ) -> None:
         """Test bulk import with mocked data to avoid external requests."""
         tags = [
@@ -100,6 +102,14 @@ class TestTaggingIntegration:
         ]
         mock_discover_tags.return_value = tags
         mock_get_all_tags.return_value = set(tags)
+        mock_get_tagged_card_names.side_effect = lambda query: [f"{query} card"]
+        applied = {}
+
+        def apply_card_tags(*, tag_kind: str, tagged_card_names: Iterable[tuple[str, list[str]]]) -> dict:
+            applied[tag_kind] = dict(tagged_card_names)
+            return {"links_added": 2, "links_removed": 0, "cards_updated": 2}
+
+        mock_apply_card_tags.side_effect = apply_card_tags
 
         api = APIResource(
             last_import_time=multiprocessing.Value("d", time.time(), lock=True),
@@ -117,10 +127,10 @@ class TestTaggingIntegration:
         # Should have called _get_all_tags to get existing tags
         mock_get_all_tags.assert_called_once()
 
-        # Should have called update_tagged_cards for each tag
-        assert mock_update_tagged_cards.call_count == 2
-        mock_update_tagged_cards.assert_any_call(tag="flying")
-        mock_update_tagged_cards.assert_any_call(tag="trample")
+        # Should have fetched the cards of each tag, then applied all of them at once
+        assert mock_get_tagged_card_names.call_count == 2
+        mock_apply_card_tags.assert_called_once()
+        assert applied == {"oracle": {"flying": ["oracletag:flying card"], "trample": ["oracletag:trample card"]}}
 
     def test_action_map_includes_new_endpoints(self) -> None:
         """Test that new endpoints are available in the action map."""
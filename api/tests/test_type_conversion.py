@@ -7,8 +7,11 @@ import time
 from typing import Any
 from unittest.mock import patch
 
+import pytest
+
 from api.api_resource import APIResource
-from api.utils.type_conversions import make_type_converting_wrapper
+from api.enums import UniqueOn
+from api.utils.type_conversions import convert_params_strictly, make_type_converting_wrapper
 
 
 class TestTypeConversion:
@@ -215,3 +218,32 @@ class TestTypeConversion:
             assert result["import_hierarchy"] is True
             assert result["import_cards_type"] == "bool"
             assert result["import_hierarchy_type"] == "bool"
+
+    def test_convert_params_strictly(self) -> None:
+        """Test strict conversion converts like the wrapper, and passes on values that are already converted."""
+
+        def job_func(*, limit: int = 10, flag: bool = False, unique: UniqueOn | None = None, note: str | None = None) -> None:
+            del limit, flag, unique, note
+
+        converted = convert_params_strictly(job_func, {"limit": "5", "flag": "off", "unique": "artwork", "note": "42"})
+
+        assert converted == {"limit": 5, "flag": False, "unique": UniqueOn.ARTWORK, "note": "42"}
+        assert convert_params_strictly(job_func, {"flag": True}) == {"flag": True}
+
+    @pytest.mark.parametrize(
+        argnames=("params", "error", "match"),
+        argvalues=[
+            ({"limit": "five"}, ValueError, "limit must be int"),
+            ({"flag": "maybe"}, ValueError, "flag must be bool"),
+            ({"colour": "red"}, TypeError, "colour"),
+            ({}, TypeError, "required"),
+        ],
+    )
+    def test_convert_params_strictly_rejects_mismatches(self, params: dict[str, str], error: type[Exception], match: str) -> None:
+        """Test values the lenient wrapper would pass on as strings, or let default, are errors."""
+
+        def job_func(*, required: str, limit: int = 10, flag: bool = False) -> None:
+            del required, limit, flag
+
+        with pytest.raises(error, match=match):
+            convert_params_strictly(job_func, {"required": "x", **params} if params else params)
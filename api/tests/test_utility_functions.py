@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from api.api_resource import get_where_clause, rewrap
+from api.api_resource import get_arithmetic_expressions, get_where_clause, rewrap, summarize_arithmetic_expression_stats
 from api.utils.error_monitoring import can_serialize
 
 
@@ -55,3 +55,44 @@ def test_get_where_clause_caching() -> None:
 
     # Results should be identical (cached)
     assert result1 == result2
+
+
+def test_get_arithmetic_expressions() -> None:
+    """Test that search queries report their normalized arithmetic expressions."""
+    assert get_arithmetic_expressions("t:creature tou>pow") == ("creature_power - creature_toughness",)
+    assert get_arithmetic_expressions("cmc:3") == ()
+
+
+def test_summarize_arithmetic_expression_stats() -> None:
+    """Test that unindexed expressions are ranked by the time an index would have saved their runs."""
+    rows = [
+        {"expression": "creature_power - creature_toughness", "search_count": 12, "run_count": 10, "total_ms": 20.0},
+        {"expression": "cmc - creature_power", "search_count": 40, "run_count": 4, "total_ms": 408.0},
+        {"expression": "cmc - creature_toughness", "search_count": 30, "run_count": 30, "total_ms": 3060.0},
+    ]
+
+    summary = summarize_arithmetic_expression_stats(rows)
+
+    assert summary["indexed_mean_ms"] == 2.0
+    assert [expr["expression"] for expr in summary["expressions"]] == [
+        "cmc - creature_toughness",
+        "cmc - creature_power",
+        "creature_power - creature_toughness",
+    ]
+    candidate = summary["expressions"][0]
+    assert candidate["indexed"] is False
+    assert candidate["mean_ms"] == 102.0
+    assert candidate["estimated_savings_ms"] == 3000.0
+    # mean over the 4 runs, not the 40 searches
+    assert summary["expressions"][1]["mean_ms"] == 102.0
+    assert summary["expressions"][-1]["estimated_savings_ms"] == 0.0
+
+
+def test_summarize_arithmetic_expression_stats_without_indexed_traffic() -> None:
+    """Test that savings can't be estimated before any indexed expression has been searched."""
+    summary = summarize_arithmetic_expression_stats(
+        [{"expression": "cmc - creature_power", "search_count": 1, "run_count": 1, "total_ms": 5.0}]
+    )
+
+    assert summary["indexed_mean_ms"] is None
+    assert summary["expressions"][0]["estimated_savings_ms"] is None
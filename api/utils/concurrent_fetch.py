@@ -0,0 +1,39 @@
+"""Running blocking fetches concurrently and handing out their results as they finish."""
+
+from __future__ import annotations
+
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator
+
+
+def fetch_concurrently[K, T](
+    keys: Iterable[K],
+    fetch: Callable[[K], T],
+    *,
+    max_workers: int,
+) -> Iterator[tuple[K, Future[T]]]:
+    """Run fetch for every key on a thread pool, yielding each key with its future as it finishes.
+
+    Results come out in the order they finish, so a consumer can write each one while the rest
+    are still being fetched. A fetch that raised re-raises from future.result(). Closing the
+    iterator early cancels the fetches that haven't started and waits for the running ones.
+
+    Args:
+        keys: Keys to fetch.
+        fetch: Blocking function fetching one key, called from the pool's threads.
+        max_workers: Most fetches running at once.
+
+    Yields:
+        (key, finished future) pairs.
+    """
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="fetch") as executor:
+        futures = {executor.submit(fetch, key): key for key in keys}
+        try:
+            for future in as_completed(futures):
+                yield futures[future], future
+        finally:
+            for future in futures:
+                future.cancel()
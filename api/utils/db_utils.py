@@ -1,12 +1,17 @@
 """Database utility functions for the API."""
 
 import atexit
+import datetime as dt
 import hashlib
 import logging
 import os
 import pathlib
 import random
+import re
 import time
+import uuid
+from collections.abc import Callable, Iterable
+from typing import Any
 
 import docker
 import docker.errors
@@ -17,6 +22,14 @@ import psycopg_pool
 
 logger = logging.getLogger(__name__)
 CONFLICT = 409
+# binary COPY dumps values by column type, and uuid and date columns need python objects
+# where card rows carry the strings they were parsed from
+BINARY_COPY_CONVERTERS: dict[str, Callable[[str], object]] = {
+    "uuid": uuid.UUID,
+    "date": dt.date.fromisoformat,
+}
+# pg_get_indexdef output, e.g. CREATE UNIQUE INDEX idx_cards_scryfall_id ON magic.cards USING btree (scryfall_id)
+INDEX_DEFINITION_PATTERN = re.compile(r"^(CREATE (?:UNIQUE )?INDEX) \S+ ON (?:ONLY )?\S+ (USING .+)$", re.DOTALL)
 
 
 class UUIDToStringLoader(psycopg.adapt.Loader):
@@ -146,6 +159,169 @@ def get_migrations() -> list[dict[str, str]]:
     return migrations
 
 
+def get_table_columns(cursor: psycopg.Cursor, table_name: str) -> list[tuple[str, str]]:
+    """Get the name and type of each column of a table, in table order.
+
+    Args:
+    ----
+        cursor (psycopg.Cursor): Cursor to query the catalog with.
+        table_name (str): Schema qualified table name, e.g. magic.cards.
+
+    Returns:
+    -------
+        List[Tuple[str, str]]: (column name, column type) pairs, e.g. ("cmc", "integer").
+
+    """
+    cursor.execute(
+        """
+        SELECT
+            attname AS column_name,
+            format_type(atttypid, atttypmod) AS column_type
+        FROM
+            pg_attribute
+        WHERE
+            attrelid = %(table_name)s::regclass
+            AND attnum > 0
+            AND NOT attisdropped
+        ORDER BY
+            attnum
+        """,
+        {"table_name": table_name},
+    )
+    return [(row["column_name"], row["column_type"]) for row in cursor.fetchall()]
+
+
+def get_index_definitions(cursor: psycopg.Cursor, table_name: str) -> list[tuple[str, str]]:
+    """Get the name and CREATE INDEX statement of each index of a table, by index name.
+
+    Indexes backing a constraint (primary keys, unique and exclusion constraints) are left out,
+    they are created along with their constraint.
+
+    Args:
+    ----
+        cursor (psycopg.Cursor): Cursor to query the catalog with.
+        table_name (str): Schema qualified table name, e.g. magic.cards.
+
+    Returns:
+    -------
+        List[Tuple[str, str]]: (index name, index definition) pairs, as returned by pg_get_indexdef.
+
+    """
+    cursor.execute(
+        """
+        SELECT
+            index_class.relname AS index_name,
+            pg_get_indexdef(pg_index.indexrelid) AS index_definition
+        FROM
+            pg_index
+            JOIN pg_class AS index_class ON index_class.oid = pg_index.indexrelid
+        WHERE
+            pg_index.indrelid = %(table_name)s::regclass
+            AND NOT EXISTS (SELECT 1 FROM pg_constraint WHERE pg_constraint.conindid = pg_index.indexrelid)
+        ORDER BY
+            index_class.relname
+        """,
+        {"table_name": table_name},
+    )
+    return [(row["index_name"], row["index_definition"]) for row in cursor.fetchall()]
+
+
+def retarget_index_definition(index_definition: str, index_name: str, table_name: str) -> str:
+    """Rewrite a CREATE INDEX statement to build the same index under another name on another table.
+
+    Args:
+    ----
+        index_definition (str): CREATE INDEX statement, as returned by pg_get_indexdef.
+        index_name (str): Name of the index to create.
+        table_name (str): Schema qualified table to create it on, with the same columns.
+
+    Returns:
+    -------
+        str: The rewritten CREATE INDEX statement.
+
+    """
+    match = INDEX_DEFINITION_PATTERN.match(index_definition)
+    if match is None:
+        msg = f"Unrecognized index definition: {index_definition}"
+        raise ValueError(msg)
+    create_index, using = match.groups()
+    return f"{create_index} {index_name} ON {table_name} {using}"
+
+
+def get_foreign_key_definitions(cursor: psycopg.Cursor, table_name: str) -> list[tuple[str, str]]:
+    """Get the name and definition of each foreign key constraint of a table, by constraint name.
+
+    Args:
+    ----
+        cursor (psycopg.Cursor): Cursor to query the catalog with.
+        table_name (str): Schema qualified table name, e.g. magic.cards.
+
+    Returns:
+    -------
+        List[Tuple[str, str]]: (constraint name, constraint definition) pairs, as returned by
+        pg_get_constraintdef, e.g. ("fk_cards_rarity", "FOREIGN KEY (...) REFERENCES ...").
+
+    """
+    cursor.execute(
+        """
+        SELECT
+            conname AS constraint_name,
+            pg_get_constraintdef(oid) AS constraint_definition
+        FROM
+            pg_constraint
+        WHERE
+            conrelid = %(table_name)s::regclass
+            AND contype = 'f'
+        ORDER BY
+            conname
+        """,
+        {"table_name": table_name},
+    )
+    return [(row["constraint_name"], row["constraint_definition"]) for row in cursor.fetchall()]
+
+
+def copy_rows_binary(
+    cursor: psycopg.Cursor,
+    table_name: str,
+    columns: list[tuple[str, str]],
+    rows: Iterable[dict[str, Any]],
+) -> int:
+    """COPY dict rows into typed columns of a table using the binary COPY format.
+
+    Values are sent as typed binary fields, so the server doesn't parse or cast them. Keys
+    missing from a row are written as NULL, keys that aren't columns are ignored.
+
+    Args:
+    ----
+        cursor (psycopg.Cursor): Cursor to COPY with.
+        table_name (str): Table to COPY into.
+        columns (List[Tuple[str, str]]): (column name, column type) pairs to write, as
+            returned by get_table_columns.
+        rows (Iterable[Dict[str, Any]]): Rows keyed by column name. uuid and date values
+            may be strings.
+
+    Returns:
+    -------
+        int: The number of rows written.
+
+    """
+    converters = [(column_name, BINARY_COPY_CONVERTERS.get(column_type)) for column_name, column_type in columns]
+    column_list = ", ".join(column_name for column_name, _ in columns)
+    num_rows = 0
+    with cursor.copy(f"COPY {table_name} ({column_list}) FROM STDIN (FORMAT BINARY)") as copy:
+        copy.set_types([column_type for _, column_type in columns])
+        for row in rows:
+            values = []
+            for column_name, convert in converters:
+                value = row.get(column_name)
+                if convert is not None and isinstance(value, str):
+                    value = convert(value)
+                values.append(value)
+            copy.write_row(values)
+            num_rows += 1
+    return num_rows
+
+
 def maybe_json(v: object) -> object:
     """Wrap a value in a Jsonb object if it is a list or dict."""
     if isinstance(v, list | dict):
@@ -0,0 +1,138 @@
+"""Rules deriving is: tags from the card data we already store."""
+
+from __future__ import annotations
+
+import re
+from typing import TYPE_CHECKING, Any
+
+from api.card_processing import parse_type_line
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+
+PERMANENT_TYPES = frozenset({"Artifact", "Battle", "Creature", "Enchantment", "Land", "Planeswalker"})
+PARTY_TYPES = frozenset({"Cleric", "Rogue", "Warrior", "Wizard"})
+OUTLAW_TYPES = frozenset({"Assassin", "Mercenary", "Pirate", "Rogue", "Warlock"})
+DOUBLE_FACED_LAYOUTS = frozenset({"transform", "modal_dfc", "meld"})
+# a bear is a 2/2 creature for 2
+BEAR_SIZE = 2
+# "Choose one —", "Choose one or more —", "Choose up to two —" and the like, followed by bullets
+_MODAL_PATTERN = re.compile(r"\bchoose\b[^\n]*—\s*\n•", re.IGNORECASE)
+_MANA_SYMBOL_PATTERN = re.compile(r"\{([^}]+)\}")
+_REMINDER_TEXT_PATTERN = re.compile(r"\([^)]*\)")
+
+
+def _types(card: dict[str, Any]) -> tuple[list[str], list[str]]:
+    return parse_type_line(card.get("type_line") or "")
+
+
+def _is_creature(card: dict[str, Any]) -> bool:
+    return "Creature" in _types(card)[0]
+
+
+def _mana_symbols(card: dict[str, Any]) -> list[list[str]]:
+    return [symbol.upper().split("/") for symbol in _MANA_SYMBOL_PATTERN.findall(card.get("mana_cost") or "")]
+
+
+def _is_french_vanilla(card: dict[str, Any]) -> bool:
+    """A creature with only keyword abilities, ignoring reminder text."""
+    text = _REMINDER_TEXT_PATTERN.sub("", card.get("oracle_text") or "").strip()
+    keywords = [keyword.lower() for keyword in card.get("keywords") or []]
+    if not _is_creature(card) or not text or not keywords:
+        return False
+    abilities = (ability.strip().lower() for line in text.splitlines() for ability in re.split(r"[,;]", line))
+    return all(any(ability.startswith(keyword) for keyword in keywords) for ability in abilities if ability)
+
+
+def _is_bear(card: dict[str, Any]) -> bool:
+    size = str(BEAR_SIZE)
+    return _is_creature(card) and card.get("cmc") == BEAR_SIZE and card.get("power") == size and card.get("toughness") == size
+
+
+def _can_be_commander(card: dict[str, Any]) -> bool:
+    """The front face is a legendary creature, or its text says it can be your commander."""
+    if card.get("face_idx", 1) != 1:
+        return False
+    card_types, _ = _types(card)
+    return {"Legendary", "Creature"} <= set(card_types) or "can be your commander" in (card.get("oracle_text") or "").lower()
+
+
+# is: tag -> whether a card face (the raw scryfall face blob kept in magic.card_blobs) has it
+IS_TAG_RULES: dict[str, Callable[[dict[str, Any]], bool]] = {
+    # types
+    "permanent": lambda card: bool(PERMANENT_TYPES & set(_types(card)[0])),
+    "spell": lambda card: bool((PERMANENT_TYPES - {"Land"} | {"Instant", "Sorcery"}) & set(_types(card)[0])),
+    "historic": lambda card: bool({"Legendary", "Artifact"} & set(_types(card)[0]) or "Saga" in _types(card)[1]),
+    "party": lambda card: _is_creature(card) and bool(PARTY_TYPES & set(_types(card)[1])),
+    "outlaw": lambda card: _is_creature(card) and bool(OUTLAW_TYPES & set(_types(card)[1])),
+    "commander": _can_be_commander,
+    # rules text
+    "vanilla": lambda card: _is_creature(card) and not (card.get("oracle_text") or "").strip(),
+    "french_vanilla": _is_french_vanilla,
+    "modal": lambda card: bool(_MODAL_PATTERN.search(card.get("oracle_text") or "")),
+    "bear": _is_bear,
+    # mana costs
+    "hybrid": lambda card: any(len([part for part in parts if part != "P"]) > 1 for parts in _mana_symbols(card)),
+    "phyrexian": lambda card: any("P" in parts for parts in _mana_symbols(card)),
+    # layouts
+    "dfc": lambda card: card.get("layout") in DOUBLE_FACED_LAYOUTS,
+    "mdfc": lambda card: card.get("layout") == "modal_dfc",
+    "transform": lambda card: card.get("layout") == "transform",
+    "meld": lambda card: card.get("layout") == "meld",
+    "split": lambda card: card.get("layout") == "split",
+    "flip": lambda card: card.get("layout") == "flip",
+    "adventure": lambda card: card.get("layout") == "adventure",
+    "leveler": lambda card: card.get("layout") == "leveler",
+    # printings
+    "reserved": lambda card: bool(card.get("reserved")),
+    "reprint": lambda card: bool(card.get("reprint")),
+    "promo": lambda card: bool(card.get("promo")),
+    "digital": lambda card: bool(card.get("digital")),
+    "full": lambda card: bool(card.get("full_art")),
+    "textless": lambda card: bool(card.get("textless")),
+    "hires": lambda card: bool(card.get("highres_image")),
+    "spotlight": lambda card: bool(card.get("story_spotlight")),
+    "booster": lambda card: bool(card.get("booster")),
+    "gamechanger": lambda card: bool(card.get("game_changer")),
+    "foil": lambda card: "foil" in (card.get("finishes") or []),
+    "nonfoil": lambda card: "nonfoil" in (card.get("finishes") or []),
+    "etched": lambda card: "etched" in (card.get("finishes") or []),
+}
+# the blob fields the rules read, so callers can fetch only those
+IS_TAG_CARD_FIELDS = (
+    "booster",
+    "cmc",
+    "digital",
+    "face_idx",
+    "finishes",
+    "full_art",
+    "game_changer",
+    "highres_image",
+    "keywords",
+    "layout",
+    "mana_cost",
+    "oracle_text",
+    "power",
+    "promo",
+    "reprint",
+    "reserved",
+    "story_spotlight",
+    "textless",
+    "toughness",
+    "type_line",
+)
+
+
+def get_derived_is_tags(card: dict[str, Any], is_tags: Iterable[str] = IS_TAG_RULES) -> list[str]:
+    """Get the is: tags of a card face that the local rules can derive.
+
+    A card has a tag if any face of any of its printings has it, as with a Scryfall search for it.
+
+    Args:
+        card: A raw scryfall card face, as kept in magic.card_blobs.
+        is_tags: Tags of IS_TAG_RULES to check, all of them by default.
+
+    Returns:
+        The face's tags among is_tags, in their order.
+    """
+    return [is_tag for is_tag in is_tags if IS_TAG_RULES[is_tag](card)]
@@ -0,0 +1,319 @@
+"""Background jobs: long admin operations queued in magic.jobs and run by the job executor process."""
+
+from __future__ import annotations
+
+import datetime as dt
+import logging
+import time
+from typing import TYPE_CHECKING, Any
+
+from psycopg.types.json import Jsonb
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    import psycopg
+    import psycopg_pool
+
+logger = logging.getLogger(__name__)
+
+# the long admin operations whose routes queue a job, rather than run in the request, when a job executor is running
+JOB_ACTIONS = frozenset(
+    {
+        "backfill_prefer_scores",
+        "discover_and_import_all_tags",
+        "export_card_data",
+        "import_all_is_tags",
+        "import_card_data",
+        "refresh_prices",
+    },
+)
+# jobs that only read the card data, so serving workers keep their caches when one finishes
+READ_ONLY_JOB_ACTIONS = frozenset({"export_card_data"})
+# seconds between a running job's progress writes, so also about how long it takes to notice a cancel
+JOB_PROGRESS_INTERVAL = 1.0
+JOB_COLUMNS = (
+    "job_id, action, params, status, progress, result, error, cancel_requested, created_at, started_at, updated_at, finished_at"
+)
+
+
+class JobCancelledError(Exception):
+    """Raised inside a running job when it has been asked to stop."""
+
+
+def estimate_seconds_remaining(elapsed: float, done: int, total: int) -> float | None:
+    """Estimate the seconds an operation has left, assuming the remaining steps go as fast as the done ones.
+
+    Args:
+        elapsed: Seconds spent so far.
+        done: Steps done so far.
+        total: Steps in all.
+
+    Returns:
+        The estimated seconds remaining, or None before any step is done.
+    """
+    if done <= 0 or total <= 0:
+        return None
+    return max(elapsed * total / done - elapsed, 0.0)
+
+
+def queue_job(cursor: psycopg.Cursor, action: str, params: dict[str, Any]) -> dict[str, Any]:
+    """Queue a job running an action with the given request parameters.
+
+    Args:
+        cursor: Cursor to insert the job with.
+        action: Name of the APIResource route the job runs.
+        params: Request parameters to call it with.
+
+    Returns:
+        The queued job.
+    """
+    cursor.execute(
+        f"INSERT INTO magic.jobs (action, params) VALUES (%(action)s, %(params)s) RETURNING {JOB_COLUMNS}",
+        {"action": action, "params": Jsonb(params)},
+    )
+    return cursor.fetchone()
+
+
+def claim_next_job(cursor: psycopg.Cursor) -> dict[str, Any] | None:
+    """Mark the oldest queued job as running and return it.
+
+    SKIP LOCKED leaves a job another executor is claiming to that executor, rather than waiting for it.
+
+    Args:
+        cursor: Cursor to claim the job with.
+
+    Returns:
+        The claimed job, or None if no job is queued.
+    """
+    cursor.execute(
+        f"""
+        UPDATE magic.jobs SET
+            status = 'running',
+            started_at = now(),
+            updated_at = now()
+        WHERE job_id = (
+            SELECT job_id
+            FROM magic.jobs
+            WHERE status = 'queued'
+            ORDER BY job_id
+            LIMIT 1
+            FOR UPDATE SKIP LOCKED
+        )
+        RETURNING {JOB_COLUMNS}
+        """,
+    )
+    return cursor.fetchone()
+
+
+def finish_job(
+    cursor: psycopg.Cursor,
+    job_id: int,
+    *,
+    status: str,
+    result: dict[str, Any] | None = None,
+    error: str | None = None,
+) -> None:
+    """Record how a job ended.
+
+    Args:
+        cursor: Cursor to update the job with.
+        job_id: The job.
+        status: succeeded, failed or cancelled.
+        result: What the job's action returned, if it returned.
+        error: Why the job failed, if it did.
+    """
+    cursor.execute(
+        """
+        UPDATE magic.jobs SET
+            status = %(status)s,
+            result = %(result)s,
+            error = %(error)s,
+            finished_at = now(),
+            updated_at = now()
+        WHERE job_id = %(job_id)s
+        """,
+        {"job_id": job_id, "status": status, "result": Jsonb(result) if result is not None else None, "error": error},
+    )
+
+
+def fail_interrupted_jobs(cursor: psycopg.Cursor) -> int:
+    """Fail the jobs an executor left running when it stopped, since a job can't resume where it was.
+
+    Args:
+        cursor: Cursor to update the jobs with.
+
+    Returns:
+        The number of jobs failed.
+    """
+    cursor.execute(
+        """
+        UPDATE magic.jobs SET
+            status = 'failed',
+            error = 'Interrupted by a restart of the job executor',
+            finished_at = now(),
+            updated_at = now()
+        WHERE status = 'running'
+        """,
+    )
+    return cursor.rowcount
+
+
+def get_job(cursor: psycopg.Cursor, job_id: int) -> dict[str, Any] | None:
+    """Get a job by its id, or None if there is no such job."""
+    cursor.execute(f"SELECT {JOB_COLUMNS} FROM magic.jobs WHERE job_id = %(job_id)s", {"job_id": job_id})
+    return cursor.fetchone()
+
+
+def list_jobs(cursor: psycopg.Cursor, *, limit: int) -> list[dict[str, Any]]:
+    """Get the most recently queued jobs, newest first."""
+    cursor.execute(f"SELECT {JOB_COLUMNS} FROM magic.jobs ORDER BY job_id DESC LIMIT %(limit)s", {"limit": limit})
+    return cursor.fetchall()
+
+
+def request_cancel(cursor: psycopg.Cursor, job_id: int) -> dict[str, Any] | None:
+    """Cancel a queued job at once, or ask a running job to stop. A finished job is left as it is.
+
+    Args:
+        cursor: Cursor to update the job with.
+        job_id: The job.
+
+    Returns:
+        The job as it is now, or None if there is no such job.
+    """
+    cursor.execute(
+        f"""
+        UPDATE magic.jobs SET
+            cancel_requested = true,
+            status = CASE WHEN status = 'queued' THEN 'cancelled' ELSE status END,
+            finished_at = CASE WHEN status = 'queued' THEN now() ELSE finished_at END,
+            updated_at = now()
+        WHERE job_id = %(job_id)s AND status IN ('queued', 'running')
+        RETURNING {JOB_COLUMNS}
+        """,
+        {"job_id": job_id},
+    )
+    return cursor.fetchone() or get_job(cursor, job_id)
+
+
+class RunningJob:
+    """A job this process is running, which its action reports progress to.
+
+    Progress is written on a connection of its own and committed at once, so it can be seen
+    while the action's own transaction is still open. Each write also checks whether the job
+    has been cancelled.
+    """
+
+    def __init__(
+        self,
+        pool: psycopg_pool.ConnectionPool,
+        job_id: int,
+        *,
+        report_interval: float = JOB_PROGRESS_INTERVAL,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize a running job.
+
+        Args:
+            pool: Pool of the executor's own connections, not the action's.
+            job_id: The job.
+            report_interval: Least seconds between progress writes.
+            clock: Monotonic clock in seconds.
+        """
+        self.job_id = job_id
+        self.report_interval = report_interval
+        self._pool = pool
+        self._clock = clock
+        self._reported_at: float | None = None
+
+    def report(self, progress: dict[str, Any]) -> None:
+        """Record the job's progress, unless it was recorded less than report_interval seconds ago.
+
+        Args:
+            progress: The progress, as built by ProgressLog.
+
+        Raises:
+            JobCancelledError: If the job has been cancelled.
+        """
+        now = self._clock()
+        if self._reported_at is not None and now - self._reported_at < self.report_interval:
+            return
+        self._reported_at = now
+        with self._pool.connection() as conn, conn.cursor() as cursor:
+            cursor.execute(
+                """
+                UPDATE magic.jobs SET
+                    progress = %(progress)s,
+                    updated_at = now()
+                WHERE job_id = %(job_id)s
+                RETURNING cancel_requested
+                """,
+                {"job_id": self.job_id, "progress": Jsonb(progress)},
+            )
+            row = cursor.fetchone()
+        if row is not None and row["cancel_requested"]:
+            msg = f"Job {self.job_id} was cancelled"
+            raise JobCancelledError(msg)
+
+
+class ProgressLog:
+    """Progress through a known number of steps, logged with an ETA as each step starts.
+
+    When the operation runs as a job, each step is also reported to the job, which is where a
+    cancelled job stops.
+    """
+
+    def __init__(
+        self,
+        total: int,
+        *,
+        description: str,
+        job: RunningJob | None = None,
+        log: logging.Logger = logger,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Start tracking an operation.
+
+        Args:
+            total: Steps in all.
+            description: What a step does, for the log, like "Fetched tag".
+            job: The job running the operation, if it runs as one.
+            log: Logger of the operation's module, so its progress is logged under that module.
+            clock: Monotonic clock in seconds.
+        """
+        self.total = total
+        self.description = description
+        self.job = job
+        self.done = 0
+        self._log = log
+        self._clock = clock
+        self._start_time = clock()
+
+    def step(self, item: str) -> None:
+        """Record that the step for item starts, the steps before it being done.
+
+        Raises:
+            JobCancelledError: If the operation runs as a job that has been cancelled.
+        """
+        elapsed = self._clock() - self._start_time
+        eta_seconds = estimate_seconds_remaining(elapsed, self.done, self.total)
+        self._log.info(
+            "%s %d of %d: %20s (ETA: %s)",
+            self.description,
+            self.done + 1,
+            self.total,
+            item,
+            "N/A" if eta_seconds is None else dt.timedelta(seconds=round(eta_seconds, 1)),
+        )
+        if self.job is not None:
+            self.job.report(
+                {
+                    "description": self.description,
+                    "done": self.done,
+                    "total": self.total,
+                    "item": item,
+                    "elapsed_seconds": round(elapsed, 1),
+                    "eta_seconds": None if eta_seconds is None else round(eta_seconds, 1),
+                },
+            )
+        self.done += 1
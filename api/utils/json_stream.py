@@ -0,0 +1,99 @@
+"""Incremental parsing of large JSON arrays."""
+
+from __future__ import annotations
+
+import json
+import re
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from typing import TextIO
+
+DEFAULT_CHUNK_SIZE = 1 << 20
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+# values that end in a closing delimiter can't be extended by more input, numbers and literals can
+_SELF_DELIMITING_STARTS = frozenset('{["')
+_VALUE_TERMINATORS = frozenset(" \t\n\r,]")
+
+
+def iter_json_array(stream: TextIO, *, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Any]:
+    """Yield the elements of a top-level JSON array one at a time.
+
+    Only the element being parsed (plus one read chunk) is held in memory, so arbitrarily
+    large arrays can be processed in bounded memory. Each element is parsed by the stdlib
+    decoder's ``raw_decode``; an element cut off by the end of the buffer is retried once
+    the next chunk has been read.
+
+    Args:
+        stream: Text stream positioned at the start of the array.
+        chunk_size: Number of characters to read at a time.
+
+    Yields:
+        The decoded array elements, in order.
+
+    Raises:
+        ValueError: If the stream isn't a well-formed JSON array.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    pos = 0
+    at_eof = False
+    expected = "["  # "[" -> "value or ]" -> ", or ]" -> "value" -> ", or ]" ... -> "done"
+
+    while True:
+        pos = _WHITESPACE.match(buffer, pos).end()
+        if pos < len(buffer):
+            char = buffer[pos]
+            if expected == "done":
+                msg = f"Unexpected data after JSON array: {char!r}"
+                raise ValueError(msg)
+            if expected == "[":
+                if char != "[":
+                    msg = f"Expected a JSON array, found {char!r}"
+                    raise ValueError(msg)
+                pos += 1
+                expected = "value or ]"
+                continue
+            if char == "]" and expected in ("value or ]", ", or ]"):
+                pos += 1
+                expected = "done"
+                continue
+            if expected == ", or ]":
+                if char != ",":
+                    msg = f"Expected ',' or ']', found {char!r}"
+                    raise ValueError(msg)
+                pos += 1
+                expected = "value"
+                continue
+            decoded = _decode_element(decoder, buffer, pos, at_eof=at_eof)
+            if decoded is not None:
+                value, pos = decoded
+                expected = ", or ]"
+                yield value
+                continue
+        elif at_eof:
+            if expected == "done":
+                return
+            msg = f"Truncated JSON array, expected {expected}"
+            raise ValueError(msg)
+
+        chunk = stream.read(chunk_size)
+        at_eof = not chunk
+        buffer = buffer[pos:] + chunk
+        pos = 0
+
+
+def _decode_element(decoder: json.JSONDecoder, buffer: str, pos: int, *, at_eof: bool) -> tuple[Any, int] | None:
+    """Decode the array element at pos, or return None if more input is needed to be sure of it."""
+    try:
+        value, end = decoder.raw_decode(buffer, pos)
+    except json.JSONDecodeError:
+        # cut off by the end of the buffer, or malformed: reading more settles which
+        if at_eof:
+            raise
+        return None
+    if at_eof or buffer[pos] in _SELF_DELIMITING_STARTS or (end < len(buffer) and buffer[end] in _VALUE_TERMINATORS):
+        return value, end
+    # a number or literal that may continue in the next chunk ("12" of "123")
+    return None
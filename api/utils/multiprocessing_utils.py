@@ -2,11 +2,16 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+import multiprocessing
+from typing import TYPE_CHECKING, Any
+
+import orjson
 
 if TYPE_CHECKING:
     from types import TracebackType
 
+IMPORT_STATUS_SIZE = 4096
+
 
 class MockLock:
     """Mock implementation of multiprocessing.Lock for testing."""
@@ -39,5 +44,36 @@ class MockEvent:
         return self._is_set
 
 
+class ImportStatus:
+    """Import progress shared between processes, kept as a JSON object in shared memory.
+
+    The importer updates it as an import goes along; any process holding it can read a snapshot.
+    """
+
+    def __init__(self, size: int = IMPORT_STATUS_SIZE) -> None:
+        """Initialize an empty status.
+
+        Args:
+            size: Bytes of shared memory to reserve for the serialized status.
+        """
+        self._buffer = multiprocessing.Array("c", size)
+
+    def update(self, **fields: Any) -> None:  # noqa: ANN401
+        """Set fields of the status, keeping the others."""
+        with self._buffer.get_lock():
+            status = orjson.loads(self._buffer.value or b"{}")
+            status.update(fields)
+            serialized = orjson.dumps(status)
+            if len(serialized) >= len(self._buffer):
+                msg = f"Import status of {len(serialized)} bytes doesn't fit in {len(self._buffer)} bytes"
+                raise ValueError(msg)
+            self._buffer.value = serialized
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return a copy of the status."""
+        with self._buffer.get_lock():
+            return orjson.loads(self._buffer.value or b"{}")
+
+
 DEFAULT_LOCK = MockLock()
 DEFAULT_EVENT = MockEvent()
@@ -0,0 +1,78 @@
+"""Prefer score components and custom weightings of them."""
+
+from __future__ import annotations
+
+import math
+from typing import Any
+
+# the components of prefer_score, each stored in its own prefer_<component> column of magic.cards
+PREFER_SCORE_COMPONENTS = (
+    "illustration_count",
+    "rarity",
+    "border",
+    "frame",
+    "extended_art",
+    "highres_scan",
+    "has_paper",
+    "language",
+    "legendary_frame",
+    "non_showcase",
+    "finish",
+    "artwork_set",
+)
+MAX_PREFER_WEIGHT = 1000.0
+
+
+def parse_prefer_weights(prefer_weights: str | None) -> tuple[tuple[str, float], ...]:
+    """Parse a weight vector like "frame:2,rarity:0" into a weight for every component.
+
+    Components that aren't listed weigh 1, so no weights at all rank exactly like prefer_score.
+    The result is in PREFER_SCORE_COMPONENTS order, so equal weightings compare (and cache) equal
+    however they were written.
+
+    Args:
+        prefer_weights: Comma separated component:weight pairs, or None.
+
+    Returns:
+        (component, weight) pairs for every component.
+
+    Raises:
+        ValueError: If a pair is malformed, names an unknown component or has a weight that
+            isn't a finite number within +/- MAX_PREFER_WEIGHT.
+    """
+    weights = dict.fromkeys(PREFER_SCORE_COMPONENTS, 1.0)
+    for pair in (prefer_weights or "").split(","):
+        if not pair.strip():
+            continue
+        component, separator, weight_text = pair.partition(":")
+        component = component.strip().lower()
+        if not separator or component not in weights:
+            msg = f"Expected component:weight with a component of {', '.join(PREFER_SCORE_COMPONENTS)}, got {pair!r}"
+            raise ValueError(msg)
+        weight = float(weight_text)
+        if not math.isfinite(weight) or abs(weight) > MAX_PREFER_WEIGHT:
+            msg = f"Weight of {component} must be a number within +/-{MAX_PREFER_WEIGHT:g}, got {weight_text!r}"
+            raise ValueError(msg)
+        weights[component] = weight
+    return tuple(weights.items())
+
+
+def get_prefer_rank_expression(weights: tuple[tuple[str, float], ...], params: dict[str, Any]) -> str:
+    """Build the SQL dot product of a weight vector with the prefer component columns.
+
+    Components weighing 0 are left out. The weights are bound as parameters, added to params.
+
+    Args:
+        weights: (component, weight) pairs, as returned by parse_prefer_weights.
+        params: Query parameters to add the weights to.
+
+    Returns:
+        A SQL expression ranking printings by the weighted components, higher is preferred.
+    """
+    terms = []
+    for component, weight in weights:
+        if not weight:
+            continue
+        params[f"prefer_weight_{component}"] = weight
+        terms.append(f"%(prefer_weight_{component})s * prefer_{component}")
+    return f"({' + '.join(terms)})" if terms else "0"
@@ -0,0 +1,228 @@
+"""Token bucket rate limiting shared by concurrent requests, across threads and worker processes."""
+
+from __future__ import annotations
+
+import email.utils
+import logging
+import multiprocessing
+import time
+import urllib.parse
+from http import HTTPStatus
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    import requests
+
+logger = logging.getLogger(__name__)
+
+# seconds to back off after an HTTP 429 that doesn't say how long to wait
+DEFAULT_RETRY_AFTER_SECONDS = 1.0
+# refilled fractions of a token that round to just under a whole one still count as one
+_TOKEN_EPSILON = 1e-9
+# a 429 halves the rate, down to this fraction of the configured one
+THROTTLED_RATE_FACTOR = 0.5
+MIN_RATE_FRACTION = 1 / 16
+# after a 429, each request handed out wins back this fraction of the configured rate
+RATE_RECOVERY_FRACTION = 0.05
+# times a request told to back off is made before its 429 is returned
+DEFAULT_REQUEST_ATTEMPTS = 4
+
+# slots of a bucket's shared state
+_TOKENS, _UPDATED_AT, _PAUSED_UNTIL, _CURRENT_RATE, _STARTED_AT, _REQUESTS, _WAITED_SECONDS, _THROTTLED = range(8)
+_STATE_SIZE = 8
+
+
+class TokenBucket:
+    """A token bucket shared by threads and processes.
+
+    Tokens refill at rate per second up to capacity, and each request takes one, waiting for it
+    if the bucket is empty. Callers sharing a bucket are held to its rate together, with bursts of
+    at most capacity requests. The bucket's state lives in shared memory, so a bucket created
+    before the worker processes fork holds all of them to one rate, as the entrypoint does for
+    Scryfall and the tagger. The default clock is system-wide, so the processes agree on it.
+
+    A server asking the callers to back off (HTTP 429) pauses everyone sharing the bucket, not
+    only the one that was told, and halves the rate. The rate then grows back with each request
+    handed out, so callers settle just under the limit the server actually enforces.
+    """
+
+    def __init__(
+        self,
+        *,
+        rate: float,
+        capacity: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        """Initialize a full bucket.
+
+        Args:
+            rate: Tokens added per second.
+            capacity: Most tokens the bucket holds, so the largest burst of requests.
+            clock: Monotonic clock in seconds.
+            sleep: Function to wait with.
+        """
+        if rate <= 0 or capacity < 1:
+            msg = f"Expected a positive rate and a capacity of at least 1, got {rate} and {capacity}"
+            raise ValueError(msg)
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._sleep = sleep
+        now = clock()
+        self._state = multiprocessing.Array("d", _STATE_SIZE)
+        state = self._state.get_obj()
+        state[_TOKENS] = capacity
+        state[_UPDATED_AT] = now
+        state[_CURRENT_RATE] = rate
+        state[_STARTED_AT] = now
+
+    def _refill(self, state: Any, now: float) -> None:  # noqa: ANN401
+        """Add the tokens earned since the last refill. Call with the lock held."""
+        if now > state[_UPDATED_AT]:
+            state[_TOKENS] = min(self.capacity, state[_TOKENS] + (now - state[_UPDATED_AT]) * state[_CURRENT_RATE])
+            state[_UPDATED_AT] = now
+
+    def acquire(self) -> float:
+        """Take one token, waiting until one is available.
+
+        Returns:
+            Seconds spent waiting.
+        """
+        waited = 0.0
+        while True:
+            with self._state.get_lock():
+                state = self._state.get_obj()
+                now = self._clock()
+                if now < state[_PAUSED_UNTIL]:
+                    delay = state[_PAUSED_UNTIL] - now
+                else:
+                    self._refill(state, now)
+                    if state[_TOKENS] >= 1 - _TOKEN_EPSILON:
+                        state[_TOKENS] = max(state[_TOKENS] - 1, 0.0)
+                        state[_CURRENT_RATE] = min(self.rate, state[_CURRENT_RATE] + self.rate * RATE_RECOVERY_FRACTION)
+                        state[_REQUESTS] += 1
+                        state[_WAITED_SECONDS] += waited
+                        return waited
+                    delay = (1 - state[_TOKENS]) / state[_CURRENT_RATE]
+            self._sleep(delay)
+            waited += delay
+
+    def pause(self, seconds: float) -> None:
+        """Hand out no tokens for the next seconds, and start refilling from empty afterwards.
+
+        Args:
+            seconds: How long to pause.
+        """
+        with self._state.get_lock():
+            self._pause(self._state.get_obj(), seconds)
+
+    def _pause(self, state: Any, seconds: float) -> None:  # noqa: ANN401
+        """Pause the bucket. Call with the lock held."""
+        state[_PAUSED_UNTIL] = max(state[_PAUSED_UNTIL], self._clock() + max(seconds, 0.0))
+        state[_TOKENS] = 0.0
+        state[_UPDATED_AT] = state[_PAUSED_UNTIL]
+
+    def back_off(self, seconds: float) -> None:
+        """Pause for the seconds a server asked for, and halve the rate.
+
+        The 429s of requests that were in flight together are one sign of being too fast, so only
+        a 429 arriving after the last pause ended slows the rate down again.
+
+        Args:
+            seconds: A 429 response's Retry-After.
+        """
+        with self._state.get_lock():
+            state = self._state.get_obj()
+            if self._clock() >= state[_PAUSED_UNTIL]:
+                state[_CURRENT_RATE] = max(state[_CURRENT_RATE] * THROTTLED_RATE_FACTOR, self.rate * MIN_RATE_FRACTION)
+            state[_THROTTLED] += 1
+            self._pause(state, seconds)
+
+    def stats(self) -> dict[str, Any]:
+        """Return the bucket's throughput and waits, as seen by everyone sharing it.
+
+        Returns:
+            The configured and current rate, requests handed out and their average rate since
+            the bucket was created, total and average seconds spent waiting for a token, the
+            number of 429s backed off from, and seconds left of the current pause.
+        """
+        with self._state.get_lock():
+            state = list(self._state.get_obj())
+        now = self._clock()
+        requests_made = int(state[_REQUESTS])
+        return {
+            "rate": self.rate,
+            "current_rate": round(state[_CURRENT_RATE], 3),
+            "capacity": self.capacity,
+            "requests": requests_made,
+            "requests_per_second": round(requests_made / (now - state[_STARTED_AT]), 3) if now > state[_STARTED_AT] else None,
+            "waited_seconds": round(state[_WAITED_SECONDS], 3),
+            "average_wait_seconds": round(state[_WAITED_SECONDS] / requests_made, 3) if requests_made else None,
+            "throttled": int(state[_THROTTLED]),
+            "paused_for_seconds": round(max(state[_PAUSED_UNTIL] - now, 0.0), 3),
+        }
+
+
+def rate_limited_get(
+    session: requests.Session,
+    url: str,
+    *,
+    rate_limiter: TokenBucket,
+    attempts: int = DEFAULT_REQUEST_ATTEMPTS,
+    **kwargs: Any,  # noqa: ANN401
+) -> requests.Response:
+    """GET within a rate limit, backing off and retrying while the server answers 429 Too Many Requests.
+
+    A 429 backs off the whole limiter for the response's Retry-After, holding back every other
+    request sharing it, before the request is tried again.
+
+    Args:
+        session: Session to make the request with.
+        url: URL to get.
+        rate_limiter: Limiter shared by every request to the same server.
+        attempts: Most times to make the request.
+        **kwargs: Passed on to session.get, such as params and timeout.
+
+    Returns:
+        The first response that isn't a 429, or the last 429 once attempts requests have been made.
+    """
+    for attempt in range(1, attempts + 1):
+        rate_limiter.acquire()
+        response = session.get(url, **kwargs)
+        if response.status_code != HTTPStatus.TOO_MANY_REQUESTS or attempt == attempts:
+            break
+        retry_after = get_retry_after_seconds(response.headers.get("Retry-After"))
+        logger.warning(
+            "%s asked to slow down, pausing requests for %.1f seconds (attempt %d)",
+            urllib.parse.urlsplit(url).netloc,
+            retry_after,
+            attempt,
+        )
+        rate_limiter.back_off(retry_after)
+    return response
+
+
+def get_retry_after_seconds(retry_after: str | None, *, default: float = DEFAULT_RETRY_AFTER_SECONDS) -> float:
+    """Parse a Retry-After header into seconds to wait.
+
+    Args:
+        retry_after: The header's value, in seconds or as an HTTP date, or None if it was missing.
+        default: Seconds to wait if the header is missing or can't be parsed.
+
+    Returns:
+        Seconds to wait, never negative.
+    """
+    if not retry_after:
+        return default
+    try:
+        return max(float(retry_after), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = email.utils.parsedate_to_datetime(retry_after)
+    except (TypeError, ValueError):
+        return default
+    return max(retry_at.timestamp() - time.time(), 0.0)
@@ -15,9 +15,37 @@ def identity(x: str) -> str:
     return x
 
 
+TRUE_STRINGS = ("true", "1", "yes", "on", "t")
+FALSE_STRINGS = ("false", "0", "no", "off", "f", "")
+
+
 def convert_to_bool(x: str) -> bool:
     """Convert a string to a boolean."""
-    return x.lower() in ("true", "1", "yes", "on", "t")
+    return x.lower() in TRUE_STRINGS
+
+
+def convert_to_bool_strictly(x: str) -> bool:
+    """Convert a string to a boolean, rejecting strings that are neither TRUE_STRINGS nor FALSE_STRINGS."""
+    if x.lower() in TRUE_STRINGS:
+        return True
+    if x.lower() in FALSE_STRINGS:
+        return False
+    msg = f"Expected a boolean, got {x!r}"
+    raise ValueError(msg)
+
+
+CONVERTERS = {
+    # enums
+    "CardOrdering": CardOrdering,
+    "PreferOrder": PreferOrder,
+    "SortDirection": SortDirection,
+    "UniqueOn": UniqueOn,
+    # other stuffs
+    "bool": convert_to_bool,
+    "float": float,
+    "int": int,
+    "str": identity,
+}
 
 
 def _convert_string_to_type(str_value: str | None, param_type: Any) -> Any:  # noqa: ANN401
@@ -33,18 +61,6 @@ def _convert_string_to_type(str_value: str | None, param_type: Any) -> Any:  # n
     if str_value is None:
         return None
 
-    converter_map = {
-        # enums
-        "CardOrdering": CardOrdering,
-        "PreferOrder": PreferOrder,
-        "SortDirection": SortDirection,
-        "UniqueOn": UniqueOn,
-        # other stuffs
-        "bool": convert_to_bool,
-        "float": float,
-        "int": int,
-        "str": identity,
-    }
     if isinstance(param_type, str):
         pass
     else:
@@ -52,7 +68,7 @@ def _convert_string_to_type(str_value: str | None, param_type: Any) -> Any:  # n
     possible_types = [x.strip() for x in param_type.split("|")]
     for ipossible_type in possible_types:
         try:
-            converter = converter_map[ipossible_type]
+            converter = CONVERTERS[ipossible_type]
         except KeyError:
             continue
         try:
@@ -128,6 +144,52 @@ def make_type_converting_wrapper(func: callable) -> callable:
     return functools.update_wrapper(wrapper, func)
 
 
+def convert_params_strictly(func: callable, params: dict[str, Any]) -> dict[str, Any]:
+    """Convert string parameters to the types of func's signature, rejecting any that don't fit.
+
+    Unlike make_type_converting_wrapper, which passes on a value it can't convert as the string
+    it was given, a value that converts to none of its parameter's types is an error. Use it
+    where the call happens later, so a bad parameter is reported while it can still be refused.
+
+    Args:
+        func: The function the parameters are for
+        params: Keyword arguments, as strings or already converted
+
+    Returns:
+        The parameters, with the strings converted to the types func expects
+
+    Raises:
+        TypeError: If the parameters don't fit func's signature
+        ValueError: If a parameter can't be converted to any of its parameter's types
+    """
+    sig = inspect.signature(func)
+    sig.bind(**params)
+    converted = {}
+    for param_name, value in params.items():
+        param = sig.parameters.get(param_name)
+        if param is None or param.annotation is inspect.Parameter.empty or not isinstance(value, str):
+            converted[param_name] = value
+            continue
+        param_type = param.annotation if isinstance(param.annotation, str) else param.annotation.__name__
+        possible_types = [x.strip() for x in param_type.split("|")]
+        if "str" in possible_types or "Any" in possible_types:
+            converted[param_name] = value
+            continue
+        for ipossible_type in possible_types:
+            converter = convert_to_bool_strictly if ipossible_type == "bool" else CONVERTERS.get(ipossible_type)
+            if converter is None:
+                continue
+            try:
+                converted[param_name] = converter(value)
+                break
+            except (ValueError, TypeError):
+                continue
+        else:
+            msg = f"Parameter {param_name} must be {param_type}, got {value!r}"
+            raise ValueError(msg)
+    return converted
+
+
 def _get_type_name(annotation: Any) -> str:  # noqa: ANN401
     """Convert a type annotation to a readable string.
 
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""Benchmark bulk data ingestion: peak RSS and cards/s, streaming vs fully loaded.
+
+Runs the ingestion pipeline up to the point where rows are handed to COPY (download/cache,
+decompress, parse, preprocess_card, dedupe, serialize), without touching the database:
+
+- stream: zstd stream decompression, incremental JSON array parsing and generator stages,
+  as used by the importer
+- list: the previous approach, decompressing and parsing the whole export at once and
+  building the full list of processed cards before serializing
+
+Each run happens in a freshly spawned process so its peak RSS is its own.
+
+Usage:
+    python scripts/benchmark_bulk_ingestion.py
+    python scripts/benchmark_bulk_ingestion.py --key default_cards --key all_cards --mode stream
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import multiprocessing
+import resource
+import time
+from typing import Any
+
+import orjson
+
+from api.card_processing import preprocess_card
+from api.scryfall_bulk_data_fetcher import BulkDataKey, ScryfallBulkDataFetcher
+
+COPY_PAGE_SIZE = 6000
+
+
+def _serialize_page(page: tuple[dict[str, Any], ...]) -> int:
+    """Serialize a page of cards the way the COPY into the staging table does, returning the byte count."""
+    return sum(len(orjson.dumps(card, option=orjson.OPT_SORT_KEYS)) for card in page)
+
+
+def run_stream(fetcher: ScryfallBulkDataFetcher, data_key: BulkDataKey) -> int:
+    """Stream the export through the generator pipeline, returning the number of cards processed."""
+
+    def processed_cards() -> Any:  # noqa: ANN401
+        seen_keys: set[tuple[str, int]] = set()
+        for card in fetcher.iter_data_for_key(data_key):
+            for processed_card in preprocess_card(card):
+                key = (processed_card["scryfall_id"], processed_card["face_idx"])
+                if key not in seen_keys:
+                    seen_keys.add(key)
+                    yield processed_card
+
+    num_cards = 0
+    for page in itertools.batched(processed_cards(), COPY_PAGE_SIZE):
+        _serialize_page(page)
+        num_cards += len(page)
+    return num_cards
+
+
+def run_list(fetcher: ScryfallBulkDataFetcher, data_key: BulkDataKey) -> int:
+    """Load and process the whole export in memory, returning the number of cards processed."""
+    key_to_card: dict[tuple[str, int], dict[str, Any]] = {}
+    for card in fetcher.get_data_for_key(data_key):
+        for processed_card in preprocess_card(card):
+            key_to_card[(processed_card["scryfall_id"], processed_card["face_idx"])] = processed_card
+    cards = list(key_to_card.values())
+    for page in itertools.batched(cards, COPY_PAGE_SIZE):
+        _serialize_page(page)
+    return len(cards)
+
+
+def measure(data_key: str, mode: str) -> dict[str, float]:
+    """Run one ingestion in this process and report its throughput and peak RSS."""
+    fetcher = ScryfallBulkDataFetcher()
+    bulk_data_key = BulkDataKey(data_key)
+    # download outside the measurement
+    fetcher.get_cache_file_for_key(bulk_data_key)
+
+    before = time.monotonic()
+    num_cards = {"stream": run_stream, "list": run_list}[mode](fetcher, bulk_data_key)
+    duration = time.monotonic() - before
+    return {
+        "cards": num_cards,
+        "seconds": duration,
+        "cards_per_second": num_cards / duration if duration else 0.0,
+        "peak_rss_mib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+
+
+def get_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Benchmark streaming bulk data ingestion")
+    parser.add_argument(
+        "--key",
+        action="append",
+        choices=[BulkDataKey.DEFAULT_CARDS, BulkDataKey.ALL_CARDS],
+        help="Bulk export to ingest, may be repeated (default: default_cards and all_cards)",
+    )
+    parser.add_argument(
+        "--mode",
+        action="append",
+        choices=["stream", "list"],
+        help="Pipeline to run, may be repeated (default: both)",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    """Main entry point for the script."""
+    args = get_args()
+    data_keys = args.key or [BulkDataKey.DEFAULT_CARDS, BulkDataKey.ALL_CARDS]
+    modes = args.mode or ["stream", "list"]
+
+    print(f"{'export':<16} {'mode':<8} {'cards':>10} {'seconds':>9} {'cards/s':>10} {'peak RSS MiB':>13}")
+    # spawn, not fork: a forked child inherits the parent's peak RSS
+    context = multiprocessing.get_context("spawn")
+    for data_key, mode in itertools.product(data_keys, modes):
+        with context.Pool(processes=1) as pool:
+            result = pool.apply(measure, (str(data_key), mode))
+        print(
+            f"{data_key!s:<16} {mode:<8} {result['cards']:>10,} {result['seconds']:>9.1f} "
+            f"{result['cards_per_second']:>10,.0f} {result['peak_rss_mib']:>13,.0f}",
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""Benchmark loading preprocessed cards with binary COPY into typed columns against the jsonb staging path.
+
+Both paths load the same preprocessed rows, 6000 cards per page, into magic.cards and
+magic.card_blobs of the database named by the PG* environment variables:
+
+- jsonb: each page is serialized with orjson, quoted through csv.writer into a fresh
+  ``card_blob jsonb`` temporary table, and expanded with jsonb_populate_record (the previous
+  loader)
+- binary: each page is written with a binary COPY into one typed staging table per load
+  and copied over column for column (how the current loader stages cards, without its
+  content_hash diff)
+
+Every row gets a fresh scryfall_id so nothing conflicts with cards already loaded, and each
+run is rolled back, so the database is left unchanged.
+
+Usage:
+    python scripts/benchmark_card_copy.py --repeat 3
+    python scripts/benchmark_card_copy.py --limit 20000 --path binary
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import itertools
+import secrets
+import statistics
+import time
+import uuid
+from typing import Any
+
+import orjson
+import psycopg
+
+from api.card_processing import preprocess_card
+from api.scryfall_bulk_data_fetcher import BulkDataKey, ScryfallBulkDataFetcher
+from api.utils.db_utils import configure_connection, copy_rows_binary, get_pg_creds, get_table_columns
+
+PAGE_SIZE = 6000
+
+
+def get_database_connection() -> psycopg.Connection:
+    """Get a connection to the PostgreSQL database."""
+    creds = get_pg_creds()
+    conninfo = " ".join(f"{k}={v}" for k, v in creds.items())
+    conn = psycopg.connect(conninfo)
+    configure_connection(conn)
+    return conn
+
+
+def load_jsonb(cursor: psycopg.Cursor, cards: list[dict[str, Any]]) -> int:
+    """Load cards through per-page jsonb staging tables and jsonb_populate_record."""
+    cards_loaded = 0
+    for page in itertools.batched(cards, PAGE_SIZE):
+        staging_table_name = f"import_staging_{secrets.token_hex(8)}"
+        cursor.execute(f"CREATE TEMPORARY TABLE {staging_table_name} (card_blob jsonb)")
+        with cursor.copy(f"COPY {staging_table_name} (card_blob) FROM STDIN WITH (FORMAT csv, HEADER false)") as copy:
+            writer = csv.writer(copy, quoting=csv.QUOTE_ALL)
+            writer.writerows([orjson.dumps(card, option=orjson.OPT_SORT_KEYS).decode("utf-8")] for card in page)
+        cursor.execute(
+            f"""
+            INSERT INTO magic.cards
+            SELECT (jsonb_populate_record(null::magic.cards, card_blob)).*
+            FROM {staging_table_name}
+            ON CONFLICT DO NOTHING
+            """,
+        )
+        cards_loaded += cursor.rowcount
+        cursor.execute(
+            f"""
+            INSERT INTO magic.card_blobs (scryfall_id, raw_card_blob)
+            SELECT (card_blob ->> 'scryfall_id')::uuid, card_blob -> 'raw_card_blob'
+            FROM {staging_table_name}
+            ON CONFLICT DO NOTHING
+            """,
+        )
+        cursor.execute(f"DROP TABLE {staging_table_name}")
+    return cards_loaded
+
+
+def load_binary(cursor: psycopg.Cursor, cards: list[dict[str, Any]]) -> int:
+    """Load cards through one typed staging table per load, written with binary COPY."""
+    staging_table_name = f"import_staging_{secrets.token_hex(8)}"
+    card_columns = get_table_columns(cursor, "magic.cards")
+    column_list = ", ".join(column_name for column_name, _ in card_columns)
+    cursor.execute(f"CREATE TEMPORARY TABLE {staging_table_name} (LIKE magic.cards) ON COMMIT DROP")
+    cursor.execute(f"ALTER TABLE {staging_table_name} ADD COLUMN raw_card_blob jsonb")
+    cards_loaded = 0
+    for page in itertools.batched(cards, PAGE_SIZE):
+        copy_rows_binary(cursor, staging_table_name, [*card_columns, ("raw_card_blob", "jsonb")], page)
+        cursor.execute(
+            f"INSERT INTO magic.cards ({column_list}) SELECT {column_list} FROM {staging_table_name} ON CONFLICT DO NOTHING",
+        )
+        cards_loaded += cursor.rowcount
+        cursor.execute(
+            f"""
+            INSERT INTO magic.card_blobs (scryfall_id, raw_card_blob)
+            SELECT scryfall_id, raw_card_blob FROM {staging_table_name}
+            ON CONFLICT DO NOTHING
+            """,
+        )
+        cursor.execute(f"TRUNCATE {staging_table_name}")
+    return cards_loaded
+
+
+def get_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Benchmark binary COPY card loading against jsonb staging")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per path, the median is reported")
+    parser.add_argument("--limit", type=int, help="Only load the first N cards of the export")
+    parser.add_argument(
+        "--path",
+        action="append",
+        choices=["jsonb", "binary"],
+        help="Load path to benchmark, may be repeated (default: both)",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    """Main entry point for the script."""
+    args = get_args()
+    paths = {"jsonb": load_jsonb, "binary": load_binary}
+    selected = args.path or list(paths)
+
+    cards = []
+    for card in ScryfallBulkDataFetcher().get_data_for_key(BulkDataKey.DEFAULT_CARDS)[: args.limit]:
+        cards.extend(preprocess_card(card))
+    original_ids = [card["scryfall_id"] for card in cards]
+    print(f"{len(cards):,} preprocessed cards, {PAGE_SIZE} per page, median of {args.repeat} runs\n")
+
+    print(f"{'path':<8} {'seconds':>9} {'cards/s':>10} {'loaded':>9}")
+    with get_database_connection() as conn:
+        for path in selected:
+            durations = []
+            for _ in range(args.repeat):
+                # faces of one card keep sharing their scryfall_id, as in a real load
+                fresh_ids = {}
+                for card, original_id in zip(cards, original_ids, strict=True):
+                    card["scryfall_id"] = fresh_ids.setdefault(original_id, str(uuid.uuid4()))
+                with conn.cursor() as cursor:
+                    before = time.monotonic()
+                    cards_loaded = paths[path](cursor, cards)
+                    durations.append(time.monotonic() - before)
+                conn.rollback()
+            duration = statistics.median(durations)
+            print(f"{path:<8} {duration:>9.2f} {len(cards) / duration:>10,.0f} {cards_loaded:>9,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""Benchmark exporting magic.cards: the in-memory JSON array against the streamed JSON lines file.
+
+Both paths export every printing of the database named by the PG* environment variables, with
+its raw_card_blob, into a temporary directory:
+
+- array: every row is fetched with fetchall() and written as one indented JSON array (the
+  previous export)
+- stream: rows are streamed EXPORT_STREAM_ROWS at a time through a zstd compressor into a JSON
+  lines file (how _export_cards_table exports now)
+
+Each run happens in a fresh process, so the reported peak RSS is the export's own.
+
+Usage:
+    python scripts/benchmark_export.py
+    python scripts/benchmark_export.py --path stream --repeat 3
+"""
+
+from __future__ import annotations
+
+import argparse
+import multiprocessing
+import pathlib
+import resource
+import statistics
+import tempfile
+import time
+from typing import TYPE_CHECKING, Any
+
+import orjson
+
+from api.api_resource import APIResource
+
+if TYPE_CHECKING:
+    from multiprocessing.connection import Connection
+
+    from psycopg import Cursor
+
+CARDS_QUERY = """
+    SELECT card.*, blob.raw_card_blob
+    FROM magic.cards AS card
+    LEFT JOIN magic.card_blobs AS blob ON blob.scryfall_id = card.scryfall_id
+    ORDER BY card.card_name
+"""
+
+
+def export_array(_api: APIResource, cursor: Cursor, export_dir: pathlib.Path) -> dict[str, Any]:
+    """Export magic.cards as the previous export did, holding every row in memory."""
+    cursor.execute(CARDS_QUERY)
+    cards_data = [dict(row) for row in cursor.fetchall()]
+    cards_file = export_dir / "cards.json"
+    with cards_file.open("w", encoding="utf-8") as f:
+        f.write(orjson.dumps(cards_data, option=orjson.OPT_INDENT_2).decode("utf-8"))
+    return {"count": len(cards_data), "bytes": cards_file.stat().st_size}
+
+
+def export_stream(api: APIResource, cursor: Cursor, export_dir: pathlib.Path) -> dict[str, Any]:
+    """Export magic.cards through the streaming exporter."""
+    return api._export_cards_table(cursor, export_dir)
+
+
+PATHS = {"array": export_array, "stream": export_stream}
+
+
+def run_export(path: str, results: Connection) -> None:
+    """Run one export in this (fresh) process and send back its result, duration and peak RSS."""
+    # a recent import time keeps the constructor from importing on its own
+    api = APIResource(last_import_time=multiprocessing.Value("d", time.time(), lock=True))
+    with tempfile.TemporaryDirectory() as temp_dir, api._conn_pool.connection() as conn, conn.cursor() as cursor:
+        before = time.monotonic()
+        result = PATHS[path](api, cursor, pathlib.Path(temp_dir))
+        result["seconds"] = time.monotonic() - before
+    result["peak_rss_mib"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    results.send(result)
+
+
+def get_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Benchmark exports of magic.cards")
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per path, the median is reported")
+    parser.add_argument(
+        "--path", action="append", choices=list(PATHS), help="Export path to benchmark, may be repeated (default: both)"
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    """Main entry point for the script."""
+    args = get_args()
+    context = multiprocessing.get_context("spawn")
+
+    print(f"{'path':<8} {'rows':>9} {'seconds':>9} {'peak RSS MiB':>13} {'file MiB':>9}")
+    for path in args.path or list(PATHS):
+        runs = []
+        for _ in range(args.repeat):
+            receiver, sender = context.Pipe(duplex=False)
+            process = context.Process(target=run_export, args=(path, sender))
+            process.start()
+            runs.append(receiver.recv())
+            process.join()
+        seconds = statistics.median(run["seconds"] for run in runs)
+        peak_rss_mib = max(run["peak_rss_mib"] for run in runs)
+        print(f"{path:<8} {runs[0]['count']:>9,} {seconds:>9.2f} {peak_rss_mib:>13,.0f} {runs[0]['bytes'] / 2**20:>9,.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""Benchmark a full reload of magic.cards: upserting every printing against the blue/green rebuild.
+
+Both paths load the same preprocessed export into the database named by the PG* environment
+variables, through the importer's own methods:
+
+- upsert: every printing's content_hash is cleared first, so the incremental loader rewrites
+  every row of the live, fully indexed magic.cards (the previous full reload)
+- reload: the blue/green rebuild, loading an unindexed copy of magic.cards, building its
+  indexes afterwards with parallel maintenance workers and swapping it in
+
+Both paths leave magic.cards holding the export, with tags and prefer scores kept, so runs can
+be repeated against a development database.
+
+Usage:
+    python scripts/benchmark_full_reload.py --repeat 3
+    python scripts/benchmark_full_reload.py --path reload --key all_cards
+"""
+
+from __future__ import annotations
+
+import argparse
+import multiprocessing
+import statistics
+import time
+from typing import Any
+
+from api.api_resource import APIResource
+from api.scryfall_bulk_data_fetcher import BulkDataKey
+
+
+def run_upsert(api: APIResource, cards: list[dict[str, Any]]) -> dict[str, Any]:
+    """Rewrite every printing through the incremental loader."""
+    with api._conn_pool.connection() as conn:
+        conn.execute("UPDATE magic.cards SET content_hash = NULL")
+    return api._load_processed_cards(cards, delete_missing=True)
+
+
+def run_reload(api: APIResource, cards: list[dict[str, Any]]) -> dict[str, Any]:
+    """Rebuild magic.cards in a fresh table and swap it in."""
+    return api._reload_processed_cards(cards)
+
+
+def get_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Benchmark full reloads of magic.cards")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per path, the median is reported")
+    parser.add_argument("--limit", type=int, help="Only load the first N cards (reload refuses fewer than MIN_IMPORT_CARDS)")
+    parser.add_argument(
+        "--path",
+        action="append",
+        choices=["upsert", "reload"],
+        help="Load path to benchmark, may be repeated (default: both)",
+    )
+    parser.add_argument(
+        "--key",
+        default=BulkDataKey.DEFAULT_CARDS,
+        choices=[BulkDataKey.DEFAULT_CARDS, BulkDataKey.ALL_CARDS],
+        help="Bulk export to load",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    """Main entry point for the script."""
+    args = get_args()
+    paths = {"upsert": run_upsert, "reload": run_reload}
+    selected = args.path or list(paths)
+
+    # a recent import time keeps the constructor from importing on its own
+    api = APIResource(last_import_time=multiprocessing.Value("d", time.time(), lock=True))
+    cards = list(api._iter_cards_to_insert(BulkDataKey(args.key)))[: args.limit]
+    print(f"{len(cards):,} preprocessed cards, median of {args.repeat} runs\n")
+
+    print(f"{'path':<8} {'seconds':>9} {'cards/s':>10} {'phases':<40}")
+    for path in selected:
+        durations = []
+        for _ in range(args.repeat):
+            before = time.monotonic()
+            result = paths[path](api, cards)
+            durations.append(time.monotonic() - before)
+            if result["status"] != "success":
+                msg = f"{path} failed: {result['message']}"
+                raise SystemExit(msg)
+        duration = statistics.median(durations)
+        if path == "reload":
+            phases = f"load {result['load_seconds']:.2f}s, index {result['index_seconds']:.2f}s, swap {result['swap_seconds']:.2f}s"
+        else:
+            phases = f"diff {result['diff_seconds']:.2f}s"
+        print(f"{path:<8} {duration:>9.2f} {len(cards) / duration:>10,.0f} {phases:<40}")
+
+
+if __name__ == "__main__":
+    main()
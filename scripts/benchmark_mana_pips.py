@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""Benchmark mana cost and devotion searches on the integer pip count columns against jsonb containment.
+
+Each query is compiled twice: once onto the integer ``mana_pips_*`` / ``devotion_*``
+columns (the current behaviour) and once onto jsonb containment over ``mana_cost_jsonb``
+and ``devotion``, as before the count columns existed. Both variants are routed the way
+``/search`` routes them, run under EXPLAIN ANALYZE against the database named by the PG*
+environment variables, and the median execution time is reported.
+
+Usage:
+    python scripts/benchmark_mana_pips.py --repeat 5
+    python scripts/benchmark_mana_pips.py --query "m>={1}{U}{U}" --query "devotion>={B}{B}"
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import statistics
+from typing import TYPE_CHECKING
+from unittest import mock
+
+import psycopg
+
+from api.parsing import card_query_nodes, generate_routed_sql_query, parse_scryfall_query
+from api.parsing.nodes import param_name
+from api.utils.db_utils import configure_connection, get_pg_creds
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+DEFAULT_QUERIES = [
+    "m:{R}{R}",
+    "m>={2}{U}{U}",
+    "m<{W}{U}",
+    "m<={3}{B}",
+    "m={1}{G}",
+    "m>{G}{G} t:creature",
+    "devotion>={G}{G}{G}",
+    "devotion<={W}{U}",
+    "devotion={B}{B}",
+]
+
+
+def _jsonb_devotion_comparison(self: card_query_nodes.CardBinaryOperatorNode, context: dict) -> str:
+    """Devotion comparison as jsonb containment, the way it was compiled before the count columns."""
+    lhs_sql = self.lhs.to_sql(context)
+    query_devotion = card_query_nodes.calculate_devotion(self.rhs.value.strip())
+    pname = param_name(query_devotion)
+    context[pname] = query_devotion
+    return {
+        "=": f"({lhs_sql} = %({pname})s)",
+        ":": f"({lhs_sql} @> %({pname})s)",
+        ">=": f"({lhs_sql} @> %({pname})s)",
+        "<=": f"({lhs_sql} <@ %({pname})s)",
+        ">": f"({lhs_sql} @> %({pname})s AND {lhs_sql} <> %({pname})s)",
+        "<": f"({lhs_sql} <@ %({pname})s AND {lhs_sql} <> %({pname})s)",
+    }.get(self.operator, f"({lhs_sql} <> %({pname})s)")
+
+
+@contextlib.contextmanager
+def count_columns_disabled() -> Iterator[None]:
+    """Compile mana cost and devotion comparisons onto the jsonb columns."""
+    with (
+        mock.patch.object(card_query_nodes, "MANA_PIP_COLUMNS", {}),
+        mock.patch.object(card_query_nodes.CardBinaryOperatorNode, "_handle_devotion_comparison", _jsonb_devotion_comparison),
+    ):
+        yield
+
+
+def get_database_connection() -> psycopg.Connection:
+    """Get a connection to the PostgreSQL database."""
+    creds = get_pg_creds()
+    conninfo = " ".join(f"{k}={v}" for k, v in creds.items())
+    conn = psycopg.connect(conninfo)
+    configure_connection(conn)
+    return conn
+
+
+def time_query(conn: psycopg.Connection, query: str, repeat: int) -> float:
+    """Return the median execution time in milliseconds of a search query's WHERE clause."""
+    where_clause, params = generate_routed_sql_query(parse_scryfall_query(query))
+    sql = f"EXPLAIN (ANALYZE, FORMAT JSON) SELECT COUNT(1) FROM magic.cards AS card WHERE {where_clause}"
+    timings = []
+    with conn.cursor() as cursor:
+        for _ in range(repeat):
+            cursor.execute(sql, params)
+            row = cursor.fetchone()
+            plan = next(iter(row.values()))[0]
+            timings.append(plan["Execution Time"])
+    return statistics.median(timings)
+
+
+def get_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Benchmark mana cost searches on the pip count columns")
+    parser.add_argument("--query", action="append", help="Query to benchmark, may be repeated (default: a built-in set)")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per query and variant (default: 5)")
+    parser.add_argument("--statement-timeout", type=int, default=60_000, help="Statement timeout in ms (default: 60000)")
+    return parser.parse_args()
+
+
+def main() -> None:
+    """Main entry point for the script."""
+    args = get_args()
+    queries = args.query or DEFAULT_QUERIES
+    print(f"Benchmarking {len(queries)} mana cost queries, median of {args.repeat} runs")
+    print(f"{'query':<28} {'jsonb ms':>10} {'pip counts ms':>14} {'speedup':>8}")
+
+    total_jsonb = total_counts = 0.0
+    with get_database_connection() as conn:
+        conn.execute(f"set statement_timeout = {args.statement_timeout}")
+        for query in queries:
+            with count_columns_disabled():
+                jsonb = time_query(conn, query, args.repeat)
+            counts = time_query(conn, query, args.repeat)
+            total_jsonb += jsonb
+            total_counts += counts
+            speedup = jsonb / counts if counts else float("inf")
+            print(f"{query:<28} {jsonb:>10.1f} {counts:>14.1f} {speedup:>7.1f}x")
+
+    print(f"{'total':<28} {total_jsonb:>10.1f} {total_counts:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""Benchmark preprocessing a bulk export across 1, 2, 4 and 8 worker processes.
+
+Loads the cached bulk export once, then times iter_preprocessed_cards plus the ordered
+(scryfall_id, face_idx) dedupe for each worker count, and checks every run produces the same
+cards in the same order as the serial run.
+
+Usage:
+    python scripts/benchmark_parallel_preprocessing.py
+    python scripts/benchmark_parallel_preprocessing.py --workers 1 --workers 4 --limit 20000
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Any
+
+import orjson
+
+from api.card_processing import PREPROCESS_CHUNK_SIZE, free_cpu_count, iter_preprocessed_cards
+from api.scryfall_bulk_data_fetcher import BulkDataKey, ScryfallBulkDataFetcher
+
+DEFAULT_WORKER_COUNTS = [1, 2, 4, 8]
+
+
+def preprocess_and_dedupe(cards: list[dict[str, Any]], max_workers: int, chunk_size: int) -> list[tuple[str, int]]:
+    """Preprocess and dedupe cards as the importer does, returning the keys of the cards kept, in order."""
+    seen_keys: set[tuple[str, int]] = set()
+    kept_keys = []
+    for processed_card in iter_preprocessed_cards(cards, max_workers=max_workers, chunk_size=chunk_size):
+        key = (processed_card["scryfall_id"], processed_card["face_idx"])
+        if key not in seen_keys:
+            seen_keys.add(key)
+            kept_keys.append(key)
+    return kept_keys
+
+
+def get_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Benchmark parallel card preprocessing")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        action="append",
+        help=f"Worker process count to benchmark, may be repeated (default: {DEFAULT_WORKER_COUNTS})",
+    )
+    parser.add_argument("--chunk-size", type=int, default=PREPROCESS_CHUNK_SIZE, help="Cards per worker task")
+    parser.add_argument("--limit", type=int, help="Only preprocess the first N cards of the export")
+    parser.add_argument(
+        "--key",
+        default=BulkDataKey.DEFAULT_CARDS,
+        choices=[BulkDataKey.DEFAULT_CARDS, BulkDataKey.ALL_CARDS],
+        help="Bulk export to preprocess",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    """Main entry point for the script."""
+    args = get_args()
+    worker_counts = args.workers or DEFAULT_WORKER_COUNTS
+
+    print(f"Loading {args.key}...")
+    # keep the export serialized: preprocess_card mutates its input, so each run decodes a fresh copy
+    raw_cards = orjson.dumps(ScryfallBulkDataFetcher().get_data_for_key(BulkDataKey(args.key))[: args.limit])
+    num_cards = len(orjson.loads(raw_cards))
+    print(f"{num_cards:,} cards, chunk size {args.chunk_size}, {free_cpu_count()} free CPUs\n")
+
+    print(f"{'workers':>7} {'seconds':>9} {'cards/s':>10} {'speedup':>8} {'output':>8}")
+    baseline_seconds = None
+    baseline_keys = None
+    for max_workers in worker_counts:
+        cards = orjson.loads(raw_cards)
+        before = time.monotonic()
+        kept_keys = preprocess_and_dedupe(cards, max_workers, args.chunk_size)
+        duration = time.monotonic() - before
+
+        if baseline_seconds is None:
+            baseline_seconds = duration
+            baseline_keys = kept_keys
+        output = "same" if kept_keys == baseline_keys else "DIFFERS"
+        print(
+            f"{max_workers:>7} {duration:>9.2f} {num_cards / duration:>10,.0f} {baseline_seconds / duration:>7.2f}x {output:>8}",
+        )
+
+
+if __name__ == "__main__":
+    main()
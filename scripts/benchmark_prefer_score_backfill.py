@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""Benchmark the prefer score backfill: the correlated subquery it replaced against the set-based rewrite.
+
+Every path runs against magic.cards of the database named by the PG* environment variables,
+in a transaction that is rolled back, so the database is left unchanged:
+
+- correlated: api/sql/backfill_prefer_scores.sql as of --ref, which counts each row's
+  illustration group with a correlated subquery and rewrites every row
+- full-cold: the set-based backfill over every card, with every score cleared first, so
+  every row is written (a first import)
+- full-warm: the set-based backfill over every card when no score changed, so nothing is
+  written (a reload, or the backfill endpoint)
+- incremental: the set-based backfill limited to --sample random printings and their
+  illustration groups, with their scores cleared first (an import that touched them)
+
+Usage:
+    python scripts/benchmark_prefer_score_backfill.py --ref HEAD~1
+    python scripts/benchmark_prefer_score_backfill.py --path full-warm --path incremental --sample 5000
+"""
+
+from __future__ import annotations
+
+import argparse
+import pathlib
+import statistics
+import subprocess
+import time
+
+import psycopg
+from psycopg.rows import dict_row
+
+from api.utils.db_utils import configure_connection, get_pg_creds
+
+BACKFILL_SQL_PATH = "api/sql/backfill_prefer_scores.sql"
+
+
+def get_database_connection() -> psycopg.Connection:
+    """Get a connection to the PostgreSQL database."""
+    creds = get_pg_creds()
+    conninfo = " ".join(f"{k}={v}" for k, v in creds.items())
+    conn = psycopg.connect(conninfo, row_factory=dict_row)
+    configure_connection(conn)
+    return conn
+
+
+def clear_scores(cursor: psycopg.Cursor, scryfall_ids: list | None = None) -> None:
+    """Clear the prefer scores of the given printings, or of every card."""
+    cursor.execute(
+        """
+        UPDATE magic.cards SET prefer_score = NULL, prefer_score_components = NULL
+        WHERE %(scryfall_ids)s::uuid[] IS NULL OR scryfall_id = ANY(%(scryfall_ids)s::uuid[])
+        """,
+        {"scryfall_ids": scryfall_ids},
+    )
+
+
+def get_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Benchmark the prefer score backfill")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per path, the median is reported")
+    parser.add_argument("--sample", type=int, default=1000, help="Printings touched in the incremental path")
+    parser.add_argument("--ref", default="HEAD~1", help=f"Git revision of {BACKFILL_SQL_PATH} for the correlated path")
+    parser.add_argument(
+        "--path",
+        action="append",
+        choices=["correlated", "full-cold", "full-warm", "incremental"],
+        help="Backfill path to benchmark, may be repeated (default: all)",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    """Main entry point for the script."""
+    args = get_args()
+    selected = args.path or ["correlated", "full-cold", "full-warm", "incremental"]
+    backfill_sql = pathlib.Path(BACKFILL_SQL_PATH).read_text(encoding="utf-8")
+    correlated_sql = subprocess.run(
+        ["git", "show", f"{args.ref}:{BACKFILL_SQL_PATH}"],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+
+    with get_database_connection() as conn:
+        num_cards = conn.execute("SELECT COUNT(1) AS num_cards FROM magic.cards").fetchone()["num_cards"]
+        sample_ids = [
+            r["scryfall_id"]
+            for r in conn.execute("SELECT scryfall_id FROM magic.cards ORDER BY RANDOM() LIMIT %s", (args.sample,)).fetchall()
+        ]
+        print(f"{num_cards:,} cards, {len(sample_ids):,} sampled for the incremental path, median of {args.repeat} runs\n")
+
+        print(f"{'path':<12} {'seconds':>9} {'updated':>9}")
+        for path in selected:
+            durations = []
+            for _ in range(args.repeat):
+                with conn.cursor() as cursor:
+                    cursor.execute("set statement_timeout = 0")
+                    if path == "full-cold":
+                        clear_scores(cursor)
+                    elif path == "incremental":
+                        clear_scores(cursor, sample_ids)
+                    params = {"scryfall_ids": sample_ids if path == "incremental" else None, "illustration_ids": []}
+                    before = time.monotonic()
+                    if path == "correlated":
+                        cursor.execute(correlated_sql)
+                    else:
+                        cursor.execute(backfill_sql, params)
+                    durations.append(time.monotonic() - before)
+                    updated = cursor.rowcount
+                conn.rollback()
+            print(f"{path:<12} {statistics.median(durations):>9.2f} {updated:>9,}")
+
+
+if __name__ == "__main__":
+    main()
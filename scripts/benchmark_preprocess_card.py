@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""Benchmark preprocess_card throughput in cards per second.
+
+Times preprocess_card plus serializing its rows the way the loader does (orjson with sorted
+keys), single process, over the cached bulk export or a JSON array file. With --ref, the
+api/card_processing.py of that git revision is timed on the same cards for comparison.
+
+Usage:
+    python scripts/benchmark_preprocess_card.py --ref HEAD~1
+    python scripts/benchmark_preprocess_card.py --input cards.json --repeat 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import pathlib
+import statistics
+import time
+from typing import TYPE_CHECKING
+
+import orjson
+
+from api import card_processing
+from api.scryfall_bulk_data_fetcher import BulkDataKey, ScryfallBulkDataFetcher
+from scripts.compare_preprocessed_rows import load_card_processing_at
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+def time_preprocessing(raw_cards: bytes, preprocess_card: Callable) -> tuple[float, int, int]:
+    """Preprocess and serialize every card once, returning the seconds taken, rows built and bytes serialized."""
+    # preprocess_card takes ownership of its input, so every run decodes a fresh copy
+    cards = orjson.loads(raw_cards)
+    num_rows = num_bytes = 0
+    before = time.monotonic()
+    for card in cards:
+        for row in preprocess_card(card):
+            num_rows += 1
+            num_bytes += len(orjson.dumps(row, option=orjson.OPT_SORT_KEYS))
+    return time.monotonic() - before, num_rows, num_bytes
+
+
+def get_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Benchmark preprocess_card throughput")
+    parser.add_argument("--ref", help="Also time api/card_processing.py as of this git revision")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per implementation, the median is reported")
+    parser.add_argument("--limit", type=int, help="Only preprocess the first N cards")
+    parser.add_argument("--input", type=pathlib.Path, help="Read cards from this JSON array file instead of the bulk export")
+    parser.add_argument(
+        "--key",
+        default=BulkDataKey.DEFAULT_CARDS,
+        choices=[BulkDataKey.DEFAULT_CARDS, BulkDataKey.ALL_CARDS],
+        help="Bulk export to preprocess",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    """Main entry point for the script."""
+    args = get_args()
+    if args.input:
+        cards = orjson.loads(args.input.read_bytes())
+    else:
+        cards = ScryfallBulkDataFetcher().get_data_for_key(BulkDataKey(args.key))
+    raw_cards = orjson.dumps(cards[: args.limit])
+    num_cards = len(orjson.loads(raw_cards))
+    del cards
+
+    implementations = {"current": card_processing.preprocess_card}
+    if args.ref:
+        implementations[args.ref] = load_card_processing_at(args.ref).preprocess_card
+
+    print(f"{num_cards:,} cards, median of {args.repeat} runs\n")
+    print(f"{'implementation':<16} {'seconds':>9} {'cards/s':>10} {'rows':>9} {'MiB serialized':>15}")
+    for name, preprocess_card in implementations.items():
+        runs = [time_preprocessing(raw_cards, preprocess_card) for _ in range(args.repeat)]
+        duration = statistics.median(seconds for seconds, _, _ in runs)
+        _, num_rows, num_bytes = runs[0]
+        print(f"{name:<16} {duration:>9.2f} {num_cards / duration:>10,.0f} {num_rows:>9,} {num_bytes / 2**20:>15,.1f}")
+
+
+if __name__ == "__main__":
+    main()
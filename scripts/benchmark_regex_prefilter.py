@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""Benchmark regex searches with and without the ILIKE literal prefilter.
+
+Every regex query used by the parser test suite is compiled twice: once with the
+required-literal ILIKE prefilters (the current behaviour) and once with the bare
+``~*`` match. Each variant is run under EXPLAIN ANALYZE against the database named
+by the PG* environment variables and the median execution time is reported.
+
+Usage:
+    python scripts/benchmark_regex_prefilter.py --repeat 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import inspect
+import statistics
+from typing import TYPE_CHECKING
+from unittest import mock
+
+import psycopg
+
+from api.parsing import card_query_nodes, generate_sql_query, parse_scryfall_query
+from api.parsing.regex_literals import extract_required_literals
+from api.parsing.tests import test_regex_patterns
+from api.utils.db_utils import configure_connection, get_pg_creds
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+# regex queries exercised by non-parametrized tests in test_regex_patterns
+EXTRA_QUERIES = [
+    "name:/a\\/b/",
+    "o:/draw a card$/",
+    "o:/\\w+/",
+    "o:/\\d+/",
+    "o:/[Tt]ap/",
+    "o:/.*?draw.*?/",
+    "o:/(?!non)/",
+    "flavor:/magic/",
+    "t:creature o:/^{T}:/",
+]
+
+
+def _looks_like_regex_query(value: object) -> bool:
+    return isinstance(value, str) and ":/" in value and value.endswith("/")
+
+
+def collect_regex_queries() -> list[str]:
+    """Collect the regex queries from the parametrize marks of the regex test suite."""
+    queries: list[str] = []
+    for _, cls in inspect.getmembers(test_regex_patterns, inspect.isclass):
+        for _, func in inspect.getmembers(cls, inspect.isfunction):
+            for mark in getattr(func, "pytestmark", []):
+                if mark.name != "parametrize":
+                    continue
+                for argvalue in mark.args[1]:
+                    values = argvalue if isinstance(argvalue, tuple) else (argvalue,)
+                    queries.extend(value for value in values if _looks_like_regex_query(value))
+    return list(dict.fromkeys(queries + EXTRA_QUERIES))
+
+
+@contextlib.contextmanager
+def prefilter_disabled() -> Iterator[None]:
+    """Compile regexes without the literal prefilter, as they were before it existed."""
+    with mock.patch.object(card_query_nodes, "extract_required_literals", return_value=[]):
+        yield
+
+
+def get_database_connection() -> psycopg.Connection:
+    """Get a connection to the PostgreSQL database."""
+    creds = get_pg_creds()
+    conninfo = " ".join(f"{k}={v}" for k, v in creds.items())
+    conn = psycopg.connect(conninfo)
+    configure_connection(conn)
+    return conn
+
+
+def time_query(conn: psycopg.Connection, query: str, repeat: int) -> float:
+    """Return the median execution time in milliseconds of a search query's WHERE clause."""
+    where_clause, params = generate_sql_query(parse_scryfall_query(query))
+    sql = f"EXPLAIN (ANALYZE, FORMAT JSON) SELECT COUNT(1) FROM magic.cards AS card WHERE {where_clause}"
+    timings = []
+    with conn.cursor() as cursor:
+        for _ in range(repeat):
+            cursor.execute(sql, params)
+            row = cursor.fetchone()
+            plan = next(iter(row.values()))[0]
+            timings.append(plan["Execution Time"])
+    return statistics.median(timings)
+
+
+def get_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Benchmark the regex literal prefilter")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per query and variant (default: 5)")
+    parser.add_argument("--statement-timeout", type=int, default=60_000, help="Statement timeout in ms (default: 60000)")
+    return parser.parse_args()
+
+
+def main() -> None:
+    """Main entry point for the script."""
+    args = get_args()
+    queries = collect_regex_queries()
+    print(f"Benchmarking {len(queries)} regex queries, median of {args.repeat} runs")
+    print(f"{'query':<32} {'literals':<24} {'~* only ms':>12} {'prefilter ms':>14} {'speedup':>8}")
+
+    total_baseline = total_prefiltered = 0.0
+    with get_database_connection() as conn:
+        conn.execute(f"set statement_timeout = {args.statement_timeout}")
+        for query in queries:
+            pattern = query.rsplit(":/", 1)[-1][:-1]
+            literals = extract_required_literals(pattern)
+            with prefilter_disabled():
+                baseline = time_query(conn, query, args.repeat)
+            prefiltered = time_query(conn, query, args.repeat)
+            total_baseline += baseline
+            total_prefiltered += prefiltered
+            speedup = baseline / prefiltered if prefiltered else float("inf")
+            print(f"{query:<32} {','.join(literals) or '-':<24} {baseline:>12.1f} {prefiltered:>14.1f} {speedup:>7.1f}x")
+
+    print(f"{'total':<57} {total_baseline:>12.1f} {total_prefiltered:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
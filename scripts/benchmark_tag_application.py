@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""Benchmark applying tags to magic.cards: the per-tag UPDATE loop against the bulk card_tags rebuild.
+
+Both paths apply the same synthetic mapping of oracle tags to card names of the database named
+by the PG* environment variables. Tags are given a random number of cards and pick them with a
+skew towards a few heavily tagged cards, as real tags do:
+
+- loop: one ``card_oracle_tags || tag`` UPDATE per batch of 200 names for each tag (the previous
+  tag import, without its commit after every batch)
+- bulk: the mapping is sent with one COPY into magic.card_tags and each affected card's
+  card_oracle_tags is rebuilt with one aggregate UPDATE (how tag imports apply tags now)
+
+Each path applies the mapping twice, as a first import and as a re-import of unchanged tags, and
+reports the time, the magic.cards rows written and the WAL generated. Each run is rolled back,
+so the database is left unchanged.
+
+Usage:
+    python scripts/benchmark_tag_application.py --repeat 3
+    python scripts/benchmark_tag_application.py --tags 5000 --path bulk
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import multiprocessing
+import random
+import statistics
+import time
+from typing import TYPE_CHECKING
+
+import orjson
+
+from api.api_resource import APIResource
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    import psycopg
+
+
+def apply_loop(api: APIResource, cursor: psycopg.Cursor, tagged_card_names: dict[str, list[str]]) -> None:
+    """Apply the tags with one UPDATE per batch of 200 names for each tag."""
+    del api
+    for tag, card_names in tagged_card_names.items():
+        for card_name_batch in itertools.batched(card_names, 200):
+            cursor.execute(
+                """
+                UPDATE magic.cards
+                SET card_oracle_tags = card_oracle_tags || %(new_tag)s::jsonb
+                WHERE card_name = ANY(%(card_names)s)
+                """,
+                {"card_names": list(card_name_batch), "new_tag": orjson.dumps({tag: True}).decode("utf-8")},
+            )
+
+
+def apply_bulk(api: APIResource, cursor: psycopg.Cursor, tagged_card_names: dict[str, list[str]]) -> None:
+    """Apply the tags through magic.card_tags."""
+    api._write_card_tags(cursor, tag_kind="oracle", tagged_card_names=tagged_card_names)
+
+
+def get_tagged_card_names(card_names: list[str], num_tags: int, max_cards_per_tag: int, seed: int) -> dict[str, list[str]]:
+    """Make a tag mapping, with card popularity falling off like 1 / rank."""
+    rng = random.Random(seed)  # noqa: S311
+    weights = [1 / rank for rank in range(1, len(card_names) + 1)]
+    tagged_card_names = {}
+    for idx in range(num_tags):
+        num_cards = min(len(card_names), int(rng.paretovariate(1.2)) * 5)
+        num_cards = min(num_cards, max_cards_per_tag)
+        picked = set(rng.choices(card_names, weights=weights, k=num_cards))
+        tagged_card_names[f"benchmark-tag-{idx}"] = sorted(picked)
+    return tagged_card_names
+
+
+def measure(api: APIResource, cursor: psycopg.Cursor, path: Callable, tagged_card_names: dict[str, list[str]]) -> dict[str, float]:
+    """Apply the tags once, returning the seconds taken, magic.cards rows written and WAL bytes generated."""
+    cursor.execute(
+        """
+        SELECT
+            pg_current_wal_insert_lsn() AS lsn,
+            (SELECT n_tup_upd FROM pg_stat_xact_user_tables
+             WHERE schemaname = 'magic' AND relname = 'cards') AS rows_written
+        """,
+    )
+    before_stats = cursor.fetchone()
+    before = time.monotonic()
+    path(api, cursor, tagged_card_names)
+    duration = time.monotonic() - before
+    cursor.execute(
+        """
+        SELECT
+            pg_wal_lsn_diff(pg_current_wal_insert_lsn(), %(lsn)s) AS wal_bytes,
+            (SELECT n_tup_upd FROM pg_stat_xact_user_tables
+             WHERE schemaname = 'magic' AND relname = 'cards') AS rows_written
+        """,
+        {"lsn": before_stats["lsn"]},
+    )
+    after_stats = cursor.fetchone()
+    return {
+        "seconds": duration,
+        "rows_written": after_stats["rows_written"] - before_stats["rows_written"],
+        "wal_bytes": float(after_stats["wal_bytes"]),
+    }
+
+
+def get_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Benchmark the per-tag UPDATE loop against bulk tag application")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per path, the median is reported")
+    parser.add_argument("--tags", type=int, default=2000, help="Number of synthetic tags")
+    parser.add_argument("--max-cards-per-tag", type=int, default=2000, help="Cap on the cards of one tag")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the synthetic mapping")
+    parser.add_argument(
+        "--path",
+        action="append",
+        choices=["loop", "bulk"],
+        help="Tag application path to benchmark, may be repeated (default: both)",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    """Main entry point for the script."""
+    args = get_args()
+    paths = {"loop": apply_loop, "bulk": apply_bulk}
+    selected = args.path or list(paths)
+
+    # a recent import time keeps the constructor from importing on its own
+    api = APIResource(last_import_time=multiprocessing.Value("d", time.time(), lock=True))
+    with api._conn_pool.connection() as conn:
+        card_names = [row["card_name"] for row in conn.execute("SELECT DISTINCT card_name FROM magic.cards ORDER BY 1")]
+    random.Random(args.seed).shuffle(card_names)  # noqa: S311
+    tagged_card_names = get_tagged_card_names(card_names, args.tags, args.max_cards_per_tag, args.seed)
+    num_links = sum(len(names) for names in tagged_card_names.values())
+    print(f"{len(tagged_card_names):,} tags, {num_links:,} tag links over {len(card_names):,} card names")
+    print(f"median of {args.repeat} runs\n")
+
+    print(f"{'path':<6} {'apply':<8} {'seconds':>9} {'rows written':>13} {'WAL MB':>9}")
+    for path in selected:
+        runs: dict[str, list[dict[str, float]]] = {"first": [], "repeat": []}
+        for _ in range(args.repeat):
+            with api._conn_pool.connection() as conn, conn.cursor() as cursor:
+                for measurements in runs.values():
+                    measurements.append(measure(api, cursor, paths[path], tagged_card_names))
+                conn.rollback()
+        for apply, measurements in runs.items():
+            seconds = statistics.median(m["seconds"] for m in measurements)
+            rows_written = statistics.median(m["rows_written"] for m in measurements)
+            wal_mb = statistics.median(m["wal_bytes"] for m in measurements) / (1 << 20)
+            print(f"{path:<6} {apply:<8} {seconds:>9.2f} {rows_written:>13,.0f} {wal_mb:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
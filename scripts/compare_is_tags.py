@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""Compare the is: tags derived from stored cards with Scryfall's answers for them.
+
+For every tag with a rule in IS_TAG_RULES (or the given --tag), the card names the rule derives
+from the database named by the PG* environment variables are compared with the names a Scryfall
+is: search finds. Scryfall's answer is limited to card names in magic.cards, since printings that
+are never imported (digital-only, playtest, un-sets) can't be tagged locally either.
+
+For each tag it reports both counts, the names only Scryfall has (missing) and only the rules
+have (extra), and their Jaccard agreement. The totals compare the time deriving every tag locally
+took with the time searching Scryfall for them took, which is what an is: tag refresh saves.
+
+Usage:
+    python scripts/compare_is_tags.py
+    python scripts/compare_is_tags.py --tag vanilla --tag french_vanilla --examples 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import multiprocessing
+import time
+
+from api.api_resource import APIResource
+from api.utils.is_tags import IS_TAG_RULES
+
+
+def get_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Compare derived is: tags with Scryfall's")
+    parser.add_argument(
+        "--tag", action="append", choices=sorted(IS_TAG_RULES), help="Tag to compare, may be repeated (default: all)"
+    )
+    parser.add_argument("--examples", type=int, default=3, help="Missing and extra card names to show per tag")
+    return parser.parse_args()
+
+
+def main() -> None:
+    """Main entry point for the script."""
+    args = get_args()
+    is_tags = args.tag or list(IS_TAG_RULES)
+
+    # a recent import time keeps the constructor from importing on its own
+    api = APIResource(last_import_time=multiprocessing.Value("d", time.time(), lock=True))
+    with api._conn_pool.connection() as conn:
+        stored_card_names = {row["card_name"] for row in conn.execute("SELECT DISTINCT card_name FROM magic.cards")}
+
+    before = time.monotonic()
+    derived = api._derive_is_tags(is_tags=is_tags)
+    derive_seconds = time.monotonic() - before
+
+    before = time.monotonic()
+    failed_tags: dict[str, str] = {}
+    searched = dict(api._iter_tagged_card_names(tags=is_tags, query_prefix="is:", failed_tags=failed_tags))
+    search_seconds = time.monotonic() - before
+
+    print(f"{len(stored_card_names):,} card names in magic.cards\n")
+    print(f"{'tag':<16} {'derived':>8} {'scryfall':>9} {'missing':>8} {'extra':>8} {'agreement':>10}")
+    for is_tag in is_tags:
+        if is_tag in failed_tags:
+            print(f"{is_tag:<16} Scryfall search failed: {failed_tags[is_tag]}")
+            continue
+        local = set(derived.get(is_tag, []))
+        remote = set(searched.get(is_tag, [])) & stored_card_names
+        missing = sorted(remote - local)
+        extra = sorted(local - remote)
+        agreement = len(local & remote) / len(local | remote) if local | remote else 1.0
+        print(f"{is_tag:<16} {len(local):>8,} {len(remote):>9,} {len(missing):>8,} {len(extra):>8,} {agreement:>10.1%}")
+        for label, card_names in (("missing", missing), ("extra", extra)):
+            if card_names and args.examples:
+                print(f"    {label}: {', '.join(card_names[: args.examples])}")
+
+    print(f"\nderived {len(is_tags)} tags in {derive_seconds:.1f}s, searching Scryfall for them took {search_seconds:.1f}s")
+    print(f"saved per refresh: {search_seconds - derive_seconds:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
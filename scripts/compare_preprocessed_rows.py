@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""Golden-file comparison of the rows preprocess_card builds for a whole bulk export.
+
+write runs preprocess_card over every card of the export and stores the resulting rows,
+projected onto the magic.cards columns plus face_idx, face_name and raw_card_blob (the keys
+the loader reads), as zstd-compressed JSON lines. check builds the rows again with the
+current code and reports every row that differs from the golden file.
+
+--ref writes the golden file with api/card_processing.py as of a git revision, so a rewrite
+can be checked against the implementation it replaces.
+
+Usage:
+    python scripts/compare_preprocessed_rows.py write /tmp/golden.jsonl.zst --ref HEAD~1
+    python scripts/compare_preprocessed_rows.py check /tmp/golden.jsonl.zst
+    python scripts/compare_preprocessed_rows.py check /tmp/golden.jsonl.zst --key all_cards
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import io
+import itertools
+import pathlib
+import subprocess
+import sys
+import tempfile
+from typing import TYPE_CHECKING, Any
+
+import orjson
+import zstandard as zstd
+
+from api import card_processing
+from api.scryfall_bulk_data_fetcher import BulkDataKey, ScryfallBulkDataFetcher
+from api.utils.json_stream import iter_json_array
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+    from types import ModuleType
+
+# magic.cards columns as of api/db/2026-10-18-04-arithmetic-expressions.sql; content_hash (added
+# later) is left out, it only digests the other keys
+CARD_COLUMNS = frozenset(
+    [
+        "card_rarity_int",
+        "cmc",
+        "collector_number_int",
+        "creature_power",
+        "creature_toughness",
+        "planeswalker_loyalty",
+        "edhrec_rank",
+        "price_usd",
+        "price_eur",
+        "price_tix",
+        "scryfall_id",
+        "set_name",
+        "oracle_id",
+        "type_line",
+        "illustration_id",
+        "released_at",
+        "card_name",
+        "oracle_text",
+        "mana_cost_text",
+        "mana_cost_jsonb",
+        "devotion",
+        "card_types",
+        "card_subtypes",
+        "card_colors",
+        "card_color_identity",
+        "card_keywords",
+        "creature_power_text",
+        "creature_toughness_text",
+        "planeswalker_loyalty_text",
+        "card_oracle_tags",
+        "card_set_code",
+        "card_artist",
+        "card_rarity_text",
+        "card_legalities",
+        "collector_number",
+        "produced_mana",
+        "card_frame_data",
+        "flavor_text",
+        "card_is_tags",
+        "card_layout",
+        "card_border",
+        "card_watermark",
+        "prefer_score_components",
+        "prefer_score",
+        "card_lang",
+        "card_image_status",
+        "card_finishes",
+        "card_games",
+        "mana_pips_w",
+        "mana_pips_u",
+        "mana_pips_b",
+        "mana_pips_r",
+        "mana_pips_g",
+        "mana_pips_c",
+        "mana_generic",
+        "mana_hybrid",
+        "mana_phyrexian",
+        "mana_other_symbols",
+        "devotion_w",
+        "devotion_u",
+        "devotion_b",
+        "devotion_r",
+        "devotion_g",
+        "devotion_c",
+    ],
+)
+ROW_KEYS = CARD_COLUMNS | {"face_idx", "face_name", "raw_card_blob"}
+MAX_REPORTED_MISMATCHES = 10
+
+
+def load_card_processing_at(ref: str) -> ModuleType:
+    """Import api/card_processing.py as it was at a git revision."""
+    source = subprocess.run(
+        ["git", "show", f"{ref}:api/card_processing.py"],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    with tempfile.NamedTemporaryFile("w", suffix=".py", delete=False) as module_file:
+        module_file.write(source)
+    spec = importlib.util.spec_from_file_location("reference_card_processing", module_file.name)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    pathlib.Path(module_file.name).unlink()
+    return module
+
+
+def iter_cards(args: argparse.Namespace) -> Iterator[dict[str, Any]]:
+    """Yield the raw cards of the export being compared."""
+    if args.input:
+        with args.input.open(encoding="utf-8") as input_file:
+            yield from iter_json_array(input_file)
+        return
+    yield from ScryfallBulkDataFetcher().iter_data_for_key(BulkDataKey(args.key))
+
+
+def iter_row_lines(cards: Iterator[dict[str, Any]], preprocess_card: Callable) -> Iterator[bytes]:
+    """Yield every row built from cards, projected onto ROW_KEYS and serialized with sorted keys."""
+    for card in cards:
+        for row in preprocess_card(card):
+            projected = {key: value for key, value in row.items() if key in ROW_KEYS}
+            yield orjson.dumps(projected, option=orjson.OPT_SORT_KEYS)
+
+
+def write_golden(args: argparse.Namespace) -> None:
+    """Write the golden rows for the export."""
+    module = load_card_processing_at(args.ref) if args.ref else card_processing
+    num_rows = 0
+    with args.golden_file.open("wb") as raw_file, zstd.ZstdCompressor().stream_writer(raw_file) as golden_file:
+        for line in iter_row_lines(iter_cards(args), module.preprocess_card):
+            golden_file.write(line + b"\n")
+            num_rows += 1
+    print(f"Wrote {num_rows:,} rows to {args.golden_file}")
+
+
+def check_golden(args: argparse.Namespace) -> int:
+    """Compare the rows built by the current code with the golden rows, returning the exit code."""
+    num_rows = num_mismatches = 0
+    with args.golden_file.open("rb") as raw_file:
+        golden_lines = io.BufferedReader(zstd.ZstdDecompressor().stream_reader(raw_file))
+        current_lines = iter_row_lines(iter_cards(args), card_processing.preprocess_card)
+        for golden_line, current_line in itertools.zip_longest(golden_lines, current_lines):
+            num_rows += 1
+            golden_line = golden_line.rstrip(b"\n") if golden_line else None  # noqa: PLW2901
+            if golden_line == current_line:
+                continue
+            num_mismatches += 1
+            if num_mismatches <= MAX_REPORTED_MISMATCHES:
+                report_mismatch(num_rows, golden_line, current_line)
+
+    print(f"{num_rows:,} rows compared, {num_mismatches:,} differ")
+    return 1 if num_mismatches else 0
+
+
+def report_mismatch(row_number: int, golden_line: bytes | None, current_line: bytes | None) -> None:
+    """Print the keys that differ between a golden row and the current row."""
+    golden = orjson.loads(golden_line) if golden_line else {}
+    current = orjson.loads(current_line) if current_line else {}
+    name = current.get("card_name") or golden.get("card_name")
+    print(f"row {row_number:,} ({name}):")
+    for key in sorted(golden.keys() | current.keys()):
+        if golden.get(key, "<missing>") != current.get(key, "<missing>"):
+            print(f"    {key}: golden {golden.get(key, '<missing>')!r:.120} current {current.get(key, '<missing>')!r:.120}")
+
+
+def get_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Golden-file comparison of preprocessed card rows")
+    parser.add_argument("command", choices=["write", "check"])
+    parser.add_argument("golden_file", type=pathlib.Path, help="Golden rows, zstd-compressed JSON lines")
+    parser.add_argument(
+        "--key",
+        default=BulkDataKey.DEFAULT_CARDS,
+        choices=[BulkDataKey.DEFAULT_CARDS, BulkDataKey.ALL_CARDS],
+        help="Bulk export to preprocess",
+    )
+    parser.add_argument("--input", type=pathlib.Path, help="Read cards from this JSON array file instead of the bulk export")
+    parser.add_argument("--ref", help="Git revision of api/card_processing.py to write the golden rows with")
+    return parser.parse_args()
+
+
+def main() -> None:
+    """Main entry point for the script."""
+    args = get_args()
+    if args.command == "write":
+        write_golden(args)
+    else:
+        sys.exit(check_golden(args))
+
+
+if __name__ == "__main__":
+    main()
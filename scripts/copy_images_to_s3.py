@@ -113,10 +113,12 @@ def fetch_cards_from_db(
             SELECT
                 card_set_code,
                 collector_number,
-                raw_card_blob->'image_uris'->>'png' as png_url,
-                (raw_card_blob->>'face_idx')::int as face_idx
+                blob.raw_card_blob->'image_uris'->>'png' as png_url,
+                (blob.raw_card_blob->>'face_idx')::int as face_idx
             FROM
-                magic.cards
+                magic.cards AS card
+            JOIN
+                magic.card_blobs AS blob ON blob.scryfall_id = card.scryfall_id
             WHERE
                 {where_clause}
             ORDER BY
@@ -8,12 +8,15 @@ but missing from the local database.
 
 import itertools
 import logging
-import time
 
 import requests
 
+from api.utils.rate_limiter import TokenBucket, rate_limited_get
+
 # Constants
 NOT_FOUND_STATUS = 404
+# Scryfall allows 10 requests per second
+SCRYFALL_REQUESTS_PER_SECOND = 10
 
 
 def setup_logging() -> None:
@@ -48,12 +51,13 @@ def generate_search_queries() -> list[str]:
     return queries
 
 
-def search_scryfall(query: str, session: requests.Session) -> set[str]:
+def search_scryfall(query: str, session: requests.Session, rate_limiter: TokenBucket) -> set[str]:
     """Search Scryfall API for cards matching the query.
 
     Args:
         query: The search query string.
         session: Requests session for API calls.
+        rate_limiter: Limiter for every request to Scryfall, which also backs off when told to.
 
     Returns:
         Set of card names found in Scryfall.
@@ -75,10 +79,7 @@ def search_scryfall(query: str, session: requests.Session) -> set[str]:
 
     try:
         while True:
-            # Rate limiting - Scryfall allows 10 requests per second
-            time.sleep(0.2)
-
-            response = session.get(base_url, params=params, timeout=30)
+            response = rate_limited_get(session, base_url, rate_limiter=rate_limiter, params=params, timeout=30)
             response.raise_for_status()
             data = response.json()
 
@@ -180,6 +181,8 @@ def main() -> None:
         },
     )
 
+    scryfall_rate_limiter = TokenBucket(rate=SCRYFALL_REQUESTS_PER_SECOND)
+
     logging.info("Starting missing card detection process...")
 
     # Generate all search queries
@@ -198,7 +201,7 @@ def main() -> None:
             if not local_cards:
                 logging.warning("Got back an empty response for: %s", query)
                 continue
-            scryfall_cards = search_scryfall(query, session)
+            scryfall_cards = search_scryfall(query, session, scryfall_rate_limiter)
 
             # Find missing cards
             missing_cards = scryfall_cards - local_cards
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""Measure card table sizes and search latency, for before/after comparisons of schema changes.
+
+Reports heap, TOAST and index sizes for every table in the magic schema, and the median
+execution time of a few representative searches plus a full-width scan of magic.cards.
+Results can be saved as JSON and compared against a later run:
+
+Usage:
+    python scripts/measure_table_sizes.py --save /tmp/before.json
+    # ... apply the migration / reload ...
+    python scripts/measure_table_sizes.py --compare /tmp/before.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import pathlib
+import statistics
+from typing import Any
+
+import orjson
+import psycopg
+
+from api.parsing import generate_sql_query, parse_scryfall_query
+from api.utils.db_utils import configure_connection, get_pg_creds
+
+SEARCH_QUERIES = [
+    "t:creature cmc=3",
+    "o:flying",
+    "name:bolt",
+    "set:iko",
+    "c:rg pow>=4",
+]
+
+SIZES_SQL = """
+    SELECT
+        cls.relname AS table_name,
+        pg_relation_size(cls.oid) AS heap_bytes,
+        COALESCE(pg_total_relation_size(cls.reltoastrelid), 0) AS toast_bytes,
+        pg_indexes_size(cls.oid) AS index_bytes,
+        pg_total_relation_size(cls.oid) AS total_bytes
+    FROM pg_class AS cls
+    JOIN pg_namespace AS nsp ON nsp.oid = cls.relnamespace
+    WHERE nsp.nspname = 'magic' AND cls.relkind = 'r'
+    ORDER BY total_bytes DESC
+"""
+
+
+def get_database_connection() -> psycopg.Connection:
+    """Get a connection to the PostgreSQL database."""
+    creds = get_pg_creds()
+    conninfo = " ".join(f"{k}={v}" for k, v in creds.items())
+    conn = psycopg.connect(conninfo)
+    configure_connection(conn)
+    return conn
+
+
+def median_execution_ms(conn: psycopg.Connection, sql: str, params: dict[str, Any], repeat: int) -> float:
+    """Return the median EXPLAIN ANALYZE execution time of a statement in milliseconds."""
+    timings = []
+    with conn.cursor() as cursor:
+        for _ in range(repeat):
+            cursor.execute(f"EXPLAIN (ANALYZE, FORMAT JSON) {sql}", params)
+            plan = next(iter(cursor.fetchone().values()))[0]
+            timings.append(plan["Execution Time"])
+    return statistics.median(timings)
+
+
+def measure(conn: psycopg.Connection, repeat: int) -> dict[str, Any]:
+    """Collect table sizes and query latencies."""
+    with conn.cursor() as cursor:
+        cursor.execute(SIZES_SQL)
+        sizes = {row["table_name"]: {k: v for k, v in row.items() if k != "table_name"} for row in cursor.fetchall()}
+
+    latencies = {}
+    for query in SEARCH_QUERIES:
+        where_clause, params = generate_sql_query(parse_scryfall_query(query))
+        sql = f"""
+            SELECT card_name, mana_cost_text, type_line, oracle_text, set_name, collector_number
+            FROM magic.cards AS card
+            WHERE {where_clause}
+            ORDER BY edhrec_rank NULLS LAST
+            LIMIT 100
+        """
+        latencies[query] = median_execution_ms(conn, sql, params, repeat)
+    latencies["SELECT * FROM magic.cards"] = median_execution_ms(conn, "SELECT * FROM magic.cards", {}, repeat)
+    return {"sizes": sizes, "latencies_ms": latencies}
+
+
+def format_bytes(num_bytes: float) -> str:
+    """Format a byte count in MiB."""
+    return f"{num_bytes / 2**20:,.1f} MiB"
+
+
+def print_report(current: dict[str, Any], baseline: dict[str, Any] | None) -> None:
+    """Print the measurements, with deltas against the baseline if given."""
+    print(f"{'table':<24} {'heap':>12} {'toast':>12} {'indexes':>12} {'total':>12} {'vs baseline':>14}")
+    for table, sizes in current["sizes"].items():
+        delta = ""
+        if baseline is not None:
+            before = baseline["sizes"].get(table, {}).get("total_bytes", 0)
+            delta = format_bytes(sizes["total_bytes"] - before)
+        print(
+            f"{table:<24} {format_bytes(sizes['heap_bytes']):>12} {format_bytes(sizes['toast_bytes']):>12} "
+            f"{format_bytes(sizes['index_bytes']):>12} {format_bytes(sizes['total_bytes']):>12} {delta:>14}",
+        )
+    print()
+    print(f"{'query':<32} {'ms':>10} {'baseline ms':>12}")
+    for query, elapsed in current["latencies_ms"].items():
+        before = "" if baseline is None else f"{baseline['latencies_ms'].get(query, float('nan')):.1f}"
+        print(f"{query:<32} {elapsed:>10.1f} {before:>12}")
+
+
+def get_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Measure magic schema table sizes and search latency")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per query (default: 5)")
+    parser.add_argument("--save", type=pathlib.Path, help="Write the measurements to this JSON file")
+    parser.add_argument("--compare", type=pathlib.Path, help="Compare against measurements saved with --save")
+    return parser.parse_args()
+
+
+def main() -> None:
+    """Main entry point for the script."""
+    args = get_args()
+    with get_database_connection() as conn:
+        current = measure(conn, args.repeat)
+
+    baseline = orjson.loads(args.compare.read_bytes()) if args.compare else None
+    print_report(current, baseline)
+    if args.save:
+        args.save.write_bytes(orjson.dumps(current, option=orjson.OPT_INDENT_2))
+
+
+if __name__ == "__main__":
+    main()
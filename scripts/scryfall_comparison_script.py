@@ -15,18 +15,21 @@ Usage: python scryfall_comparison_script.py
 
 import logging
 import tempfile
-import time
 from dataclasses import dataclass
 
 import requests
 import tenacity
 
+from api.utils.rate_limiter import TokenBucket, rate_limited_get
+
 # Constants for magic values
 HTTP_NOT_FOUND = 404
 CORRELATION_THRESHOLD_LOW = 0.3
 CORRELATION_THRESHOLD_MEDIUM = 0.5
 RESULT_DIFF_THRESHOLD = 0.5
 MAX_DISPLAYED_CARDS = 5
+# Scryfall allows 10 requests per second
+SCRYFALL_REQUESTS_PER_SECOND = 10
 
 retryer = tenacity.retry(
     wait=tenacity.wait_exponential(multiplier=0.1, min=0.1, max=2) + tenacity.wait_random(0, 0.1),
@@ -73,6 +76,7 @@ class ScryfallAPIComparator:
         """Initialize the API comparator with default settings."""
         self.official_base_url = "https://api.scryfall.com"
         self.local_base_url = "https://scryfall.crestcourt.com"
+        self.scryfall_rate_limiter = TokenBucket(rate=SCRYFALL_REQUESTS_PER_SECOND)
         self.session = requests.Session()
         self.session.headers.update(
             {
@@ -96,7 +100,7 @@ class ScryfallAPIComparator:
             @retryer
             def get_response() -> requests.Response:
                 """Get response with retry logic."""
-                response = self.session.get(url, params=params, timeout=30)
+                response = rate_limited_get(self.session, url, rate_limiter=self.scryfall_rate_limiter, params=params, timeout=30)
                 if response.status_code not in [200, HTTP_NOT_FOUND]:
                     response.raise_for_status()
                 return response
@@ -257,7 +261,6 @@ class ScryfallAPIComparator:
 
     def compare_results(self, query: str) -> ComparisonResult:
         """Compare search results between official and local APIs."""
-        time.sleep(0.5)  # Rate limiting
         official_result = self.search_official_scryfall(query)
         local_result = self.search_local_scryfall(query)
 
@@ -344,7 +347,6 @@ class ScryfallAPIComparator:
             try:
                 result = self.compare_results(query)
                 results.append(result)
-                time.sleep(0.2)  # Rate limiting
             except (requests.RequestException, ValueError) as e:
                 logger.error(f"Failed to compare query '{query}': {e}")
             logger.info("")